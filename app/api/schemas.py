@@ -54,6 +54,20 @@ class AggregateReportRequest(_Base):
     output_root: str = "output"
 
 
+class CacheMaintenanceRequest(_Base):
+    """
+    Overrides for one maintenance pass; unset fields use the JOBAGENT_CACHE_*
+    and JOBAGENT_MAINTENANCE_* settings.
+    """
+
+    dry_run: bool = False
+    ttl_days: Optional[float] = None
+    max_mb: Optional[int] = None
+    evict_stale_versions: Optional[bool] = None
+    pool_ttl_days: Optional[float] = None
+    run_retention_days: Optional[float] = None
+
+
 # --- Responses --------------------------------------------------------------
 
 class FetchMeta(_Base):
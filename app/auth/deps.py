@@ -8,6 +8,7 @@ from sqlalchemy.exc import DBAPIError, OperationalError
 
 from app.auth.constants import AUTH_COOKIE_NAME
 from app.auth.security import decode_token
+from app.config.settings import settings
 from app.db.session import is_transient_db_error, run_db_with_retries
 from app.db.crud_users import get_user_by_id
 
@@ -62,3 +63,10 @@ def get_current_user(
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
     return user
+
+
+def require_admin(user=Depends(get_current_user)):
+    admins = {email.lower() for email in settings.admin_emails}
+    if (getattr(user, "email", None) or "").lower() not in admins:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return user
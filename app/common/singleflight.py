@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one in-flight task.
+
+    The first caller starts ``fn()``; callers arriving while it runs await the
+    same task. Every caller receives its own deep copy of the result, since
+    pipeline code mutates the dicts it gets back. Exceptions propagate to
+    every waiter. The shared task is shielded, so one caller being cancelled
+    does not cancel the others. In-flight maps are kept per event loop because
+    asyncio tasks are loop-bound (Prefect runs each task with asyncio.run()).
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._inflight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, asyncio.Task]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    def _tasks(self) -> Dict[Hashable, asyncio.Task]:
+        loop = asyncio.get_running_loop()
+        tasks = self._inflight.get(loop)
+        if tasks is None:
+            tasks = {}
+            self._inflight[loop] = tasks
+        return tasks
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Return ``(result, shared)``; ``shared`` is True when another caller did the work."""
+        self.calls += 1
+        tasks = self._tasks()
+        task = tasks.get(key)
+        if task is not None:
+            self.coalesced += 1
+            result = await asyncio.shield(task)
+            return copy.deepcopy(result), True
+
+        self.executions += 1
+        task = asyncio.ensure_future(fn())
+        tasks[key] = task
+
+        def _forget(done: asyncio.Task, key: Hashable = key, tasks: Dict[Hashable, asyncio.Task] = tasks) -> None:
+            if tasks.get(key) is done:
+                del tasks[key]
+
+        task.add_done_callback(_forget)
+        result = await asyncio.shield(task)
+        return copy.deepcopy(result), False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "inflight": sum(len(t) for t in self._inflight.values()),
+        }
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+from typing import Callable, Optional, Sequence, Tuple, Union
+
+
+def connect_sqlite(path: Union[str, Path], *, timeout: float = 30.0) -> sqlite3.Connection:
+    """
+    Open a SQLite file for local caches/indexes shared between the API and
+    Prefect worker processes: WAL journal so readers don't block the writer,
+    a busy timeout instead of immediate "database is locked" errors, and
+    autocommit so callers control transactions explicitly.
+    """
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(p), timeout=timeout, isolation_level=None, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={int(timeout * 1000)}")
+    return conn
+
+
+def evict_to_size_cap(
+    conn: sqlite3.Connection,
+    *,
+    table: str,
+    key_column: str,
+    size_column: str,
+    order_by: str,
+    max_bytes: int,
+    columns: Sequence[str] = (),
+    on_evict: Optional[Callable[[sqlite3.Row], None]] = None,
+    batch_size: int = 500,
+) -> Tuple[int, int]:
+    """
+    Size-bounded eviction for the local SQLite caches. When the summed
+    ``size_column`` of ``table`` exceeds ``max_bytes``, rows are deleted in
+    ``order_by`` order (oldest first) down to 90% of the cap, reading them in
+    batches rather than loading the whole table. ``on_evict`` runs for each
+    row before it is deleted (e.g. to unlink a blob file or drop dependent
+    rows) and sees ``key_column``, ``size_column`` and ``columns``.
+
+    Runs in one explicit transaction on an autocommit connection from
+    ``connect_sqlite``; the caller holds its own lock. Returns
+    ``(evicted, remaining_bytes)``.
+    """
+    total = int(conn.execute(f"SELECT COALESCE(SUM({size_column}), 0) FROM {table}").fetchone()[0])
+    if max_bytes <= 0 or total <= max_bytes:
+        return 0, total
+    target = int(max_bytes * 0.9)
+    select = ", ".join([key_column, size_column, *columns])
+    evicted = 0
+    conn.execute("BEGIN")
+    try:
+        while total > target:
+            rows = conn.execute(
+                f"SELECT {select} FROM {table} ORDER BY {order_by} LIMIT ?", (int(batch_size),)
+            ).fetchall()
+            if not rows:
+                break
+            for row in rows:
+                if total <= target:
+                    break
+                if on_evict is not None:
+                    on_evict(row)
+                conn.execute(f"DELETE FROM {table} WHERE {key_column} = ?", (row[key_column],))
+                total -= int(row[size_column])
+                evicted += 1
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return evicted, total
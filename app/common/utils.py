@@ -31,6 +31,14 @@ def safe_filename(name: str) -> str:
     cleaned = re.sub(r"[^A-Za-z0-9._-]+", "_", base)
     return cleaned or "file"
 
+def normalize_url(url: str) -> str:
+    if not url:
+        return ""
+    cleaned = url.strip()
+    if not cleaned:
+        return ""
+    return cleaned.split("#", 1)[0].strip()
+
 def sha256_bytes(data: bytes) -> str:
     return hashlib.sha256(data).hexdigest()
 
@@ -66,6 +66,38 @@ class Settings:
     llm_language_override: bool = os.getenv("JOBAGENT_LLM_LANGUAGE_OVERRIDE", "1").lower() in ("1", "true")
     llm_language_override_conf: float = float(os.getenv("JOBAGENT_LLM_LANGUAGE_OVERRIDE_CONF", "0.9"))
     openai_api_key: str | None = _env("OPENAI_API_KEY", "JOBAGENT_OPENAI_API_KEY", default=None)
+    # Async LLM path: global in-flight cap, optional per-model caps ("model=N,..."), request timeout
+    llm_max_concurrency: int = _env_int("JOBAGENT_LLM_MAX_CONCURRENCY", default=4)
+    llm_model_concurrency: tuple[str, ...] = _env_csv("JOBAGENT_LLM_MODEL_CONCURRENCY", default="")
+    llm_timeout_sec: float = _env_float("JOBAGENT_LLM_TIMEOUT_SEC", default=60.0)
+    # LLM scheduler: requests/tokens per minute (0 = unlimited, per-model "model=N") and 429/5xx retries
+    llm_rpm: int = _env_int("JOBAGENT_LLM_RPM", default=0)
+    llm_tpm: int = _env_int("JOBAGENT_LLM_TPM", default=0)
+    llm_model_rpm: tuple[str, ...] = _env_csv("JOBAGENT_LLM_MODEL_RPM", default="")
+    llm_model_tpm: tuple[str, ...] = _env_csv("JOBAGENT_LLM_MODEL_TPM", default="")
+    llm_max_retries: int = _env_int("JOBAGENT_LLM_MAX_RETRIES", default=4)
+    llm_backoff_base_sec: float = _env_float("JOBAGENT_LLM_BACKOFF_BASE_SEC", default=1.0)
+    llm_backoff_max_sec: float = _env_float("JOBAGENT_LLM_BACKOFF_MAX_SEC", default=60.0)
+    # One LLM call for enrichment + LLM scoring when both are requested
+    llm_combined_mode: bool = _env_bool("JOBAGENT_LLM_COMBINED", default=False)
+    # Prompt compaction: strip boilerplate/duplicates from descriptions and fit a per-call token budget
+    llm_prompt_compaction: bool = _env_bool("JOBAGENT_LLM_PROMPT_COMPACTION", default=False)
+    llm_prompt_max_tokens: int = _env_int("JOBAGENT_LLM_PROMPT_MAX_TOKENS", default=4000)
+    # LLM gate: skip LLM scoring when the heuristic score is outside [min, max] or hard blockers already cap it
+    llm_gate_enabled: bool = _env_bool("JOBAGENT_LLM_GATE", default=False)
+    llm_gate_min_score: float = _env_float("JOBAGENT_LLM_GATE_MIN_SCORE", default=30.0)
+    llm_gate_max_score: float = _env_float("JOBAGENT_LLM_GATE_MAX_SCORE", default=100.0)
+    llm_gate_skip_hard_blockers: bool = _env_bool("JOBAGENT_LLM_GATE_SKIP_HARD_BLOCKERS", default=True)
+    # Raw LLM responses keyed by (model, temperature, messages hash); defaults to <output>/_llm_cache.sqlite
+    llm_cache_enabled: bool = _env_bool("JOBAGENT_LLM_CACHE_ENABLED", default=True)
+    llm_cache_path: str | None = _env("JOBAGENT_LLM_CACHE_PATH", default=None)
+    llm_cache_ttl_days: float = _env_float("JOBAGENT_LLM_CACHE_TTL_DAYS", default=30.0)
+    llm_cache_max_mb: int = _env_int("JOBAGENT_LLM_CACHE_MAX_MB", default=256)
+    # Deferred LLM: process runs stage heuristic results and send all prompts as one OpenAI Batch API job
+    llm_deferred_mode: bool = _env_bool("JOBAGENT_LLM_DEFERRED", default=False)
+    llm_batch_base_url: str | None = _env("JOBAGENT_LLM_BATCH_BASE_URL", default=None)
+    llm_batch_poll_sec: float = _env_float("JOBAGENT_LLM_BATCH_POLL_SEC", default=30.0)
+    llm_batch_timeout_sec: float = _env_float("JOBAGENT_LLM_BATCH_TIMEOUT_SEC", default=86400.0)
 
     # Fetching / crawling (canonical: JOBAGENT_*, with fallbacks)
     use_playwright_default: bool = _env_bool("JOBAGENT_USE" "_PLAYWRIGHT", "USE" "_PLAYWRIGHT", default=True)
@@ -80,6 +112,23 @@ class Settings:
         default=5.0,
     )
 
+    # Adaptive per-domain rate (requests/sec): starts at the average of the
+    # delay window above, grows on fast successes, halves on 429/403/5xx.
+    # JOBAGENT_FETCH_RATE_BOUNDS overrides floor:ceiling per domain,
+    # e.g. "stepstone.de=0.02:0.2".
+    fetch_rate_min_per_sec: float = _env_float("JOBAGENT_FETCH_RATE_MIN_PER_SEC", default=0.02)
+    fetch_rate_max_per_sec: float = _env_float("JOBAGENT_FETCH_RATE_MAX_PER_SEC", default=0.2)
+    fetch_rate_increase_step: float = _env_float("JOBAGENT_FETCH_RATE_INCREASE_STEP", default=0.005)
+    fetch_rate_decrease_factor: float = _env_float("JOBAGENT_FETCH_RATE_DECREASE_FACTOR", default=0.5)
+    fetch_rate_latency_target_sec: float = _env_float("JOBAGENT_FETCH_RATE_LATENCY_TARGET_SEC", default=3.0)
+    fetch_retry_after_max_sec: float = _env_float("JOBAGENT_FETCH_RETRY_AFTER_MAX_SEC", default=600.0)
+    fetch_rate_bounds: tuple[str, ...] = _env_csv("JOBAGENT_FETCH_RATE_BOUNDS", default="")
+
+    # Rate-limit and robots state shared by all local processes (SQLite file,
+    # defaults to <output>/_fetch_state.sqlite); falls back to in-memory state.
+    fetch_shared_state_enabled: bool = _env_bool("JOBAGENT_FETCH_SHARED_STATE", default=True)
+    fetch_shared_state_path: str | None = _env("JOBAGENT_FETCH_SHARED_STATE_PATH", default=None)
+
     # HTTP fetch behavior
     fetch_http_timeout_sec: float = _env_float("JOBAGENT_FETCH_HTTP_TIMEOUT", "JOB" "_FETCH_HTTP_TIMEOUT", default=35.0)
     fetch_http_retries: int = _env_int("JOBAGENT_FETCH_HTTP_RETRIES", "JOB" "_FETCH_HTTP_RETRIES", default=2)
@@ -89,6 +138,12 @@ class Settings:
         default=3.0,
     )
 
+    # Pooled HTTP clients (one keep-alive client per domain)
+    fetch_http_max_connections: int = _env_int("JOBAGENT_FETCH_HTTP_MAX_CONNECTIONS", default=10)
+    fetch_http_max_keepalive: int = _env_int("JOBAGENT_FETCH_HTTP_MAX_KEEPALIVE", default=5)
+    fetch_http_keepalive_expiry_sec: float = _env_float("JOBAGENT_FETCH_HTTP_KEEPALIVE_EXPIRY_SEC", default=30.0)
+    fetch_http2: bool = _env_bool("JOBAGENT_FETCH_HTTP2", default=False)
+
     # Playwright tuning
     playwright_wait_until: str = _env(
         "JOBAGENT_FETCH_PW_WAIT_UNTIL",
@@ -101,6 +156,29 @@ class Settings:
         default=45000,
     )
 
+    # Playwright browser pool
+    playwright_pool_size: int = _env_int("JOBAGENT_PLAYWRIGHT_POOL_SIZE", default=1)
+    playwright_max_pages_per_browser: int = _env_int("JOBAGENT_PLAYWRIGHT_MAX_PAGES_PER_BROWSER", default=50)
+
+    # Playwright page load profile: block heavy/tracking requests and return as
+    # soon as the JSON-LD script is attached ("jsonld") or after a fixed settle.
+    playwright_block_resources: bool = _env_bool("JOBAGENT_PLAYWRIGHT_BLOCK_RESOURCES", default=True)
+    playwright_block_resource_types: tuple[str, ...] = _env_csv(
+        "JOBAGENT_PLAYWRIGHT_BLOCK_TYPES", default="image,media,font,stylesheet"
+    )
+    playwright_block_url_patterns: tuple[str, ...] = _env_csv(
+        "JOBAGENT_PLAYWRIGHT_BLOCK_URL_PATTERNS",
+        default=(
+            "google-analytics.com,googletagmanager.com,doubleclick.net,facebook.net,"
+            "hotjar.com,bing.com/bat,criteo,adnxs.com,tiktok.com,linkedin.com/px"
+        ),
+    )
+    playwright_allow_url_patterns: tuple[str, ...] = _env_csv(
+        "JOBAGENT_PLAYWRIGHT_ALLOW_URL_PATTERNS", default=""
+    )
+    playwright_content_wait: str = _env("JOBAGENT_PLAYWRIGHT_CONTENT_WAIT", default="jsonld") or "jsonld"
+    playwright_jsonld_wait_ms: int = _env_int("JOBAGENT_PLAYWRIGHT_JSONLD_WAIT_MS", default=5000)
+
     # Robots / access denied heuristics
     fetch_robots_ttl_sec: float = _env_float("JOBAGENT_FETCH_ROBOTS_TTL_SEC", "JOB" "_FETCH_ROBOTS_TTL_SEC", default=86400.0)
     fetch_access_denied_markers: tuple[str, ...] = tuple(
@@ -131,6 +209,14 @@ class Settings:
         default="de-DE,de;q=0.9,en-US;q=0.7,en;q=0.6",
     ) or ""
 
+    # Batch processing
+    process_concurrency: int = _env_int("JOBAGENT_PROCESS_CONCURRENCY", default=1)
+    # Where HTML parsing and heuristic scoring run: process | thread | inline
+    cpu_executor_mode: str = (_env("JOBAGENT_CPU_EXECUTOR", default="process") or "process").strip().lower()
+    # 0 = min(4, cpu_count)
+    cpu_executor_workers: int = _env_int("JOBAGENT_CPU_EXECUTOR_WORKERS", default=0)
+    cpu_executor_warmup: bool = _env_bool("JOBAGENT_CPU_EXECUTOR_WARMUP", default=True)
+
     # Legacy delay used by some older utilities (ms)
     request_delay_ms: int = _env_int("JOBAGENT_REQUEST" "_DELAY_MS", "REQUEST" "_DELAY_MS", default=800)
 
@@ -139,6 +225,24 @@ class Settings:
     cache_ttl_days: int = _env_int("JOBAGENT_CACHE_TTL_DAYS", default=7)
     cache_version: str = _env("JOBAGENT_CACHE_VERSION", default="v2") or "v2"
     cache_per_profile: bool = _env_bool("JOBAGENT_CACHE_PER_PROFILE", default=True)
+    cache_backend: str = (_env("JOBAGENT_CACHE_BACKEND", default="sqlite") or "sqlite").lower()
+    cache_max_mb: int = _env_int("JOBAGENT_CACHE_MAX_MB", default=2048)
+    # In-process LRU in front of the cache store (0 entries disables it)
+    cache_memory_entries: int = _env_int("JOBAGENT_CACHE_MEMORY_ENTRIES", default=2048)
+    cache_memory_mb: int = _env_int("JOBAGENT_CACHE_MEMORY_MB", default=64)
+
+    # Cache / URL pool / run directory maintenance (0 keeps everything)
+    maintenance_pool_ttl_days: float = _env_float("JOBAGENT_MAINTENANCE_POOL_TTL_DAYS", default=0.0)
+    maintenance_run_retention_days: float = _env_float("JOBAGENT_MAINTENANCE_RUN_RETENTION_DAYS", default=0.0)
+    maintenance_batch_size: int = _env_int("JOBAGENT_MAINTENANCE_BATCH_SIZE", default=500)
+    maintenance_pause_ms: int = _env_int("JOBAGENT_MAINTENANCE_PAUSE_MS", default=10)
+
+    # Raw HTML archive (content-addressed, compressed; enables offline replay)
+    html_archive_enabled: bool = _env_bool("JOBAGENT_HTML_ARCHIVE_ENABLED", default=True)
+    html_archive_dir: str | None = _env("JOBAGENT_HTML_ARCHIVE_DIR", default=None)
+    html_archive_max_mb: int = _env_int("JOBAGENT_HTML_ARCHIVE_MAX_MB", default=1024)
+    # Directory of saved pages served by the offline "archive" backend before the archive itself
+    fetch_replay_dir: str | None = _env("JOBAGENT_FETCH_REPLAY_DIR", default=None)
 
     # Database (Azure SQL)
     database_url: str | None = _env("JOBAGENT_DATABASE_URL", default=None)
@@ -151,6 +255,8 @@ class Settings:
     jwt_secret: str | None = _env("JOBAGENT_JWT_SECRET", default=None)
     jwt_alg: str = _env("JOBAGENT_JWT_ALG", default="HS256") or "HS256"
     jwt_expires_min: int = _env_int("JOBAGENT_JWT_EXPIRES_MIN", default=120)
+    # Users allowed on /api/admin/* endpoints
+    admin_emails: tuple[str, ...] = _env_csv("JOBAGENT_ADMIN_EMAILS", default="")
 
     # Paths
     output_dir: Path = Path(os.getenv("JOBAGENT_OUTPUT_DIR", "output"))
@@ -6,6 +6,7 @@ import re
 import subprocess
 import uuid
 import logging
+from dataclasses import asdict
 from pathlib import Path
 from urllib.parse import quote
 from datetime import datetime, timedelta, timezone
@@ -25,7 +26,7 @@ from app.config import profile_store
 from app.config.focus import DEFAULT_FOCUS, FocusConfig, get_focus_config
 from app.gui_runs import run_manager
 from app.auth.constants import AUTH_COOKIE_NAME
-from app.auth.deps import get_current_user
+from app.auth.deps import get_current_user, require_admin
 from app.db.crud_profiles import (
     create_profile_for_user,
     delete_profile_for_user,
@@ -41,6 +42,7 @@ from app.db.models import Resume
 from app.api.schemas import (
     AggregateReportRequest,
     BundleRequest,
+    CacheMaintenanceRequest,
     JobDetailsRequest,
     RunSingleRequest,
     RunSingleResponse,
@@ -63,16 +65,25 @@ from .pipeline.models import UnifiedJobPosting, FocusProfileModel
 from .pipeline.resume_parse import parse_resume_file
 from app.common.utils import ensure_dir, safe_filename, sha256_bytes
 from app.common.logging_ctx import get_run_ctx, run_ctx_scope
+from .pipeline.url_pool import pool_store_path_for_profile
 from .pipeline.url_pool_maintenance import prune_unavailable_stepstone_urls
 from .stepstone.search_http import search_stepstone as crawl_http
 from .stepstone.search_playwright import search_stepstone_pw as crawl_pw
 from .stepstone.smoke import search_stepstone as ss_search 
-from .pipeline.state import load_state, save_state
+from .pipeline.state import cache_stats, load_state, save_state
+from .pipeline.cache_maintenance import MaintenancePolicy, maintenance_status, run_maintenance_exclusive
 from .fetching.polite_fetch import (
     RobotsDisallowedError,
     AccessDeniedError as FetchAccessDeniedError,
+    FETCH_BACKENDS,
     FetchError,
+    close_fetch_resources,
 )
+from .fetching.browser_pool import get_browser_pool
+from .pipeline.executors import shutdown_cpu_executor, warm_up_cpu_executor
+from .pipeline.llm_enrich import close_async_client
+from .pipeline.llm_limits import LLM_LIMITER
+from .pipeline.llm_scheduler import LLM_SCHEDULER
 from .pipeline.pipeline import fetch_job_details as pipeline_fetch_job_details
 from .stepstone.dates import parse_iso8601_utc
 
@@ -122,6 +133,18 @@ def _startup_checks():
     except Exception:
         APP_STATE["db_ok"] = False
 
+    try:
+        warm_up_cpu_executor()
+    except Exception:
+        logger.warning("CPU executor warm-up failed", exc_info=True)
+
+
+@app.on_event("shutdown")
+async def _shutdown_fetch_resources():
+    await close_fetch_resources()
+    await close_async_client()
+    shutdown_cpu_executor()
+
 
 @app.exception_handler(OperationalError)
 async def sqlalchemy_operational_error_handler(request: Request, exc: OperationalError):
@@ -208,24 +231,60 @@ def health_config():
     )
 
 
+@app.get("/health/llm")
+def health_llm():
+    """LLM request scheduler (rate queue, throttling, retries) and concurrency limiter counters."""
+    return {"scheduler": LLM_SCHEDULER.stats(), "limiter": LLM_LIMITER.stats()}
+
+
+@app.get("/health/cache")
+async def health_cache():
+    """Job cache: in-memory LRU counters (hits, misses, stale reloads, evictions) and store size."""
+    return await run_in_threadpool(cache_stats)
+
+
+@app.get("/api/admin/cache", dependencies=[Depends(require_admin)])
+async def admin_cache_status():
+    """Cache store stats plus the state and last report of the maintenance pass."""
+    store = await run_in_threadpool(cache_stats)
+    return {"store": store, "maintenance": maintenance_status()}
+
+
+@app.post("/api/admin/cache/maintenance", status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(require_admin)])
+def admin_cache_maintenance(req: CacheMaintenanceRequest, background_tasks: BackgroundTasks):
+    """
+    Schedule a maintenance pass (cache eviction, URL pool TTL, run retention).
+    It runs in the background in small batches; poll GET /api/admin/cache for the report.
+    """
+    if maintenance_status()["running"]:
+        raise HTTPException(status_code=409, detail="Cache maintenance already running")
+    policy = MaintenancePolicy.from_settings(
+        dry_run=req.dry_run,
+        ttl_days=req.ttl_days,
+        max_bytes=(req.max_mb * 1024 * 1024 if req.max_mb is not None else None),
+        evict_stale_versions=req.evict_stale_versions,
+        pool_ttl_days=req.pool_ttl_days,
+        run_retention_days=req.run_retention_days,
+    )
+    background_tasks.add_task(run_maintenance_exclusive, policy)
+    return {"scheduled": True, "policy": asdict(policy)}
+
+
 @app.get("/playwright_check")
 async def playwright_check():
     if not use_playwright_default:
         raise HTTPException(status_code=400, detail="Playwright disabled in .env")
     try:
-        from playwright.async_api import async_playwright
         ua = None
-        async with async_playwright() as pw:
-            browser = await pw.chromium.launch(headless=headless_mode)
-            page = await browser.new_page()
+        pool = get_browser_pool()
+        async with pool.page() as page:
             await page.goto("https://httpbin.org/user-agent", wait_until="domcontentloaded")
             data = await page.content()
-            await browser.close()
         import re, html
         text = html.unescape(data)
         m = re.search(r'\"user-agent\"\\s*:\\s*\"([^\"]+)\"', text)
         ua = m.group(1) if m else "unknown"
-        return JSONResponse({"ok": True, "user_agent": ua})
+        return JSONResponse({"ok": True, "user_agent": ua, "browser_pool": pool.stats()})
     except Exception as e:
         logger.exception("Playwright check failed")
         raise HTTPException(status_code=500, detail=f"Playwright error: {e}")
@@ -419,8 +478,8 @@ async def search_stepstone_list(req: SearchStepstoneListRequest) -> SearchStepst
 @app.post("/job_details", response_model=JobDetailsResponse)
 async def job_details(req: JobDetailsRequest) -> JobDetailsResponse:
     backend = req.backend or "auto"
-    if backend not in ("auto", "pw", "http"):
-        raise HTTPException(status_code=400, detail="backend must be 'pw', 'http', or 'auto'")
+    if backend not in FETCH_BACKENDS:
+        raise HTTPException(status_code=400, detail="backend must be 'pw', 'http', 'archive', or 'auto'")
 
     active_focus = DEFAULT_FOCUS
     if req.profile_key:
@@ -1539,8 +1598,7 @@ def _run_prune_url_pool(
             metrics_path.write_text(json.dumps(metrics, ensure_ascii=False, indent=2), encoding="utf-8")
             artifacts = status.get("artifacts") or {}
             artifacts["run_metrics_json"] = str(metrics_path)
-            artifacts["url_pool_jsonl"] = str(profile_dir / "url_pool.jsonl")
-            artifacts["url_pool_unavailable_jsonl"] = str(profile_dir / "url_pool_unavailable.jsonl")
+            artifacts["url_pool_db"] = str(pool_store_path_for_profile(profile_dir))
             status["artifacts"] = artifacts
             status["status"] = "completed"
             status["finished_at"] = run_manager._now_iso()
@@ -1562,8 +1620,8 @@ async def run_single(req: RunSingleRequest, user=Depends(get_current_user)) -> R
     focus = FocusConfig.from_profile(profile_model)
 
     backend = req.backend or "auto"
-    if backend not in ("auto", "pw", "http"):
-        raise HTTPException(status_code=400, detail="backend must be 'pw', 'http', or 'auto'")
+    if backend not in FETCH_BACKENDS:
+        raise HTTPException(status_code=400, detail="backend must be 'pw', 'http', 'archive', or 'auto'")
 
     user_id_str = str(user.id)
     run_id = run_manager.create_run_dir(user_id_str, req.profile_key)
@@ -1,6 +1,8 @@
 from .http_client import fetch
 from .polite_fetch import (
+    FETCH_BACKENDS,
     fetch_job_html,
+    close_fetch_resources,
     RobotsDisallowedError,
     AccessDeniedError,
     FetchError,
@@ -9,7 +11,9 @@ from .polite_fetch import (
 
 __all__ = [
     "fetch",
+    "FETCH_BACKENDS",
     "fetch_job_html",
+    "close_fetch_resources",
     "RobotsDisallowedError",
     "AccessDeniedError",
     "FetchError",
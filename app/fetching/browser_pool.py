@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from app.config.settings import settings
+
+Launcher = Callable[[bool, Sequence[str]], Awaitable[Any]]
+
+
+@dataclass
+class _BrowserSlot:
+    browser: Any
+    launch_key: Tuple[Any, ...]
+    pages_served: int = 0
+    in_use: bool = False
+    contexts: Dict[str, Any] = field(default_factory=dict)
+
+
+class BrowserPool:
+    """
+    Keeps up to ``size`` Chromium instances warm and hands out one page per
+    lease. Browser contexts are reused per option set (user agent, locale,
+    headers) so cookies and the HTTP cache survive between detail fetches.
+
+    A browser is recycled after ``max_pages_per_browser`` pages or as soon as
+    it reports itself disconnected. Like the HTTP client pool, the pool is
+    bound to the event loop that first used it and starts fresh on a new loop.
+    """
+
+    def __init__(
+        self,
+        *,
+        size: int,
+        max_pages_per_browser: int,
+        headless: bool,
+        launcher: Optional[Launcher] = None,
+    ) -> None:
+        self.size = max(1, int(size))
+        self.max_pages_per_browser = max(1, int(max_pages_per_browser))
+        self.headless = bool(headless)
+        self._launcher = launcher
+        self._playwright = None
+        self._slots: List[_BrowserSlot] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._slots_free: Optional[asyncio.Semaphore] = None
+        self.launched = 0
+        self.recycled = 0
+        self.pages_served = 0
+
+    def _check_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        if self._slots:
+            logger.debug("Event loop changed; discarding {} pooled browsers", len(self._slots))
+        self._slots = []
+        self._playwright = None
+        self._loop = loop
+        self._lock = asyncio.Lock()
+        self._slots_free = asyncio.Semaphore(self.size)
+
+    async def _launch(self, headless: bool, args: Sequence[str]) -> Any:
+        if self._launcher is not None:
+            return await self._launcher(headless, args)
+        if self._playwright is None:
+            from playwright.async_api import async_playwright
+
+            self._playwright = await async_playwright().start()
+        return await self._playwright.chromium.launch(headless=headless, args=list(args))
+
+    @staticmethod
+    def _is_healthy(slot: _BrowserSlot) -> bool:
+        try:
+            return bool(slot.browser.is_connected())
+        except Exception:
+            return False
+
+    async def _close_slot(self, slot: _BrowserSlot) -> None:
+        for ctx in list(slot.contexts.values()):
+            try:
+                await ctx.close()
+            except Exception:
+                pass
+        slot.contexts.clear()
+        try:
+            await slot.browser.close()
+        except Exception:
+            pass
+
+    async def _checkout(self, launch_key: Tuple[Any, ...]) -> _BrowserSlot:
+        assert self._lock is not None
+        evicted: Optional[_BrowserSlot] = None
+        async with self._lock:
+            for slot in list(self._slots):
+                if slot.in_use:
+                    continue
+                if slot.launch_key == launch_key and self._is_healthy(slot):
+                    slot.in_use = True
+                    return slot
+            # No idle match: free capacity by dropping idle unhealthy or
+            # mismatching browsers before launching a new one.
+            if len(self._slots) >= self.size:
+                for slot in list(self._slots):
+                    if not slot.in_use:
+                        self._slots.remove(slot)
+                        evicted = slot
+                        break
+            # Reserve the slot so concurrent checkouts see the capacity as taken,
+            # then launch without holding the lock.
+            reserved = _BrowserSlot(browser=None, launch_key=launch_key, in_use=True)
+            self._slots.append(reserved)
+        if evicted is not None:
+            await self._close_slot(evicted)
+        headless, args = launch_key
+        try:
+            browser = await self._launch(headless, args)
+        except BaseException:
+            async with self._lock:
+                if reserved in self._slots:
+                    self._slots.remove(reserved)
+            raise
+        self.launched += 1
+        reserved.browser = browser
+        return reserved
+
+    async def _release(self, slot: _BrowserSlot) -> None:
+        assert self._lock is not None
+        retired = False
+        async with self._lock:
+            slot.in_use = False
+            if slot.pages_served >= self.max_pages_per_browser or not self._is_healthy(slot):
+                if slot in self._slots:
+                    self._slots.remove(slot)
+                self.recycled += 1
+                retired = True
+        # Closing a browser can take seconds; don't hold up other checkouts.
+        if retired:
+            await self._close_slot(slot)
+
+    @asynccontextmanager
+    async def page(
+        self,
+        *,
+        context_options: Optional[Dict[str, Any]] = None,
+        launch_args: Sequence[str] = (),
+        headless: Optional[bool] = None,
+    ) -> AsyncIterator[Any]:
+        """Lease a fresh page in a warm browser; the page is closed on exit."""
+        self._check_loop()
+        assert self._slots_free is not None
+        launch_key = (self.headless if headless is None else bool(headless), tuple(launch_args))
+        ctx_key = json.dumps(context_options or {}, sort_keys=True, default=str)
+
+        async with self._slots_free:
+            slot = await self._checkout(launch_key)
+            page = None
+            try:
+                context = slot.contexts.get(ctx_key)
+                if context is None:
+                    context = await slot.browser.new_context(**(context_options or {}))
+                    slot.contexts[ctx_key] = context
+                page = await context.new_page()
+                slot.pages_served += 1
+                self.pages_served += 1
+                yield page
+            finally:
+                if page is not None:
+                    try:
+                        await page.close()
+                    except Exception:
+                        pass
+                await self._release(slot)
+
+    async def aclose(self) -> None:
+        slots, self._slots = self._slots, []
+        playwright, self._playwright = self._playwright, None
+        try:
+            same_loop = self._loop is asyncio.get_running_loop()
+        except RuntimeError:
+            same_loop = False
+        self._loop = None
+        if not same_loop:
+            return
+        for slot in slots:
+            await self._close_slot(slot)
+        if playwright is not None:
+            try:
+                await playwright.stop()
+            except Exception as exc:
+                logger.debug("Error stopping Playwright: {}", exc)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "browsers": len(self._slots),
+            "in_use": sum(1 for slot in self._slots if slot.in_use),
+            "launched": self.launched,
+            "recycled": self.recycled,
+            "pages_served": self.pages_served,
+            "max_pages_per_browser": self.max_pages_per_browser,
+        }
+
+
+BROWSER_POOL = BrowserPool(
+    size=settings.playwright_pool_size,
+    max_pages_per_browser=settings.playwright_max_pages_per_browser,
+    headless=settings.headless,
+)
+
+
+def get_browser_pool() -> BrowserPool:
+    return BROWSER_POOL
+
+
+async def close_browser_pool() -> None:
+    await BROWSER_POOL.aclose()
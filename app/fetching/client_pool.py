@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlparse
+
+import httpx
+from loguru import logger
+
+from app.config.settings import settings
+
+try:  # optional: HTTP/2 needs the "h2" package
+    import h2  # noqa: F401
+
+    _H2_AVAILABLE = True
+except Exception:
+    _H2_AVAILABLE = False
+
+
+class HttpClientPool:
+    """
+    Keeps one long-lived httpx.AsyncClient per domain so repeated fetches reuse
+    TCP/TLS connections instead of paying a handshake per request.
+
+    httpx clients are bound to the event loop they were first used on. Prefect
+    tasks call asyncio.run() per job, so the pool remembers the loop and drops
+    its clients when a different loop asks for one.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: int,
+        max_keepalive: int,
+        keepalive_expiry: float,
+        http2: bool,
+        transport_factory: Optional[Callable[[], httpx.AsyncBaseTransport]] = None,
+    ) -> None:
+        self.max_connections = max(1, int(max_connections))
+        self.max_keepalive = max(0, int(max_keepalive))
+        self.keepalive_expiry = float(keepalive_expiry)
+        self.http2 = bool(http2) and _H2_AVAILABLE
+        self.transport_factory = transport_factory
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.created = 0
+
+    def _check_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        if self._clients:
+            logger.debug("Event loop changed; discarding {} pooled HTTP clients", len(self._clients))
+        self._clients = {}
+        self._loop = loop
+
+    def _build_client(self) -> httpx.AsyncClient:
+        kwargs: Dict[str, Any] = {
+            "limits": httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            "http2": self.http2,
+        }
+        if self.transport_factory is not None:
+            kwargs["transport"] = self.transport_factory()
+        self.created += 1
+        return httpx.AsyncClient(**kwargs)
+
+    def client_for(self, url: str) -> httpx.AsyncClient:
+        self._check_loop()
+        domain = urlparse(url).netloc.lower()
+        client = self._clients.get(domain)
+        if client is None or client.is_closed:
+            client = self._build_client()
+            self._clients[domain] = client
+        return client
+
+    async def get(
+        self,
+        url: str,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        follow_redirects: bool = False,
+    ) -> httpx.Response:
+        client = self.client_for(url)
+        return await client.get(
+            url,
+            headers=headers,
+            timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+            follow_redirects=follow_redirects,
+        )
+
+    async def aclose(self) -> None:
+        clients, self._clients = self._clients, {}
+        try:
+            same_loop = self._loop is asyncio.get_running_loop()
+        except RuntimeError:
+            same_loop = False
+        self._loop = None
+        if not same_loop:
+            return
+        for client in clients.values():
+            try:
+                await client.aclose()
+            except Exception as exc:
+                logger.debug("Error closing pooled HTTP client: {}", exc)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "domains": sorted(self._clients),
+            "clients_created": self.created,
+            "http2": self.http2,
+            "max_connections": self.max_connections,
+        }
+
+
+HTTP_POOL = HttpClientPool(
+    max_connections=settings.fetch_http_max_connections,
+    max_keepalive=settings.fetch_http_max_keepalive,
+    keepalive_expiry=settings.fetch_http_keepalive_expiry_sec,
+    http2=settings.fetch_http2,
+)
+
+
+def get_http_pool() -> HttpClientPool:
+    return HTTP_POOL
+
+
+async def close_http_pool() -> None:
+    await HTTP_POOL.aclose()
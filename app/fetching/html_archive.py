@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from app.common.sqlite_utils import connect_sqlite, evict_to_size_cap
+from app.common.utils import normalize_url
+from app.config.settings import settings
+
+try:  # optional: better ratio and much faster than gzip
+    import zstandard
+except Exception:  # pragma: no cover
+    zstandard = None  # type: ignore
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    sha256 TEXT PRIMARY KEY,
+    codec TEXT NOT NULL,
+    raw_size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS blobs_last_access ON blobs(last_access);
+CREATE TABLE IF NOT EXISTS fetches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    sha256 TEXT NOT NULL,
+    backend TEXT,
+    status INTEGER,
+    final_url TEXT
+);
+CREATE INDEX IF NOT EXISTS fetches_url_time ON fetches(url, fetched_at);
+CREATE INDEX IF NOT EXISTS fetches_sha ON fetches(sha256);
+"""
+
+_SUFFIX = {"zstd": ".html.zst", "gzip": ".html.gz"}
+
+# Size-based eviction sums the whole blob table; run it every N writes rather than on each put.
+_EVICT_EVERY_PUTS = 100
+
+
+@dataclass
+class ArchivedPage:
+    url: str
+    fetched_at: float
+    sha256: str
+    backend: Optional[str]
+    status: Optional[int]
+    final_url: Optional[str]
+    html: str
+
+
+class HtmlArchive:
+    """
+    Content-addressed store of fetched job pages.
+
+    Blobs are keyed by the sha256 of the HTML and compressed with zstd when
+    available (gzip otherwise); a SQLite index maps normalized URL + fetch time
+    to blobs. Identical pages fetched twice share one blob. When the stored
+    size exceeds ``max_bytes`` the least recently read blobs (and their index
+    rows) are evicted down to 90% of the cap, checked every
+    ``_EVICT_EVERY_PUTS`` writes and on ``evict()``.
+    """
+
+    def __init__(self, root: Path, *, max_bytes: int, codec: Optional[str] = None) -> None:
+        self.root = Path(root)
+        self.max_bytes = max(0, int(max_bytes))
+        if codec is None:
+            codec = "zstd" if zstandard is not None else "gzip"
+        if codec == "zstd" and zstandard is None:
+            codec = "gzip"
+        self.codec = codec
+        self._puts = 0
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(self.root / "index.sqlite")
+        self._conn.executescript(_SCHEMA)
+
+    # --- blobs ---------------------------------------------------------
+
+    def _blob_path(self, sha: str, codec: str) -> Path:
+        return self.root / "blobs" / sha[:2] / f"{sha}{_SUFFIX[codec]}"
+
+    @staticmethod
+    def _compress(data: bytes, codec: str) -> bytes:
+        if codec == "zstd":
+            return zstandard.ZstdCompressor(level=10).compress(data)
+        return gzip.compress(data, compresslevel=6)
+
+    @staticmethod
+    def _decompress(data: bytes, codec: str) -> bytes:
+        if codec == "zstd":
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read zstd archive blobs")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return gzip.decompress(data)
+
+    def put(
+        self,
+        url: str,
+        html: str,
+        *,
+        backend: Optional[str] = None,
+        status: Optional[int] = None,
+        final_url: Optional[str] = None,
+        fetched_at: Optional[float] = None,
+    ) -> str:
+        raw = html.encode("utf-8")
+        sha = hashlib.sha256(raw).hexdigest()
+        now = time.time()
+        fetched_at = now if fetched_at is None else float(fetched_at)
+        key = normalize_url(url)
+
+        with self._lock:
+            row = self._conn.execute("SELECT codec FROM blobs WHERE sha256 = ?", (sha,)).fetchone()
+            if row is None or not self._blob_path(sha, row["codec"]).exists():
+                stored = self._compress(raw, self.codec)
+                path = self._blob_path(sha, self.codec)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_name(path.name + ".tmp")
+                tmp.write_bytes(stored)
+                tmp.replace(path)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO blobs(sha256, codec, raw_size, stored_size, created_at, last_access)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (sha, self.codec, len(raw), len(stored), now, now),
+                )
+            else:
+                self._conn.execute("UPDATE blobs SET last_access = ? WHERE sha256 = ?", (now, sha))
+            self._conn.execute(
+                "INSERT INTO fetches(url, fetched_at, sha256, backend, status, final_url) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, fetched_at, sha, backend, status, final_url),
+            )
+            self._puts += 1
+            if self._puts % _EVICT_EVERY_PUTS == 0:
+                self._evict_locked()
+        return sha
+
+    def read_blob(self, sha: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT codec FROM blobs WHERE sha256 = ?", (sha,)).fetchone()
+            if row is None:
+                return None
+            path = self._blob_path(sha, row["codec"])
+            try:
+                data = path.read_bytes()
+            except FileNotFoundError:
+                return None
+            self._conn.execute("UPDATE blobs SET last_access = ? WHERE sha256 = ?", (time.time(), sha))
+        return self._decompress(data, row["codec"]).decode("utf-8")
+
+    # --- lookups -------------------------------------------------------
+
+    def latest(self, url: str, *, max_age_sec: Optional[float] = None) -> Optional[ArchivedPage]:
+        key = normalize_url(url)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, fetched_at, sha256, backend, status, final_url FROM fetches"
+                " WHERE url = ? ORDER BY fetched_at DESC LIMIT 1",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        if max_age_sec is not None and time.time() - float(row["fetched_at"]) > max_age_sec:
+            return None
+        html = self.read_blob(row["sha256"])
+        if html is None:
+            return None
+        return ArchivedPage(
+            url=row["url"],
+            fetched_at=float(row["fetched_at"]),
+            sha256=row["sha256"],
+            backend=row["backend"],
+            status=row["status"],
+            final_url=row["final_url"],
+            html=html,
+        )
+
+    def history(self, url: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT fetched_at, sha256, backend, status FROM fetches WHERE url = ? ORDER BY fetched_at",
+                (normalize_url(url),),
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    # --- eviction / stats ---------------------------------------------
+
+    def _evict_locked(self) -> int:
+        def _drop_blob(row) -> None:
+            self._blob_path(row["sha256"], row["codec"]).unlink(missing_ok=True)
+            self._conn.execute("DELETE FROM fetches WHERE sha256 = ?", (row["sha256"],))
+
+        evicted, total = evict_to_size_cap(
+            self._conn,
+            table="blobs",
+            key_column="sha256",
+            size_column="stored_size",
+            order_by="last_access",
+            max_bytes=self.max_bytes,
+            columns=("codec",),
+            on_evict=_drop_blob,
+        )
+        if evicted:
+            logger.info("HTML archive evicted {} blobs (now {} bytes)", evicted, total)
+        return evicted
+
+    def evict(self) -> int:
+        with self._lock:
+            return self._evict_locked()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            blob = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(stored_size), 0) FROM blobs"
+            ).fetchone()
+            fetches = self._conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT url) FROM fetches"
+            ).fetchone()
+        return {
+            "root": str(self.root),
+            "codec": self.codec,
+            "blobs": blob[0],
+            "raw_bytes": blob[1],
+            "stored_bytes": blob[2],
+            "fetches": fetches[0],
+            "urls": fetches[1],
+            "max_bytes": self.max_bytes,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_ARCHIVE: Optional[HtmlArchive] = None
+_ARCHIVE_LOCK = threading.Lock()
+
+
+def archive_root() -> Path:
+    return Path(settings.html_archive_dir) if settings.html_archive_dir else settings.output_dir / "_html_archive"
+
+
+def get_html_archive() -> Optional[HtmlArchive]:
+    """Process-wide archive, or None when JOBAGENT_HTML_ARCHIVE_ENABLED is off."""
+    global _ARCHIVE
+    if not settings.html_archive_enabled:
+        return None
+    if _ARCHIVE is None:
+        with _ARCHIVE_LOCK:
+            if _ARCHIVE is None:
+                _ARCHIVE = HtmlArchive(
+                    archive_root(),
+                    max_bytes=int(settings.html_archive_max_mb) * 1024 * 1024,
+                )
+    return _ARCHIVE
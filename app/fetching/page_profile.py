@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+from loguru import logger
+
+from app.config.settings import settings
+
+JSONLD_SELECTOR = 'script[type="application/ld+json"]'
+
+# Rough transfer sizes per resource type. Aborted requests never report a body
+# size, so the saving is a guess and is reported as ``bytes_saved_estimate``,
+# apart from the measured ``bytes_loaded``.
+_EST_BYTES_BY_TYPE: Dict[str, int] = {
+    "image": 40_000,
+    "media": 250_000,
+    "font": 35_000,
+    "stylesheet": 30_000,
+    "script": 45_000,
+    "xhr": 5_000,
+    "fetch": 5_000,
+    "other": 5_000,
+}
+
+
+@dataclass(frozen=True)
+class ResourceProfile:
+    """Which requests a Playwright page may make. Allow patterns win over blocks."""
+
+    block_types: Tuple[str, ...] = ()
+    block_url_patterns: Tuple[str, ...] = ()
+    allow_url_patterns: Tuple[str, ...] = ()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.block_types or self.block_url_patterns)
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        lower = url.lower()
+        if any(pat in lower for pat in self.allow_url_patterns):
+            return False
+        if resource_type in self.block_types:
+            return True
+        return any(pat in lower for pat in self.block_url_patterns)
+
+
+@dataclass
+class ResourceStats:
+    blocked: int = 0
+    allowed: int = 0
+    blocked_requests_by_type: Dict[str, int] = field(default_factory=dict)
+    bytes_saved_estimate: int = 0
+    bytes_loaded: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "blocked": self.blocked,
+            "allowed": self.allowed,
+            "blocked_requests_by_type": dict(self.blocked_requests_by_type),
+            "bytes_saved_estimate": self.bytes_saved_estimate,
+            "bytes_loaded": self.bytes_loaded,
+        }
+
+
+def _lower_tuple(values) -> Tuple[str, ...]:
+    return tuple(v.strip().lower() for v in values if v and v.strip())
+
+
+def detail_profile() -> ResourceProfile:
+    if not settings.playwright_block_resources:
+        return ResourceProfile()
+    return ResourceProfile(
+        block_types=_lower_tuple(settings.playwright_block_resource_types),
+        block_url_patterns=_lower_tuple(settings.playwright_block_url_patterns),
+        allow_url_patterns=_lower_tuple(settings.playwright_allow_url_patterns),
+    )
+
+
+def search_profile() -> ResourceProfile:
+    # Result lists are read from the DOM and lazy-load on scroll, so keep CSS
+    # and scripts; only drop heavy assets and trackers.
+    base = detail_profile()
+    if not base.enabled:
+        return base
+    return ResourceProfile(
+        block_types=tuple(t for t in base.block_types if t in {"image", "media", "font"}),
+        block_url_patterns=base.block_url_patterns,
+        allow_url_patterns=base.allow_url_patterns,
+    )
+
+
+async def install_resource_blocking(page: Any, profile: ResourceProfile) -> ResourceStats:
+    """Route every request of ``page`` through ``profile`` and count the outcome."""
+    stats = ResourceStats()
+    if not profile.enabled:
+        return stats
+
+    async def _handle(route, request) -> None:
+        rtype = (request.resource_type or "other").lower()
+        if profile.should_block(request.url, rtype):
+            stats.blocked += 1
+            stats.blocked_requests_by_type[rtype] = stats.blocked_requests_by_type.get(rtype, 0) + 1
+            stats.bytes_saved_estimate += _EST_BYTES_BY_TYPE.get(rtype, _EST_BYTES_BY_TYPE["other"])
+            try:
+                await route.abort()
+            except Exception:
+                pass
+            return
+        stats.allowed += 1
+        try:
+            await route.continue_()
+        except Exception:
+            pass
+
+    def _on_response(response) -> None:
+        try:
+            length = response.headers.get("content-length")
+            if length:
+                stats.bytes_loaded += int(length)
+        except Exception:
+            pass
+
+    await page.route("**/*", _handle)
+    page.on("response", _on_response)
+    return stats
+
+
+async def wait_for_content(
+    page: Any,
+    *,
+    mode: Optional[str] = None,
+    timeout_ms: Optional[int] = None,
+    started_at: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Wait until the page is usable. ``jsonld`` returns as soon as a JSON-LD
+    script is attached (falling back to the fixed settle delay on timeout);
+    ``fixed`` keeps the legacy 350ms settle.
+    """
+    mode = (mode or settings.playwright_content_wait or "fixed").lower()
+    timeout_ms = int(timeout_ms if timeout_ms is not None else settings.playwright_jsonld_wait_ms)
+    matched = False
+    if mode == "jsonld":
+        try:
+            await page.wait_for_selector(JSONLD_SELECTOR, state="attached", timeout=timeout_ms)
+            matched = True
+        except Exception as exc:
+            logger.debug("JSON-LD not found within {}ms: {}", timeout_ms, exc)
+            await page.wait_for_timeout(350)
+    else:
+        await page.wait_for_timeout(350)
+    out: Dict[str, Any] = {"wait_mode": mode, "jsonld_found": matched}
+    if started_at is not None:
+        out["time_to_content"] = round(time.perf_counter() - started_at, 3)
+    return out
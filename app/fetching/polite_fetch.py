@@ -4,7 +4,7 @@ import asyncio
 import random
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 import urllib.robotparser
 
@@ -12,6 +12,13 @@ import httpx
 from loguru import logger
 
 from app.config.settings import settings
+from .browser_pool import close_browser_pool, get_browser_pool
+from .client_pool import close_http_pool, get_http_pool
+from .html_archive import get_html_archive
+from . import rate_limit
+from .replay import REPLAY_BACKEND, load_replay_html
+from .shared_state import disable_shared_fetch_state, get_shared_fetch_state
+from .page_profile import detail_profile, install_resource_blocking, wait_for_content
 
 DEFAULT_USER_AGENT = settings.fetch_user_agent
 DEFAULT_ACCEPT_LANGUAGE = settings.fetch_accept_language
@@ -24,13 +31,13 @@ HTTP_RETRIES = int(settings.fetch_http_retries)
 HTTP_BACKOFF_BASE = float(settings.fetch_http_backoff_base)
 
 ROBOTS_TTL = float(settings.fetch_robots_ttl_sec)
-DELAY_MIN = float(settings.fetch_delay_min_sec)
-DELAY_MAX = float(settings.fetch_delay_max_sec)
 FAILURE_BACKOFF = float(settings.fetch_failure_backoff_sec)
 
 PLAYWRIGHT_WAIT_UNTIL = settings.playwright_wait_until
 PLAYWRIGHT_TIMEOUT_MS = int(settings.playwright_timeout_ms)
 
+FETCH_BACKENDS: Tuple[str, ...] = ("auto", "http", "pw", REPLAY_BACKEND)
+
 ACCESS_DENIED_MARKERS: Tuple[str, ...] = tuple(x.strip().lower() for x in settings.fetch_access_denied_markers)
 
 
@@ -74,6 +81,8 @@ class DomainState:
     lock: asyncio.Lock
     last_request: float = 0.0
     consecutive_failures: int = 0
+    aimd: Optional[rate_limit.AimdState] = None
+    bounds: Optional[rate_limit.AimdBounds] = None
 
 
 ROBOTS_CACHE: Dict[str, RobotsEntry] = {}
@@ -89,7 +98,8 @@ async def _get_domain_state(domain: str) -> DomainState:
     async with STATE_INIT_LOCK:
         state = DOMAIN_STATE.get(domain)
         if state is None:
-            state = DomainState(lock=asyncio.Lock())
+            bounds = rate_limit.bounds_for_domain(domain)
+            state = DomainState(lock=asyncio.Lock(), aimd=rate_limit.new_state(bounds), bounds=bounds)
             DOMAIN_STATE[domain] = state
     return state
 
@@ -106,7 +116,8 @@ async def _get_robots_lock(domain: str) -> asyncio.Lock:
     return lock
 
 
-async def _fetch_robots(url: str, user_agent: str) -> Optional[urllib.robotparser.RobotFileParser]:
+async def _fetch_robots_text(url: str, user_agent: str) -> Optional[str]:
+    """Download robots.txt; None means unavailable and is treated as allow-all."""
     parsed = urlparse(url)
     scheme = parsed.scheme or "https"
     domain = parsed.netloc
@@ -117,23 +128,32 @@ async def _fetch_robots(url: str, user_agent: str) -> Optional[urllib.robotparse
         "Accept": "text/plain,*/*;q=0.8",
     }
     try:
-        async with httpx.AsyncClient(timeout=15.0, headers=headers) as client:
-            resp = await client.get(robots_url)
-            if resp.status_code >= 400:
-                logger.warning(
-                    "robots.txt unavailable for {} (status={}); treating as allow-all",
-                    robots_url,
-                    resp.status_code,
-                )
-                return None
-            parser = urllib.robotparser.RobotFileParser()
-            parser.parse(resp.text.splitlines())
-            return parser
+        resp = await get_http_pool().get(robots_url, headers=headers, timeout=15.0)
+        if resp.status_code >= 400:
+            logger.warning(
+                "robots.txt unavailable for {} (status={}); treating as allow-all",
+                robots_url,
+                resp.status_code,
+            )
+            return None
+        return resp.text
     except Exception as exc:
         logger.warning("robots.txt fetch failed for {}: {}", robots_url, exc)
         return None
 
 
+def _parse_robots(text: Optional[str]) -> Optional[urllib.robotparser.RobotFileParser]:
+    if text is None:
+        return None
+    parser = urllib.robotparser.RobotFileParser()
+    parser.parse(text.splitlines())
+    return parser
+
+
+async def _fetch_robots(url: str, user_agent: str) -> Optional[urllib.robotparser.RobotFileParser]:
+    return _parse_robots(await _fetch_robots_text(url, user_agent))
+
+
 async def _robots_parser(url: str, user_agent: str) -> Optional[urllib.robotparser.RobotFileParser]:
     parsed = urlparse(url)
     domain = parsed.netloc
@@ -147,8 +167,28 @@ async def _robots_parser(url: str, user_agent: str) -> Optional[urllib.robotpars
         entry = ROBOTS_CACHE.get(domain)
         if entry and now - entry.fetched_at < ROBOTS_TTL:
             return entry.parser
-        parser = await _fetch_robots(url, user_agent)
+
+        # Another process may already have fetched robots.txt for this domain.
+        shared = get_shared_fetch_state()
+        if shared is not None:
+            try:
+                found, body = await asyncio.to_thread(shared.get_robots, domain, ttl=ROBOTS_TTL)
+                if found:
+                    parser = _parse_robots(body)
+                    ROBOTS_CACHE[domain] = RobotsEntry(parser=parser, fetched_at=time.time())
+                    return parser
+            except Exception as exc:
+                disable_shared_fetch_state(exc)
+                shared = None
+
+        body = await _fetch_robots_text(url, user_agent)
+        parser = _parse_robots(body)
         ROBOTS_CACHE[domain] = RobotsEntry(parser=parser, fetched_at=time.time())
+        if shared is not None:
+            try:
+                await asyncio.to_thread(shared.put_robots, domain, body)
+            except Exception as exc:
+                disable_shared_fetch_state(exc)
         return parser
 
 
@@ -165,39 +205,86 @@ async def _ensure_robots_allowed(url: str, user_agent: str) -> None:
         )
 
 
-async def _mark_success(domain: str) -> None:
+async def _update_domain(domain: str, fn: Callable[[Any, float], None]) -> None:
+    """
+    Apply ``fn(record, now)`` to the domain's politeness state: in the shared
+    SQLite store when available (so all processes see it), else in memory.
+    ``record`` exposes ``aimd`` and ``consecutive_failures`` either way.
+    """
     state = await _get_domain_state(domain)
+    shared = get_shared_fetch_state()
+    if shared is not None:
+        try:
+            record = await asyncio.to_thread(shared.update, domain, state.bounds, fn)
+            state.aimd = record.aimd
+            state.consecutive_failures = record.consecutive_failures
+            return
+        except Exception as exc:
+            disable_shared_fetch_state(exc)
     async with state.lock:
-        state.consecutive_failures = 0
+        fn(state, time.time())
 
 
-async def _mark_failure(domain: str) -> None:
+async def _mark_success(domain: str, *, latency: Optional[float] = None) -> None:
     state = await _get_domain_state(domain)
-    async with state.lock:
-        state.consecutive_failures += 1
 
+    def _apply(record: Any, now: float) -> None:
+        record.consecutive_failures = 0
+        rate_limit.on_success(record.aimd, state.bounds, latency=latency)
 
-async def _respect_rate_limit(domain: str) -> None:
+    await _update_domain(domain, _apply)
+
+
+async def _mark_failure(
+    domain: str,
+    *,
+    throttled: bool = True,
+    retry_after: Optional[float] = None,
+) -> None:
+    """
+    Record a failed request. Throttling and transient errors halve the domain's
+    rate (honouring Retry-After); every failure also adds the linear failure
+    backoff before the next request.
+    """
     state = await _get_domain_state(domain)
-    min_delay = max(0.0, DELAY_MIN)
-    max_delay = max(min_delay, DELAY_MAX)
 
-    async with state.lock:
-        now = time.monotonic()
-        if state.last_request <= 0:
-            state.last_request = now
-            return
+    def _apply(record: Any, now: float) -> None:
+        record.consecutive_failures += 1
+        if throttled:
+            rate_limit.on_throttle(record.aimd, state.bounds, now=now, retry_after=retry_after)
+        if FAILURE_BACKOFF > 0:
+            pause = FAILURE_BACKOFF * min(record.consecutive_failures, 6)
+            record.aimd.blocked_until = max(record.aimd.blocked_until, now + pause)
+
+    await _update_domain(domain, _apply)
 
-        gap = min_delay
-        if max_delay > min_delay:
-            gap += random.uniform(0, max_delay - min_delay)
-        if FAILURE_BACKOFF > 0 and state.consecutive_failures > 0:
-            gap += FAILURE_BACKOFF * min(state.consecutive_failures, 6)
 
-        wait_for = (state.last_request + gap) - now
-        if wait_for > 0:
-            await asyncio.sleep(wait_for)
-        state.last_request = time.monotonic()
+async def _respect_rate_limit(domain: str) -> None:
+    state = await _get_domain_state(domain)
+    wait_for: Optional[float] = None
+    shared = get_shared_fetch_state()
+    if shared is not None:
+        try:
+            wait_for, record = await asyncio.to_thread(shared.reserve, domain, state.bounds)
+            state.aimd = record.aimd
+            state.consecutive_failures = record.consecutive_failures
+        except Exception as exc:
+            disable_shared_fetch_state(exc)
+            wait_for = None
+    if wait_for is None:
+        async with state.lock:
+            wait_for = rate_limit.reserve(state.aimd, time.time())
+    if wait_for > 0:
+        # A little jitter keeps the request pattern from looking machine-timed.
+        await asyncio.sleep(wait_for * random.uniform(0.9, 1.1))
+    state.last_request = time.monotonic()
+
+
+def domain_rate_snapshot(domain: str) -> Dict[str, Any]:
+    state = DOMAIN_STATE.get(domain)
+    if state is None or state.aimd is None:
+        return {}
+    return {**rate_limit.describe(state.aimd), "consecutive_failures": state.consecutive_failures}
 
 
 def _looks_access_denied(text: str) -> bool:
@@ -224,8 +311,7 @@ async def _http_attempt(
 
     start = time.perf_counter()
     try:
-        async with httpx.AsyncClient(timeout=FETCH_TIMEOUT, headers=headers, follow_redirects=True) as client:
-            resp = await client.get(url)
+        resp = await get_http_pool().get(url, headers=headers, timeout=FETCH_TIMEOUT, follow_redirects=True)
     except httpx.RequestError as exc:
         elapsed = time.perf_counter() - start
         logger.warning("HTTP fetch error for {} attempt {}: {}", url, attempt_index, exc)
@@ -258,7 +344,7 @@ async def _http_attempt(
             retry_after,
         )
         data = {**attempt_meta, "retry_after": retry_after}
-        await _mark_failure(domain)
+        await _mark_failure(domain, retry_after=rate_limit.parse_retry_after(retry_after))
         raise AccessDeniedError(
             f"HTTP {status} from upstream",
             backend="http",
@@ -280,7 +366,7 @@ async def _http_attempt(
     if status >= 400:
         logger.error("HTTP {} (client error) for {} attempt {}", status, url, attempt_index)
         data = attempt_meta.copy()
-        await _mark_failure(domain)
+        await _mark_failure(domain, throttled=False)
         raise FetchError(
             f"HTTP {status} client error",
             backend="http",
@@ -309,7 +395,7 @@ async def _http_attempt(
         attempt_index,
         elapsed,
     )
-    await _mark_success(domain)
+    await _mark_success(domain, latency=elapsed)
     return text, attempt_meta
 
 
@@ -321,22 +407,19 @@ async def _playwright_attempt(
 ) -> Tuple[str, Dict[str, Any]]:
     await _respect_rate_limit(domain)
     start = time.perf_counter()
-    from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
-    browser = None
-    context = None
-    page = None
     try:
-        async with async_playwright() as pw:
-            browser = await pw.chromium.launch(headless=headless_mode)
-            context = await browser.new_context(user_agent=user_agent, accept_downloads=False)
-            page = await context.new_page()
+        async with get_browser_pool().page(
+            context_options={"user_agent": user_agent, "accept_downloads": False},
+        ) as page:
+            resource_stats = await install_resource_blocking(page, detail_profile())
             response = await page.goto(
                 url,
                 wait_until=PLAYWRIGHT_WAIT_UNTIL,
                 timeout=PLAYWRIGHT_TIMEOUT_MS,
             )
-            await page.wait_for_timeout(350)
+            wait_meta = await wait_for_content(page, started_at=start)
             html = await page.content()
             final_url = page.url
             status = response.status if response else 200
@@ -347,6 +430,8 @@ async def _playwright_attempt(
                 "elapsed": round(elapsed, 3),
                 "backend": "pw",
                 "final_url": final_url,
+                **wait_meta,
+                "resources": resource_stats.as_dict(),
             }
             if _looks_access_denied(html):
                 logger.warning("Playwright body indicates Access Denied for {} attempt {}", url, attempt_index)
@@ -367,6 +452,7 @@ async def _playwright_attempt(
                 attempt_index,
                 elapsed,
             )
+            # Browser timings include rendering, so only count the success itself.
             await _mark_success(domain)
             return html, meta
     except PlaywrightTimeoutError as exc:
@@ -389,22 +475,50 @@ async def _playwright_attempt(
             backend="pw",
             data={"elapsed": round(elapsed, 3), "attempt": attempt_index},
         ) from exc
-    finally:
-        try:
-            if page:
-                await page.close()
-        except Exception:
-            pass
-        try:
-            if context:
-                await context.close()
-        except Exception:
-            pass
-        try:
-            if browser:
-                await browser.close()
-        except Exception:
-            pass
+
+
+async def _archive_html(url: str, html: str, telemetry: Dict[str, Any]) -> None:
+    archive = get_html_archive()
+    if archive is None:
+        return
+    last = telemetry["attempts"][-1] if telemetry.get("attempts") else {}
+    try:
+        telemetry["archive_sha256"] = await asyncio.to_thread(
+            archive.put,
+            url,
+            html,
+            backend=telemetry.get("backend"),
+            status=last.get("status"),
+            final_url=last.get("final_url"),
+        )
+    except Exception as exc:
+        logger.warning("Failed to archive HTML for {}: {}", url, exc)
+
+
+async def _replay_fetch(url: str, domain: str) -> Tuple[str, Dict[str, Any]]:
+    """Serve HTML from the replay dir / archive; no robots check, no rate limiting."""
+    found = await asyncio.to_thread(load_replay_html, url)
+    telemetry: Dict[str, Any] = {
+        "url": url,
+        "domain": domain,
+        "preferred_backend": REPLAY_BACKEND,
+        "attempts": [],
+    }
+    if found is None:
+        telemetry["attempts"].append({"attempt": 1, "backend": REPLAY_BACKEND, "ok": False, "status": 404})
+        raise FetchError(
+            f"No archived HTML for {url}",
+            backend=REPLAY_BACKEND,
+            status=404,
+            data=telemetry,
+        )
+    html, meta = found
+    telemetry["attempts"].append({"attempt": 1, "backend": REPLAY_BACKEND, "ok": True, **meta})
+    telemetry["backend"] = REPLAY_BACKEND
+    telemetry["ok"] = True
+    if meta.get("archive_sha256"):
+        telemetry["archive_sha256"] = meta["archive_sha256"]
+    return html, telemetry
 
 
 def _decide_backend_order(preferred: Optional[str]) -> List[str]:
@@ -439,6 +553,9 @@ async def fetch_job_html(
     user_agent = DEFAULT_USER_AGENT
     domain = parsed.netloc
 
+    if preferred_backend == REPLAY_BACKEND:
+        return await _replay_fetch(url, domain)
+
     await _ensure_robots_allowed(url, user_agent)
 
     backend_order = _decide_backend_order(preferred_backend)
@@ -459,6 +576,8 @@ async def fetch_job_html(
                     telemetry["attempts"].append({**attempt_meta, "ok": True})
                     telemetry["backend"] = "http"
                     telemetry["ok"] = True
+                    telemetry["rate_limit"] = domain_rate_snapshot(domain)
+                    await _archive_html(url, html, telemetry)
                     return html, telemetry
                 except AccessDeniedError as exc:
                     data = {**exc.data, "ok": False, "error": str(exc)}
@@ -499,8 +618,12 @@ async def fetch_job_html(
             try:
                 html, attempt_meta = await _playwright_attempt(url, domain, user_agent, 1)
                 telemetry["attempts"].append({**attempt_meta, "ok": True})
+                telemetry["time_to_content"] = attempt_meta.get("time_to_content")
+                telemetry["resources"] = attempt_meta.get("resources")
                 telemetry["backend"] = "pw"
                 telemetry["ok"] = True
+                telemetry["rate_limit"] = domain_rate_snapshot(domain)
+                await _archive_html(url, html, telemetry)
                 return html, telemetry
             except FetchError as exc:
                 data = {**exc.data, "ok": False, "error": str(exc)}
@@ -515,4 +638,11 @@ async def fetch_job_html(
 
     telemetry["ok"] = False
     telemetry["error"] = str(last_error)
+    telemetry["rate_limit"] = domain_rate_snapshot(domain)
     raise last_error
+
+
+async def close_fetch_resources() -> None:
+    """Release pooled network resources; call at the end of a flow or app lifespan."""
+    await close_http_pool()
+    await close_browser_pool()
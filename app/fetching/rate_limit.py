@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+from app.config.settings import settings
+
+
+@dataclass(frozen=True)
+class AimdBounds:
+    """Request-rate bounds for one domain, in requests per second."""
+
+    min_rate: float
+    max_rate: float
+    initial_rate: float
+
+
+@dataclass
+class AimdState:
+    """
+    Token bucket whose refill rate adapts AIMD-style: additive increase after
+    fast successes, multiplicative decrease on throttling or server errors.
+    Timestamps are wall-clock (time.time()) so the state can be persisted and
+    shared between processes.
+    """
+
+    rate: float
+    tokens: float = 1.0
+    updated_at: float = 0.0
+    blocked_until: float = 0.0
+    successes: int = 0
+    throttles: int = 0
+
+
+def _parse_bounds_overrides(raw: Tuple[str, ...]) -> Dict[str, Tuple[float, float]]:
+    # "stepstone.de=0.02:0.2" -> {"stepstone.de": (0.02, 0.2)}
+    out: Dict[str, Tuple[float, float]] = {}
+    for item in raw:
+        if "=" not in item or ":" not in item:
+            continue
+        domain, _, bounds = item.partition("=")
+        lo, _, hi = bounds.partition(":")
+        try:
+            out[domain.strip().lower()] = (float(lo), float(hi))
+        except ValueError:
+            continue
+    return out
+
+
+_OVERRIDES = _parse_bounds_overrides(settings.fetch_rate_bounds)
+
+
+def bounds_for_domain(domain: str) -> AimdBounds:
+    """Global floor/ceiling unless a per-domain override matches the host or a parent domain."""
+    lo = float(settings.fetch_rate_min_per_sec)
+    hi = float(settings.fetch_rate_max_per_sec)
+    host = (domain or "").lower().split(":", 1)[0]
+    for key, (o_lo, o_hi) in _OVERRIDES.items():
+        if host == key or host.endswith("." + key):
+            lo, hi = o_lo, o_hi
+            break
+    lo = max(1e-4, lo)
+    hi = max(lo, hi)
+    # Start from the legacy average gap so behaviour only drifts once signals arrive.
+    avg_gap = (max(0.0, settings.fetch_delay_min_sec) + max(0.0, settings.fetch_delay_max_sec)) / 2.0
+    initial = 1.0 / avg_gap if avg_gap > 0 else hi
+    return AimdBounds(min_rate=lo, max_rate=hi, initial_rate=min(hi, max(lo, initial)))
+
+
+def new_state(bounds: AimdBounds, now: Optional[float] = None) -> AimdState:
+    return AimdState(rate=bounds.initial_rate, tokens=1.0, updated_at=time.time() if now is None else now)
+
+
+def reserve(state: AimdState, now: float) -> float:
+    """
+    Take one token and return how long the caller must wait before sending.
+    Tokens may go negative: concurrent callers queue up behind each other
+    instead of all waking at the same instant. Nothing refills during a
+    Retry-After block: the bucket restarts when the block ends, so callers
+    queued behind it are still spaced 1/rate apart.
+    """
+    state.updated_at = max(state.updated_at, state.blocked_until)
+    elapsed = max(0.0, now - state.updated_at)
+    state.tokens = min(1.0, state.tokens + elapsed * state.rate)
+    state.updated_at = max(now, state.updated_at)
+    state.tokens -= 1.0
+    wait = max(0.0, state.updated_at - now)
+    if state.tokens < 0:
+        wait += -state.tokens / state.rate
+    return wait
+
+
+def on_success(state: AimdState, bounds: AimdBounds, *, latency: Optional[float] = None) -> None:
+    state.successes += 1
+    target = float(settings.fetch_rate_latency_target_sec)
+    if latency is not None and target > 0 and latency > 2 * target:
+        # Server is slowing down: ease off a little without a full halving.
+        state.rate = max(bounds.min_rate, state.rate * 0.9)
+        return
+    if latency is None or target <= 0 or latency <= target:
+        state.rate = min(bounds.max_rate, state.rate + float(settings.fetch_rate_increase_step))
+
+
+def on_throttle(
+    state: AimdState,
+    bounds: AimdBounds,
+    *,
+    now: float,
+    retry_after: Optional[float] = None,
+) -> None:
+    state.throttles += 1
+    state.rate = max(bounds.min_rate, state.rate * float(settings.fetch_rate_decrease_factor))
+    if retry_after is not None and retry_after > 0:
+        state.blocked_until = max(state.blocked_until, now + min(retry_after, float(settings.fetch_retry_after_max_sec)))
+
+
+def parse_retry_after(value: Optional[str], *, now: Optional[float] = None) -> Optional[float]:
+    """Retry-After is either delta-seconds or an HTTP-date; return seconds from now."""
+    if value is None:
+        return None
+    raw = str(value).strip()
+    if not raw:
+        return None
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        pass
+    try:
+        dt = parsedate_to_datetime(raw)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    ref = time.time() if now is None else now
+    return max(0.0, dt.timestamp() - ref)
+
+
+def describe(state: AimdState) -> Dict[str, float]:
+    return {
+        "rate_per_sec": round(state.rate, 4),
+        "gap_sec": round(1.0 / state.rate, 2) if state.rate > 0 else 0.0,
+        "blocked_until": round(state.blocked_until, 3) if state.blocked_until > time.time() else 0.0,
+    }
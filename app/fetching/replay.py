@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+from loguru import logger
+
+from app.common.utils import normalize_url
+from app.config.settings import settings
+from .html_archive import get_html_archive
+
+REPLAY_BACKEND = "archive"
+
+
+def replay_key(url: str) -> str:
+    """File stem used for saved pages: sha1 of the normalized URL."""
+    return hashlib.sha1(normalize_url(url).encode("utf-8")).hexdigest()
+
+
+def _load_manifest(root: Path) -> Dict[str, str]:
+    path = root / "index.json"
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception as exc:
+        logger.warning("Invalid replay manifest {}: {}", path, exc)
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {normalize_url(str(k)): str(v) for k, v in data.items()}
+
+
+def _find_in_dir(root: Path, url: str) -> Optional[Path]:
+    """
+    Resolve a saved page for ``url`` inside ``root``: an ``index.json``
+    manifest ({url: filename}) wins, then ``<sha1(url)>.html``, then a file
+    named like the last URL path segment (e.g. ``job_stepstone_1.html``).
+    """
+    if not root.is_dir():
+        return None
+    key = normalize_url(url)
+    manifest = _load_manifest(root)
+    if key in manifest:
+        candidate = root / manifest[key]
+        if candidate.is_file():
+            return candidate
+    candidate = root / f"{replay_key(url)}.html"
+    if candidate.is_file():
+        return candidate
+    name = Path(urlparse(key).path).name
+    if name:
+        candidate = root / name
+        if candidate.is_file():
+            return candidate
+        if not name.endswith(".html"):
+            candidate = root / f"{name}.html"
+            if candidate.is_file():
+                return candidate
+    return None
+
+
+def load_replay_html(url: str, *, replay_dir: Optional[str] = None) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    Return archived HTML for ``url`` without touching the network, or None.
+    A replay directory (JOBAGENT_FETCH_REPLAY_DIR) takes precedence over the
+    HTML archive so fixture sets can shadow archived pages.
+    """
+    start = time.perf_counter()
+    root = replay_dir or settings.fetch_replay_dir
+    if root:
+        path = _find_in_dir(Path(root), url)
+        if path is not None:
+            html = path.read_text(encoding="utf-8", errors="replace")
+            return html, {
+                "source": "replay_dir",
+                "path": str(path),
+                "elapsed": round(time.perf_counter() - start, 3),
+            }
+
+    archive = get_html_archive()
+    if archive is not None:
+        page = archive.latest(url)
+        if page is not None:
+            return page.html, {
+                "source": "html_archive",
+                "archive_sha256": page.sha256,
+                "archived_at": page.fetched_at,
+                "archived_backend": page.backend,
+                "status": page.status,
+                "final_url": page.final_url,
+                "elapsed": round(time.perf_counter() - start, 3),
+            }
+    return None
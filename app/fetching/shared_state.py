@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+from loguru import logger
+
+from app.common.sqlite_utils import connect_sqlite
+from app.config.settings import settings
+from . import rate_limit
+from .rate_limit import AimdBounds, AimdState
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS domain_state (
+    domain TEXT PRIMARY KEY,
+    rate REAL NOT NULL,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    blocked_until REAL NOT NULL DEFAULT 0,
+    successes INTEGER NOT NULL DEFAULT 0,
+    throttles INTEGER NOT NULL DEFAULT 0,
+    consecutive_failures INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS robots (
+    domain TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    body TEXT
+);
+"""
+
+
+@dataclass
+class DomainRecord:
+    """Shape shared with polite_fetch.DomainState so the same update helpers apply."""
+
+    aimd: AimdState
+    consecutive_failures: int = 0
+
+
+class SharedFetchState:
+    """
+    Per-domain politeness state and robots.txt bodies in one SQLite file, so
+    every API worker and ``python -m app.prefect_run`` subprocess on the host
+    draws from the same request budget.
+
+    Slot reservations run inside ``BEGIN IMMEDIATE`` transactions: the write
+    lock is taken up front, so two processes can never both see a free token.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(self.path)
+        self._conn.executescript(_SCHEMA)
+
+    def _load(self, domain: str, bounds: AimdBounds, now: float) -> DomainRecord:
+        row = self._conn.execute(
+            "SELECT rate, tokens, updated_at, blocked_until, successes, throttles, consecutive_failures"
+            " FROM domain_state WHERE domain = ?",
+            (domain,),
+        ).fetchone()
+        if row is None:
+            return DomainRecord(aimd=rate_limit.new_state(bounds, now=now))
+        aimd = AimdState(
+            rate=min(bounds.max_rate, max(bounds.min_rate, float(row["rate"]))),
+            tokens=float(row["tokens"]),
+            updated_at=float(row["updated_at"]),
+            blocked_until=float(row["blocked_until"]),
+            successes=int(row["successes"]),
+            throttles=int(row["throttles"]),
+        )
+        return DomainRecord(aimd=aimd, consecutive_failures=int(row["consecutive_failures"]))
+
+    def _save(self, domain: str, record: DomainRecord) -> None:
+        a = record.aimd
+        self._conn.execute(
+            "INSERT OR REPLACE INTO domain_state"
+            "(domain, rate, tokens, updated_at, blocked_until, successes, throttles, consecutive_failures)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (domain, a.rate, a.tokens, a.updated_at, a.blocked_until, a.successes, a.throttles, record.consecutive_failures),
+        )
+
+    def _transact(self, domain: str, bounds: AimdBounds, fn: Callable[[DomainRecord, float], object]) -> Tuple[object, DomainRecord]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                record = self._load(domain, bounds, now)
+                out = fn(record, now)
+                self._save(domain, record)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return out, record
+
+    def reserve(self, domain: str, bounds: AimdBounds) -> Tuple[float, DomainRecord]:
+        """Take the next request slot for ``domain``; returns (seconds to wait, state)."""
+        wait, record = self._transact(domain, bounds, lambda rec, now: rate_limit.reserve(rec.aimd, now))
+        return float(wait), record
+
+    def update(self, domain: str, bounds: AimdBounds, fn: Callable[[DomainRecord, float], None]) -> DomainRecord:
+        _, record = self._transact(domain, bounds, fn)
+        return record
+
+    # --- robots ---------------------------------------------------------
+
+    def get_robots(self, domain: str, *, ttl: float) -> Tuple[bool, Optional[str]]:
+        """Returns (found, body); a found None body means "treat as allow-all"."""
+        with self._lock:
+            row = self._conn.execute("SELECT fetched_at, body FROM robots WHERE domain = ?", (domain,)).fetchone()
+        if row is None or time.time() - float(row["fetched_at"]) >= ttl:
+            return False, None
+        return True, row["body"]
+
+    def put_robots(self, domain: str, body: Optional[str]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO robots(domain, fetched_at, body) VALUES (?, ?, ?)",
+                (domain, time.time(), body),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_SHARED: Optional[SharedFetchState] = None
+_SHARED_FAILED = False
+_SHARED_LOCK = threading.Lock()
+
+
+def shared_state_path() -> Path:
+    if settings.fetch_shared_state_path:
+        return Path(settings.fetch_shared_state_path)
+    return settings.output_dir / "_fetch_state.sqlite"
+
+
+def get_shared_fetch_state() -> Optional[SharedFetchState]:
+    """Process-wide handle, or None when disabled or the file cannot be opened."""
+    global _SHARED, _SHARED_FAILED
+    if not settings.fetch_shared_state_enabled or _SHARED_FAILED:
+        return None
+    if _SHARED is None:
+        with _SHARED_LOCK:
+            if _SHARED is None and not _SHARED_FAILED:
+                try:
+                    _SHARED = SharedFetchState(shared_state_path())
+                except Exception as exc:
+                    _SHARED_FAILED = True
+                    logger.warning("Shared fetch state unavailable ({}); using in-memory state", exc)
+                    return None
+    return _SHARED
+
+
+def disable_shared_fetch_state(reason: Exception) -> None:
+    """Fall back to per-process state after a runtime SQLite failure."""
+    global _SHARED_FAILED
+    if not _SHARED_FAILED:
+        logger.warning("Shared fetch state failed ({}); falling back to in-memory state", reason)
+    _SHARED_FAILED = True
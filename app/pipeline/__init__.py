@@ -2,8 +2,9 @@ from .pipeline import fetch_job_details, write_job_bundle
 from .templating import generate_bundle
 from .output import write_bundle, write_summary
 from .models import UnifiedJobPosting
-from .scoring import score_job
-from .llm_enrich import enrich_jobposting
+from .scoring import ascore_job, score_job
+from .scoring_batch import score_jobs
+from .llm_enrich import aenrich_jobposting, enrich_and_score_jobposting, enrich_jobposting
 from .state import cache_get, cache_put, load_state, save_state
 
 __all__ = [
@@ -14,7 +15,11 @@ __all__ = [
     "write_summary",
     "UnifiedJobPosting",
     "score_job",
+    "score_jobs",
+    "ascore_job",
     "enrich_jobposting",
+    "aenrich_jobposting",
+    "enrich_and_score_jobposting",
     "cache_get",
     "cache_put",
     "load_state",
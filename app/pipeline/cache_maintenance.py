@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import json
+import re
+import shutil
+import threading
+import time
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from app.config.settings import settings
+from .cache_store import CacheStore, EntryInfo
+from .llm_cache import get_llm_cache
+from .llm_enrich import LLM_SCORING_VERSION
+from .scoring import HEURISTIC_SCORING_VERSION, SCORING_VERSION
+from .state import get_cache_store
+from .url_pool import UrlPoolStore
+
+# Upper bounds (days) of the age histogram buckets; older entries land in the last bucket.
+AGE_BUCKETS_DAYS = (1, 7, 30, 90)
+LEGACY_POOL_FILES = ("url_pool.jsonl", "url_pool_unavailable.jsonl")
+POOL_STORE_FILE = "url_pool.sqlite"
+# Run directory names: GUI runs (20250101T120000-abcd1234) and CLI runs (2025-01-01T12:00:00Z).
+RUN_DIR_RE = re.compile(r"^\d{4}-?\d{2}-?\d{2}T\d{2}:?\d{2}:?\d{2}")
+
+
+@dataclass(frozen=True)
+class MaintenancePolicy:
+    """
+    What a maintenance pass may delete. Zero disables a limit. Work is split
+    into ``batch_size`` chunks with ``pause_sec`` between them so a pass
+    never holds the cache store (or the API threadpool) for long.
+    """
+
+    ttl_days: float = 0
+    max_bytes: int = 0
+    evict_stale_versions: bool = True
+    pool_ttl_days: float = 0
+    run_retention_days: float = 0
+    batch_size: int = 500
+    pause_sec: float = 0.0
+    dry_run: bool = False
+
+    @classmethod
+    def from_settings(cls, **overrides: Any) -> "MaintenancePolicy":
+        policy = cls(
+            ttl_days=float(settings.cache_ttl_days),
+            max_bytes=int(settings.cache_max_mb) * 1024 * 1024,
+            pool_ttl_days=float(settings.maintenance_pool_ttl_days),
+            run_retention_days=float(settings.maintenance_run_retention_days),
+            batch_size=max(1, int(settings.maintenance_batch_size)),
+            pause_sec=max(0, int(settings.maintenance_pause_ms)) / 1000.0,
+        )
+        return replace(policy, **{k: v for k, v in overrides.items() if v is not None})
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def current_scoring_versions() -> Dict[str, str]:
+    return {
+        "heuristic_version": HEURISTIC_SCORING_VERSION,
+        "version": SCORING_VERSION,
+        "llm_scoring_version": LLM_SCORING_VERSION,
+    }
+
+
+def stale_reason(meta: Dict[str, Any], current: Dict[str, str]) -> Optional[str]:
+    """Why an entry can never be served again (old cache_version or scoring versions), else None."""
+    if meta.get("cache_version") not in (None, settings.cache_version):
+        return "cache_version"
+    stored = meta.get("scoring_versions") or {}
+    for name, value in stored.items():
+        if value is not None and name in current and value != current[name]:
+            return "scoring_version"
+    return None
+
+
+def _age_bucket(age_days: float) -> str:
+    lower = 0
+    for upper in AGE_BUCKETS_DAYS:
+        if age_days < upper:
+            return f"{lower}-{upper}d"
+        lower = upper
+    return f">={lower}d"
+
+
+def _histogram() -> Dict[str, int]:
+    hist = {_age_bucket(upper - 0.5): 0 for upper in AGE_BUCKETS_DAYS}
+    hist[_age_bucket(float(AGE_BUCKETS_DAYS[-1]))] = 0
+    return hist
+
+
+def _pause(policy: MaintenancePolicy) -> None:
+    if policy.pause_sec > 0:
+        time.sleep(policy.pause_sec)
+
+
+def maintain_cache_store(store: CacheStore, policy: MaintenancePolicy, *, now: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Scan the job cache in batches, tally counts, bytes and ages per layer and
+    evict expired entries, entries from old cache/scoring versions and then the
+    oldest entries beyond the size budget. With ``dry_run`` nothing is deleted.
+    """
+    now = time.time() if now is None else now
+    current = current_scoring_versions()
+    layers: Dict[str, Dict[str, int]] = {}
+    histogram = _histogram()
+    evict: List[Tuple[str, str]] = []
+    evicted = {"expired": 0, "cache_version": 0, "scoring_version": 0, "size_budget": 0}
+    survivors: List[Tuple[float, int, str, str]] = []
+    total_bytes = 0
+
+    for batch in store.scan(policy.batch_size):
+        for info in batch:
+            layer = layers.setdefault(info.layer, {"entries": 0, "bytes": 0})
+            layer["entries"] += 1
+            layer["bytes"] += info.size
+            total_bytes += info.size
+            age_days = max(0.0, now - info.cached_at) / 86400
+            histogram[_age_bucket(age_days)] += 1
+            reason = _evict_reason(info, age_days, policy, current)
+            if reason:
+                evicted[reason] += 1
+                evict.append((info.key, info.layer))
+            else:
+                survivors.append((info.cached_at, info.size, info.key, info.layer))
+        _pause(policy)
+
+    if policy.max_bytes > 0:
+        kept = sum(size for _, size, _, _ in survivors)
+        if kept > policy.max_bytes:
+            survivors.sort()
+            for _, size, key, layer in survivors:
+                if kept <= policy.max_bytes:
+                    break
+                evict.append((key, layer))
+                evicted["size_budget"] += 1
+                kept -= size
+
+    deleted = 0
+    if not policy.dry_run:
+        for start in range(0, len(evict), policy.batch_size):
+            deleted += store.delete_many(evict[start : start + policy.batch_size])
+            _pause(policy)
+
+    stats = store.stats()
+    return {
+        "backend": stats.get("backend"),
+        "path": stats.get("path"),
+        "entries": sum(v["entries"] for v in layers.values()),
+        "bytes": total_bytes,
+        "layers": layers,
+        "age_histogram": histogram,
+        "evict": evicted,
+        "deleted": deleted,
+        "memory": stats.get("memory"),
+    }
+
+
+def _evict_reason(info: EntryInfo, age_days: float, policy: MaintenancePolicy, current: Dict[str, str]) -> Optional[str]:
+    if policy.ttl_days > 0 and age_days > policy.ttl_days:
+        return "expired"
+    if policy.evict_stale_versions:
+        return stale_reason(info.meta, current)
+    return None
+
+
+def find_pool_files(root: Path, names: Tuple[str, ...] = LEGACY_POOL_FILES) -> List[Path]:
+    """url_pool files of CLI (<root>/runs) and GUI (<root>/<user>/<profile>) profiles."""
+    found: List[Path] = []
+    for pattern in ("*/{name}", "*/*/{name}"):
+        for name in names:
+            found.extend(p for p in root.glob(pattern.format(name=name)) if p.is_file())
+    return sorted(set(found))
+
+
+def maintain_pool_store(path: Path, policy: MaintenancePolicy, *, now: Optional[float] = None) -> Dict[str, Any]:
+    """Counts of a profile's URL pool store; drops entries not seen for ``pool_ttl_days``."""
+    now = time.time() if now is None else now
+    store = UrlPoolStore(path)
+    try:
+        report: Dict[str, Any] = {**store.stats(), "bytes": path.stat().st_size, "evicted": 0}
+        if policy.pool_ttl_days > 0 and not policy.dry_run:
+            cutoff = datetime.fromtimestamp(now - policy.pool_ttl_days * 86400, timezone.utc).isoformat()
+            report["evicted"] = store.evict_older_than(cutoff)
+        return report
+    finally:
+        store.close()
+
+
+def _protected_run_ids(profile_dir: Path) -> set[str]:
+    try:
+        latest = json.loads((profile_dir / "latest.json").read_text(encoding="utf-8"))
+        return {str(latest.get("run_id"))} if latest.get("run_id") else set()
+    except Exception:
+        return set()
+
+
+def _is_running(run_dir: Path) -> bool:
+    try:
+        status = json.loads((run_dir / "status.json").read_text(encoding="utf-8"))
+    except Exception:
+        return False
+    return status.get("status") in ("running", "queued")
+
+
+def find_run_dirs(root: Path) -> List[Path]:
+    candidates = list(root.glob("runs/*")) + list(root.glob("gui_runs/*")) + list(root.glob("*/*/*"))
+    return sorted({p for p in candidates if p.is_dir() and RUN_DIR_RE.match(p.name)})
+
+
+def prune_run_dirs(root: Path, policy: MaintenancePolicy, *, now: Optional[float] = None) -> Dict[str, Any]:
+    """Delete run directories older than ``run_retention_days``, except running ones and each profile's latest run."""
+    now = time.time() if now is None else now
+    report: Dict[str, Any] = {"run_dirs": 0, "expired": 0, "deleted": 0, "bytes_freed": 0}
+    if policy.run_retention_days <= 0:
+        report["run_dirs"] = len(find_run_dirs(root))
+        return report
+    cutoff = now - policy.run_retention_days * 86400
+    for run_dir in find_run_dirs(root):
+        report["run_dirs"] += 1
+        if run_dir.stat().st_mtime >= cutoff:
+            continue
+        if run_dir.name in _protected_run_ids(run_dir.parent) or _is_running(run_dir):
+            continue
+        report["expired"] += 1
+        if policy.dry_run:
+            continue
+        size = sum(f.stat().st_size for f in run_dir.rglob("*") if f.is_file())
+        shutil.rmtree(run_dir, ignore_errors=True)
+        (root / "_run_index" / f"{run_dir.name}.json").unlink(missing_ok=True)
+        report["deleted"] += 1
+        report["bytes_freed"] += size
+        _pause(policy)
+    return report
+
+
+def run_maintenance(
+    policy: Optional[MaintenancePolicy] = None,
+    *,
+    root: Optional[Path] = None,
+    store: Optional[CacheStore] = None,
+) -> Dict[str, Any]:
+    """One pass over the job cache, URL pools and run directories."""
+    policy = policy or MaintenancePolicy.from_settings()
+    root = Path(root) if root is not None else settings.output_dir
+    started = time.perf_counter()
+    report: Dict[str, Any] = {"started_at": _now_iso(), "policy": asdict(policy)}
+    report["cache"] = maintain_cache_store(store or get_cache_store(), policy)
+    # Legacy JSONL pools are only import sources for url_pool.sqlite now; list them, never rewrite them.
+    report["legacy_url_pool_files"] = [{"path": str(path), "bytes": path.stat().st_size} for path in find_pool_files(root)]
+    report["url_pool_stores"] = [maintain_pool_store(path, policy) for path in find_pool_files(root, (POOL_STORE_FILE,))]
+    report["runs"] = prune_run_dirs(root, policy)
+    llm_cache = get_llm_cache()
+    report["llm_cache"] = llm_cache.stats() if llm_cache is not None else None
+    report["finished_at"] = _now_iso()
+    report["duration_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return report
+
+
+_RUN_LOCK = threading.Lock()
+_LAST_REPORT: Optional[Dict[str, Any]] = None
+
+
+def run_maintenance_exclusive(policy: Optional[MaintenancePolicy] = None, **kwargs: Any) -> Optional[Dict[str, Any]]:
+    """run_maintenance unless a pass is already running in this process (then None)."""
+    global _LAST_REPORT
+    if not _RUN_LOCK.acquire(blocking=False):
+        return None
+    try:
+        report = run_maintenance(policy, **kwargs)
+        _LAST_REPORT = report
+        return report
+    except Exception as exc:
+        logger.exception("Cache maintenance failed")
+        _LAST_REPORT = {"error": str(exc), "finished_at": _now_iso()}
+        return _LAST_REPORT
+    finally:
+        _RUN_LOCK.release()
+
+
+def maintenance_status() -> Dict[str, Any]:
+    return {"running": _RUN_LOCK.locked(), "last_report": _LAST_REPORT}
@@ -0,0 +1,440 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from app.common.sqlite_utils import connect_sqlite
+from app.common.utils import ensure_dir
+
+# Layer name of the legacy whole-result entries written by state.cache_put.
+RESULT_LAYER = "result"
+
+CACHE_BACKENDS = ("sqlite", "json")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    layer TEXT NOT NULL,
+    profile TEXT,
+    url TEXT,
+    cache_version TEXT,
+    cached_at REAL NOT NULL,
+    size INTEGER NOT NULL,
+    meta TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_cached_at ON entries(cached_at);
+CREATE INDEX IF NOT EXISTS entries_profile ON entries(profile, cached_at);
+CREATE INDEX IF NOT EXISTS entries_layer ON entries(layer, cached_at);
+"""
+
+# Size-based eviction is a SUM over the table; run it every N writes rather than on each put.
+_EVICT_EVERY_PUTS = 500
+
+
+@dataclass
+class EntryInfo:
+    """Metadata of one stored entry, as listed by ``CacheStore.scan``."""
+
+    key: str
+    layer: str
+    cached_at: float
+    size: int
+    meta: Dict[str, Any]
+
+
+def _epoch(cached_at: Any) -> float:
+    if not cached_at:
+        return time.time()
+    try:
+        return datetime.fromisoformat(str(cached_at).replace("Z", "+00:00")).timestamp()
+    except Exception:
+        return time.time()
+
+
+class CacheStore:
+    """
+    Key/value store behind ``state.cache_get``/``layer_get``. Values are the
+    ``{"cache_meta": ..., "payload": ...}`` envelopes; validation (version,
+    TTL, profile) stays in state.py so every backend behaves the same.
+    """
+
+    backend = ""
+    # Called after the store drops entries on its own (periodic TTL/size eviction), so wrappers can invalidate.
+    on_evict: Optional[Callable[[], None]] = None
+
+    def get(self, key: str, layer: str) -> Optional[Dict[str, Any]]:
+        raw = self.get_raw(key, layer)
+        return json.loads(raw) if raw is not None else None
+
+    def get_raw(self, key: str, layer: str) -> Optional[str]:
+        """The entry envelope as a JSON string, or None."""
+        raise NotImplementedError
+
+    def token(self, key: str, layer: str) -> Any:
+        """Cheap value that changes when the stored entry may have changed (used by MemoryFrontStore)."""
+        return None
+
+    def put(self, key: str, layer: str, entry: Dict[str, Any], *, profile: Optional[str] = None) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str, layer: str) -> None:
+        raise NotImplementedError
+
+    def delete_many(self, items: Sequence[Tuple[str, str]]) -> int:
+        for key, layer in items:
+            self.delete(key, layer)
+        return len(items)
+
+    def scan(self, batch_size: int = 500) -> Iterator[List[EntryInfo]]:
+        """Entry metadata in batches, so maintenance can pause between them."""
+        raise NotImplementedError
+
+    def evict(self, *, ttl_sec: float = 0, max_bytes: int = 0) -> int:
+        return 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+    def close(self) -> None:
+        pass
+
+
+class JsonFileCacheStore(CacheStore):
+    """One JSON file per entry: ``<root>/<key>.json`` for results, ``<root>/layer/<layer>/<key>.json`` otherwise."""
+
+    backend = "json"
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+
+    def path_for(self, key: str, layer: str) -> Path:
+        if layer == RESULT_LAYER:
+            return self.root / f"{key}.json"
+        return self.root / "layer" / layer / f"{key}.json"
+
+    def get_raw(self, key: str, layer: str) -> Optional[str]:
+        try:
+            return self.path_for(key, layer).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def token(self, key: str, layer: str) -> Any:
+        try:
+            return self.path_for(key, layer).stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, layer: str, entry: Dict[str, Any], *, profile: Optional[str] = None) -> None:
+        p = self.path_for(key, layer)
+        ensure_dir(p.parent)
+        p.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+
+    def delete(self, key: str, layer: str) -> None:
+        self.path_for(key, layer).unlink(missing_ok=True)
+
+    def scan(self, batch_size: int = 500) -> Iterator[List[EntryInfo]]:
+        batch: List[EntryInfo] = []
+        for key, layer, p in iter_json_entries(self.root):
+            try:
+                st = p.stat()
+                meta = (json.loads(p.read_text(encoding="utf-8")) or {}).get("cache_meta") or {}
+            except FileNotFoundError:
+                continue
+            except Exception:
+                meta = {}
+            cached_at = _epoch(meta.get("cached_at")) if meta.get("cached_at") else st.st_mtime
+            batch.append(EntryInfo(key, layer, cached_at, st.st_size, meta))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def stats(self) -> Dict[str, Any]:
+        files = list(iter_json_entries(self.root))
+        return {
+            "backend": self.backend,
+            "path": str(self.root),
+            "entries": len(files),
+            "bytes": sum(p.stat().st_size for _, _, p in files),
+        }
+
+
+class SqliteCacheStore(CacheStore):
+    """
+    All cache entries in one SQLite file (WAL, shared by the API and the
+    Prefect worker processes), indexed by key, layer, profile and cached_at
+    so TTL and size eviction are single bulk statements. When the stored
+    payloads exceed ``max_bytes``, the oldest entries are dropped down to 90%
+    of the cap.
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, path: Path, *, ttl_sec: float = 0, max_bytes: int = 0) -> None:
+        self.path = Path(path)
+        self.ttl_sec = float(ttl_sec)
+        self.max_bytes = max(0, int(max_bytes))
+        self._puts = 0
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(self.path)
+        self._conn.executescript(_SCHEMA)
+
+    def get_raw(self, key: str, layer: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT meta, payload FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return f'{{"cache_meta": {row["meta"]}, "payload": {row["payload"]}}}'
+
+    def token(self, key: str, layer: str) -> Any:
+        # Bumped whenever another connection (another process) commits; our own writes go through put().
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def put(self, key: str, layer: str, entry: Dict[str, Any], *, profile: Optional[str] = None) -> None:
+        meta = entry.get("cache_meta") or {}
+        payload = json.dumps(entry.get("payload"), ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries(key, layer, profile, url, cache_version, cached_at, size, meta, payload)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    layer,
+                    profile,
+                    meta.get("url"),
+                    meta.get("cache_version"),
+                    _epoch(meta.get("cached_at")),
+                    len(payload.encode("utf-8")),
+                    json.dumps(meta, ensure_ascii=False),
+                    payload,
+                ),
+            )
+            self._puts += 1
+            due = self._puts % _EVICT_EVERY_PUTS == 0
+        if due:
+            self.evict(ttl_sec=self.ttl_sec, max_bytes=self.max_bytes)
+
+    def delete(self, key: str, layer: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def delete_many(self, items: Sequence[Tuple[str, str]]) -> int:
+        with self._lock:
+            cur = self._conn.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key, _ in items])
+            return cur.rowcount or 0
+
+    def scan(self, batch_size: int = 500) -> Iterator[List[EntryInfo]]:
+        last = ""
+        while True:
+            # Keyset pagination: each batch is one short read, the lock is released in between.
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT key, layer, cached_at, size, meta FROM entries WHERE key > ? ORDER BY key LIMIT ?",
+                    (last, int(batch_size)),
+                ).fetchall()
+            if not rows:
+                return
+            last = rows[-1]["key"]
+            yield [
+                EntryInfo(row["key"], row["layer"], float(row["cached_at"]), int(row["size"]), json.loads(row["meta"]))
+                for row in rows
+            ]
+
+    def evict(self, *, ttl_sec: float = 0, max_bytes: int = 0) -> int:
+        evicted = 0
+        with self._lock:
+            if ttl_sec > 0:
+                cur = self._conn.execute("DELETE FROM entries WHERE cached_at < ?", (time.time() - ttl_sec,))
+                evicted += cur.rowcount or 0
+            if max_bytes > 0:
+                total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+                if total > max_bytes:
+                    # Keep the newest entries whose running size fits in 90% of the cap.
+                    cur = self._conn.execute(
+                        "DELETE FROM entries WHERE key IN ("
+                        " SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY cached_at DESC, key) AS running FROM entries)"
+                        " WHERE running > ?)",
+                        (int(max_bytes * 0.9),),
+                    )
+                    evicted += cur.rowcount or 0
+        if evicted:
+            logger.info("Cache store evicted {} entries", evicted)
+            if self.on_evict is not None:
+                self.on_evict()
+        return evicted
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT layer, COUNT(*) AS entries, COALESCE(SUM(size), 0) AS bytes FROM entries GROUP BY layer"
+            ).fetchall()
+        layers = {row["layer"]: {"entries": row["entries"], "bytes": row["bytes"]} for row in rows}
+        return {
+            "backend": self.backend,
+            "path": str(self.path),
+            "entries": sum(v["entries"] for v in layers.values()),
+            "bytes": sum(v["bytes"] for v in layers.values()),
+            "max_bytes": self.max_bytes,
+            "ttl_sec": self.ttl_sec,
+            "layers": layers,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class MemoryFrontStore(CacheStore):
+    """
+    Bounded in-process LRU in front of another store. Each entry remembers
+    the inner store's ``token`` (file mtime, SQLite data_version) and is
+    reloaded when it no longer matches, so writes from other processes are
+    picked up. The raw JSON is kept and parsed per hit: callers get their own
+    objects (the pipeline mutates cached jobs) and json.loads beats a copy.
+    """
+
+    def __init__(self, inner: CacheStore, *, max_entries: int, max_bytes: int) -> None:
+        self.inner = inner
+        self.backend = inner.backend
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(0, int(max_bytes))
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Any, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # The inner store's own writes don't move its token (SQLite data_version),
+        # so drop the LRU whenever it evicts, including the periodic pass in put().
+        inner.on_evict = self.clear
+
+    def get_raw(self, key: str, layer: str) -> Optional[str]:
+        token = self.inner.token(key, layer)
+        with self._lock:
+            cached = self._entries.get((layer, key))
+            if cached is not None:
+                if cached[0] == token:
+                    self._entries.move_to_end((layer, key))
+                    self.hits += 1
+                    return cached[1]
+                self._drop_locked((layer, key))
+                self.stale += 1
+            self.misses += 1
+        raw = self.inner.get_raw(key, layer)
+        if raw is None or (self.max_bytes and len(raw) > self.max_bytes):
+            return raw
+        with self._lock:
+            self._drop_locked((layer, key))
+            self._entries[(layer, key)] = (token, raw)
+            self.bytes += len(raw)
+            while len(self._entries) > self.max_entries or (self.max_bytes and self.bytes > self.max_bytes):
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= len(evicted)
+                self.evictions += 1
+        return raw
+
+    def token(self, key: str, layer: str) -> Any:
+        return self.inner.token(key, layer)
+
+    def _drop_locked(self, item: Tuple[str, str]) -> None:
+        cached = self._entries.pop(item, None)
+        if cached is not None:
+            self.bytes -= len(cached[1])
+
+    def put(self, key: str, layer: str, entry: Dict[str, Any], *, profile: Optional[str] = None) -> None:
+        with self._lock:
+            self._drop_locked((layer, key))
+        self.inner.put(key, layer, entry, profile=profile)
+
+    def delete(self, key: str, layer: str) -> None:
+        with self._lock:
+            self._drop_locked((layer, key))
+        self.inner.delete(key, layer)
+
+    def delete_many(self, items: Sequence[Tuple[str, str]]) -> int:
+        with self._lock:
+            for key, layer in items:
+                self._drop_locked((layer, key))
+        return self.inner.delete_many(items)
+
+    def scan(self, batch_size: int = 500) -> Iterator[List[EntryInfo]]:
+        return self.inner.scan(batch_size)
+
+    def evict(self, *, ttl_sec: float = 0, max_bytes: int = 0) -> int:
+        return self.inner.evict(ttl_sec=ttl_sec, max_bytes=max_bytes)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def memory_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.inner.stats(), "memory": self.memory_stats()}
+
+    def close(self) -> None:
+        self.clear()
+        self.inner.close()
+
+
+def iter_json_entries(root: Path) -> Iterator[Tuple[str, str, Path]]:
+    """(key, layer, path) for every JSON cache file under ``root``."""
+    root = Path(root)
+    if not root.exists():
+        return
+    for p in sorted(root.glob("*.json")):
+        yield p.stem, RESULT_LAYER, p
+    for layer_dir in sorted((root / "layer").glob("*")):
+        if layer_dir.is_dir():
+            for p in sorted(layer_dir.glob("*.json")):
+                yield p.stem, layer_dir.name, p
+
+
+def import_json_cache(root: Path, store: CacheStore, *, delete: bool = False) -> Dict[str, int]:
+    """
+    Copy the one-file-per-entry JSON cache under ``root`` into ``store``.
+    Unreadable files are counted and left in place; with ``delete`` the
+    imported files are removed.
+    """
+    counts = {"imported": 0, "failed": 0, "deleted": 0}
+    for key, layer, p in iter_json_entries(root):
+        try:
+            entry = json.loads(p.read_text(encoding="utf-8"))
+            if not isinstance(entry, dict) or "cache_meta" not in entry:
+                raise ValueError("not a cache entry")
+            store.put(key, layer, entry, profile=(entry.get("cache_meta") or {}).get("focus_profile"))
+            counts["imported"] += 1
+        except Exception:
+            logger.warning("Skipping cache file {}", p, exc_info=True)
+            counts["failed"] += 1
+            continue
+        if delete:
+            p.unlink(missing_ok=True)
+            counts["deleted"] += 1
+    return counts
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import asyncio
+import atexit
+import os
+import pickle
+import sys
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from loguru import logger
+
+from app.config.settings import settings
+
+EXECUTOR_MODES = ("process", "thread", "inline")
+
+_WARMUP_HTML = (
+    '<html><head><script type="application/ld+json">'
+    '{"@type": "JobPosting", "title": "Warmup", "description": "<p>SQL Python</p>"}'
+    "</script></head><body><h1>Warmup</h1></body></html>"
+)
+
+
+def _timed_call(fn: Callable[..., Any], args: Tuple[Any, ...]) -> Tuple[Any, float, float]:
+    """Runs in the worker; wall-clock stamps are comparable across processes."""
+    started = time.time()
+    result = fn(*args)
+    return result, started, time.time()
+
+
+def _warm_worker() -> int:
+    """Import the parse/score modules and touch their regexes once per worker."""
+    from .parsers import extract_jobposting_from_html
+    from .scoring import score_job
+
+    job = extract_jobposting_from_html(_WARMUP_HTML)
+    score_job(job, use_llm_scoring=False, apply_blocker_cap=False)
+    return os.getpid()
+
+
+def _importable(fn: Callable[..., Any]) -> bool:
+    """Process workers resolve functions by module path; locals and monkeypatched fakes can't cross."""
+    obj: Any = sys.modules.get(getattr(fn, "__module__", "") or "")
+    for part in (getattr(fn, "__qualname__", "") or "<locals>").split("."):
+        obj = getattr(obj, part, None)
+        if obj is None:
+            return False
+    return obj is fn
+
+
+@dataclass
+class StageStats:
+    calls: int = 0
+    queue_wait_total: float = 0.0
+    queue_wait_max: float = 0.0
+    exec_total: float = 0.0
+    exec_max: float = 0.0
+
+    def record(self, queue_wait: float, exec_time: float) -> None:
+        self.calls += 1
+        self.queue_wait_total += queue_wait
+        self.queue_wait_max = max(self.queue_wait_max, queue_wait)
+        self.exec_total += exec_time
+        self.exec_max = max(self.exec_max, exec_time)
+
+    def as_dict(self) -> Dict[str, Any]:
+        calls = max(1, self.calls)
+        return {
+            "calls": self.calls,
+            "queue_wait_ms_avg": round(self.queue_wait_total / calls * 1000, 2),
+            "queue_wait_ms_max": round(self.queue_wait_max * 1000, 2),
+            "exec_ms_avg": round(self.exec_total / calls * 1000, 2),
+            "exec_ms_max": round(self.exec_max * 1000, 2),
+        }
+
+
+class CpuExecutor:
+    """
+    Runs CPU-bound pipeline stages (HTML parsing, heuristic scoring) off the
+    event loop.
+
+    ``process`` uses a ProcessPoolExecutor, ``thread`` a dedicated thread pool
+    (lxml releases the GIL for part of the work), and ``inline`` calls the
+    function directly. A broken or unstartable process pool degrades the
+    executor to inline mode. Functions that cannot be resolved by module path
+    in a worker process run on the thread pool instead.
+
+    Each call reports queue wait (submit -> worker start) and execution time.
+    """
+
+    def __init__(self, mode: Optional[str] = None, workers: Optional[int] = None) -> None:
+        mode = (mode or settings.cpu_executor_mode or "process").strip().lower()
+        if mode not in EXECUTOR_MODES:
+            logger.warning("Unknown CPU executor mode {!r}; using 'thread'", mode)
+            mode = "thread"
+        self.configured_mode = mode
+        self.mode = mode
+        self.workers = max(1, int(workers or settings.cpu_executor_workers or min(4, os.cpu_count() or 1)))
+        self.fallback_reason: Optional[str] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._stages: Dict[str, StageStats] = {}
+
+    def _pool_for(self, mode: str) -> Executor:
+        with self._lock:
+            if mode == "process":
+                if self._process_pool is None:
+                    self._process_pool = ProcessPoolExecutor(max_workers=self.workers)
+                return self._process_pool
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="jobagent-cpu")
+            return self._thread_pool
+
+    def _degrade(self, exc: BaseException) -> None:
+        with self._lock:
+            if self.mode == "process":
+                logger.warning("Process pool unavailable ({}); running CPU stages inline", exc)
+                self.mode = "inline"
+                self.fallback_reason = f"{type(exc).__name__}: {exc}"
+            pool, self._process_pool = self._process_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, stage: str, fn: Callable[..., Any], *args: Any) -> Tuple[Any, Dict[str, Any]]:
+        """Run ``fn(*args)`` for ``stage`` and return ``(result, timing)``."""
+        mode = self.mode
+        if mode == "process" and not _importable(fn):
+            mode = "thread"
+
+        submitted = time.time()
+        if mode == "inline":
+            result, started, finished = _timed_call(fn, args)
+        else:
+            loop = asyncio.get_running_loop()
+            try:
+                future = loop.run_in_executor(self._pool_for(mode), _timed_call, fn, args)
+            except (BrokenProcessPool, OSError) as exc:
+                # pool could not start (no /dev/shm, fork limits, ...)
+                if mode != "process":
+                    raise
+                self._degrade(exc)
+                future = None
+            try:
+                if future is None:
+                    raise BrokenProcessPool("process pool unavailable")
+                result, started, finished = await future
+            except (BrokenProcessPool, pickle.PicklingError) as exc:
+                if mode != "process":
+                    raise
+                if isinstance(exc, BrokenProcessPool):
+                    self._degrade(exc)
+                mode = "inline"
+                result, started, finished = _timed_call(fn, args)
+
+        queue_wait = max(0.0, started - submitted)
+        exec_time = max(0.0, finished - started)
+        with self._lock:
+            self._stages.setdefault(stage, StageStats()).record(queue_wait, exec_time)
+        timing = {
+            "mode": mode,
+            "queue_wait_ms": round(queue_wait * 1000, 2),
+            "exec_ms": round(exec_time * 1000, 2),
+        }
+        return result, timing
+
+    def warm_up(self, timeout: float = 30.0) -> Dict[str, Any]:
+        """Start every worker and pre-import the parse/score modules so the first jobs don't pay for it."""
+        started = time.perf_counter()
+        pids: set[int] = set()
+        if self.mode == "process":
+            try:
+                pool = self._pool_for("process")
+                futures = [pool.submit(_warm_worker) for _ in range(self.workers)]
+                pids = {f.result(timeout=timeout) for f in futures}
+            except Exception as exc:
+                self._degrade(exc)
+        if self.mode != "process":
+            pids = {_warm_worker()}
+        return {
+            "mode": self.mode,
+            "workers": len(pids),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stages = {name: s.as_dict() for name, s in self._stages.items()}
+        return {
+            "mode": self.mode,
+            "configured_mode": self.configured_mode,
+            "workers": self.workers,
+            "fallback_reason": self.fallback_reason,
+            "stages": stages,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            pools = (self._process_pool, self._thread_pool)
+            self._process_pool = None
+            self._thread_pool = None
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown(wait=wait, cancel_futures=True)
+
+
+CPU_EXECUTOR: Optional[CpuExecutor] = None
+_CPU_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_cpu_executor() -> CpuExecutor:
+    global CPU_EXECUTOR
+    if CPU_EXECUTOR is None:
+        with _CPU_EXECUTOR_LOCK:
+            if CPU_EXECUTOR is None:
+                CPU_EXECUTOR = CpuExecutor()
+    return CPU_EXECUTOR
+
+
+def warm_up_cpu_executor() -> Optional[Dict[str, Any]]:
+    if not settings.cpu_executor_warmup:
+        return None
+    info = get_cpu_executor().warm_up()
+    logger.info("CPU executor ready mode={} workers={} in {}ms", info["mode"], info["workers"], info["elapsed_ms"])
+    return info
+
+
+def shutdown_cpu_executor(wait: bool = True) -> None:
+    global CPU_EXECUTOR
+    with _CPU_EXECUTOR_LOCK:
+        executor, CPU_EXECUTOR = CPU_EXECUTOR, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+
+atexit.register(shutdown_cpu_executor, False)
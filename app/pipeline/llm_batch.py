@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from loguru import logger
+from openai import OpenAI
+
+from app.config.focus import DEFAULT_FOCUS
+from app.config.settings import settings
+from . import llm_enrich
+from .llm_cache import llm_cache_key
+from .scoring import llm_gate_reason, score_job
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+class BatchRequestError(RuntimeError):
+    """A batch line came back with an error, or the batch ended without it."""
+
+
+@dataclass
+class BatchRequest:
+    custom_id: str
+    model: str
+    messages: List[Dict[str, str]]
+
+    def body(self) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "temperature": llm_enrich._temperature(self.model),
+            "messages": self.messages,
+        }
+
+    def line(self) -> str:
+        return json.dumps(
+            {"custom_id": self.custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": self.body()},
+            ensure_ascii=False,
+        )
+
+
+@dataclass
+class BatchOutcome:
+    content: Optional[str] = None
+    error: Optional[str] = None
+    cached: bool = False
+
+
+def _batch_client() -> Any:
+    if settings.llm_batch_base_url:
+        return OpenAI(base_url=settings.llm_batch_base_url, timeout=settings.llm_timeout_sec)
+    return llm_enrich._client()
+
+
+class BatchLlmClient:
+    """
+    Thin wrapper over the OpenAI Batch API: upload a JSONL of chat completion
+    requests, create a batch, poll until it reaches a terminal status and map
+    the output (and error) files back to ``custom_id``.
+
+    When ``state_path`` is given, the batch id is persisted next to a hash of
+    the input, so a crashed or restarted run resumes polling the same batch
+    instead of paying for a second one.
+    """
+
+    def __init__(
+        self,
+        client: Any = None,
+        *,
+        poll_interval: Optional[float] = None,
+        timeout: Optional[float] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.client = client or _batch_client()
+        self.poll_interval = float(settings.llm_batch_poll_sec if poll_interval is None else poll_interval)
+        self.timeout = float(settings.llm_batch_timeout_sec if timeout is None else timeout)
+        self._sleep = sleep
+
+    def submit(self, requests: Sequence[BatchRequest], *, metadata: Optional[Dict[str, str]] = None) -> str:
+        payload = ("\n".join(r.line() for r in requests) + "\n").encode("utf-8")
+        uploaded = self.client.files.create(file=("batch_input.jsonl", payload), purpose="batch")
+        kwargs: Dict[str, Any] = {}
+        if metadata:
+            kwargs["metadata"] = metadata
+        batch = self.client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window="24h",
+            **kwargs,
+        )
+        logger.info("Submitted LLM batch {} with {} requests", batch.id, len(requests))
+        return batch.id
+
+    def wait(self, batch_id: str) -> Any:
+        deadline = time.monotonic() + self.timeout
+        while True:
+            batch = self.client.batches.retrieve(batch_id)
+            if batch.status in TERMINAL_STATUSES:
+                return batch
+            if time.monotonic() >= deadline:
+                logger.warning("LLM batch {} still {} after {}s; giving up", batch_id, batch.status, self.timeout)
+                return batch
+            logger.debug("LLM batch {} status={} counts={}", batch_id, batch.status, getattr(batch, "request_counts", None))
+            self._sleep(self.poll_interval)
+
+    def _read_jsonl(self, file_id: Optional[str]) -> List[Dict[str, Any]]:
+        if not file_id:
+            return []
+        text = self.client.files.content(file_id).text
+        rows = []
+        for line in text.splitlines():
+            line = line.strip()
+            if line:
+                try:
+                    rows.append(json.loads(line))
+                except Exception:
+                    continue
+        return rows
+
+    def collect(self, batch: Any) -> Dict[str, BatchOutcome]:
+        outcomes: Dict[str, BatchOutcome] = {}
+        # expired batches may still carry partial output
+        rows = self._read_jsonl(getattr(batch, "output_file_id", None)) + self._read_jsonl(
+            getattr(batch, "error_file_id", None)
+        )
+        for row in rows:
+            custom_id = row.get("custom_id")
+            if not custom_id:
+                continue
+            response = row.get("response") or {}
+            body = response.get("body") or {}
+            error = row.get("error")
+            if error or int(response.get("status_code") or 0) != 200:
+                message = (error or {}).get("message") or (body.get("error") or {}).get("message") or "request failed"
+                outcomes.setdefault(custom_id, BatchOutcome(error=str(message)))
+                continue
+            try:
+                content = body["choices"][0]["message"]["content"] or "{}"
+            except Exception:
+                outcomes[custom_id] = BatchOutcome(error="malformed batch response body")
+                continue
+            outcomes[custom_id] = BatchOutcome(content=content)
+        return outcomes
+
+    def run(
+        self,
+        requests: Sequence[BatchRequest],
+        *,
+        state_path: Optional[Path] = None,
+        metadata: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """Submit (or resume), wait and collect. Returns {"batch_id", "status", "outcomes"}."""
+        input_sha = hashlib.sha256("\n".join(r.line() for r in requests).encode("utf-8")).hexdigest()
+        state: Dict[str, Any] = {}
+        if state_path and state_path.exists():
+            try:
+                state = json.loads(state_path.read_text(encoding="utf-8"))
+            except Exception:
+                state = {}
+        batch_id = state.get("batch_id") if state.get("input_sha256") == input_sha else None
+        if batch_id:
+            logger.info("Resuming LLM batch {}", batch_id)
+        else:
+            batch_id = self.submit(requests, metadata=metadata)
+        if state_path:
+            state = {"batch_id": batch_id, "input_sha256": input_sha, "requests": len(requests), "status": "submitted"}
+            state_path.parent.mkdir(parents=True, exist_ok=True)
+            state_path.write_text(json.dumps(state, indent=2), encoding="utf-8")
+
+        batch = self.wait(batch_id)
+        outcomes = self.collect(batch)
+        for r in requests:
+            outcomes.setdefault(r.custom_id, BatchOutcome(error=f"no result (batch status {batch.status})"))
+        if state_path:
+            state["status"] = batch.status
+            state_path.write_text(json.dumps(state, indent=2), encoding="utf-8")
+        return {"batch_id": batch_id, "status": batch.status, "outcomes": outcomes}
+
+
+def run_deferred_llm(
+    details_list: Sequence[Dict[str, Any]],
+    *,
+    focus=DEFAULT_FOCUS,
+    use_llm_scoring: bool,
+    apply_blocker_cap: Optional[bool],
+    work_dir: Optional[Path] = None,
+    batch_client: Optional[BatchLlmClient] = None,
+) -> Dict[str, Any]:
+    """
+    Enrich (and LLM-score) staged jobs with one Batch API job, then re-score.
+
+    Each entry is a fetch_job_details() result produced with enrich=False and
+    heuristic-only scoring; it is updated in place with the enriched job, the
+    blended scoring and enrichment_meta. With LLM scoring on, one combined
+    enrich+score prompt is sent per job, or the enrichment prompt alone when
+    the LLM gate skips scoring for it. Prompts already in the LLM response
+    cache are not submitted. Items whose request fails keep heuristic-only
+    scoring, exactly like a failed synchronous LLM call.
+    """
+    active_focus = focus or DEFAULT_FOCUS
+    model = settings.openai_model
+    started = time.perf_counter()
+
+    requests: List[BatchRequest] = []
+    resolved: Dict[str, BatchOutcome] = {}
+    cache_infos: Dict[str, Optional[Dict[str, Any]]] = {}
+    keys: Dict[str, str] = {}
+    gated: Dict[str, str] = {}
+    cache = None
+    for idx, details in enumerate(details_list):
+        job = details.get("job") or {}
+        custom_id = f"job-{idx}"
+        if use_llm_scoring:
+            reason = llm_gate_reason(job, active_focus, apply_blocker_cap)
+            if reason:
+                gated[custom_id] = reason
+        messages = (
+            llm_enrich._combined_messages(job, active_focus)
+            if use_llm_scoring and custom_id not in gated
+            else llm_enrich._enrich_messages(job, active_focus)
+        )
+        key = keys[custom_id] = llm_cache_key(model, llm_enrich._temperature(model), messages)
+        cache, content = llm_enrich._cache_get(key)
+        if content is not None:
+            resolved[custom_id] = BatchOutcome(content=content, cached=True)
+            cache_infos[custom_id] = cache.info(hit=True)
+            continue
+        requests.append(BatchRequest(custom_id=custom_id, model=model, messages=messages))
+
+    batch_id = None
+    status = "skipped"
+    if requests:
+        client = batch_client or BatchLlmClient()
+        try:
+            out = client.run(
+                requests,
+                state_path=(work_dir / "batch_state.json") if work_dir else None,
+                metadata={"source": "jobagent", "profile": str(getattr(active_focus, "profile_name", ""))},
+            )
+            batch_id, status = out["batch_id"], out["status"]
+            resolved.update(out["outcomes"])
+        except Exception as exc:
+            logger.warning("LLM batch failed ({}); keeping heuristic-only scores", exc)
+            status = f"error: {type(exc).__name__}"
+            for r in requests:
+                resolved[r.custom_id] = BatchOutcome(error=str(exc))
+        for r in requests:
+            outcome = resolved[r.custom_id]
+            if outcome.content is not None:
+                cache_infos[r.custom_id] = llm_enrich._cache_put(cache, keys[r.custom_id], model, outcome.content)
+
+    failed = 0
+    for idx, details in enumerate(details_list):
+        custom_id = f"job-{idx}"
+        job = {k: v for k, v in (details.get("job") or {}).items() if k != "junior_fit_score"}
+        outcome = resolved.get(custom_id) or BatchOutcome(error="missing from batch")
+        llm_part = None
+        combined = use_llm_scoring and custom_id not in gated
+        if outcome.content is not None:
+            if combined:
+                enriched, meta, llm_part = llm_enrich._split_combined(job, outcome.content, cache_infos.get(custom_id))
+            else:
+                enriched, meta = llm_enrich._merge_enrichment(job, outcome.content, cache_infos.get(custom_id))
+        else:
+            failed += 1
+            exc = BatchRequestError(outcome.error or "batch request failed")
+            if combined:
+                enriched, meta, llm_part = llm_enrich._combined_failure(job, exc, "")
+            else:
+                enriched, meta = llm_enrich._enrichment_failure(job, exc, "")
+        meta.update({"deferred": True, "batch_id": batch_id})
+
+        scoring = score_job(
+            enriched,
+            active_focus,
+            use_llm_scoring=combined,
+            apply_blocker_cap=apply_blocker_cap,
+            llm_part=llm_part,
+        )
+        if custom_id in gated:
+            # Decided on the staged job: no synchronous LLM call after the batch.
+            scoring.update({"llm_enabled": True, "llm_skipped_reason": gated[custom_id]})
+        details["job"] = {**enriched, "junior_fit_score": scoring["score"]}
+        details["scoring"] = scoring
+        details["enrichment_meta"] = meta
+
+    return {
+        "jobs": len(details_list),
+        "submitted": len(requests),
+        "cache_hits": len(details_list) - len(requests),
+        "failed": failed,
+        "llm_gated": len(gated),
+        "batch_id": batch_id,
+        "status": status,
+        "elapsed_sec": round(time.perf_counter() - started, 2),
+    }
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from app.common.sqlite_utils import connect_sqlite, evict_to_size_cap
+from app.config.settings import settings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    content TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses(last_access);
+"""
+
+# Size-based eviction sums the whole table; run it every N writes rather than on each put.
+_EVICT_EVERY_PUTS = 100
+
+
+def llm_cache_key(model: str, temperature: float, messages: List[Dict[str, Any]]) -> str:
+    """Hash of everything that determines the completion: model, temperature and the exact messages."""
+    payload = json.dumps(
+        {"model": model, "temperature": temperature, "messages": messages},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LlmResponseCache:
+    """
+    SQLite store of raw LLM completions keyed by ``llm_cache_key``.
+
+    Prompts embed the focus profile and resume snapshot, so any profile whose
+    prompt is byte-identical reuses the entry. This cache is independent of
+    ``cache_version``. Entries expire after ``ttl_sec``. When the stored text
+    exceeds ``max_bytes``, the least recently read entries are evicted down to
+    90% of the cap, checked every ``_EVICT_EVERY_PUTS`` writes and on ``evict()``.
+    """
+
+    def __init__(self, path: Path, *, ttl_sec: float, max_bytes: int) -> None:
+        self.path = Path(path)
+        self.ttl_sec = float(ttl_sec)
+        self.max_bytes = max(0, int(max_bytes))
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(self.path)
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT content, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl_sec > 0 and now - float(row["created_at"]) > self.ttl_sec:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ?, hits = hits + 1 WHERE key = ?", (now, key))
+            self.hits += 1
+        return row["content"]
+
+    def put(self, key: str, model: str, content: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses(key, model, content, size, created_at, last_access, hits)"
+                " VALUES (?, ?, ?, ?, ?, ?, 0)",
+                (key, model, content, len(content.encode("utf-8")), now, now),
+            )
+            self._puts += 1
+            if self._puts % _EVICT_EVERY_PUTS == 0:
+                self._evict_locked()
+
+    def info(self, *, hit: bool) -> Dict[str, Any]:
+        """Per-call summary attached to enrichment/scoring metadata."""
+        return {"hit": hit, "hits": self.hits, "misses": self.misses}
+
+    def _evict_locked(self) -> int:
+        evicted, total = evict_to_size_cap(
+            self._conn,
+            table="responses",
+            key_column="key",
+            size_column="size",
+            order_by="last_access",
+            max_bytes=self.max_bytes,
+        )
+        if evicted:
+            logger.info("LLM cache evicted {} entries (now {} bytes)", evicted, total)
+        return evicted
+
+    def evict(self) -> int:
+        with self._lock:
+            return self._evict_locked()
+
+    def purge_expired(self) -> int:
+        if self.ttl_sec <= 0:
+            return 0
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_sec,))
+            return cur.rowcount or 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return {
+            "path": str(self.path),
+            "entries": row[0],
+            "bytes": row[1],
+            "max_bytes": self.max_bytes,
+            "ttl_sec": self.ttl_sec,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_CACHE: Optional[LlmResponseCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def llm_cache_path() -> Path:
+    if settings.llm_cache_path:
+        return Path(settings.llm_cache_path)
+    return settings.output_dir / "_llm_cache.sqlite"
+
+
+def get_llm_cache() -> Optional[LlmResponseCache]:
+    """Process-wide cache, or None when JOBAGENT_LLM_CACHE_ENABLED is off."""
+    global _CACHE
+    if not settings.llm_cache_enabled:
+        return None
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = LlmResponseCache(
+                    llm_cache_path(),
+                    ttl_sec=float(settings.llm_cache_ttl_days) * 86400,
+                    max_bytes=int(settings.llm_cache_max_mb) * 1024 * 1024,
+                )
+    return _CACHE
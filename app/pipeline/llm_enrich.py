@@ -1,24 +1,144 @@
 from __future__ import annotations
+import asyncio
+import hashlib
 import json, re
 import os
+import weakref
 from dataclasses import dataclass
-from typing import Dict, Any, Optional, Tuple
-from openai import OpenAI
+from typing import Dict, Any, List, Optional, Tuple
+from openai import AsyncOpenAI, OpenAI
 
 from app.config.focus import DEFAULT_FOCUS
 from app.config.settings import settings
 from loguru import logger
+from .llm_cache import get_llm_cache, llm_cache_key
+from .llm_limits import LLM_LIMITER
+from .llm_scheduler import LLM_SCHEDULER
+from .prompt_compact import compact_description, estimate_tokens, log_compaction
 
 _CLIENT = None
+# AsyncOpenAI wraps an httpx.AsyncClient, which is bound to the loop it was created on.
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
 
 
 def _client():
     global _CLIENT
     if _CLIENT is None:
-        _CLIENT = OpenAI()
+        # retries are owned by LLM_SCHEDULER
+        _CLIENT = OpenAI(timeout=settings.llm_timeout_sec, max_retries=0)
     return _CLIENT
 
 
+def _async_client():
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_CLIENTS.get(loop)
+    if client is None:
+        client = AsyncOpenAI(timeout=settings.llm_timeout_sec, max_retries=0)
+        _ASYNC_CLIENTS[loop] = client
+    return client
+
+
+async def close_async_client() -> None:
+    """Close the AsyncOpenAI client bound to the running loop (call before the loop ends)."""
+    client = _ASYNC_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
+
+
+def _temperature(model: str) -> float:
+    return 1 if "gpt-5" in model else 0.2
+
+
+def _cacheable(content: str) -> bool:
+    """Only keep completions that contain a parseable JSON object."""
+    m = re.search(r"\{.*\}", content or "", re.DOTALL)
+    if not m:
+        return False
+    try:
+        json.loads(m.group(0))
+    except Exception:
+        return False
+    return True
+
+
+def _cache_get(key: str) -> Tuple[Any, Optional[str]]:
+    cache = get_llm_cache()
+    if cache is None:
+        return None, None
+    try:
+        return cache, cache.get(key)
+    except Exception as exc:
+        logger.warning("LLM cache read failed ({}); calling the model", exc)
+        return None, None
+
+
+def _cache_put(cache, key: str, model: str, content: str) -> Optional[Dict[str, Any]]:
+    if cache is None:
+        return None
+    try:
+        if _cacheable(content):
+            cache.put(key, model, content)
+    except Exception as exc:
+        logger.warning("LLM cache write failed ({})", exc)
+    return cache.info(hit=False)
+
+
+# Reserved for the completion until the response reports actual usage.
+_COMPLETION_TOKEN_ALLOWANCE = 1000
+
+
+def _request_tokens(messages: List[Dict[str, str]]) -> int:
+    return sum(estimate_tokens(m.get("content")) for m in messages) + _COMPLETION_TOKEN_ALLOWANCE
+
+
+def _complete(model: str, messages: List[Dict[str, str]]) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """Sync chat completion through the response cache and the rate scheduler; returns (content, cache info)."""
+    key = llm_cache_key(model, _temperature(model), messages)
+    cache, content = _cache_get(key)
+    if content is not None:
+        return content, cache.info(hit=True)
+    resp = LLM_SCHEDULER.call(
+        model,
+        _request_tokens(messages),
+        lambda: _client().chat.completions.create(
+            model=model,
+            temperature=_temperature(model),
+            messages=messages,
+        ),
+    )
+    content = resp.choices[0].message.content or "{}"
+    return content, _cache_put(cache, key, model, content)
+
+
+async def _acomplete(model: str, messages: List[Dict[str, str]]) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    Async chat completion: cache first, then the model under the per-minute
+    rate budgets (queued, with 429/5xx retries), the global/per-model
+    concurrency caps and a hard timeout per attempt.
+    """
+    key = llm_cache_key(model, _temperature(model), messages)
+    cache, content = await asyncio.to_thread(_cache_get, key)
+    if content is not None:
+        return content, cache.info(hit=True)
+    client = _async_client()
+
+    async def attempt():
+        # rate-queued callers don't hold a concurrency slot
+        async with LLM_LIMITER.slot(model):
+            return await asyncio.wait_for(
+                client.chat.completions.create(
+                    model=model,
+                    temperature=_temperature(model),
+                    messages=messages,
+                ),
+                timeout=settings.llm_timeout_sec,
+            )
+
+    resp = await LLM_SCHEDULER.acall(model, _request_tokens(messages), attempt)
+    content = resp.choices[0].message.content or "{}"
+    return content, await asyncio.to_thread(_cache_put, cache, key, model, content)
+
+
 @dataclass
 class EnrichmentMeta:
     ok: bool
@@ -26,6 +146,7 @@ class EnrichmentMeta:
     error_type: Optional[str] = None
     error_message: Optional[str] = None
     raw_excerpt: Optional[str] = None
+    llm_cache: Optional[Dict[str, Any]] = None
 
 
 def _build_system_prompt(focus=DEFAULT_FOCUS) -> str:
@@ -99,17 +220,63 @@ def _load_resume_snapshot() -> Optional[Dict[str, Any]]:
     }
 
 
-def _build_user_prompt(job: Dict[str, Any], focus=DEFAULT_FOCUS) -> str:
-    title = job.get("title") or "Unknown"
-    company = job.get("company") or "Unknown"
-    location = job.get("location") or "Unknown"
-    desc = job.get("description_text") or ""
-    focus_payload = {}
+# Focus fields the enrichment user prompt quotes; titles, skills and locations
+# are already spelled out in the system prompt, and scoring-only knobs (weights,
+# penalties, caps) stay out so editing them keeps cached enrichments valid.
+_PROMPT_FOCUS_KEYS = (
+    "profile_name",
+    "target_seniority",
+    "max_allowed_seniority",
+    "max_required_experience_years",
+    "min_german_level",
+    "candidate_german_level",
+    "requires_student_status",
+    "relocation_ok",
+    "excluded_locations",
+)
+_MIN_DESCRIPTION_TOKENS = 400
+
+
+def _description_budget(fixed_tokens: int) -> int:
+    return max(_MIN_DESCRIPTION_TOKENS, int(settings.llm_prompt_max_tokens) - fixed_tokens)
+
+
+def _prompt_focus_payload(focus) -> Dict[str, Any]:
+    """The focus block of the enrichment user prompt."""
     if hasattr(focus, "model_dump"):
         focus_payload = focus.model_dump()
     else:
         focus_payload = getattr(focus, "__dict__", {}) or {}
     focus_payload = _safe_jsonable(focus_payload)
+    return {k: focus_payload[k] for k in _PROMPT_FOCUS_KEYS if k in focus_payload}
+
+
+def enrichment_fingerprint(focus=DEFAULT_FOCUS) -> str:
+    """
+    Hash of everything besides the posting that shapes the enrichment prompt:
+    the focus fields it quotes, the resume snapshot, compaction settings and
+    the model. Profile edits that only affect scoring leave it unchanged.
+    """
+    active_focus = focus or DEFAULT_FOCUS
+    resume = _load_resume_snapshot() or {}
+    payload = {
+        "system": _build_system_prompt(active_focus),
+        "focus": _prompt_focus_payload(active_focus),
+        "resume": resume.get("sha256") or resume.get("resume_id"),
+        "compaction": [settings.llm_prompt_compaction, settings.llm_prompt_max_tokens],
+        "model": settings.openai_model,
+        "temperature": _temperature(settings.openai_model),
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _build_user_prompt(job: Dict[str, Any], focus=DEFAULT_FOCUS, reserved_tokens: int = 0) -> str:
+    compact = settings.llm_prompt_compaction
+    title = job.get("title") or "Unknown"
+    company = job.get("company") or "Unknown"
+    location = job.get("location") or "Unknown"
+    desc = job.get("description_text") or ""
     meta = {
         "title": title,
         "company": company,
@@ -117,101 +284,122 @@ def _build_user_prompt(job: Dict[str, Any], focus=DEFAULT_FOCUS) -> str:
         "employment_type": job.get("employment_type"),
         "date_posted": job.get("date_posted"),
         "url": job.get("url"),
-        "focus": focus_payload,
+        "focus": _prompt_focus_payload(focus),
     }
+    indent = None if compact else 2
     resume_ctx = _load_resume_snapshot()
     resume_block = ""
     if resume_ctx:
         resume_block = (
             "\n\nResume CONTEXT:\n"
-            f"{json.dumps(resume_ctx, ensure_ascii=False, indent=2)}"
+            f"{json.dumps(resume_ctx, ensure_ascii=False, indent=indent)}"
         )
-    return f"""Job META:
-{json.dumps(meta, ensure_ascii=False, indent=2)}
+    head = f"""Job META:
+{json.dumps(meta, ensure_ascii=False, indent=indent)}
 {resume_block}
 
 Job DESCRIPTION (text):
 \"\"\"
-{desc[:20000]}
+"""
+    if compact:
+        fixed = reserved_tokens + estimate_tokens(head)
+        result = compact_description(desc, _description_budget(fixed))
+        log_compaction("enrich", job, result, fixed + result.tokens_out)
+        desc = result.text
+    return f"""{head}{desc[:20000]}
 \"\"\""""
 
 
+def _enrich_messages(job: Dict[str, Any], focus=DEFAULT_FOCUS, reserved_tokens: int = 0) -> List[Dict[str, str]]:
+    active_focus = focus or DEFAULT_FOCUS
+    system = _build_system_prompt(active_focus)
+    reserved = reserved_tokens + (estimate_tokens(system) if settings.llm_prompt_compaction else 0)
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": _build_user_prompt(job, active_focus, reserved)},
+    ]
+
+
+def _merge_enrichment(
+    job: Dict[str, Any],
+    content: str,
+    cache_info: Optional[Dict[str, Any]] = None,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    m = re.search(r"\{.*\}", content, re.DOTALL)
+    data = {}
+    if m:
+        try:
+            data = json.loads(m.group(0))
+        except Exception:
+            data = {}
+    enriched = job.copy()
+    for k in (
+        "seniority",
+        "english_ok",
+        "german_requirement",
+        "skills_detected",
+        "skill_hits",
+        "reasons_include",
+        "reasons_exclude",
+        "language_requirements",
+    ):
+        if k in data:
+            enriched[k] = data[k]
+    meta = EnrichmentMeta(
+        ok=True,
+        model=settings.openai_model,
+        raw_excerpt=content[:400],
+        llm_cache=cache_info,
+    ).__dict__
+    return enriched, meta
+
+
+def _enrichment_failure(job: Dict[str, Any], exc: Exception, raw_text: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    logger.warning(
+        "LLM enrichment failed for job '%s' (%s): %s",
+        job.get("title"),
+        job.get("url"),
+        exc,
+    )
+    meta = EnrichmentMeta(
+        ok=False,
+        model=settings.openai_model,
+        error_type=type(exc).__name__,
+        error_message=str(exc),
+        raw_excerpt=raw_text[:400] if raw_text else None,
+    ).__dict__
+    return job, meta
+
+
 def enrich_jobposting(job: Dict[str, Any], focus=DEFAULT_FOCUS) -> Tuple[Dict[str, Any], Dict[str, Any]]:
     """
     Calls OpenAI to enrich fields. Returns (merged dict, enrichment_meta).
     Enrichment failures do not raise; metadata captures the failure.
     """
-    active_focus = focus or DEFAULT_FOCUS
-    prompt = _build_user_prompt(job, active_focus)
-    system_prompt = _build_system_prompt(active_focus)
-    client = _client()
+    messages = _enrich_messages(job, focus)
     raw_text = ""
     try:
-        temperature = 0.2
-        if "gpt-5" in settings.openai_model:
-            temperature = 1
-        resp = client.chat.completions.create(
-            model=settings.openai_model,
-            temperature=temperature,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": prompt},
-            ],
-        )
-        content = resp.choices[0].message.content or "{}"
-        raw_text = content
-        m = re.search(r"\{.*\}", content, re.DOTALL)
-        data = {}
-        if m:
-            try:
-                data = json.loads(m.group(0))
-            except Exception:
-                data = {}
-        enriched = job.copy()
-        for k in (
-            "seniority",
-            "english_ok",
-            "german_requirement",
-            "skills_detected",
-            "skill_hits",
-            "reasons_include",
-            "reasons_exclude",
-            "language_requirements",
-        ):
-            if k in data:
-                enriched[k] = data[k]
-        meta = EnrichmentMeta(
-            ok=True,
-            model=settings.openai_model,
-            raw_excerpt=raw_text[:400],
-        ).__dict__
-        return enriched, meta
+        raw_text, cache_info = _complete(settings.openai_model, messages)
+        return _merge_enrichment(job, raw_text, cache_info)
     except Exception as exc:
-        logger.warning(
-            "LLM enrichment failed for job '%s' (%s): %s",
-            job.get("title"),
-            job.get("url"),
-            exc,
-        )
-        meta = EnrichmentMeta(
-            ok=False,
-            model=settings.openai_model,
-            error_type=type(exc).__name__,
-            error_message=str(exc),
-            raw_excerpt=raw_text[:400] if raw_text else None,
-        ).__dict__
-        return job, meta
+        return _enrichment_failure(job, exc, raw_text)
+
+
+async def aenrich_jobposting(job: Dict[str, Any], focus=DEFAULT_FOCUS) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Async variant of enrich_jobposting; waits for an LLM slot instead of blocking a thread."""
+    messages = _enrich_messages(job, focus)
+    raw_text = ""
+    try:
+        raw_text, cache_info = await _acomplete(settings.openai_model, messages)
+        return _merge_enrichment(job, raw_text, cache_info)
+    except Exception as exc:
+        return _enrichment_failure(job, exc, raw_text)
 
 
 LLM_SCORING_VERSION = "1.0.0"
 
 
-def llm_score_job(job: Dict[str, Any], focus: Any, heuristic_result: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Ask an LLM to provide a holistic score and German requirement summary.
-    Returns a dict with llm_score and related metadata.
-    """
-    client = _client()
+def _llm_score_messages(job: Dict[str, Any], focus: Any, heuristic_result: Dict[str, Any]) -> List[Dict[str, str]]:
     payload = {
         "candidate_profile": {
             "profile_name": getattr(focus, "profile_name", ""),
@@ -251,112 +439,235 @@ def llm_score_job(job: Dict[str, Any], focus: Any, heuristic_result: Dict[str, A
         "Output ONLY JSON with keys: llm_score, german_requirement{type,min_level,justification}, risk_flags, critical_blockers, summary.\n"
     )
 
-    content: str = ""
-    raw_excerpt: Optional[str] = None
-    try:
-        temperature = 0.2
-        if "gpt-5" in settings.openai_model_scoring:
-            temperature = 1
-        resp = client.chat.completions.create(
-            model=settings.openai_model_scoring,
-            temperature=temperature,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": json.dumps(payload, ensure_ascii=False)},
-            ],
-        )
-        content = resp.choices[0].message.content or "{}"
-        raw_excerpt = content[:600] if content else None
-
-        m = re.search(r"\{.*\}", content, re.DOTALL)
-        if not m:
-            return {
-                "llm_scoring_version": LLM_SCORING_VERSION,
-                "llm_score": None,
-                "german_requirement": None,
-                "risk_flags": [],
-                "critical_blockers": [],
-                "summary": None,
-                "confidence": None,
-                "llm_ok": False,
-                "ok": False,  # alias
-                "error_type": "parse_error",
-                "error_message": "No JSON object found in model output.",
-                "raw_excerpt": raw_excerpt,
-            }
+    if settings.llm_prompt_compaction:
+        # components/reasons already summarize the per-component meta
+        payload["heuristic_summary"].pop("meta", None)
+        desc = payload["job"].pop("description_text") or ""
+        fixed = estimate_tokens(system_prompt) + estimate_tokens(json.dumps(payload, ensure_ascii=False))
+        result = compact_description(desc, _description_budget(fixed))
+        log_compaction("score", job, result, fixed + result.tokens_out)
+        payload["job"]["description_text"] = result.text
 
-        try:
-            data = json.loads(m.group(0))
-        except Exception as exc:
-            return {
-                "llm_scoring_version": LLM_SCORING_VERSION,
-                "llm_score": None,
-                "german_requirement": None,
-                "risk_flags": [],
-                "critical_blockers": [],
-                "summary": None,
-                "confidence": None,
-                "llm_ok": False,
-                "ok": False,  # alias
-                "error_type": "parse_error",
-                "error_message": f"Failed to parse JSON: {type(exc).__name__}: {exc}",
-                "raw_excerpt": raw_excerpt,
-            }
-
-        llm_score = data.get("llm_score")
-        llm_ok = isinstance(llm_score, (int, float))
-
-        conf_raw = data.get("confidence")
-        llm_confidence = None
-        try:
-            if conf_raw is not None:
-                llm_confidence = float(conf_raw)
-        except Exception:
-            llm_confidence = None
-
-        if not llm_ok:
-            return {
-                "llm_scoring_version": LLM_SCORING_VERSION,
-                "llm_score": llm_score,
-                "german_requirement": data.get("german_requirement"),
-                "risk_flags": data.get("risk_flags") or [],
-                "critical_blockers": data.get("critical_blockers") or [],
-                "summary": data.get("summary"),
-                "confidence": llm_confidence,
-                "llm_ok": False,
-                "ok": False,  # alias
-                "error_type": "schema_error",
-                "error_message": "Parsed JSON but llm_score is missing or not a number.",
-                "raw_excerpt": raw_excerpt,
-            }
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": json.dumps(payload, ensure_ascii=False)},
+    ]
+
+
+def _parse_llm_score(content: str) -> Dict[str, Any]:
+    raw_excerpt = content[:600] if content else None
 
+    m = re.search(r"\{.*\}", content, re.DOTALL)
+    if not m:
         return {
             "llm_scoring_version": LLM_SCORING_VERSION,
-            "llm_score": float(llm_score),
-            "german_requirement": data.get("german_requirement"),
-            "risk_flags": data.get("risk_flags") or [],
-            "critical_blockers": data.get("critical_blockers") or [],
-            "summary": data.get("summary"),
-            "confidence": llm_confidence,
-            "llm_ok": True,
-            "ok": True,  # alias
-            "error_type": None,
-            "error_message": None,
+            "llm_score": None,
+            "german_requirement": None,
+            "risk_flags": [],
+            "critical_blockers": [],
+            "summary": None,
+            "confidence": None,
+            "llm_ok": False,
+            "ok": False,  # alias
+            "error_type": "parse_error",
+            "error_message": "No JSON object found in model output.",
             "raw_excerpt": raw_excerpt,
         }
+
+    try:
+        data = json.loads(m.group(0))
     except Exception as exc:
-        # On any LLM failure, fall back gracefully
         return {
-            "llm_score": None,
             "llm_scoring_version": LLM_SCORING_VERSION,
+            "llm_score": None,
             "german_requirement": None,
             "risk_flags": [],
             "critical_blockers": [],
             "summary": None,
             "confidence": None,
             "llm_ok": False,
-            "ok": False,
-            "error_type": type(exc).__name__,
-            "error_message": str(exc),
+            "ok": False,  # alias
+            "error_type": "parse_error",
+            "error_message": f"Failed to parse JSON: {type(exc).__name__}: {exc}",
             "raw_excerpt": raw_excerpt,
         }
+
+    return _llm_score_fields(data, raw_excerpt)
+
+
+def _llm_score_fields(data: Dict[str, Any], raw_excerpt: Optional[str]) -> Dict[str, Any]:
+    llm_score = data.get("llm_score")
+    llm_ok = isinstance(llm_score, (int, float))
+
+    conf_raw = data.get("confidence")
+    llm_confidence = None
+    try:
+        if conf_raw is not None:
+            llm_confidence = float(conf_raw)
+    except Exception:
+        llm_confidence = None
+
+    if not llm_ok:
+        return {
+            "llm_scoring_version": LLM_SCORING_VERSION,
+            "llm_score": llm_score,
+            "german_requirement": data.get("german_requirement"),
+            "risk_flags": data.get("risk_flags") or [],
+            "critical_blockers": data.get("critical_blockers") or [],
+            "summary": data.get("summary"),
+            "confidence": llm_confidence,
+            "llm_ok": False,
+            "ok": False,  # alias
+            "error_type": "schema_error",
+            "error_message": "Parsed JSON but llm_score is missing or not a number.",
+            "raw_excerpt": raw_excerpt,
+        }
+
+    return {
+        "llm_scoring_version": LLM_SCORING_VERSION,
+        "llm_score": float(llm_score),
+        "german_requirement": data.get("german_requirement"),
+        "risk_flags": data.get("risk_flags") or [],
+        "critical_blockers": data.get("critical_blockers") or [],
+        "summary": data.get("summary"),
+        "confidence": llm_confidence,
+        "llm_ok": True,
+        "ok": True,  # alias
+        "error_type": None,
+        "error_message": None,
+        "raw_excerpt": raw_excerpt,
+    }
+
+
+def _llm_score_failure(exc: Exception, raw_excerpt: Optional[str]) -> Dict[str, Any]:
+    # On any LLM failure, fall back gracefully
+    return {
+        "llm_score": None,
+        "llm_scoring_version": LLM_SCORING_VERSION,
+        "german_requirement": None,
+        "risk_flags": [],
+        "critical_blockers": [],
+        "summary": None,
+        "confidence": None,
+        "llm_ok": False,
+        "ok": False,
+        "error_type": type(exc).__name__,
+        "error_message": str(exc),
+        "raw_excerpt": raw_excerpt,
+    }
+
+
+def llm_score_job(job: Dict[str, Any], focus: Any, heuristic_result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Ask an LLM to provide a holistic score and German requirement summary.
+    Returns a dict with llm_score and related metadata.
+    """
+    messages = _llm_score_messages(job, focus, heuristic_result)
+    content: str = ""
+    try:
+        content, cache_info = _complete(settings.openai_model_scoring, messages)
+        return {**_parse_llm_score(content), "llm_cache": cache_info}
+    except Exception as exc:
+        return _llm_score_failure(exc, content[:600] if content else None)
+
+
+async def allm_score_job(job: Dict[str, Any], focus: Any, heuristic_result: Dict[str, Any]) -> Dict[str, Any]:
+    """Async variant of llm_score_job, sharing the LLM concurrency caps."""
+    messages = _llm_score_messages(job, focus, heuristic_result)
+    content: str = ""
+    try:
+        content, cache_info = await _acomplete(settings.openai_model_scoring, messages)
+        return {**_parse_llm_score(content), "llm_cache": cache_info}
+    except Exception as exc:
+        return _llm_score_failure(exc, content[:600] if content else None)
+
+
+# --- combined enrich + score ------------------------------------------------
+
+_COMBINED_SCORING_INSTRUCTIONS = (
+    "Additionally, evaluate how well the job fits the target profile and add a key \"scoring\" with an object:\n"
+    "- llm_score: holistic suitability 0-100 (0-20 impossible, 20-50 weak, 50-70 stretch, 70-85 good, 85-100 excellent)\n"
+    "- german_requirement: {type: none|preferred|required|hard_blocker, min_level: A2|B1|B2|C1|C2|Unknown, justification}\n"
+    "- risk_flags (list of strings)\n"
+    "- critical_blockers (list of strings)\n"
+    "- summary (one or two sentences)\n"
+    "- confidence (0.0-1.0)\n"
+    "Read the FULL job description text before scoring.\n"
+)
+
+
+def _combined_messages(job: Dict[str, Any], focus=DEFAULT_FOCUS) -> List[Dict[str, str]]:
+    """Enrichment prompt plus the scoring task, so the description is sent once."""
+    messages = _enrich_messages(job, focus, reserved_tokens=estimate_tokens(_COMBINED_SCORING_INSTRUCTIONS))
+    system = messages[0]["content"].replace("Output ONLY JSON.\n", "")
+    messages[0] = {"role": "system", "content": system + _COMBINED_SCORING_INSTRUCTIONS + "Output ONLY JSON.\n"}
+    return messages
+
+
+def _split_combined(
+    job: Dict[str, Any],
+    content: str,
+    cache_info: Optional[Dict[str, Any]],
+) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    enriched, meta = _merge_enrichment(job, content, cache_info)
+    meta["combined"] = True
+    m = re.search(r"\{.*\}", content, re.DOTALL)
+    try:
+        data = json.loads(m.group(0)) if m else {}
+    except Exception:
+        data = {}
+    scoring_data = data.get("scoring") if isinstance(data, dict) else None
+    if isinstance(scoring_data, dict):
+        llm_part = _llm_score_fields(scoring_data, content[:600] if content else None)
+    else:
+        llm_part = _llm_score_failure(
+            ValueError("Combined output has no 'scoring' object."),
+            content[:600] if content else None,
+        )
+        llm_part["error_type"] = "schema_error"
+    llm_part.update({"llm_cache": cache_info, "llm_combined": True})
+    return enriched, meta, llm_part
+
+
+def _combined_failure(
+    job: Dict[str, Any],
+    exc: Exception,
+    raw_text: str,
+) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    job_out, meta = _enrichment_failure(job, exc, raw_text)
+    meta["combined"] = True
+    llm_part = _llm_score_failure(exc, raw_text[:600] if raw_text else None)
+    llm_part["llm_combined"] = True
+    return job_out, meta, llm_part
+
+
+def enrich_and_score_jobposting(
+    job: Dict[str, Any],
+    focus=DEFAULT_FOCUS,
+) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    """
+    One LLM call returning enrichment fields plus the llm_score_job fields.
+    Returns (merged job, enrichment_meta, llm_part); pass llm_part to
+    score_job(..., llm_part=...) to blend it with the heuristic score as usual.
+    """
+    messages = _combined_messages(job, focus)
+    raw_text = ""
+    try:
+        raw_text, cache_info = _complete(settings.openai_model, messages)
+        return _split_combined(job, raw_text, cache_info)
+    except Exception as exc:
+        return _combined_failure(job, exc, raw_text)
+
+
+async def aenrich_and_score_jobposting(
+    job: Dict[str, Any],
+    focus=DEFAULT_FOCUS,
+) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    """Async variant of enrich_and_score_jobposting."""
+    messages = _combined_messages(job, focus)
+    raw_text = ""
+    try:
+        raw_text, cache_info = await _acomplete(settings.openai_model, messages)
+        return _split_combined(job, raw_text, cache_info)
+    except Exception as exc:
+        return _combined_failure(job, exc, raw_text)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Mapping, Optional, Tuple
+
+from loguru import logger
+
+from app.config.settings import settings
+
+
+def _parse_model_caps(entries: Tuple[str, ...]) -> Dict[str, int]:
+    caps: Dict[str, int] = {}
+    for entry in entries:
+        model, _, value = entry.partition("=")
+        try:
+            caps[model.strip()] = max(1, int(value))
+        except ValueError:
+            logger.warning("Ignoring malformed model=N entry {!r}", entry)
+    return caps
+
+
+class LlmLimiter:
+    """
+    Bounds concurrent LLM requests: one global cap plus optional per-model
+    caps. A request holds the global slot and its model slot for its whole
+    duration. Semaphores are kept per event loop, since asyncio primitives
+    are loop-bound and Prefect tasks each run their own loop.
+    """
+
+    def __init__(self, max_concurrency: int, model_caps: Optional[Mapping[str, int]] = None) -> None:
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.model_caps = dict(model_caps or {})
+        self._per_loop: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Optional[str], asyncio.Semaphore]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.requests = 0
+        self.inflight = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _semaphores(self, model: str) -> Tuple[asyncio.Semaphore, Optional[asyncio.Semaphore]]:
+        loop = asyncio.get_running_loop()
+        sems = self._per_loop.get(loop)
+        if sems is None:
+            sems = {None: asyncio.Semaphore(self.max_concurrency)}
+            self._per_loop[loop] = sems
+        model_sem = None
+        cap = self.model_caps.get(model)
+        if cap:
+            model_sem = sems.get(model)
+            if model_sem is None:
+                model_sem = sems[model] = asyncio.Semaphore(cap)
+        return sems[None], model_sem
+
+    @asynccontextmanager
+    async def slot(self, model: str) -> AsyncIterator[float]:
+        """Hold a request slot for ``model``; yields the seconds spent waiting for it."""
+        global_sem, model_sem = self._semaphores(model)
+        started = time.perf_counter()
+        # model slot first so a throttled model doesn't sit on global slots
+        if model_sem is not None:
+            await model_sem.acquire()
+        try:
+            async with global_sem:
+                waited = time.perf_counter() - started
+                self.requests += 1
+                self.inflight += 1
+                self.wait_total += waited
+                self.wait_max = max(self.wait_max, waited)
+                try:
+                    yield waited
+                finally:
+                    self.inflight -= 1
+        finally:
+            if model_sem is not None:
+                model_sem.release()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "model_caps": dict(self.model_caps),
+            "requests": self.requests,
+            "inflight": self.inflight,
+            "wait_ms_avg": round(self.wait_total / max(1, self.requests) * 1000, 2),
+            "wait_ms_max": round(self.wait_max * 1000, 2),
+        }
+
+
+LLM_LIMITER = LlmLimiter(
+    settings.llm_max_concurrency,
+    _parse_model_caps(settings.llm_model_concurrency),
+)
@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Mapping, Optional, Tuple, TypeVar
+
+import openai
+from loguru import logger
+
+from app.config.settings import settings
+from app.fetching.rate_limit import parse_retry_after
+from .llm_limits import _parse_model_caps
+
+T = TypeVar("T")
+
+_WINDOW_SEC = 60.0
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """OpenAI x-ratelimit-reset-* values look like '1s', '6m0s' or '20ms'."""
+    if not value:
+        return None
+    parts = _DURATION_RE.findall(str(value).strip())
+    if not parts:
+        return parse_retry_after(value)
+    return sum(float(num) * _DURATION_UNITS[unit] for num, unit in parts)
+
+
+def reset_delay_from_headers(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """Longest wait the provider asked for via retry-after(-ms) or x-ratelimit-reset-* headers."""
+    if not headers:
+        return None
+    delays = []
+    ms = headers.get("retry-after-ms")
+    if ms:
+        try:
+            delays.append(float(ms) / 1000.0)
+        except ValueError:
+            pass
+    for name, parse in (
+        ("retry-after", parse_retry_after),
+        ("x-ratelimit-reset-requests", parse_reset_duration),
+        ("x-ratelimit-reset-tokens", parse_reset_duration),
+    ):
+        delay = parse(headers.get(name))
+        if delay is not None:
+            delays.append(delay)
+    return max(delays) if delays else None
+
+
+def _retry_info(exc: BaseException) -> Tuple[bool, Optional[str], Optional[float]]:
+    """(retryable, kind, provider delay) for an exception raised by a completion call."""
+    if isinstance(exc, openai.RateLimitError):
+        return True, "rate_limited", reset_delay_from_headers(exc.response.headers)
+    if isinstance(exc, openai.APIStatusError):
+        if exc.status_code >= 500:
+            return True, "server_error", reset_delay_from_headers(exc.response.headers)
+        return False, None, None
+    # Timeouts are the caller's latency budget, so only plain connection failures are retried.
+    if isinstance(exc, openai.APIConnectionError) and not isinstance(exc, openai.APITimeoutError):
+        return True, "connection_error", None
+    return False, None, None
+
+
+@dataclass
+class _ModelWindow:
+    """Sliding one-minute window of (timestamp, tokens) reservations for one model."""
+
+    rpm: int
+    tpm: int
+    entries: Deque[list] = field(default_factory=deque)
+    blocked_until: float = 0.0
+
+    def _trim(self, now: float) -> None:
+        while self.entries and self.entries[0][0] <= now - _WINDOW_SEC:
+            self.entries.popleft()
+
+    def wait_for(self, now: float, tokens: int) -> float:
+        self._trim(now)
+        wait = max(0.0, self.blocked_until - now)
+        if self.rpm and len(self.entries) >= self.rpm:
+            wait = max(wait, self.entries[len(self.entries) - self.rpm][0] + _WINDOW_SEC - now)
+        if self.tpm:
+            used = sum(e[1] for e in self.entries)
+            # drop the oldest reservations until the new one fits
+            for ts, spent in self.entries:
+                if used + tokens <= self.tpm:
+                    break
+                used -= spent
+                wait = max(wait, ts + _WINDOW_SEC - now)
+        return wait
+
+    def usage(self, now: float) -> Dict[str, int]:
+        self._trim(now)
+        return {"requests": len(self.entries), "tokens": int(sum(e[1] for e in self.entries))}
+
+
+class LlmScheduler:
+    """
+    Admits LLM requests under per-model requests-per-minute and
+    tokens-per-minute budgets and retries throttled or failed calls.
+
+    Callers over budget wait in line instead of failing. 429, 5xx and
+    connection errors are retried with full-jitter exponential backoff, never
+    sooner than the provider's retry-after / x-ratelimit-reset-* headers, and
+    the whole model pauses until then. Token reservations use the prompt
+    estimate and are corrected with the reported usage afterwards. A limit of
+    0 disables that budget. Works from both sync and async code.
+    """
+
+    def __init__(
+        self,
+        *,
+        rpm: int = 0,
+        tpm: int = 0,
+        model_rpm: Optional[Mapping[str, int]] = None,
+        model_tpm: Optional[Mapping[str, int]] = None,
+        max_retries: int = 4,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rpm = max(0, int(rpm))
+        self.tpm = max(0, int(tpm))
+        self.model_rpm = dict(model_rpm or {})
+        self.model_tpm = dict(model_tpm or {})
+        self.max_retries = max(0, int(max_retries))
+        self.backoff_base = max(0.0, float(backoff_base))
+        self.backoff_max = max(self.backoff_base, float(backoff_max))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._windows: Dict[str, _ModelWindow] = {}
+        self.queue_depth = 0
+        self.queued_total = 0
+        self.throttle_sec_total = 0.0
+        self.requests = 0
+        self.retries = 0
+        self.errors: Dict[str, int] = {}
+        self.failures = 0
+
+    def _window(self, model: str) -> _ModelWindow:
+        window = self._windows.get(model)
+        if window is None:
+            window = _ModelWindow(
+                rpm=int(self.model_rpm.get(model, self.rpm)),
+                tpm=int(self.model_tpm.get(model, self.tpm)),
+            )
+            self._windows[model] = window
+        return window
+
+    def _try_reserve(self, model: str, tokens: int) -> Tuple[float, Optional[list]]:
+        """Reserve budget now, or return how long to wait before asking again."""
+        with self._lock:
+            now = self._clock()
+            window = self._window(model)
+            wait = window.wait_for(now, tokens)
+            if wait > 0:
+                return wait, None
+            entry = [now, tokens]
+            window.entries.append(entry)
+            self.requests += 1
+            return 0.0, entry
+
+    def _settle(self, entry: list, result: Any) -> None:
+        usage = getattr(result, "usage", None)
+        total = getattr(usage, "total_tokens", None)
+        if isinstance(total, int) and total > 0:
+            with self._lock:
+                entry[1] = total
+
+    def _on_error(self, model: str, exc: BaseException, attempt: int) -> Optional[float]:
+        """Return the backoff before the next attempt, or None when the error should propagate."""
+        retryable, kind, provider_delay = _retry_info(exc)
+        if not retryable or attempt >= self.max_retries:
+            if retryable:
+                with self._lock:
+                    self.failures += 1
+            return None
+        delay = random.uniform(0.0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        if provider_delay is not None:
+            delay = max(delay, min(provider_delay, self.backoff_max))
+        with self._lock:
+            self.retries += 1
+            self.errors[kind] = self.errors.get(kind, 0) + 1
+            if kind == "rate_limited":
+                window = self._window(model)
+                window.blocked_until = max(window.blocked_until, self._clock() + delay)
+        logger.warning("LLM {} for {} (attempt {}); retrying in {:.2f}s", kind, model, attempt + 1, delay)
+        return delay
+
+    def _waited(self, seconds: float, queued: bool) -> None:
+        with self._lock:
+            self.throttle_sec_total += seconds
+            if queued:
+                self.queued_total += 1
+
+    def _enter_queue(self, delta: int) -> None:
+        with self._lock:
+            self.queue_depth += delta
+
+    async def acall(self, model: str, tokens: int, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await ``fn()`` once budget for ``tokens`` is available, retrying transient errors."""
+        attempt = 0
+        while True:
+            entry = await self._areserve(model, tokens)
+            try:
+                result = await fn()
+            except Exception as exc:
+                delay = self._on_error(model, exc, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                await self._asleep(delay)
+                continue
+            self._settle(entry, result)
+            return result
+
+    def call(self, model: str, tokens: int, fn: Callable[[], T]) -> T:
+        """Sync variant of :meth:`acall` (blocks the calling thread while queued)."""
+        attempt = 0
+        while True:
+            entry = self._reserve_blocking(model, tokens)
+            try:
+                result = fn()
+            except Exception as exc:
+                delay = self._on_error(model, exc, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                self._sleep(delay)
+                continue
+            self._settle(entry, result)
+            return result
+
+    async def _areserve(self, model: str, tokens: int) -> list:
+        wait, entry = self._try_reserve(model, tokens)
+        if entry is not None:
+            return entry
+        self._enter_queue(1)
+        queued = True
+        try:
+            while entry is None:
+                await self._asleep(wait, queued=queued)
+                queued = False
+                wait, entry = self._try_reserve(model, tokens)
+        finally:
+            self._enter_queue(-1)
+        return entry
+
+    def _reserve_blocking(self, model: str, tokens: int) -> list:
+        wait, entry = self._try_reserve(model, tokens)
+        if entry is not None:
+            return entry
+        self._enter_queue(1)
+        queued = True
+        try:
+            while entry is None:
+                self._sleep(wait, queued=queued)
+                queued = False
+                wait, entry = self._try_reserve(model, tokens)
+        finally:
+            self._enter_queue(-1)
+        return entry
+
+    async def _asleep(self, seconds: float, queued: bool = False) -> None:
+        self._waited(seconds, queued)
+        await asyncio.sleep(seconds)
+
+    def _sleep(self, seconds: float, queued: bool = False) -> None:
+        self._waited(seconds, queued)
+        time.sleep(seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            now = self._clock()
+            models = {
+                name: {"rpm": w.rpm, "tpm": w.tpm, **w.usage(now)} for name, w in self._windows.items()
+            }
+            return {
+                "requests": self.requests,
+                "queue_depth": self.queue_depth,
+                "queued_total": self.queued_total,
+                "throttle_sec_total": round(self.throttle_sec_total, 3),
+                "retries": self.retries,
+                "errors": dict(self.errors),
+                "failures_after_retries": self.failures,
+                "models": models,
+            }
+
+
+LLM_SCHEDULER = LlmScheduler(
+    rpm=settings.llm_rpm,
+    tpm=settings.llm_tpm,
+    model_rpm=_parse_model_caps(settings.llm_model_rpm),
+    model_tpm=_parse_model_caps(settings.llm_model_tpm),
+    max_retries=settings.llm_max_retries,
+    backoff_base=settings.llm_backoff_base_sec,
+    backoff_max=settings.llm_backoff_max_sec,
+)
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from .state import focus_fingerprint
+
+LANG_PATTERNS = [
+    (r"\bdeutsch(?:kenntnisse)?\s*(?:auf\s*)?(?:niveau\s*)?(c2)\b", "C2", 0.95),
+    (r"\bdeutsch(?:kenntnisse)?\s*(?:auf\s*)?(?:niveau\s*)?(c1)\b", "C1", 0.95),
+    (r"\bdeutsch(?:kenntnisse)?\s*(?:auf\s*)?(?:niveau\s*)?(b2)\b", "B2", 0.95),
+    (r"\bdeutsch(?:kenntnisse)?\s*(?:auf\s*)?(?:niveau\s*)?(b1)\b", "B1", 0.95),
+    (r"\bmuttersprache(?:lich(?:e|er|es)?)?\b.*\bdeutsch\b", "C2", 0.95),
+    (r"\bverhandlungssicher(?:e|er|es)?\b.*\bdeutsch\b", "C1", 0.9),
+    (r"\bflie(?:ss|ß)end(?:e|er|es)?\b.*\bdeutsch\b", "C1", 0.7),
+    (r"\bsehr\s+gute\s+deutschkenntnisse\b", "B2", 0.7),
+    (r"\b(gute|sichere)\s+deutschkenntnisse\b", "B2", 0.6),
+    (r"\bgrundkenntnisse\b.*\bdeutsch\b|\bbasiskenntnisse\b.*\bdeutsch\b", "A2", 0.5),
+    (r"\bdeutschkenntnisse\b.*\b(von vorteil|w(ü|u)nschenswert)\b", "B1", 0.35),
+    # --- English phrasing that implies German requirement ---
+    (r"\bfluent\s+in\s+(?:both\s+)?english\s+and\s+german\b", "C1", 0.92),
+    (r"\bfluent\s+in\s+german\b", "C1", 0.90),
+    (r"\bfluent\s+german\b", "C1", 0.85),
+    (r"\bnative\s+german\b", "C2", 0.95),
+    (r"\bbusiness\s+fluent\s+german\b", "C1", 0.90),
+    (r"\bfluent german\b", "C1", 0.8),
+    (r"\bproficient german\b", "B2", 0.7),
+    (r"\bgood german\b", "B2", 0.6),
+    (r"\bbasic german\b", "A2", 0.5),
+    (r"\b(in wort und schrift)\b", None, 0.2),
+]
+# Literals every match of the corresponding LANG_PATTERNS entry contains. A pattern
+# is only searched when all of them occur in the text; a miss costs a full regex scan.
+_LANG_PATTERN_LITERALS = (
+    ("deutsch", "c2"),
+    ("deutsch", "c1"),
+    ("deutsch", "b2"),
+    ("deutsch", "b1"),
+    ("muttersprache", "deutsch"),
+    ("verhandlungssicher", "deutsch"),
+    ("flie", "deutsch"),
+    ("sehr", "gute", "deutschkenntnisse"),
+    ("deutschkenntnisse",),
+    ("kenntnisse", "deutsch"),
+    ("deutschkenntnisse",),
+    ("fluent", "english", "german"),
+    ("fluent", "german"),
+    ("fluent", "german"),
+    ("native", "german"),
+    ("business", "fluent", "german"),
+    ("fluent german",),
+    ("proficient german",),
+    ("good german",),
+    ("basic german",),
+    ("in wort und schrift",),
+)
+_LANG_RES = [
+    (re.compile(p), level, conf, literals)
+    for (p, level, conf), literals in zip(LANG_PATTERNS, _LANG_PATTERN_LITERALS, strict=True)
+]
+
+GERMAN_HEAVY_CONTEXT = re.compile(r"\b(kunde|kundenkontakt|beratung|berater|consultant|vertrieb|stakeholder|workshop)\b", re.IGNORECASE)
+PUBLIC_SECTOR = re.compile(r"\b(behörde|amt|öffentliche(r|n)? dienst|verwaltung|klin(ik|ikum)|schule|schulen)\b", re.IGNORECASE)
+
+_GERMAN_CONTEXT_WORDS = frozenset({"kunde", "kundenkontakt", "beratung", "berater", "consultant", "vertrieb", "stakeholder", "workshop"})
+_GERMAN_STOPWORDS = frozenset({"und", "der", "die", "das", "nicht", "ist", "mit", "für", "den", "des", "auf", "zu", "vom", "nach"})
+_ENGLISH_STOPWORDS = frozenset({"the", "and", "with", "for", "not", "is", "are", "will", "from", "into", "of", "in"})
+_UMLAUTS = "äöüß"
+
+# Title seniority cues in priority order (first hit wins, regardless of position).
+_TITLE_SENIORITY = (
+    ("Working Student", re.compile(r"\b(werkstudent|working student)\b")),
+    ("Internship", re.compile(r"\btrainee\b")),
+    ("Internship", re.compile(r"\b(intern(ship)?)\b")),
+    ("Junior", re.compile(r"\bjunior\b")),
+    ("Senior", re.compile(r"\bsenior\b")),
+)
+_TITLE_SENIORITY_ANY = re.compile(r"werkstudent|working student|trainee|intern|junior|senior")
+
+_TOKEN_RE = re.compile(r"\w+")
+_MAX_MATCHERS = 32
+
+
+class TextScan:
+    """
+    Focus-independent view of one lowercased job text, built in a single pass:
+    word tokens (for keyword and phrase counts), posting language, German level
+    pattern hit and context flags. Use :func:`scan_text` to share it between
+    the scoring helpers.
+    """
+
+    __slots__ = (
+        "text", "words", "_separators", "_positions", "counts",
+        "post_language", "mentions_english", "customer_facing", "public_sector", "german_pattern",
+    )
+
+    def __init__(self, text_lower: str) -> None:
+        self.text = text_lower
+        words = _TOKEN_RE.findall(text_lower)
+        self.words = words
+        self._separators: Optional[List[str]] = None
+        self._positions: Optional[Dict[str, List[int]]] = None
+        self.counts = Counter(words)
+
+        german = sum(self.counts[w] for w in _GERMAN_STOPWORDS) + sum(text_lower.count(c) for c in _UMLAUTS)
+        english = sum(self.counts[w] for w in _ENGLISH_STOPWORDS)
+        if german == 0 and english == 0:
+            self.post_language = "Unknown"
+        elif german > english * 1.5:
+            self.post_language = "German"
+        elif english > german * 1.5:
+            self.post_language = "English"
+        else:
+            self.post_language = "Mixed"
+
+        self.mentions_english = bool(self.counts["english"] or self.counts["englisch"])
+        self.customer_facing = any(self.counts[w] for w in _GERMAN_CONTEXT_WORDS)
+        self.public_sector = bool(PUBLIC_SECTOR.search(text_lower))
+        self.german_pattern: Optional[Tuple[Optional[str], float, str]] = None
+        for rx, level, conf, literals in _LANG_RES:
+            if not all(lit in text_lower for lit in literals):
+                continue
+            m = rx.search(text_lower)
+            if m:
+                self.german_pattern = (level, conf, m.group(0))
+                break
+
+    def phrase_count(self, parts: Tuple[str, ...]) -> int:
+        """Non-overlapping occurrences of whitespace-separated word ``parts`` (like ``re.findall``)."""
+        if len(parts) == 1:
+            return self.counts[parts[0]]
+        if not self.counts[parts[0]]:
+            return 0
+        if self._separators is None:
+            # separators[i] is the text before words[i]
+            self._separators = _TOKEN_RE.split(self.text)
+            self._positions = {}
+        first = parts[0]
+        positions = self._positions.get(first)
+        if positions is None:
+            positions = self._positions[first] = [i for i, word in enumerate(self.words) if word == first]
+        words, seps, n = self.words, self._separators, len(parts)
+        count, next_free = 0, 0
+        for start in positions:
+            if start < next_free or start + n > len(words):
+                continue
+            if all(words[start + j] == parts[j] and seps[start + j].isspace() for j in range(1, n)):
+                count += 1
+                next_free = start + n
+        return count
+
+
+@lru_cache(maxsize=256)
+def scan_text(text_lower: str) -> TextScan:
+    """Cached :class:`TextScan`; scoring looks at the same text several times per job."""
+    return TextScan(text_lower)
+
+
+@dataclass
+class JobHits:
+    """Everything the heuristic components look up in one job, from one scan."""
+
+    scan: TextScan
+    exclude_title_hits: List[str] = field(default_factory=list)
+    location_hits: List[str] = field(default_factory=list)
+    must_have_counts: Dict[str, int] = field(default_factory=dict)
+    nice_to_have_counts: Dict[str, int] = field(default_factory=dict)
+    title_seniority: Optional[str] = None
+
+
+class _SubstringSet:
+    """Case-insensitive substring hits; one combined alternation rules out the usual no-hit case."""
+
+    def __init__(self, words: Any) -> None:
+        self.words = [(w, w.lower()) for w in words if w]
+        lowered = sorted({low for _, low in self.words}, key=len, reverse=True)
+        self._any = re.compile("|".join(re.escape(low) for low in lowered)) if lowered else None
+
+    def hits(self, text: str) -> List[str]:
+        if self._any is None:
+            return []
+        low = text.lower()
+        if not self._any.search(low):
+            return []
+        return [w for w, lw in self.words if lw in low]
+
+
+class _KeywordCounter:
+    """Whole-word keyword counts read off a :class:`TextScan`."""
+
+    def __init__(self, keywords: Any) -> None:
+        self.entries: List[Tuple[str, Tuple[str, ...], Optional[re.Pattern]]] = []
+        for k in keywords:
+            if not k:
+                continue
+            parts = tuple(k.lower().split())
+            if not parts:
+                continue
+            if all(_TOKEN_RE.fullmatch(part) for part in parts):
+                self.entries.append((k, parts, None))
+            else:
+                # punctuation inside the keyword (c++, ci/cd): keep the word-boundary regex
+                pattern = r"\b" + r"\s+".join(re.escape(part) for part in parts) + r"\b"
+                self.entries.append((k, parts, re.compile(pattern)))
+
+    def counts(self, scan: TextScan) -> Dict[str, int]:
+        out: Dict[str, int] = {}
+        for k, parts, rx in self.entries:
+            out[k] = len(rx.findall(scan.text)) if rx is not None else scan.phrase_count(parts)
+        return out
+
+
+class FocusMatcher:
+    """
+    Keyword, phrase and location lookups for one focus profile, compiled once.
+
+    Results match the original per-keyword regex / substring checks exactly
+    (tests/test_matcher.py); keyword order follows the profile's sets.
+    """
+
+    def __init__(self, focus) -> None:
+        self.exclude_titles = _SubstringSet(getattr(focus, "exclude_titles_any", ()) or ())
+        self.locations = _SubstringSet(getattr(focus, "locations_any", ()) or ())
+        self.must_have = _KeywordCounter(getattr(focus, "include_skills_any", ()) or ())
+        self.nice_to_have = _KeywordCounter(getattr(focus, "nice_to_have", ()) or ())
+
+    def location_hits(self, title: str, location: str) -> List[str]:
+        return self.locations.hits(f"{title} {location}")
+
+    def match(self, title: str, text_lower: str, location: str) -> JobHits:
+        scan = scan_text(text_lower)
+        return JobHits(
+            scan=scan,
+            exclude_title_hits=self.exclude_titles.hits(title),
+            location_hits=self.location_hits(title, location),
+            must_have_counts=self.must_have.counts(scan),
+            nice_to_have_counts=self.nice_to_have.counts(scan),
+            title_seniority=title_seniority(title),
+        )
+
+
+def title_seniority(title: str) -> Optional[str]:
+    low = title.lower()
+    if not _TITLE_SENIORITY_ANY.search(low):
+        return None
+    for level, rx in _TITLE_SENIORITY:
+        if rx.search(low):
+            return level
+    return None
+
+
+_MATCHERS: Dict[str, FocusMatcher] = {}
+_MATCHERS_BY_ID: Dict[int, Tuple[Any, FocusMatcher]] = {}
+_MATCHERS_LOCK = threading.Lock()
+
+
+def matcher_for(focus) -> FocusMatcher:
+    """The compiled matcher for ``focus``, cached by its fingerprint."""
+    entry = _MATCHERS_BY_ID.get(id(focus))
+    if entry is not None and entry[0] is focus:
+        return entry[1]
+    key = focus_fingerprint(focus) or ""
+    with _MATCHERS_LOCK:
+        matcher = _MATCHERS.get(key)
+        if matcher is None:
+            if len(_MATCHERS) >= _MAX_MATCHERS:
+                _MATCHERS.clear()
+            matcher = _MATCHERS[key] = FocusMatcher(focus)
+        if len(_MATCHERS_BY_ID) >= _MAX_MATCHERS:
+            _MATCHERS_BY_ID.clear()
+        # holding the focus keeps its id from being reused while cached
+        _MATCHERS_BY_ID[id(focus)] = (focus, matcher)
+    return matcher
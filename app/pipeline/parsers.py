@@ -19,6 +19,38 @@ def _as_text(html_str: Optional[str]) -> Optional[str]:
     text = soup.get_text(" ", strip=True)
     return re.sub(r"\s+", " ", text).strip() if text else None
 
+# Fast path: StepStone detail pages are 500KB+ but all we need is the JSON-LD
+# script, so find it with a regex instead of building a DOM.
+_LD_JSON_RE = re.compile(
+    r"<script\b[^>]*\btype\s*=\s*[\"']?application/ld\+json[\"']?[^>]*>(.*?)</script\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+_DROP_BLOCKS_RE = re.compile(r"<!--.*?-->|<(script|style|template)\b[^>]*>.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r"</?[A-Za-z][^>]*>|<![^>]*>")
+_WS_RE = re.compile(r"\s+")
+
+def _html_to_text(html_str: Optional[str]) -> Optional[str]:
+    """Lightweight equivalent of _as_text for description snippets (no DOM)."""
+    if not html_str:
+        return None
+    text = _DROP_BLOCKS_RE.sub(" ", html_str)
+    text = _TAG_RE.sub(" ", text)
+    text = _WS_RE.sub(" ", unescape(text)).strip()
+    return text or None
+
+def _extract_ld_blocks_fast(html: str) -> List[Any]:
+    ld_blocks: List[Any] = []
+    for match in _LD_JSON_RE.finditer(html or ""):
+        raw = match.group(1)
+        if not raw:
+            continue
+        try:
+            # Some sites HTML-escape the JSON
+            ld_blocks.append(json.loads(unescape(raw).strip()))
+        except Exception:
+            continue
+    return ld_blocks
+
 def _normalize_location(job_json: Dict[str, Any]) -> Optional[str]:
     loc = job_json.get("jobLocation")
     if isinstance(loc, list) and loc:
@@ -74,29 +106,8 @@ def _pick_jobposting(ld_blocks: List[Any]) -> Optional[Dict[str, Any]]:
                     return node
     return None
 
-def extract_jobposting_from_html(html: str) -> Dict[str, Any]:
-    """
-    Parse <script type='application/ld+json'>, find a JobPosting object,
-    and map to a unified schema. If missing, return minimal Unknown fields.
-    """
-    soup = BeautifulSoup(html, "lxml")
-    scripts = soup.find_all("script", attrs={"type": "application/ld+json"})
-    ld_blocks: List[Any] = []
-    for s in scripts:
-        try:
-            # Some sites HTML-escape the JSON
-            raw = s.string or s.text
-            if not raw:
-                continue
-            raw = unescape(raw).strip()
-            data = json.loads(raw)
-            ld_blocks.append(data)
-        except Exception:
-            continue
-
-    jp = _pick_jobposting(ld_blocks) or {}
-
-    title = _first_not_none(jp.get("title"), soup.find("h1").get_text(strip=True) if soup.find("h1") else None)
+def _map_jobposting(jp: Dict[str, Any], *, title_fallback: Optional[str], as_text) -> Dict[str, Any]:
+    title = _first_not_none(jp.get("title"), title_fallback)
     org = jp.get("hiringOrganization") or {}
     if isinstance(org, dict):
         company = _first_not_none(org.get("name"), org.get("legalName"))
@@ -104,7 +115,7 @@ def extract_jobposting_from_html(html: str) -> Dict[str, Any]:
         company = None
 
     desc_html = jp.get("description")
-    description_text = _as_text(desc_html)
+    description_text = as_text(desc_html)
     location = _normalize_location(jp)
     emp_type = _first_not_none(jp.get("employmentType"))
     date_posted = _first_not_none(jp.get("datePosted"), jp.get("datePublished"))
@@ -132,3 +143,34 @@ def extract_jobposting_from_html(html: str) -> Dict[str, Any]:
         "description_html": desc_html or None,
         "description_text": description_text or None,
     }
+
+def _extract_jobposting_soup(html: str) -> Dict[str, Any]:
+    """Full-DOM path; used when the fast path finds no titled JobPosting."""
+    soup = BeautifulSoup(html, "lxml")
+    scripts = soup.find_all("script", attrs={"type": "application/ld+json"})
+    ld_blocks: List[Any] = []
+    for s in scripts:
+        try:
+            # Some sites HTML-escape the JSON
+            raw = s.string or s.text
+            if not raw:
+                continue
+            raw = unescape(raw).strip()
+            data = json.loads(raw)
+            ld_blocks.append(data)
+        except Exception:
+            continue
+
+    jp = _pick_jobposting(ld_blocks) or {}
+    h1 = soup.find("h1")
+    return _map_jobposting(jp, title_fallback=h1.get_text(strip=True) if h1 else None, as_text=_as_text)
+
+def extract_jobposting_from_html(html: str) -> Dict[str, Any]:
+    """
+    Parse <script type='application/ld+json'>, find a JobPosting object,
+    and map to a unified schema. If missing, return minimal Unknown fields.
+    """
+    jp = _pick_jobposting(_extract_ld_blocks_fast(html))
+    if jp and _first_not_none(jp.get("title")):
+        return _map_jobposting(jp, title_fallback=None, as_text=_html_to_text)
+    return _extract_jobposting_soup(html)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import hashlib
+import time
 from datetime import datetime
 import os
 from pathlib import Path
@@ -7,24 +9,162 @@ from typing import Any, Dict, Optional
 
 from loguru import logger
 
+from ..fetching.html_archive import get_html_archive
 from ..fetching.polite_fetch import (
+    REPLAY_BACKEND,
     FetchError,
     RobotsDisallowedError,
     AccessDeniedError as FetchAccessDeniedError,
     fetch_job_html,
 )
+from app.common.singleflight import SingleFlight
+from app.common.utils import normalize_url
 from app.config.settings import settings
 from app.config.focus import FocusConfig, DEFAULT_FOCUS
 from .output import write_bundle
-from .state import cache_get, cache_put
-from .llm_enrich import enrich_jobposting
+from .state import (
+    CACHE_LAYERS,
+    LAYER_ENRICH,
+    LAYER_FETCH,
+    LAYER_PARSE,
+    LAYER_SCORE,
+    content_hash,
+    focus_fingerprint,
+    layer_get,
+    layer_key,
+    layer_put,
+    scoring_versions,
+)
+from .executors import get_cpu_executor
+from .llm_enrich import LLM_SCORING_VERSION, aenrich_and_score_jobposting, aenrich_jobposting, enrichment_fingerprint
 from .models import UnifiedJobPosting
 from .parsers import extract_jobposting_from_html
-from .scoring import score_job
+from . import scoring as scoring_mod
+from .scoring import HEURISTIC_SCORING_VERSION, SCORING_VERSION, finish_score_job, llm_gate_reason, prepare_score_job, score_job
 from .templating import generate_bundle
 
 CachePayload = Dict[str, Any]
 
+FETCH_FLIGHT = SingleFlight("fetch")
+ENRICH_FLIGHT = SingleFlight("enrich")
+
+
+def _enrich_flight_key(core: Dict[str, Any], focus: FocusConfig) -> str:
+    """Enrichment depends on the parsed posting content and the prompt-relevant focus fields."""
+    return f"{content_hash(core)}|{enrichment_fingerprint(focus)}"
+
+
+def _score_layer_key(
+    job: Dict[str, Any],
+    focus: FocusConfig,
+    llm_scoring: bool,
+    apply_blocker_cap: Optional[bool],
+    llm_part: Optional[Dict[str, Any]],
+) -> str:
+    """Scoring depends on the (enriched) job, the whole focus profile, the scoring versions and flags."""
+    do_cap = settings.apply_blocker_cap if apply_blocker_cap is None else bool(apply_blocker_cap)
+    parts = [
+        content_hash(job),
+        focus_fingerprint(focus),
+        HEURISTIC_SCORING_VERSION,
+        SCORING_VERSION,
+        f"cap:{do_cap}",
+        f"lang_override:{settings.llm_language_override}",
+    ]
+    if llm_scoring or llm_part is not None:
+        parts += [
+            LLM_SCORING_VERSION,
+            settings.openai_model_scoring,
+            f"gate:{settings.llm_gate_enabled}:{settings.llm_gate_min_score}:{settings.llm_gate_max_score}:{settings.llm_gate_skip_hard_blockers}",
+            content_hash(llm_part) if llm_part is not None else "llm:call",
+        ]
+    return layer_key(LAYER_SCORE, *parts)
+
+
+def _cached_fetch(url: str) -> Optional[tuple[str, Dict[str, Any]]]:
+    entry = layer_get(LAYER_FETCH, layer_key(LAYER_FETCH, normalize_url(url)))
+    if not entry:
+        return None
+    html = entry.get("html")
+    if html is None and entry.get("html_sha256"):
+        archive = get_html_archive()
+        html = archive.read_blob(entry["html_sha256"]) if archive is not None else None
+    if html is None:
+        return None
+    return html, dict(entry.get("fetch_meta") or {})
+
+
+def _store_fetch(url: str, html: str, html_sha: str, fetch_meta: Dict[str, Any]) -> None:
+    # Archived pages are referenced by sha instead of being stored twice.
+    archived = fetch_meta.get("archive_sha256") == html_sha
+    layer_put(
+        LAYER_FETCH,
+        layer_key(LAYER_FETCH, normalize_url(url)),
+        {"fetch_meta": dict(fetch_meta), "html_sha256": html_sha, "html": None if archived else html},
+        url=url,
+    )
+
+
+def _score_stage(
+    job: Dict[str, Any],
+    focus: FocusConfig,
+    use_llm_scoring: Optional[bool],
+    apply_blocker_cap: Optional[bool],
+    llm_part: Optional[Dict[str, Any]] = None,
+) -> tuple[Dict[str, Any], Dict[str, Any]]:
+    """score_job annotates the job in place; return it so the changes survive a process hop."""
+    scoring = score_job(
+        job,
+        focus=focus,
+        use_llm_scoring=use_llm_scoring,
+        apply_blocker_cap=apply_blocker_cap,
+        llm_part=llm_part,
+    )
+    return scoring, job
+
+
+def _score_prepare_stage(
+    job: Dict[str, Any],
+    focus: FocusConfig,
+    apply_blocker_cap: Optional[bool],
+) -> tuple:
+    """Heuristic half of LLM scoring; returns the job too so its annotations survive a process hop."""
+    hp, do_llm, do_cap, skip_reason = prepare_score_job(job, focus, True, apply_blocker_cap)
+    return hp, do_llm, do_cap, skip_reason, job
+
+
+def _score_finish_stage(
+    job: Dict[str, Any],
+    focus: FocusConfig,
+    hp,
+    llm_part: Optional[Dict[str, Any]],
+    do_llm: bool,
+    do_cap: bool,
+    skip_reason: Optional[str],
+) -> tuple[Dict[str, Any], Dict[str, Any]]:
+    scoring = finish_score_job(job, focus, hp, llm_part, do_llm, do_cap, skip_reason)
+    return scoring, job
+
+
+async def _parse_core(cpu, html: str, url: str, stage_timings: Dict[str, Any]) -> Dict[str, Any]:
+    base, stage_timings["parse"] = await cpu.run("parse", extract_jobposting_from_html, html)
+    base.setdefault("url", url)
+    return UnifiedJobPosting(
+        **{
+            "title": base.get("title") or "Unknown",
+            "company": base.get("company") or "Unknown",
+            "location": base.get("location") or "Unknown",
+            "employment_type": base.get("employment_type"),
+            "date_posted": base.get("date_posted"),
+            "valid_through": base.get("valid_through"),
+            "url": base.get("url"),
+            "job_id": base.get("job_id"),
+            "salary": base.get("salary"),
+            "description_html": base.get("description_html"),
+            "description_text": base.get("description_text"),
+        }
+    ).model_dump(mode="json")
+
 
 def _parse_iso8601(ts: Optional[str]) -> Optional[datetime]:
     if not ts:
@@ -49,75 +189,105 @@ async def fetch_job_details(
     focus: Optional[FocusConfig] = None,
     use_llm_scoring: Optional[bool] = None,
     apply_blocker_cap: Optional[bool] = None,
+    combined_llm: Optional[bool] = None,
 ) -> Dict[str, Any]:
     """
     Fetch a StepStone job posting, optionally enrich and score it, and compute
     whether it is stale compared to an ISO8601 cutoff timestamp.
     Mirrors the behaviour of the FastAPI /job_details endpoint so orchestration
     layers (Prefect, HTTP) stay consistent.
+    With enrichment and LLM scoring both on, ``combined_llm`` (default:
+    settings.llm_combined_mode) makes one LLM call serve both.
     """
-    cache_enabled = use_cache and settings.cache_enabled and (settings.cache_per_profile or focus is None)
-    # Optional cache short-circuit
-    if cache_enabled:
+    # Replays from the HTML archive are regression/benchmark runs of the
+    # non-network stages, so never short-circuit them through the cache.
+    replay = backend == REPLAY_BACKEND
+    use_layers = use_cache and not replay and settings.cache_enabled
+    layer_hits = {layer: False for layer in CACHE_LAYERS}
+
+    cached_fetch = _cached_fetch(url) if use_layers else None
+    if cached_fetch is not None:
+        html, fetch_meta = cached_fetch
+        layer_hits[LAYER_FETCH] = True
+    else:
         try:
-            cached = cache_get(url, focus=focus)
-            if cached:
-                cutoff_dt = _parse_iso8601(cutoff_iso)
-                posted_dt = _parse_iso8601((cached.get("job") or {}).get("date_posted"))
-                stale = bool(cutoff_dt and posted_dt and posted_dt < cutoff_dt)
-
-                cached["cutoff_iso"] = cutoff_iso
-                cached["stale"] = stale
-                cached_job = cached.get("job")
-                if isinstance(cached_job, dict):
-                    if stale:
-                        cached_job["stale"] = True
-                    else:
-                        cached_job.pop("stale", None)
-                return cached
-        except Exception:
-            logger.warning("cache_get failed; continuing without cache", exc_info=True)
+            # Concurrent callers (API requests, profiles in a batch) asking for the
+            # same page share one fetch.
+            (html, fetch_meta), fetch_shared = await FETCH_FLIGHT.do(
+                (normalize_url(url), backend or "auto"),
+                lambda: fetch_job_html(url, preferred_backend=backend),
+            )
+            fetch_meta["coalesced"] = fetch_shared
+            fetch_meta["coalesced_total"] = FETCH_FLIGHT.coalesced
+            logger.info(
+                "job_details fetch success url={} backend={} attempts={}",
+                url,
+                fetch_meta.get("backend"),
+                fetch_meta.get("attempts"),
+            )
+        except RobotsDisallowedError:
+            raise
+        except FetchAccessDeniedError:
+            raise
+        except FetchError:
+            raise
+    html_sha = hashlib.sha256(html.encode("utf-8")).hexdigest()
+    if use_layers and cached_fetch is None:
+        _store_fetch(url, html, html_sha, fetch_meta)
 
-    try:
-        html, fetch_meta = await fetch_job_html(url, preferred_backend=backend)
-        logger.info(
-            "job_details fetch success url={} backend={} attempts={}",
-            url,
-            fetch_meta.get("backend"),
-            fetch_meta.get("attempts"),
-        )
-    except RobotsDisallowedError:
-        raise
-    except FetchAccessDeniedError:
-        raise
-    except FetchError:
-        raise
-
-    base = extract_jobposting_from_html(html)
-    base.setdefault("url", url)
-
-    core = UnifiedJobPosting(
-        **{
-            "title": base.get("title") or "Unknown",
-            "company": base.get("company") or "Unknown",
-            "location": base.get("location") or "Unknown",
-            "employment_type": base.get("employment_type"),
-            "date_posted": base.get("date_posted"),
-            "valid_through": base.get("valid_through"),
-            "url": base.get("url"),
-            "job_id": base.get("job_id"),
-            "salary": base.get("salary"),
-            "description_html": base.get("description_html"),
-            "description_text": base.get("description_text"),
-        }
-    ).model_dump(mode="json")
+    # Parsing and heuristic scoring are CPU-bound; keep them off the event loop.
+    cpu = get_cpu_executor()
+    stage_timings: Dict[str, Any] = {}
+    fetch_meta["stage_timings"] = stage_timings
+    parse_key = layer_key(LAYER_PARSE, html_sha, url)
+    core = layer_get(LAYER_PARSE, parse_key) if use_layers else None
+    if core is not None:
+        layer_hits[LAYER_PARSE] = True
+    else:
+        core = await _parse_core(cpu, html, url, stage_timings)
+        if use_layers:
+            layer_put(LAYER_PARSE, parse_key, core, url=url)
 
     enrichment_meta = None
+    llm_part: Optional[Dict[str, Any]] = None
     active_focus = focus or DEFAULT_FOCUS
     final_job: Dict[str, Any] = core
-    if enrich:
+    llm_scoring = score and (settings.use_llm_scoring if use_llm_scoring is None else bool(use_llm_scoring))
+    combined = enrich and llm_scoring and (settings.llm_combined_mode if combined_llm is None else bool(combined_llm))
+    if combined and llm_gate_reason(core, active_focus, apply_blocker_cap):
+        # Gated out before enrichment: enrich only and let score_job re-check the gate on the enriched job.
+        combined = False
+    enrich_key = None
+    if enrich and use_layers:
+        enrich_key = layer_key(
+            LAYER_ENRICH,
+            content_hash(core),
+            enrichment_fingerprint(active_focus),
+            "combined" if combined else "enrich",
+        )
+        cached_enrich = layer_get(LAYER_ENRICH, enrich_key)
+        if cached_enrich is not None:
+            final_job = cached_enrich["job"]
+            enrichment_meta = cached_enrich.get("enrichment_meta")
+            llm_part = cached_enrich.get("llm_part")
+            layer_hits[LAYER_ENRICH] = True
+    # LLM calls go through the async client (bounded by llm_limits) so they
+    # never block the event loop.
+    if enrich and not layer_hits[LAYER_ENRICH]:
         try:
-            final_job, enrichment_meta = enrich_jobposting(core, focus=active_focus)
+            if combined:
+                (final_job, enrichment_meta, llm_part), enrich_shared = await ENRICH_FLIGHT.do(
+                    _enrich_flight_key(core, active_focus) + "|combined",
+                    lambda: aenrich_and_score_jobposting(core, focus=active_focus),
+                )
+            else:
+                (final_job, enrichment_meta), enrich_shared = await ENRICH_FLIGHT.do(
+                    _enrich_flight_key(core, active_focus),
+                    lambda: aenrich_jobposting(core, focus=active_focus),
+                )
+            if isinstance(enrichment_meta, dict):
+                enrichment_meta["coalesced"] = enrich_shared
+                enrichment_meta["coalesced_total"] = ENRICH_FLIGHT.coalesced
         except Exception as exc:
             enrichment_meta = {
                 "ok": False,
@@ -126,12 +296,78 @@ async def fetch_job_details(
                 "error_message": f"Unexpected error in enrichment wrapper: {exc}",
             }
             logger.exception("Unexpected error in enrichment wrapper")
-    scoring = score_job(
-        final_job,
-        focus=active_focus,
-        use_llm_scoring=use_llm_scoring,
-        apply_blocker_cap=apply_blocker_cap,
-    ) if score else None
+        enrich_ok = isinstance(enrichment_meta, dict) and enrichment_meta.get("ok")
+        if enrich_key and enrich_ok and (llm_part is None or llm_part.get("llm_ok")):
+            layer_put(
+                LAYER_ENRICH,
+                enrich_key,
+                {"job": final_job, "enrichment_meta": enrichment_meta, "llm_part": llm_part},
+                url=url,
+            )
+    scoring = None
+    score_key = None
+    if score and use_layers:
+        score_key = _score_layer_key(final_job, active_focus, llm_scoring, apply_blocker_cap, llm_part)
+        cached_score = layer_get(LAYER_SCORE, score_key)
+        if cached_score is not None:
+            scoring, final_job = cached_score["scoring"], cached_score["job"]
+            layer_hits[LAYER_SCORE] = True
+    if score and not layer_hits[LAYER_SCORE]:
+        if llm_part is not None:
+            # LLM part came with the combined enrichment call; only the blend is left.
+            (scoring, final_job), stage_timings["score"] = await cpu.run(
+                "score",
+                _score_stage,
+                final_job,
+                active_focus,
+                True,
+                apply_blocker_cap,
+                llm_part,
+            )
+        elif llm_scoring:
+            # Heuristic pass and blend run on the CPU executor; only the network-bound
+            # LLM call is awaited on the loop, and it is timed separately.
+            (hp, do_llm, do_cap, skip_reason, final_job), stage_timings["score"] = await cpu.run(
+                "score",
+                _score_prepare_stage,
+                final_job,
+                active_focus,
+                apply_blocker_cap,
+            )
+            scored_part = None
+            if do_llm and skip_reason is None:
+                started = time.perf_counter()
+                scored_part = await scoring_mod.allm_score_job(final_job, active_focus, hp.llm_payload())
+                stage_timings["llm_score"] = {"mode": "async", "exec_ms": round((time.perf_counter() - started) * 1000, 2)}
+            (scoring, final_job), stage_timings["score_blend"] = await cpu.run(
+                "score_blend",
+                _score_finish_stage,
+                final_job,
+                active_focus,
+                hp,
+                scored_part,
+                do_llm,
+                do_cap,
+                skip_reason,
+            )
+        else:
+            (scoring, final_job), stage_timings["score"] = await cpu.run(
+                "score",
+                _score_stage,
+                final_job,
+                active_focus,
+                use_llm_scoring,
+                apply_blocker_cap,
+            )
+        llm_settled = not scoring.get("llm_enabled") or scoring.get("llm_skipped_reason") or scoring.get("llm_ok")
+        if score_key and llm_settled:
+            layer_put(
+                LAYER_SCORE,
+                score_key,
+                {"scoring": scoring, "job": final_job},
+                url=url,
+                scoring_versions=scoring_versions(scoring),
+            )
 
     if scoring:
         final_job = {**final_job, "junior_fit_score": scoring["score"]}
@@ -145,6 +381,7 @@ async def fetch_job_details(
         "cutoff_iso": cutoff_iso,
         "enrichment_meta": enrichment_meta,
         "stale": False,
+        "cache_layers": layer_hits,
     }
 
     cutoff_dt = _parse_iso8601(cutoff_iso)
@@ -154,12 +391,6 @@ async def fetch_job_details(
     if stale:
         result["job"]["stale"] = True
 
-    if cache_enabled:
-        try:
-            cache_put(url, result, focus=focus)
-        except Exception:
-            logger.warning("cache_put failed; continuing without cache", exc_info=True)
-
     return result
 
 
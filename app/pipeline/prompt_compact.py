@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Tuple
+
+from loguru import logger
+
+try:  # optional: exact counts for OpenAI models
+    import tiktoken
+except ImportError:  # pragma: no cover - depends on the environment
+    tiktoken = None
+
+# Section headers as they appear in flattened StepStone descriptions.
+# Requirement/task sections are never dropped and are filled first under a budget.
+_KEEP_HEADERS = (
+    r"(?:ihre|deine|eure)\s+aufgaben",
+    r"aufgabengebiet",
+    r"(?:ihr|dein)\s+profil",
+    r"anforderungen",
+    r"qualifikation(?:en)?",
+    r"was\s+(?:du|sie)\s+mitbring(?:st|en)",
+    r"das\s+bring(?:st\s+du|en\s+sie)\s+mit",
+    r"your\s+(?:tasks|profile|responsibilities)",
+    r"responsibilities",
+    r"requirements",
+    r"qualifications",
+    r"what\s+you(?:'ll|\s+will)?\s+(?:bring|do)",
+)
+_DROP_HEADERS = (
+    r"(?:was\s+)?wir\s+bieten",
+    r"das\s+bieten\s+wir(?:\s+(?:dir|ihnen))?",
+    r"unser\s+angebot",
+    r"(?:ihre|deine)\s+vorteile",
+    r"benefits",
+    r"what\s+we\s+offer",
+    r"über\s+uns",
+    r"about\s+us",
+    r"wer\s+wir\s+sind",
+    r"who\s+we\s+are",
+    r"(?:ihr|dein)\s+kontakt",
+    r"ansprechpartner(?:in)?",
+    r"kontakt:",
+    r"haben\s+wir\s+(?:ihr|dein)\s+interesse\s+geweckt",
+    r"interesse\s+geweckt\??",
+    r"so\s+bewirbst\s+du\s+dich",
+    r"jetzt\s+bewerben",
+)
+_HEADER_RE = re.compile(
+    "|".join(
+        [f"(?P<keep{i}>\\b{p}(?!\\w):?)" for i, p in enumerate(_KEEP_HEADERS)]
+        + [f"(?P<drop{i}>\\b{p}(?!\\w):?)" for i, p in enumerate(_DROP_HEADERS)]
+    ),
+    re.IGNORECASE,
+)
+# Legal footer / EEO / privacy sentences, dropped wherever they occur.
+_LEGAL_RE = re.compile(
+    r"datenschutz|privacy\s+policy|impressum|schwerbehindert|gleichgestellt|chancengleichheit"
+    r"|unabhängig\s+von\s+(?:geschlecht|alter|herkunft)|regardless\s+of\s+(?:gender|age|race|origin)"
+    r"|equal\s+opportunit|all\s+rights\s+reserved|stepstone\s+gmbh",
+    re.IGNORECASE,
+)
+# Sentences that carry hard requirements are kept even inside boilerplate sections.
+_SIGNAL_RE = re.compile(
+    r"deutsch|german|englisch|english|sprach|language|\b[abc][12]\b|muttersprach|fließend|fluent"
+    r"|erfahrung|experience|relocat|umzug|visa|visum|studierend|student|immatrikul",
+    re.IGNORECASE,
+)
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?;])\s+|\s+(?=[•▪●·]\s)")
+_NORM_RE = re.compile(r"\W+")
+
+_ENCODER: Any = None
+_ENCODER_LOCK = threading.Lock()
+
+
+def _encoder() -> Any:
+    global _ENCODER
+    if _ENCODER is None and tiktoken is not None:
+        with _ENCODER_LOCK:
+            if _ENCODER is None:
+                try:
+                    _ENCODER = tiktoken.get_encoding("o200k_base")
+                except Exception as exc:  # encoding files unavailable offline
+                    logger.debug("tiktoken encoding unavailable ({}); estimating tokens from length", exc)
+                    _ENCODER = False
+    return _ENCODER or None
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """Token count via tiktoken when installed, else the ~4 chars/token rule of thumb."""
+    if not text:
+        return 0
+    enc = _encoder()
+    if enc is not None:
+        return len(enc.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+@dataclass
+class _Section:
+    header: str
+    body: str
+    keep: bool
+
+    @property
+    def requirement(self) -> bool:
+        """A named requirement/task section (the untitled intro is kept but not prioritised)."""
+        return self.keep and bool(self.header)
+
+
+@dataclass
+class CompactResult:
+    text: str
+    tokens_in: int
+    tokens_out: int
+    dropped_sections: List[str] = field(default_factory=list)
+    truncated: bool = False
+
+
+def _split_sections(text: str) -> List[_Section]:
+    sections: List[_Section] = []
+    last_end = 0
+    header, keep = "", True
+    for m in _HEADER_RE.finditer(text):
+        body = text[last_end:m.start()].strip()
+        if body or header:
+            sections.append(_Section(header, body, keep))
+        header = m.group(0).strip()
+        keep = any(name.startswith("keep") for name, val in m.groupdict().items() if val)
+        last_end = m.end()
+    sections.append(_Section(header, text[last_end:].strip(), keep))
+    return [s for s in sections if s.header or s.body]
+
+
+def _sentences(text: str) -> List[str]:
+    return [s.strip() for s in _SENTENCE_SPLIT_RE.split(text) if s and s.strip()]
+
+
+def _clean_section(section: _Section, seen: set) -> str:
+    """Drop legal/duplicate sentences; boilerplate sections keep only requirement signals."""
+    kept: List[str] = []
+    for sentence in _sentences(section.body):
+        norm = _NORM_RE.sub(" ", sentence.lower()).strip()
+        if len(norm) > 20 and norm in seen:
+            continue
+        signal = bool(_SIGNAL_RE.search(sentence))
+        if (_LEGAL_RE.search(sentence) and not signal) or (not section.keep and not signal):
+            continue
+        # Only kept sentences count as seen, so a dropped copy can't suppress a later kept one.
+        seen.add(norm)
+        kept.append(sentence)
+    return " ".join(kept)
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    if max_tokens <= 0:
+        return ""
+    tokens = estimate_tokens(text)
+    if tokens <= max_tokens:
+        return text
+    cut = max(1, int(len(text) * max_tokens / tokens))
+    while cut > 0 and estimate_tokens(text[:cut]) > max_tokens:
+        cut = int(cut * 0.9)
+    head = text[:cut]
+    space = head.rfind(" ")
+    return (head[:space] if space > cut * 0.8 else head).rstrip() + " …"
+
+
+def compact_description(text: Optional[str], max_tokens: int) -> CompactResult:
+    """
+    Shrink a job description for an LLM prompt: drop benefits / company /
+    contact sections and legal footer sentences, remove repeated sentences,
+    then fit ``max_tokens``. Requirement and task sections are filled first and
+    sentences mentioning languages, experience or student status survive even
+    inside dropped sections; other text is truncated in document order.
+    """
+    text = (text or "").strip()
+    tokens_in = estimate_tokens(text)
+    if not text:
+        return CompactResult("", 0, 0)
+
+    seen: set = set()
+    parts: List[Tuple[_Section, str]] = []
+    dropped: List[str] = []
+    for section in _split_sections(text):
+        body = _clean_section(section, seen)
+        if not section.keep and not body:
+            dropped.append(section.header)
+            continue
+        header = section.header if section.keep or body else ""
+        parts.append((section, f"{header} {body}".strip()))
+
+    # Budget: requirement/task sections first, then everything else in order.
+    budget = max(0, int(max_tokens))
+    fitted: List[str] = [""] * len(parts)
+    truncated = False
+    for first_pass in (True, False):
+        for idx, (section, chunk) in enumerate(parts):
+            if section.requirement != first_pass or not chunk:
+                continue
+            cost = estimate_tokens(chunk)
+            if cost <= budget:
+                fitted[idx] = chunk
+                budget -= cost
+            else:
+                fitted[idx] = _truncate(chunk, budget)
+                budget -= estimate_tokens(fitted[idx])
+                truncated = True
+    out = " ".join(chunk for chunk in fitted if chunk)
+    return CompactResult(out, tokens_in, estimate_tokens(out), dropped, truncated)
+
+
+def log_compaction(kind: str, job: dict, result: CompactResult, prompt_tokens: int) -> None:
+    logger.info(
+        "Prompt compaction [{}] {}: description {} -> {} tokens, prompt ~{} tokens{}{}",
+        kind,
+        job.get("url") or job.get("title"),
+        result.tokens_in,
+        result.tokens_out,
+        prompt_tokens,
+        f", dropped {result.dropped_sections}" if result.dropped_sections else "",
+        " (truncated)" if result.truncated else "",
+    )
@@ -5,7 +5,13 @@ from typing import Dict, List, Tuple, Any, Optional
 
 from app.config.focus import DEFAULT_FOCUS
 from app.config.settings import settings
-from .llm_enrich import llm_score_job, LLM_SCORING_VERSION
+from .llm_enrich import allm_score_job, llm_score_job, LLM_SCORING_VERSION
+from .matcher import GERMAN_HEAVY_CONTEXT, LANG_PATTERNS, PUBLIC_SECTOR, JobHits, matcher_for, scan_text, title_seniority
+
+# llm_skipped_reason values when the LLM gate skips the scoring call
+LLM_SKIP_BELOW_BAND = "heuristic_below_band"
+LLM_SKIP_ABOVE_BAND = "heuristic_above_band"
+LLM_SKIP_HARD_BLOCKERS = "hard_blockers"
 
 
 @dataclass
@@ -60,34 +66,6 @@ _LANG_PENALTY = {
 
 FALLBACK_VAGUE_PENALTY = -8
 
-LANG_PATTERNS = [
-    (r"\bdeutsch(?:kenntnisse)?\s*(?:auf\s*)?(?:niveau\s*)?(c2)\b", "C2", 0.95),
-    (r"\bdeutsch(?:kenntnisse)?\s*(?:auf\s*)?(?:niveau\s*)?(c1)\b", "C1", 0.95),
-    (r"\bdeutsch(?:kenntnisse)?\s*(?:auf\s*)?(?:niveau\s*)?(b2)\b", "B2", 0.95),
-    (r"\bdeutsch(?:kenntnisse)?\s*(?:auf\s*)?(?:niveau\s*)?(b1)\b", "B1", 0.95),
-    (r"\bmuttersprache(?:lich(?:e|er|es)?)?\b.*\bdeutsch\b", "C2", 0.95),
-    (r"\bverhandlungssicher(?:e|er|es)?\b.*\bdeutsch\b", "C1", 0.9),
-    (r"\bflie(?:ss|ß)end(?:e|er|es)?\b.*\bdeutsch\b", "C1", 0.7),
-    (r"\bsehr\s+gute\s+deutschkenntnisse\b", "B2", 0.7),
-    (r"\b(gute|sichere)\s+deutschkenntnisse\b", "B2", 0.6),
-    (r"\bgrundkenntnisse\b.*\bdeutsch\b|\bbasiskenntnisse\b.*\bdeutsch\b", "A2", 0.5),
-    (r"\bdeutschkenntnisse\b.*\b(von vorteil|w(ü|u)nschenswert)\b", "B1", 0.35),
-    # --- English phrasing that implies German requirement ---
-    (r"\bfluent\s+in\s+(?:both\s+)?english\s+and\s+german\b", "C1", 0.92),
-    (r"\bfluent\s+in\s+german\b", "C1", 0.90),
-    (r"\bfluent\s+german\b", "C1", 0.85),
-    (r"\bnative\s+german\b", "C2", 0.95),
-    (r"\bbusiness\s+fluent\s+german\b", "C1", 0.90),
-    (r"\bfluent german\b", "C1", 0.8),
-    (r"\bproficient german\b", "B2", 0.7),
-    (r"\bgood german\b", "B2", 0.6),
-    (r"\bbasic german\b", "A2", 0.5),
-    (r"\b(in wort und schrift)\b", None, 0.2),
-]
-
-GERMAN_HEAVY_CONTEXT = re.compile(r"\b(kunde|kundenkontakt|beratung|berater|consultant|vertrieb|stakeholder|workshop)\b", re.IGNORECASE)
-PUBLIC_SECTOR = re.compile(r"\b(behörde|amt|öffentliche(r|n)? dienst|verwaltung|klin(ik|ikum)|schule|schulen)\b", re.IGNORECASE)
-
 _YEARS_PENALTY = [
     (5, -25),
     (4, -20),
@@ -117,8 +95,7 @@ def _rank_cefr(level: str | None) -> int:
 
 
 def _location_matches_focus(title: str, loc: str, focus) -> bool:
-    hits = _contains_any(f"{title} {loc}", list(getattr(focus, "locations_any", []) or []))
-    return bool(hits)
+    return bool(matcher_for(focus).location_hits(title, loc))
 
 
 def classify_blockers(*, job: Dict[str, Any], focus, llm_part: Optional[Dict[str, Any]]) -> Dict[str, Any]:
@@ -211,31 +188,6 @@ def apply_blocker_caps(*, score: float, focus, blockers: Dict[str, Any], enabled
         "cap_reason": cap_reason,
     }
 
-def _contains_any(text: str, words: List[str]) -> List[str]:
-    hits = []
-    low = text.lower()
-    for w in words:
-        if w and w.lower() in low:
-            hits.append(w)
-    return hits
-
-def _count_keywords(text: str, keywords: List[str]) -> Dict[str,int]:
-    low = text.lower()
-    counts = {}
-    for k in keywords:
-        if not k:
-            continue
-        parts = k.lower().split()
-        if not parts:
-            continue
-        if len(parts) == 1:
-            pattern = rf"\b{re.escape(parts[0])}\b"
-        else:
-            pattern = r"\b" + r"\s+".join(re.escape(part) for part in parts) + r"\b"
-        c = len(re.findall(pattern, low))
-        counts[k] = c
-    return counts
-
 def _clamp_confidence(value: Any) -> float:
     try:
         conf = float(value)
@@ -244,39 +196,30 @@ def _clamp_confidence(value: Any) -> float:
     return max(0.0, min(1.0, conf))
 
 def _guess_post_language(text_lower: str) -> str:
-    german_hits = len(re.findall(r"\b(und|der|die|das|nicht|ist|mit|für|den|des|auf|zu|vom|nach)\b", text_lower)) + len(re.findall(r"[äöüß]", text_lower))
-    english_hits = len(re.findall(r"\b(the|and|with|for|not|is|are|will|from|into|of|in)\b", text_lower))
-    if german_hits == 0 and english_hits == 0:
-        return "Unknown"
-    if german_hits > english_hits * 1.5:
-        return "German"
-    if english_hits > german_hits * 1.5:
-        return "English"
-    return "Mixed"
+    return scan_text(text_lower).post_language
 
 def _regex_guess_german(text_lower: str) -> Optional[Dict[str, Any]]:
-    for pattern, level, conf in LANG_PATTERNS:
-        m = re.search(pattern, text_lower)
-        if m:
-            snippet = m.group(0)
-            return {
-                "language": "German",
-                "cefr_guess": (level or "Unknown").upper() if level else "Unknown",
-                "confidence": conf,
-                "evidence_phrases": [snippet[:160]],
-                "customer_facing": bool(GERMAN_HEAVY_CONTEXT.search(text_lower)),
-                "job_post_language": _guess_post_language(text_lower),
-                "source": "regex",
-            }
+    scan = scan_text(text_lower)
+    if scan.german_pattern:
+        level, conf, snippet = scan.german_pattern
+        return {
+            "language": "German",
+            "cefr_guess": (level or "Unknown").upper() if level else "Unknown",
+            "confidence": conf,
+            "evidence_phrases": [snippet[:160]],
+            "customer_facing": scan.customer_facing,
+            "job_post_language": scan.post_language,
+            "source": "regex",
+        }
 
-    post_lang = _guess_post_language(text_lower)
+    post_lang = scan.post_language
     if post_lang == "German":
         return {
             "language": "German",
             "cefr_guess": "Unknown",
             "confidence": 0.2,
             "evidence_phrases": ["posting_language:German"],
-            "customer_facing": bool(GERMAN_HEAVY_CONTEXT.search(text_lower)),
+            "customer_facing": scan.customer_facing,
             "job_post_language": post_lang,
             "source": "fallback",
         }
@@ -334,7 +277,7 @@ def resolve_language_items(
                 "cefr_guess": legacy_level,
                 "confidence": 0.6,
                 "evidence_phrases": ["legacy german_requirement field"],
-                "customer_facing": bool(GERMAN_HEAVY_CONTEXT.search(text_lower)),
+                "customer_facing": scan_text(text_lower).customer_facing,
                 "job_post_language": _guess_post_language(text_lower),
                 "source": "legacy_field",
             }
@@ -394,7 +337,7 @@ def resolve_language_items(
             "cefr_guess": default_lvl,
             "confidence": 0.5,
             "evidence_phrases": [f"posting_language:German (default {default_lvl})"],
-            "customer_facing": bool(GERMAN_HEAVY_CONTEXT.search(text_lower)),
+            "customer_facing": scan_text(text_lower).customer_facing,
             "job_post_language": post_lang,
             "source": "fallback",
         }
@@ -471,10 +414,11 @@ def _vagueness_context_nudge(text_lower: str, english_detected: bool) -> Tuple[i
     delta = 0
     notes: List[str] = []
     if not english_detected:
-        if GERMAN_HEAVY_CONTEXT.search(text_lower):
+        scan = scan_text(text_lower)
+        if scan.customer_facing:
             delta -= 8
             notes.append("German-heavy context (customer-facing/consulting)")
-        if PUBLIC_SECTOR.search(text_lower):
+        if scan.public_sector:
             delta -= 10
             notes.append("Public-sector context")
     return delta, "; ".join(notes) if notes else ""
@@ -546,12 +490,12 @@ def _employment_delta(emp: str|None) -> Tuple[int,str]:
     if "CONTRACT" in e: return (+0, "employment: CONTRACT")
     return (0, f"employment: {emp}")
 
-def apply_seniority(title: str, seniority: Optional[str], focus=DEFAULT_FOCUS) -> HeuristicComponentResult:
+def apply_seniority(title: str, seniority: Optional[str], focus=DEFAULT_FOCUS, hits: Optional[JobHits] = None) -> HeuristicComponentResult:
     reasons: List[str] = []
     delta = 0
     components: Dict[str, float] = {"seniority": 0}
 
-    excl = _contains_any(title, list(focus.exclude_titles_any))
+    excl = hits.exclude_title_hits if hits else matcher_for(focus).exclude_titles.hits(title)
     if excl:
         delta += -30
         components["exclude_title"] = -30
@@ -559,16 +503,7 @@ def apply_seniority(title: str, seniority: Optional[str], focus=DEFAULT_FOCUS) -
 
     inferred = seniority
     if not inferred:
-        if re.search(r"\b(werkstudent|working student)\b", title.lower()):
-            inferred = "Working Student"
-        elif re.search(r"\btrainee\b", title.lower()):
-            inferred = "Internship"
-        elif re.search(r"\b(intern(ship)?)\b", title.lower()):
-            inferred = "Internship"
-        elif re.search(r"\bjunior\b", title.lower()):
-            inferred = "Junior"
-        elif re.search(r"\bsenior\b", title.lower()):
-            inferred = "Senior"
+        inferred = hits.title_seniority if hits else title_seniority(title)
 
     sen_delta, sen_reason = _seniority_delta(inferred)
     delta += sen_delta
@@ -621,12 +556,14 @@ def apply_language(text: str, lang_items: Optional[List[Dict[str, Any]]], englis
     return HeuristicComponentResult(name="language", raw_score=delta, reasons=reasons, meta=meta)
 
 
-def apply_skills(text: str, focus=DEFAULT_FOCUS) -> HeuristicComponentResult:
+def apply_skills(text: str, focus=DEFAULT_FOCUS, hits: Optional[JobHits] = None) -> HeuristicComponentResult:
     reasons: List[str] = []
     components: Dict[str, float] = {}
     delta = 0
 
-    include_counts = _count_keywords(text, list(focus.include_skills_any))
+    if hits is None:
+        hits = matcher_for(focus).match("", text.lower(), "")
+    include_counts = dict(hits.must_have_counts)
     must_bonus = 0
     for k, v in include_counts.items():
         if v > 0:
@@ -640,7 +577,7 @@ def apply_skills(text: str, focus=DEFAULT_FOCUS) -> HeuristicComponentResult:
     delta += must_delta
     components["include_skills"] = must_delta
 
-    nth_counts = _count_keywords(text, list(focus.nice_to_have))
+    nth_counts = dict(hits.nice_to_have_counts)
     nth_bonus = 0
     for k, v in nth_counts.items():
         if v > 0:
@@ -659,12 +596,12 @@ def apply_skills(text: str, focus=DEFAULT_FOCUS) -> HeuristicComponentResult:
     return HeuristicComponentResult(name="skills", raw_score=delta, reasons=reasons, meta=meta)
 
 
-def apply_location(title: str, loc: str, focus=DEFAULT_FOCUS) -> HeuristicComponentResult:
+def apply_location(title: str, loc: str, focus=DEFAULT_FOCUS, hits: Optional[JobHits] = None) -> HeuristicComponentResult:
     reasons: List[str] = []
     components: Dict[str, float] = {}
     delta = 0
 
-    loc_hits = _contains_any(f"{title} {loc}", list(focus.locations_any))
+    loc_hits = hits.location_hits if hits else matcher_for(focus).location_hits(title, loc)
     if loc_hits:
         delta += 8
         components["location"] = 8
@@ -759,16 +696,62 @@ def compute_alpha(
     return max(0.65, min(0.90, alpha))
 
 
-def score_job(
-    job: Dict[str, Any],
-    focus=DEFAULT_FOCUS,
-    use_llm_scoring: Optional[bool] = None,
-    apply_blocker_cap: Optional[bool] = None,
-) -> Dict[str, Any]:
-    """
-    Compute a 0–100 junior-fit score. Returns {score:int, reasons:[...], components:{...}}.
-    Uses enrichment fields when present; otherwise falls back to keyword heuristics.
-    """
+def _summarize_components(job: Dict[str, Any], comp_results: List[HeuristicComponentResult]):
+    reasons_local: List[str] = []
+    components_local: Dict[str, float] = {}
+    meta_local: Dict[str, Any] = {}
+    derived_english_local = False
+    derived_german_local = None
+    must_counts_local = {}
+    nice_counts_local = {}
+    seniority_value_local = job.get("seniority")
+
+    for res in comp_results:
+        reasons_local.extend(res.reasons)
+        meta_local[res.name] = res.meta
+        for k, v in res.meta.get("components", {}).items():
+            components_local[k] = v
+        if res.name == "language":
+            derived_english_local = bool(res.meta.get("english_detected", False))
+            german_entry = res.meta.get("german_entry")
+            derived_german_local = german_entry.get("cefr_guess") if german_entry else None
+        if res.name == "skills":
+            must_counts_local = res.meta.get("must_have_counts", {})
+            nice_counts_local = res.meta.get("nice_to_have_counts", {})
+        if res.name == "seniority" and res.meta.get("seniority"):
+            seniority_value_local = res.meta.get("seniority")
+
+    return (
+        reasons_local,
+        components_local,
+        meta_local,
+        derived_english_local,
+        derived_german_local,
+        must_counts_local,
+        nice_counts_local,
+        seniority_value_local,
+    )
+
+
+@dataclass
+class HeuristicPass:
+    """Intermediate state between the heuristic pass and the (optional) LLM blend."""
+
+    text: str
+    text_lower: str
+    english_hint: Any
+    lang_items: Optional[List[Dict[str, Any]]]
+    component_results: List[HeuristicComponentResult]
+    score_val: float
+    summary: Tuple[Any, ...]
+
+    def llm_payload(self) -> Dict[str, Any]:
+        reasons, components, meta = self.summary[:3]
+        return {"heuristic_score": self.score_val, "components": components, "reasons": reasons, "meta": meta}
+
+
+def heuristic_pass(job: Dict[str, Any], focus, aggregate: bool = True) -> HeuristicPass:
+    """Components (and, with ``aggregate``, the weighted heuristic score) of ``job``; sets its language_requirements."""
     title = (job.get("title") or "").strip()
     desc = (job.get("description_text") or "")
     loc = (job.get("location") or "")
@@ -776,10 +759,11 @@ def score_job(
 
     text = f"{title}\n{desc}\n{loc}".strip()
     text_lower = text.lower()
+    hits = matcher_for(focus).match(title, text_lower, loc)
 
     english_hint = job.get("english_ok")
     if english_hint is None:
-        english_hint = bool(re.search(r"\b(english|englisch)\b", text_lower))
+        english_hint = hits.scan.mentions_english
 
     lang_items = job.get("language_requirements")
     if isinstance(lang_items, list):
@@ -801,50 +785,109 @@ def score_job(
     job["language_requirements"] = lang_items
 
     component_results: List[HeuristicComponentResult] = []
-    component_results.append(apply_seniority(title, job.get("seniority"), focus))
+    component_results.append(apply_seniority(title, job.get("seniority"), focus, hits))
     component_results.append(apply_language(text_lower, lang_items, english_hint))
-    component_results.append(apply_skills(text, focus))
-    component_results.append(apply_location(title, loc, focus))
+    component_results.append(apply_skills(text, focus, hits))
+    component_results.append(apply_location(title, loc, focus, hits))
     component_results.append(apply_employment_type(employment))
     component_results.append(apply_experience(text, focus))
 
-    def _summarize_components(comp_results: List[HeuristicComponentResult]):
-        reasons_local: List[str] = []
-        components_local: Dict[str, float] = {}
-        meta_local: Dict[str, Any] = {}
-        derived_english_local = False
-        derived_german_local = None
-        must_counts_local = {}
-        nice_counts_local = {}
-        seniority_value_local = job.get("seniority")
-
-        for res in comp_results:
-            reasons_local.extend(res.reasons)
-            meta_local[res.name] = res.meta
-            for k, v in res.meta.get("components", {}).items():
-                components_local[k] = v
-            if res.name == "language":
-                derived_english_local = bool(res.meta.get("english_detected", False))
-                german_entry = res.meta.get("german_entry")
-                derived_german_local = german_entry.get("cefr_guess") if german_entry else None
-            if res.name == "skills":
-                must_counts_local = res.meta.get("must_have_counts", {})
-                nice_counts_local = res.meta.get("nice_to_have_counts", {})
-            if res.name == "seniority" and res.meta.get("seniority"):
-                seniority_value_local = res.meta.get("seniority")
-
-        return (
-            reasons_local,
-            components_local,
-            meta_local,
-            derived_english_local,
-            derived_german_local,
-            must_counts_local,
-            nice_counts_local,
-            seniority_value_local,
-        )
+    return HeuristicPass(
+        text=text,
+        text_lower=text_lower,
+        english_hint=english_hint,
+        lang_items=lang_items,
+        component_results=component_results,
+        score_val=aggregate_heuristic(component_results) if aggregate else 0.0,
+        summary=_summarize_components(job, component_results),
+    )
+
+
+def apply_llm_language(job: Dict[str, Any], focus, hp: HeuristicPass, llm_part: Optional[Dict[str, Any]], aggregate: bool = True) -> None:
+    """Re-resolve the language component with the LLM's German requirement; updates ``hp`` in place."""
+    if not llm_part or not settings.llm_language_override:
+        return
+    lang_items2, _lang_evidence2 = resolve_language_items(
+        text_lower=hp.text_lower,
+        job=job,
+        lang_items=hp.lang_items,
+        english_hint=bool(hp.english_hint),
+        llm_part=llm_part,
+        focus=focus,
+    )
+    if lang_items2 == hp.lang_items:
+        return
+    hp.lang_items = lang_items2
+    job["language_requirements"] = lang_items2
+
+    # refresh just the language component (then recompute heuristic aggregate)
+    component_results = hp.component_results
+    lang_override_res = apply_language(hp.text_lower, lang_items2, hp.english_hint)
+    for k, cr in enumerate(component_results):
+        if cr.name == "language":
+            component_results[k] = lang_override_res
+            break
+    else:
+        component_results.append(lang_override_res)
+
+    if aggregate:
+        hp.score_val = aggregate_heuristic(component_results)
+    hp.summary = _summarize_components(job, component_results)
+
+    german_entry = hp.summary[2].get("language", {}).get("german_entry")
+    if german_entry:
+        job["german_requirement"] = str(german_entry.get("cefr_guess") or "").upper()
+
+
+def blend_alpha(hp: HeuristicPass, llm_part: Dict[str, Any]) -> Optional[float]:
+    """Heuristic weight for the blend, or None when the LLM returned no usable score."""
+    llm_score = llm_part.get("llm_score")
+    if not isinstance(llm_score, (int, float)):
+        return None
+    return compute_alpha(
+        llm_ok=True,
+        llm_confidence=llm_part.get("confidence"),
+        text_len=len(hp.text),
+        score_gap=abs(float(hp.score_val) - float(llm_score)),
+        risk_flags=llm_part.get("risk_flags"),
+        critical_blockers=llm_part.get("critical_blockers"),
+    )
+
+
+def _finish_scoring(
+    job: Dict[str, Any],
+    focus,
+    hp: HeuristicPass,
+    llm_part: Optional[Dict[str, Any]],
+    do_llm: bool,
+    do_cap: bool,
+) -> Dict[str, Any]:
+    apply_llm_language(job, focus, hp, llm_part)
+
+    alpha = 1.0  # default: heuristic only
+    final_score = float(hp.score_val)
+    if do_llm and llm_part:
+        llm_alpha = blend_alpha(hp, llm_part)
+        if llm_alpha is not None:
+            alpha = llm_alpha
+            final_score = alpha * float(hp.score_val) + (1.0 - alpha) * float(llm_part["llm_score"])
+            final_score = max(0.0, min(100.0, final_score))
+
+    blockers = classify_blockers(job=job, focus=focus, llm_part=llm_part)
+    cap_meta = apply_blocker_caps(score=final_score, focus=focus, blockers=blockers, enabled=do_cap)
+    return scoring_result(hp, llm_part, alpha, do_llm, do_cap, blockers, cap_meta)
 
-    score_val = aggregate_heuristic(component_results)
+
+def scoring_result(
+    hp: HeuristicPass,
+    llm_part: Optional[Dict[str, Any]],
+    alpha: float,
+    do_llm: bool,
+    do_cap: bool,
+    blockers: Dict[str, Any],
+    cap_meta: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Assemble the score_job result dict from a heuristic pass, blend weight and cap outcome."""
     (
         reasons,
         components,
@@ -854,81 +897,9 @@ def score_job(
         must_counts,
         nice_counts,
         seniority_value,
-    ) = _summarize_components(component_results)
-
-    # Optional LLM-assisted score with dynamic alpha
-    llm_part = None
-    alpha = 1.0  # default: heuristic only
-    do_llm = settings.use_llm_scoring if use_llm_scoring is None else bool(use_llm_scoring)
-    do_cap = settings.apply_blocker_cap if apply_blocker_cap is None else bool(apply_blocker_cap)
-
-    if do_llm:
-        llm_part = llm_score_job(job, focus, {"heuristic_score": score_val, "components": components, "reasons": reasons, "meta": meta})
-
-    if llm_part and settings.llm_language_override:
-        lang_items2, _lang_evidence2 = resolve_language_items(
-            text_lower=text_lower,
-            job=job,
-            lang_items=lang_items,
-            english_hint=bool(english_hint),
-            llm_part=llm_part,
-            focus=focus,
-        )
-        if lang_items2 != lang_items:
-            lang_items = lang_items2
-            job["language_requirements"] = lang_items2
-
-            # refresh just the language component (then recompute heuristic aggregate)
-            lang_override_res = apply_language(text_lower, lang_items2, english_hint)
-            for k, cr in enumerate(component_results):
-                if cr.name == "language":
-                    component_results[k] = lang_override_res
-                    break
-            else:
-                component_results.append(lang_override_res)
-
-            score_val = aggregate_heuristic(component_results)
-            (
-                reasons,
-                components,
-                meta,
-                derived_english,
-                derived_german,
-                must_counts,
-                nice_counts,
-                seniority_value,
-            ) = _summarize_components(component_results)
-
-            german_entry = meta.get("language", {}).get("german_entry")
-            if german_entry:
-                job["german_requirement"] = str(german_entry.get("cefr_guess") or "").upper()
-
-    final_score = float(score_val)
-    if do_llm and llm_part:
-        llm_score = llm_part.get("llm_score")
-        llm_conf = llm_part.get("confidence")
-        llm_ok = isinstance(llm_score, (int, float))
-
-        if llm_ok:
-            text_len = len(text)
-            gap = abs(float(score_val) - float(llm_score))
-            alpha = compute_alpha(
-                llm_ok=True,
-                llm_confidence=llm_conf,
-                text_len=text_len,
-                score_gap=gap,
-                risk_flags=llm_part.get("risk_flags"),
-                critical_blockers=llm_part.get("critical_blockers"),
-            )
-            final_score = alpha * float(score_val) + (1.0 - alpha) * float(llm_score)
-            final_score = max(0.0, min(100.0, final_score))
-        else:
-            alpha = 1.0
-            final_score = float(score_val)
-
-    blockers = classify_blockers(job=job, focus=focus, llm_part=llm_part)
-    cap_meta = apply_blocker_caps(score=final_score, focus=focus, blockers=blockers, enabled=do_cap)
+    ) = hp.summary
     final_score = cap_meta["score"]
+    score_val = hp.score_val
 
     result = {
         "score": int(round(final_score)),
@@ -968,6 +939,8 @@ def score_job(
                 "llm_error_type": llm_part.get("error_type"),
                 "llm_error_message": llm_part.get("error_message"),
                 "llm_raw_excerpt": llm_part.get("raw_excerpt"),
+                "llm_cache_hit": (llm_part.get("llm_cache") or {}).get("hit"),
+                "llm_combined": bool(llm_part.get("llm_combined")),
                 "llm_debug": (
                     f"alpha={alpha:.2f} llm_score={llm_part.get('llm_score')} "
                     f"llm_ok={llm_part.get('llm_ok')} err_type={llm_part.get('error_type')} "
@@ -979,3 +952,119 @@ def score_job(
         result["llm_debug"] = f"alpha={alpha:.2f} llm_score=None ok=False err=None"
 
     return result
+
+
+def scoring_flags(use_llm_scoring: Optional[bool], apply_blocker_cap: Optional[bool]) -> Tuple[bool, bool]:
+    """(use LLM, apply blocker caps), falling back to settings for None."""
+    do_llm = settings.use_llm_scoring if use_llm_scoring is None else bool(use_llm_scoring)
+    do_cap = settings.apply_blocker_cap if apply_blocker_cap is None else bool(apply_blocker_cap)
+    return do_llm, do_cap
+
+
+def _llm_gate(job: Dict[str, Any], focus, hp: HeuristicPass, do_cap: bool) -> Optional[str]:
+    if not settings.llm_gate_enabled:
+        return None
+    # Hard caps hold whatever the LLM says (it can only add blockers), so the call can't change the outcome.
+    if do_cap and settings.llm_gate_skip_hard_blockers:
+        if classify_blockers(job=job, focus=focus, llm_part=None).get("hard"):
+            return LLM_SKIP_HARD_BLOCKERS
+    if hp.score_val < settings.llm_gate_min_score:
+        return LLM_SKIP_BELOW_BAND
+    if hp.score_val > settings.llm_gate_max_score:
+        return LLM_SKIP_ABOVE_BAND
+    return None
+
+
+def llm_gate_reason(
+    job: Dict[str, Any],
+    focus=DEFAULT_FOCUS,
+    apply_blocker_cap: Optional[bool] = None,
+) -> Optional[str]:
+    """
+    Why score_job would skip the LLM for ``job`` (heuristic outside the
+    JOBAGENT_LLM_GATE_* band, or hard blockers already capping), else None.
+    Works on a copy, so callers can decide before enrichment without side effects.
+    """
+    if not settings.llm_gate_enabled:
+        return None
+    _, do_cap = scoring_flags(True, apply_blocker_cap)
+    job_copy = dict(job)
+    return _llm_gate(job_copy, focus or DEFAULT_FOCUS, heuristic_pass(job_copy, focus or DEFAULT_FOCUS), do_cap)
+
+
+def with_skip_reason(result: Dict[str, Any], reason: Optional[str]) -> Dict[str, Any]:
+    """Record why the LLM was skipped (None when it wasn't) on a score_job result."""
+    result["llm_skipped_reason"] = reason
+    if reason:
+        result["llm_debug"] = f"alpha=1.00 llm skipped: {reason}"
+    return result
+
+
+def score_job(
+    job: Dict[str, Any],
+    focus=DEFAULT_FOCUS,
+    use_llm_scoring: Optional[bool] = None,
+    apply_blocker_cap: Optional[bool] = None,
+    llm_part: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Compute a 0–100 junior-fit score. Returns {score:int, reasons:[...], components:{...}}.
+    Uses enrichment fields when present; otherwise falls back to keyword heuristics.
+    A precomputed ``llm_part`` (combined enrich+score call) is blended instead of
+    calling the LLM again.
+    """
+    hp = heuristic_pass(job, focus)
+    do_llm, do_cap = scoring_flags(use_llm_scoring, apply_blocker_cap)
+    skip_reason = None
+    if llm_part is not None:
+        do_llm = True
+    elif do_llm:
+        skip_reason = _llm_gate(job, focus, hp, do_cap)
+        if skip_reason is None:
+            # Optional LLM-assisted score with dynamic alpha
+            llm_part = llm_score_job(job, focus, hp.llm_payload())
+    return with_skip_reason(_finish_scoring(job, focus, hp, llm_part, do_llm, do_cap), skip_reason)
+
+
+async def ascore_job(
+    job: Dict[str, Any],
+    focus=DEFAULT_FOCUS,
+    use_llm_scoring: Optional[bool] = None,
+    apply_blocker_cap: Optional[bool] = None,
+) -> Dict[str, Any]:
+    """score_job with the LLM call made through the async client (same result shape)."""
+    hp, do_llm, do_cap, skip_reason = prepare_score_job(job, focus, use_llm_scoring, apply_blocker_cap)
+    llm_part = None
+    if do_llm and skip_reason is None:
+        llm_part = await allm_score_job(job, focus, hp.llm_payload())
+    return finish_score_job(job, focus, hp, llm_part, do_llm, do_cap, skip_reason)
+
+
+def prepare_score_job(
+    job: Dict[str, Any],
+    focus=DEFAULT_FOCUS,
+    use_llm_scoring: Optional[bool] = None,
+    apply_blocker_cap: Optional[bool] = None,
+) -> Tuple[HeuristicPass, bool, bool, Optional[str]]:
+    """
+    CPU-bound half of ascore_job before the LLM call: the heuristic pass, the
+    scoring flags and the LLM gate reason. Lets callers run it (and
+    finish_score_job) on a worker and await only ``allm_score_job``.
+    """
+    hp = heuristic_pass(job, focus)
+    do_llm, do_cap = scoring_flags(use_llm_scoring, apply_blocker_cap)
+    skip_reason = _llm_gate(job, focus, hp, do_cap) if do_llm else None
+    return hp, do_llm, do_cap, skip_reason
+
+
+def finish_score_job(
+    job: Dict[str, Any],
+    focus,
+    hp: HeuristicPass,
+    llm_part: Optional[Dict[str, Any]],
+    do_llm: bool,
+    do_cap: bool,
+    skip_reason: Optional[str],
+) -> Dict[str, Any]:
+    """Blend ``llm_part`` into a prepare_score_job pass and apply the blocker caps."""
+    return with_skip_reason(_finish_scoring(job, focus, hp, llm_part, do_llm, do_cap), skip_reason)
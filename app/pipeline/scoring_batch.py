@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.config.focus import DEFAULT_FOCUS
+from .scoring import (
+    DEFAULT_HEURISTIC_WEIGHTS,
+    HeuristicWeights,
+    apply_llm_language,
+    blend_alpha,
+    classify_blockers,
+    heuristic_pass,
+    scoring_flags,
+    scoring_result,
+    with_skip_reason,
+)
+
+
+def score_jobs(
+    jobs: Sequence[Dict[str, Any]],
+    focus=DEFAULT_FOCUS,
+    apply_blocker_cap: Optional[bool] = None,
+    llm_parts: Optional[Sequence[Optional[Dict[str, Any]]]] = None,
+    weights: HeuristicWeights = DEFAULT_HEURISTIC_WEIGHTS,
+) -> List[Dict[str, Any]]:
+    """
+    Score many postings at once for bulk rescoring and offline analysis.
+
+    Each result matches ``score_job(job, focus, use_llm_scoring=False,
+    apply_blocker_cap, llm_part)``. No LLM calls are made: pass previously
+    stored ``llm_parts`` (one per job, None to skip) to blend them. Jobs are
+    updated in place like score_job does.
+
+    This is a convenience API, not a faster path: the heuristic pass, LLM
+    language override, blend weights and blocker classification still run per
+    job; only the weighted sum, the blend and the caps are array operations
+    over a (jobs × components) matrix. Use ``weights`` to rescore under other
+    component weights.
+    """
+    if llm_parts is not None and len(llm_parts) != len(jobs):
+        raise ValueError("llm_parts must have one entry per job")
+    _, do_cap = scoring_flags(False, apply_blocker_cap)
+    parts = list(llm_parts) if llm_parts is not None else [None] * len(jobs)
+    if not jobs:
+        return []
+
+    passes = []
+    for job, llm_part in zip(jobs, parts):
+        hp = heuristic_pass(job, focus, aggregate=False)
+        apply_llm_language(job, focus, hp, llm_part, aggregate=False)
+        passes.append(hp)
+
+    # jobs × components, columns in component order so the sums add up like aggregate_heuristic
+    names: List[str] = []
+    for hp in passes:
+        for res in hp.component_results:
+            if res.name not in names:
+                names.append(res.name)
+    column = {name: i for i, name in enumerate(names)}
+    deltas = np.zeros((len(passes), len(names)))
+    for row, hp in enumerate(passes):
+        for res in hp.component_results:
+            deltas[row, column[res.name]] = res.raw_score
+    heuristic = np.full(len(passes), float(weights.base_score))
+    for i, name in enumerate(names):
+        heuristic += weights.components.get(name, 1.0) * deltas[:, i]
+    heuristic = np.clip(heuristic, 0.0, 100.0)
+    for hp, value in zip(passes, heuristic.tolist()):
+        hp.score_val = value
+
+    # LLM blend where a usable stored score exists
+    alpha = np.ones(len(passes))
+    llm_score = np.zeros(len(passes))
+    blended = np.zeros(len(passes), dtype=bool)
+    for row, (hp, llm_part) in enumerate(zip(passes, parts)):
+        if llm_part:
+            job_alpha = blend_alpha(hp, llm_part)
+            if job_alpha is not None:
+                alpha[row], llm_score[row], blended[row] = job_alpha, float(llm_part["llm_score"]), True
+    final = np.where(blended, np.clip(alpha * heuristic + (1.0 - alpha) * llm_score, 0.0, 100.0), heuristic)
+
+    # blocker caps: hard beats soft, inf means uncapped
+    blockers = [classify_blockers(job=job, focus=focus, llm_part=llm_part) for job, llm_part in zip(jobs, parts)]
+    hard = np.array([bool(b.get("hard")) for b in blockers])
+    soft = np.array([bool(b.get("soft")) for b in blockers])
+    cap = np.where(hard, float(int(getattr(focus, "blocker_cap_hard", 35))), np.inf)
+    cap = np.where(~hard & soft, float(int(getattr(focus, "blocker_cap_soft", 55))), cap)
+    capped = np.minimum(final, cap) if do_cap else final
+
+    results: List[Dict[str, Any]] = []
+    for row, (hp, llm_part, job_blockers) in enumerate(zip(passes, parts, blockers)):
+        cap_meta: Dict[str, Any] = {"score": float(capped[row]), "cap_applied": False, "cap_value": None, "cap_reason": None}
+        if do_cap and np.isfinite(cap[row]):
+            kind = "hard" if hard[row] else "soft"
+            cap_meta.update(
+                cap_applied=bool(capped[row] != final[row]),
+                cap_value=int(cap[row]),
+                cap_reason=f"{kind}_blockers:" + ",".join(job_blockers[kind]),
+            )
+        result = scoring_result(hp, llm_part, float(alpha[row]), llm_part is not None, do_cap, job_blockers, cap_meta)
+        results.append(with_skip_reason(result, None))
+    return results
@@ -2,16 +2,19 @@ from __future__ import annotations
 
 import hashlib
 import json
+import threading
+import weakref
 from dataclasses import asdict, is_dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from loguru import logger
 
 from app.common.utils import ensure_dir
 from app.config.focus import FocusConfig
 from app.config.settings import settings
+from .cache_store import RESULT_LAYER, CacheStore, JsonFileCacheStore, MemoryFrontStore, SqliteCacheStore
 
 STATE_DIR = settings.output_dir / "_state"
 STATE_FILE = STATE_DIR / "run_state.json"
@@ -75,36 +78,112 @@ def _stable_json(obj: Any) -> str:
     return json.dumps(obj, sort_keys=True, ensure_ascii=False)
 
 
-def _focus_fingerprint(focus: Optional[FocusConfig]) -> Optional[str]:
+# id(focus) -> (weakref, fingerprint). FocusConfig holds sets, so it can't be
+# hashed or used as a WeakKeyDictionary key; the weakref drops the entry when
+# the profile object goes away. Profiles are treated as immutable once built.
+_FINGERPRINTS: Dict[int, Tuple["weakref.ref[Any]", str]] = {}
+
+
+def focus_fingerprint(focus: Optional[FocusConfig]) -> Optional[str]:
     if not focus:
         return None
+    entry = _FINGERPRINTS.get(id(focus))
+    if entry is not None and entry[0]() is focus:
+        return entry[1]
     raw = _stable_json(focus)
-    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+    fingerprint = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+    try:
+        key = id(focus)
+        ref = weakref.ref(focus, lambda _ref, key=key: _FINGERPRINTS.pop(key, None))
+    except TypeError:
+        return fingerprint
+    _FINGERPRINTS[key] = (ref, fingerprint)
+    return fingerprint
 
 
 def _cache_key(url: str, focus: Optional[FocusConfig]) -> str:
     parts = [url.strip(), f"cv:{settings.cache_version}"]
     if focus and settings.cache_per_profile:
         parts.append(f"profile:{focus.profile_name}")
-        parts.append(f"fh:{_focus_fingerprint(focus)}")
+        parts.append(f"fh:{focus_fingerprint(focus)}")
     base = "|".join(parts)
     return hashlib.sha1(base.encode("utf-8")).hexdigest()
 
 
 def _cache_path(url: str, focus: Optional[FocusConfig]) -> Path:
+    """File of a whole-result entry when JOBAGENT_CACHE_BACKEND=json."""
     ensure_dir(CACHE_DIR)
-    return CACHE_DIR / f"{_cache_key(url, focus)}.json"
+    return JsonFileCacheStore(CACHE_DIR).path_for(_cache_key(url, focus), RESULT_LAYER)
+
+
+_STORE: Optional[CacheStore] = None
+_STORE_ID: Optional[tuple] = None
+_STORE_LOCK = threading.Lock()
+
+
+def cache_store_path() -> Path:
+    return CACHE_DIR / "cache.sqlite"
+
+
+def get_cache_store() -> CacheStore:
+    """Process-wide store for JOBAGENT_CACHE_BACKEND, rooted at CACHE_DIR."""
+    global _STORE, _STORE_ID
+    store_id = (
+        settings.cache_backend,
+        str(CACHE_DIR),
+        settings.cache_ttl_days,
+        settings.cache_max_mb,
+        settings.cache_memory_entries,
+        settings.cache_memory_mb,
+    )
+    if _STORE is None or _STORE_ID != store_id:
+        with _STORE_LOCK:
+            if _STORE is None or _STORE_ID != store_id:
+                if _STORE is not None:
+                    _STORE.close()
+                if settings.cache_backend == "json":
+                    _STORE = JsonFileCacheStore(CACHE_DIR)
+                else:
+                    _STORE = SqliteCacheStore(
+                        cache_store_path(),
+                        ttl_sec=float(settings.cache_ttl_days) * 86400,
+                        max_bytes=int(settings.cache_max_mb) * 1024 * 1024,
+                    )
+                if settings.cache_memory_entries > 0:
+                    _STORE = MemoryFrontStore(
+                        _STORE,
+                        max_entries=settings.cache_memory_entries,
+                        max_bytes=int(settings.cache_memory_mb) * 1024 * 1024,
+                    )
+                _STORE_ID = store_id
+    return _STORE
+
+
+def cache_stats() -> Dict[str, Any]:
+    """In-memory LRU counters (hits, misses, stale reloads, evictions) plus the backing store's stats."""
+    stats = get_cache_store().stats()
+    stats.setdefault("memory", None)
+    return stats
+
+
+def scoring_versions(scoring: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Versions stamped into cache_meta so stale scores can be evicted after a scoring change."""
+    scoring = scoring or {}
+    return {
+        "heuristic_version": scoring.get("heuristic_version"),
+        "version": scoring.get("version"),
+        "llm_scoring_version": scoring.get("llm_scoring_version"),
+    }
 
 
 def cache_get(url: str, focus: Optional[FocusConfig] = None) -> Optional[Dict[str, Any]]:
     if not settings.cache_enabled:
         return None
-    p = _cache_path(url, focus)
-    if not p.exists():
-        return None
 
     try:
-        data = json.loads(p.read_text(encoding="utf-8"))
+        data = get_cache_store().get(_cache_key(url, focus), RESULT_LAYER)
+        if not data:
+            return None
         meta = (data or {}).get("cache_meta") or {}
         payload = (data or {}).get("payload")
 
@@ -123,7 +202,7 @@ def cache_get(url: str, focus: Optional[FocusConfig] = None) -> Optional[Dict[st
         if focus and settings.cache_per_profile:
             if meta.get("focus_profile") != focus.profile_name:
                 return None
-            if meta.get("focus_hash") != _focus_fingerprint(focus):
+            if meta.get("focus_hash") != focus_fingerprint(focus):
                 return None
 
         if isinstance(payload, dict):
@@ -144,18 +223,76 @@ def cache_put(url: str, payload: Dict[str, Any], focus: Optional[FocusConfig] =
             "cache_version": settings.cache_version,
             "url": url,
             "focus_profile": (focus.profile_name if (focus and settings.cache_per_profile) else None),
-            "focus_hash": (_focus_fingerprint(focus) if (focus and settings.cache_per_profile) else None),
-            "scoring_versions": {
-                "heuristic_version": scoring.get("heuristic_version"),
-                "version": scoring.get("version"),
-                "llm_scoring_version": scoring.get("llm_scoring_version"),
-            },
+            "focus_hash": (focus_fingerprint(focus) if (focus and settings.cache_per_profile) else None),
+            "scoring_versions": scoring_versions(scoring),
         }
-        p = _cache_path(url, focus)
-        p.write_text(
-            json.dumps({"cache_meta": meta, "payload": payload}, ensure_ascii=False, indent=2),
-            encoding="utf-8",
+        get_cache_store().put(
+            _cache_key(url, focus),
+            RESULT_LAYER,
+            {"cache_meta": meta, "payload": payload},
+            profile=meta["focus_profile"],
         )
     except Exception:
         logger.warning("cache_put failed; continuing", exc_info=True)
 
+
+# --- layered pipeline cache ----------------------------------------------
+# fetch_job_details caches each stage separately so a profile edit only
+# recomputes the stages that depend on it:
+#   fetch   normalized URL                   -> fetch_meta + HTML (by archive sha)
+#   parse   HTML sha256                      -> UnifiedJobPosting dict
+#   enrich  posting hash + prompt fingerprint -> enriched job (+ combined LLM part)
+#   score   job hash + focus fingerprint + scoring versions -> scoring result
+LAYER_FETCH = "fetch"
+LAYER_PARSE = "parse"
+LAYER_ENRICH = "enrich"
+LAYER_SCORE = "score"
+CACHE_LAYERS = (LAYER_FETCH, LAYER_PARSE, LAYER_ENRICH, LAYER_SCORE)
+
+
+def content_hash(obj: Any) -> str:
+    """sha256 of a JSON-serialisable value (stable key order)."""
+    raw = obj if isinstance(obj, str) else json.dumps(obj, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def layer_key(layer: str, *parts: Any) -> str:
+    base = "|".join([layer, f"cv:{settings.cache_version}", *(str(p) for p in parts)])
+    return hashlib.sha1(base.encode("utf-8")).hexdigest()
+
+
+def _expired(cached_at: Any) -> bool:
+    if not cached_at or settings.cache_ttl_days <= 0:
+        return False
+    try:
+        dt = datetime.fromisoformat(str(cached_at).replace("Z", "+00:00"))
+    except Exception:
+        return True
+    return datetime.now(timezone.utc) - dt > timedelta(days=settings.cache_ttl_days)
+
+
+def layer_get(layer: str, key: str) -> Optional[Dict[str, Any]]:
+    if not settings.cache_enabled:
+        return None
+    try:
+        data = get_cache_store().get(key, layer)
+        if not data:
+            return None
+        meta = (data or {}).get("cache_meta") or {}
+        payload = (data or {}).get("payload")
+        if meta.get("cache_version") != settings.cache_version or _expired(meta.get("cached_at")):
+            return None
+        return payload if isinstance(payload, dict) else None
+    except Exception:
+        logger.warning("layer_get({}) failed; ignoring cache", layer, exc_info=True)
+        return None
+
+
+def layer_put(layer: str, key: str, payload: Dict[str, Any], **meta: Any) -> None:
+    if not settings.cache_enabled:
+        return
+    try:
+        cache_meta = {"cached_at": _now_iso(), "cache_version": settings.cache_version, "layer": layer, **meta}
+        get_cache_store().put(key, layer, {"cache_meta": cache_meta, "payload": payload})
+    except Exception:
+        logger.warning("layer_put({}) failed; continuing", layer, exc_info=True)
@@ -1,61 +1,258 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable, Optional, Set
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from loguru import logger
+
+from app.common.sqlite_utils import connect_sqlite
+from app.common.utils import normalize_url
 
 
 def pool_path_for_profile(profile_dir: Path) -> Path:
     return profile_dir / "url_pool.jsonl"
 
 
-def normalize_url(url: str) -> str:
-    if not url:
-        return ""
-    cleaned = url.strip()
-    if not cleaned:
-        return ""
-    return cleaned.split("#", 1)[0].strip()
+def unavailable_path_for_profile(profile_dir: Path) -> Path:
+    return profile_dir / "url_pool_unavailable.jsonl"
+
+
+_POOL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS url_pool (
+    url_hash TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    active INTEGER NOT NULL DEFAULT 1,
+    last_http_status INTEGER,
+    first_seen_at TEXT NOT NULL,
+    last_seen_at TEXT NOT NULL,
+    run_id TEXT,
+    seed_slug TEXT,
+    reason TEXT
+);
+CREATE INDEX IF NOT EXISTS url_pool_active_first_seen ON url_pool(active, first_seen_at);
+CREATE INDEX IF NOT EXISTS url_pool_last_seen ON url_pool(last_seen_at);
+"""
+
+# Membership checks bind this many url hashes per statement (SQLite's default limit is 999).
+_IN_CHUNK = 500
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+def _iso(value: Any) -> str:
+    """Normalise imported timestamps so last_seen_at sorts and compares as text."""
+    if not value:
+        return _now_iso()
+    try:
+        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return _now_iso()
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+def url_hash(url: str) -> str:
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+
+def pool_store_path_for_profile(profile_dir: Path) -> Path:
+    return profile_dir / "url_pool.sqlite"
+
+
+class UrlPoolStore:
+    """
+    Indexed URL pool of one profile: the columns of ``app.db.models.UrlPoolEntry``
+    (keyed by url_hash within the profile) in a local SQLite file. Active
+    entries are the URLs a run skips; URLs found unavailable stay as inactive
+    rows with their last HTTP status instead of moving to a second file.
+    """
 
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(self.path)
+        self._conn.executescript(_POOL_SCHEMA)
 
-def load_pool_set(path: Path) -> Set[str]:
-    if not path.exists():
-        return set()
-    seen: Set[str] = set()
-    with path.open("r", encoding="utf-8") as handle:
-        for line in handle:
-            raw = line.strip()
-            if not raw:
+    def upsert(self, entries: Iterable[Dict[str, Any]], *, reactivate: bool = True) -> int:
+        """
+        Bulk insert-or-update of ``{"url", "seen_at", "run_id", "seed_slug",
+        "active", "last_http_status", "reason"}`` dicts (only url is required).
+        Existing rows keep first_seen_at; last_seen_at only moves forward; a
+        missing reason keeps the stored one. With ``reactivate=False`` an
+        active entry never overrides a row already marked inactive.
+        """
+        rows = []
+        for entry in entries:
+            url = normalize_url(str(entry.get("url") or ""))
+            if not url:
                 continue
+            seen = _iso(entry.get("seen_at"))
+            rows.append(
+                (
+                    url_hash(url),
+                    url,
+                    1 if entry.get("active", True) else 0,
+                    entry.get("last_http_status"),
+                    seen,
+                    seen,
+                    entry.get("run_id"),
+                    entry.get("seed_slug"),
+                    entry.get("reason"),
+                )
+            )
+        if not rows:
+            return 0
+        with self._lock:
+            self._conn.execute("BEGIN")
             try:
-                payload = json.loads(raw)
-            except json.JSONDecodeError:
-                continue
-            url = normalize_url(str(payload.get("url") or ""))
-            if url:
-                seen.add(url)
-    return seen
-
-
-def append_pool_entries(
-    path: Path,
-    urls: Iterable[str],
-    *,
-    run_id: str,
-    seed_slug: Optional[str] = None,
-) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    now = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-    with path.open("a", encoding="utf-8") as handle:
-        for url in urls:
-            normalized = normalize_url(url)
-            if not normalized:
-                continue
-            payload = {
-                "url": normalized,
-                "seen_at": now,
-                "run_id": run_id,
-                "seed_slug": seed_slug,
-            }
-            handle.write(json.dumps(payload, ensure_ascii=False) + "\n")
+                self._conn.executemany(
+                    "INSERT INTO url_pool(url_hash, url, active, last_http_status, first_seen_at, last_seen_at, run_id, seed_slug, reason)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                    " ON CONFLICT(url_hash) DO UPDATE SET"
+                    f" active = {'excluded.active' if reactivate else 'MIN(active, excluded.active)'},"
+                    " last_http_status = COALESCE(excluded.last_http_status, last_http_status),"
+                    " first_seen_at = MIN(first_seen_at, excluded.first_seen_at),"
+                    " last_seen_at = MAX(last_seen_at, excluded.last_seen_at),"
+                    " run_id = CASE WHEN excluded.last_seen_at >= last_seen_at THEN excluded.run_id ELSE run_id END,"
+                    " seed_slug = COALESCE(excluded.seed_slug, seed_slug),"
+                    " reason = COALESCE(excluded.reason, reason)",
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def add_urls(self, urls: Iterable[str], *, run_id: str, seed_slug: Optional[str] = None) -> int:
+        now = _now_iso()
+        return self.upsert({"url": url, "seen_at": now, "run_id": run_id, "seed_slug": seed_slug} for url in urls)
+
+    def known(self, urls: Iterable[str], *, active_only: bool = True) -> Set[str]:
+        """The subset of ``urls`` (normalised) already in the pool."""
+        by_hash = {url_hash(u): u for u in (normalize_url(url) for url in urls) if u}
+        hashes = list(by_hash)
+        found: Set[str] = set()
+        active_clause = " AND active = 1" if active_only else ""
+        with self._lock:
+            for start in range(0, len(hashes), _IN_CHUNK):
+                chunk = hashes[start : start + _IN_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT url_hash FROM url_pool WHERE url_hash IN ({placeholders}){active_clause}",
+                    chunk,
+                ).fetchall()
+                found.update(by_hash[row["url_hash"]] for row in rows)
+        return found
+
+    def contains(self, url: str) -> bool:
+        return bool(self.known([url]))
+
+    def urls(self, *, active: bool = True, limit: Optional[int] = None) -> List[str]:
+        """URLs in first-seen order."""
+        sql = "SELECT url FROM url_pool WHERE active = ? ORDER BY first_seen_at, rowid"
+        params: List[Any] = [1 if active else 0]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        with self._lock:
+            return [row["url"] for row in self._conn.execute(sql, params).fetchall()]
+
+    def set_status(
+        self,
+        statuses: Dict[str, Optional[int]],
+        *,
+        active: Optional[bool] = None,
+        reason: Optional[str] = None,
+    ) -> int:
+        """Record the last HTTP status per URL; with ``active`` also (de)activate them."""
+        rows = [
+            (status, None if active is None else int(active), reason, url_hash(normalize_url(url)))
+            for url, status in statuses.items()
+            if normalize_url(url)
+        ]
+        with self._lock:
+            cur = self._conn.executemany(
+                "UPDATE url_pool SET last_http_status = COALESCE(?, last_http_status),"
+                " active = COALESCE(?, active), reason = COALESCE(?, reason) WHERE url_hash = ?",
+                rows,
+            )
+            return cur.rowcount or 0
+
+    def mark_inactive(self, urls: Iterable[str], *, http_status: Optional[int] = None, reason: str = "unavailable") -> int:
+        return self.set_status({url: http_status for url in urls}, active=False, reason=reason)
+
+    def evict_older_than(self, cutoff_iso: str) -> int:
+        """Delete entries not seen since ``cutoff_iso``."""
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM url_pool WHERE last_seen_at < ?", (_iso(cutoff_iso),))
+            return cur.rowcount or 0
+
+    def count(self, *, active: Optional[bool] = True) -> int:
+        with self._lock:
+            if active is None:
+                return self._conn.execute("SELECT COUNT(*) FROM url_pool").fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM url_pool WHERE active = ?", (int(active),)).fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"path": str(self.path), "active": self.count(active=True), "inactive": self.count(active=False)}
+
+    def import_jsonl(self, path: Path, *, active: bool = True, batch_size: int = 5000) -> Dict[str, int]:
+        """
+        Import a legacy url_pool.jsonl (``active``) or url_pool_unavailable.jsonl
+        (``active=False``) file. Duplicate lines collapse onto one row, and
+        re-importing never reactivates URLs the prune has marked inactive.
+        """
+        counts = {"lines": 0, "imported": 0, "invalid": 0}
+        if not path.exists():
+            return counts
+        batch: List[Dict[str, Any]] = []
+        with path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                raw = line.strip()
+                if not raw:
+                    continue
+                counts["lines"] += 1
+                try:
+                    payload = json.loads(raw)
+                except json.JSONDecodeError:
+                    counts["invalid"] += 1
+                    continue
+                batch.append({**payload, "active": active})
+                if len(batch) >= batch_size:
+                    counts["imported"] += self.upsert(batch, reactivate=False)
+                    batch = []
+        counts["imported"] += self.upsert(batch, reactivate=False)
+        return counts
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def open_pool_store(profile_dir: Path) -> UrlPoolStore:
+    """
+    The profile's pool store. On first use the legacy JSONL pool files are
+    imported (and left in place).
+    """
+    path = pool_store_path_for_profile(profile_dir)
+    fresh = not path.exists()
+    store = UrlPoolStore(path)
+    if fresh:
+        imported = store.import_jsonl(pool_path_for_profile(profile_dir))
+        unavailable = store.import_jsonl(unavailable_path_for_profile(profile_dir), active=False)
+        if imported["lines"] or unavailable["lines"]:
+            logger.info(
+                "Imported URL pool into {}: {} active lines, {} unavailable lines",
+                path,
+                imported["lines"],
+                unavailable["lines"],
+            )
+    return store
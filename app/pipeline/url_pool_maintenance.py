@@ -1,12 +1,10 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import random
 import time
-from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 
 from app.fetching.polite_fetch import (
     AccessDeniedError,
@@ -17,7 +15,7 @@ from app.fetching.polite_fetch import (
 )
 from app.config.settings import settings
 
-from .url_pool import normalize_url, pool_path_for_profile
+from .url_pool import open_pool_store
 
 UNAVAILABLE_MARKERS = (
     "Diese Stellenanzeige ist nicht mehr verfügbar",
@@ -40,50 +38,6 @@ class _RateLimiter:
             self._next_ts = time.monotonic() + random.uniform(self._min, self._max)
 
 
-def _now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-
-
-def _append_unavailable(
-    path: Path,
-    urls: Iterable[str],
-    *,
-    run_id: str,
-    reason: str = "stepstone_unavailable",
-) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    now = _now_iso()
-    with path.open("a", encoding="utf-8") as handle:
-        for url in urls:
-            payload = {"url": url, "seen_at": now, "run_id": run_id, "reason": reason}
-            handle.write(json.dumps(payload, ensure_ascii=False) + "\n")
-
-
-def _load_pool_entries(path: Path) -> Tuple[List[Tuple[str, Optional[str]]], List[str]]:
-    entries: List[Tuple[str, Optional[str]]] = []
-    unique_urls: List[str] = []
-    seen: set[str] = set()
-    if not path.exists():
-        return entries, unique_urls
-    with path.open("r", encoding="utf-8") as handle:
-        for line in handle:
-            raw = line.rstrip("\n")
-            if not raw:
-                entries.append((line, None))
-                continue
-            try:
-                payload = json.loads(raw)
-            except json.JSONDecodeError:
-                entries.append((line, None))
-                continue
-            url_norm = normalize_url(str(payload.get("url") or ""))
-            entries.append((line, url_norm if url_norm else None))
-            if url_norm and url_norm not in seen:
-                seen.add(url_norm)
-                unique_urls.append(url_norm)
-    return entries, unique_urls
-
-
 def _telemetry_status_hint(telemetry: Dict[str, Any]) -> Optional[int]:
     if "status" in telemetry and isinstance(telemetry["status"], int):
         return telemetry["status"]
@@ -103,9 +57,9 @@ async def _check_unavailable_polite(
     timeout_sec: float,
     preferred_backend: Optional[str],
     limiter: Optional[_RateLimiter] = None,
-) -> Tuple[str, bool, Optional[str], bool]:
+) -> Tuple[str, bool, Optional[str], bool, Optional[int]]:
     """
-    Returns: (url, unavailable, error_str, access_denied)
+    Returns: (url, unavailable, error_str, access_denied, http_status)
     access_denied=True means we should NOT prune (keep URL) and just count it.
     """
     async with sem:
@@ -118,16 +72,16 @@ async def _check_unavailable_polite(
             )
             status = _telemetry_status_hint(telemetry)
             if status in (404, 410):
-                return url, True, None, False
+                return url, True, None, False, status
             if html and any(marker in html for marker in UNAVAILABLE_MARKERS):
-                return url, True, None, False
-            return url, False, None, False
+                return url, True, None, False, status
+            return url, False, None, False, status
         except asyncio.TimeoutError:
-            return url, False, f"timeout_after={timeout_sec}s", False
+            return url, False, f"timeout_after={timeout_sec}s", False, None
         except AccessDeniedError as exc:
-            return url, False, str(exc), True
+            return url, False, str(exc), True, getattr(exc, "status", None)
         except (RobotsDisallowedError, TransientFetchError, FetchError) as exc:
-            return url, False, str(exc), False
+            return url, False, str(exc), False, getattr(exc, "status", None)
 
 
 def prune_unavailable_stepstone_urls(
@@ -140,15 +94,16 @@ def prune_unavailable_stepstone_urls(
     run_id: str,
     preferred_backend: Optional[str] = None,
 ) -> Dict[str, Any]:
-    pool_path = pool_path_for_profile(profile_dir)
-    entries, unique_urls = _load_pool_entries(pool_path)
-    urls_to_check = unique_urls[: max(0, int(max_urls))]
+    pool = open_pool_store(profile_dir)
+    active_total = pool.count()
+    urls_to_check = pool.urls(limit=max(0, int(max_urls)))
 
     if logger:
-        logger.info(f"Loaded {len(unique_urls)} unique URLs from pool")
+        logger.info(f"Loaded {active_total} unique URLs from pool")
         logger.info(f"Checking up to {len(urls_to_check)} URLs for availability")
 
     removed: set[str] = set()
+    statuses: Dict[str, Optional[int]] = {}
     access_denied = 0
     fetch_errors = 0
     aborted = False
@@ -175,9 +130,11 @@ def prune_unavailable_stepstone_urls(
         try:
             for coro in asyncio.as_completed(tasks):
                 try:
-                    url, unavailable, err, denied = await coro
+                    url, unavailable, err, denied, http_status = await coro
                 except asyncio.CancelledError:
                     continue
+                if http_status is not None:
+                    statuses[url] = http_status
                 if denied:
                     access_denied += 1
                     aborted = True
@@ -207,25 +164,14 @@ def prune_unavailable_stepstone_urls(
         asyncio.run(_run())
 
     removed_count = len(removed)
-    if removed_count and entries:
-        tmp_path = pool_path.with_suffix(".tmp")
-        with tmp_path.open("w", encoding="utf-8") as handle:
-            for raw_line, url_norm in entries:
-                if url_norm and url_norm in removed:
-                    continue
-                if raw_line.endswith("\n"):
-                    handle.write(raw_line)
-                else:
-                    handle.write(raw_line + "\n")
-        tmp_path.replace(pool_path)
-        if logger:
-            logger.info(f"Rewrote active pool without {removed_count} URLs")
-
+    pool.set_status(statuses)
     if removed:
-        unavailable_path = profile_dir / "url_pool_unavailable.jsonl"
-        _append_unavailable(unavailable_path, sorted(removed), run_id=run_id)
+        pool.mark_inactive(sorted(removed), reason="stepstone_unavailable")
+        if logger:
+            logger.info(f"Marked {removed_count} URLs inactive in the pool")
+    pool.close()
 
-    kept_active = max(0, len(unique_urls) - removed_count)
+    kept_active = max(0, active_total - removed_count)
     return {
         "checked_total": len(urls_to_check),
         "removed_unavailable": removed_count,
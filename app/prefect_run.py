@@ -7,19 +7,33 @@ import argparse
 from dataclasses import dataclass, asdict
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Sequence
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from dotenv import load_dotenv
 from prefect import flow, get_run_logger, task
 
 from app.config.settings import settings
 from app.config.focus import DEFAULT_FOCUS, get_focus_config
+from .fetching.polite_fetch import FETCH_BACKENDS, REPLAY_BACKEND, close_fetch_resources
+from .pipeline.executors import get_cpu_executor, warm_up_cpu_executor
+from .pipeline.llm_batch import run_deferred_llm
+from .pipeline.llm_enrich import close_async_client
+from .pipeline.llm_scheduler import LLM_SCHEDULER
 from .pipeline.pipeline import fetch_job_details, write_job_bundle
-from .pipeline.state import load_state, save_state
+from .pipeline.cache_maintenance import MaintenancePolicy, run_maintenance
+from .pipeline.cache_store import import_json_cache
+from .pipeline.state import CACHE_DIR, get_cache_store, load_state, save_state
 from .stepstone.search_http import search_stepstone
 from .stepstone.search_playwright import search_stepstone_pw
 from .pipeline.output import write_summary
-from .pipeline.url_pool import append_pool_entries, load_pool_set, normalize_url, pool_path_for_profile
+from .pipeline.url_pool import (
+    UrlPoolStore,
+    normalize_url,
+    open_pool_store,
+    pool_path_for_profile,
+    pool_store_path_for_profile,
+    unavailable_path_for_profile,
+)
 from .common.utils import ensure_dir
 from .stepstone.dates import parse_iso8601_utc
 
@@ -93,7 +107,7 @@ def _search_seed_task(
     seed: SeedConfig,
 ) -> Dict[str, Any]:
     if seed.use_playwright:
-        return asyncio.run(
+        return _run_with_fetch_cleanup(
             search_stepstone_pw(
                 seed.seed_url,
                 pages=None,
@@ -165,51 +179,59 @@ def _write_seed_urls(
     return path
 
 
-@task(name="Process job")
-def _process_job_task(
+def _resolve_focus(profile_key: Optional[str], logger):
+    # Resolve focus/profile consistently with FastAPI
+    try:
+        return get_focus_config(profile_key) if profile_key else DEFAULT_FOCUS
+    except Exception as exc:
+        logger.warning("Unknown profile_key=%s; falling back to DEFAULT_FOCUS (%s)", profile_key, exc)
+        return DEFAULT_FOCUS
+
+
+async def _process_job(
     url: str,
     seed_slug: str,
     cutoff_iso: Optional[str],
     *,
     backend: str = "auto",
     profile_key: Optional[str],
+    focus,
     use_llm_scoring: bool,
     apply_blocker_cap: bool,
+    logger,
+    deferred_llm: bool = False,
 ) -> Dict[str, Any]:
-    logger = get_run_logger()
-
-    # Resolve focus/profile consistently with FastAPI
-    try:
-        focus = get_focus_config(profile_key) if profile_key else DEFAULT_FOCUS
-    except Exception as exc:
-        logger.warning("Unknown profile_key=%s; falling back to DEFAULT_FOCUS (%s)", profile_key, exc)
-        focus = DEFAULT_FOCUS
-
+    if deferred_llm:
+        return await _stage_job(
+            url,
+            seed_slug,
+            cutoff_iso,
+            backend=backend,
+            profile_key=profile_key,
+            focus=focus,
+            apply_blocker_cap=apply_blocker_cap,
+        )
     try:
-        details = asyncio.run(
-            fetch_job_details(
-                url,
-                backend=backend,  # IMPORTANT: no more None drift
-                enrich=True,
-                score=True,
-                cutoff_iso=cutoff_iso,
-                focus=focus,
-                use_llm_scoring=use_llm_scoring,
-                apply_blocker_cap=apply_blocker_cap,
-            )
+        details = await fetch_job_details(
+            url,
+            backend=backend,  # IMPORTANT: no more None drift
+            enrich=True,
+            score=True,
+            cutoff_iso=cutoff_iso,
+            focus=focus,
+            use_llm_scoring=use_llm_scoring,
+            apply_blocker_cap=apply_blocker_cap,
         )
     except TypeError:
         # If the pipeline signature doesn't yet include these kwargs, prefer
         # running without them over crashing the batch run.
-        details = asyncio.run(
-            fetch_job_details(
-                url,
-                backend=backend,
-                enrich=True,
-                score=True,
-                cutoff_iso=cutoff_iso,
-                focus=focus,
-            )
+        details = await fetch_job_details(
+            url,
+            backend=backend,
+            enrich=True,
+            score=True,
+            cutoff_iso=cutoff_iso,
+            focus=focus,
         )
     except Exception as exc:
         return {
@@ -231,6 +253,60 @@ def _process_job_task(
             "backend": backend,
         }
 
+    return _finalize_job(url, seed_slug, details, profile_key=profile_key, backend=backend, logger=logger)
+
+
+async def _stage_job(
+    url: str,
+    seed_slug: str,
+    cutoff_iso: Optional[str],
+    *,
+    backend: str,
+    profile_key: Optional[str],
+    focus,
+    apply_blocker_cap: bool,
+) -> Dict[str, Any]:
+    """Deferred-LLM first pass: fetch, parse and heuristic-score only."""
+    try:
+        details = await fetch_job_details(
+            url,
+            backend=backend,
+            enrich=False,
+            score=True,
+            cutoff_iso=cutoff_iso,
+            focus=focus,
+            use_llm_scoring=False,
+            apply_blocker_cap=apply_blocker_cap,
+        )
+    except Exception as exc:
+        return {
+            "url": url,
+            "seed_slug": seed_slug,
+            "status": "error",
+            "error": str(exc),
+            "profile_key": profile_key,
+            "backend": backend,
+        }
+    return {
+        "url": url,
+        "seed_slug": seed_slug,
+        "status": "stale" if details.get("stale") else "staged",
+        "details": details,
+        "profile_key": profile_key,
+        "backend": backend,
+    }
+
+
+def _finalize_job(
+    url: str,
+    seed_slug: str,
+    details: Dict[str, Any],
+    *,
+    profile_key: Optional[str],
+    backend: str,
+    logger,
+) -> Dict[str, Any]:
+    """Apply the keep threshold to a scored job and write its bundle."""
     job = details.get("job") or {}
     scoring = details.get("scoring")
     if scoring:
@@ -292,6 +368,191 @@ def _process_job_task(
     }
 
 
+def _log_job_result(logger, item: Dict[str, Any], result: Dict[str, Any]) -> None:
+    status = result.get("status")
+    if status == "processed":
+        logger.info(
+            f"Processed {item['url']} ({item['seed_slug']}) -> {result.get('bundle_dir')}"
+        )
+    elif status == "stale":
+        logger.info(f"Skipping stale job {item['url']} ({item['seed_slug']})")
+    elif status == "staged":
+        logger.debug(f"Staged {item['url']} ({item['seed_slug']}) for the deferred LLM batch")
+    else:
+        detail = result.get("error")
+        if not detail and status == "rejected_low_score":
+            score_val = ((result.get("details") or {}).get("scoring") or {}).get("score")
+            detail = f"score={score_val} threshold={result.get('threshold')}"
+        logger.warning(
+            "Job %s (%s) finished with status %s: %s",
+            item["url"],
+            item["seed_slug"],
+            status,
+            detail,
+        )
+
+
+def _run_with_fetch_cleanup(coro):
+    """asyncio.run() a coroutine and release pooled fetch/LLM clients before the loop closes."""
+
+    async def _runner():
+        try:
+            return await coro
+        finally:
+            await close_fetch_resources()
+            await close_async_client()
+
+    return asyncio.run(_runner())
+
+
+async def _process_jobs_concurrently(
+    items: Sequence[Dict[str, Any]],
+    cutoff_iso: Optional[str],
+    *,
+    workers: int,
+    backend: str,
+    profile_key: Optional[str],
+    focus,
+    use_llm_scoring: bool,
+    apply_blocker_cap: bool,
+    logger,
+    deferred_llm: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Run fetch/enrich/score/bundle for many jobs on one event loop. Workers pull
+    from a shared queue; per-domain pacing still comes from polite_fetch, where
+    each request reserves a token from the domain's AIMD bucket and sleeps
+    outside the lock, so extra workers queue behind each other and overlap
+    LLM/parse time rather than hitting StepStone harder. Results keep the
+    input order.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    queue: asyncio.Queue = asyncio.Queue()
+    for idx, item in enumerate(items):
+        queue.put_nowait((idx, item))
+
+    async def _worker() -> None:
+        while True:
+            try:
+                idx, item = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                result = await _process_job(
+                    item["url"],
+                    item["seed_slug"],
+                    cutoff_iso,
+                    backend=backend,
+                    profile_key=profile_key,
+                    focus=focus,
+                    use_llm_scoring=use_llm_scoring,
+                    apply_blocker_cap=apply_blocker_cap,
+                    logger=logger,
+                    deferred_llm=deferred_llm,
+                )
+            except Exception as exc:
+                result = {
+                    "url": item["url"],
+                    "seed_slug": item["seed_slug"],
+                    "status": "error",
+                    "error": str(exc),
+                    "profile_key": profile_key,
+                    "backend": backend,
+                }
+            _log_job_result(logger, item, result)
+            results[idx] = result
+
+    worker_count = max(1, min(int(workers), len(items)))
+    await asyncio.gather(*(_worker() for _ in range(worker_count)))
+    return [res for res in results if res is not None]
+
+
+@task(name="Process jobs concurrently")
+def _process_jobs_concurrent_task(
+    items: List[Dict[str, Any]],
+    cutoff_iso: Optional[str],
+    *,
+    workers: int,
+    backend: str = "auto",
+    profile_key: Optional[str],
+    use_llm_scoring: bool,
+    apply_blocker_cap: bool,
+    deferred_llm: bool = False,
+) -> List[Dict[str, Any]]:
+    logger = get_run_logger()
+    focus = _resolve_focus(profile_key, logger)
+    return _run_with_fetch_cleanup(
+        _process_jobs_concurrently(
+            items,
+            cutoff_iso,
+            workers=workers,
+            backend=backend,
+            profile_key=profile_key,
+            focus=focus,
+            use_llm_scoring=use_llm_scoring,
+            apply_blocker_cap=apply_blocker_cap,
+            logger=logger,
+            deferred_llm=deferred_llm,
+        )
+    )
+
+
+@task(name="Deferred LLM batch")
+def _deferred_llm_task(
+    processed: List[Dict[str, Any]],
+    *,
+    run_path: Path,
+    profile_key: Optional[str],
+    backend: str,
+    use_llm_scoring: bool,
+    apply_blocker_cap: bool,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Send every staged job's enrichment (+ LLM scoring) prompt as one Batch API
+    job, then apply the keep threshold and write bundles as the inline path
+    would. Returns a copy of ``processed`` with the staged entries replaced by
+    their final results, plus the batch stats.
+    """
+    logger = get_run_logger()
+    focus = _resolve_focus(profile_key, logger)
+    staged = [idx for idx, res in enumerate(processed) if res.get("status") == "staged"]
+    if not staged:
+        return list(processed), {"jobs": 0, "submitted": 0, "status": "skipped"}
+
+    logger.info(f"Submitting {len(staged)} staged jobs as one LLM batch")
+    stats = run_deferred_llm(
+        [processed[idx]["details"] for idx in staged],
+        focus=focus,
+        use_llm_scoring=use_llm_scoring,
+        apply_blocker_cap=apply_blocker_cap,
+        work_dir=run_path / "llm_batch",
+    )
+    logger.info(
+        "LLM batch %s finished status=%s submitted=%s cache_hits=%s failed=%s",
+        stats.get("batch_id"),
+        stats.get("status"),
+        stats.get("submitted"),
+        stats.get("cache_hits"),
+        stats.get("failed"),
+    )
+
+    finalized = list(processed)
+    for idx in staged:
+        staged_res = processed[idx]
+        details = staged_res["details"]
+        result = _finalize_job(
+            staged_res["url"],
+            staged_res["seed_slug"],
+            details,
+            profile_key=profile_key,
+            backend=backend,
+            logger=logger,
+        )
+        _log_job_result(logger, staged_res, result)
+        finalized[idx] = result
+    return finalized, stats
+
+
 @flow(name="Crawl StepStone Seeds")
 def crawl_and_save_flow(
     seeds: Optional[Sequence[SeedConfig]] = None,
@@ -340,10 +601,15 @@ def process_run_flow(
     use_llm_scoring: Optional[bool] = None,
     apply_blocker_cap: Optional[bool] = None,
     run_id: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    deferred_llm: Optional[bool] = None,
 ) -> Dict[str, Any]:
     """
     Load the latest crawl run, deduplicate job URLs, then fetch job details and
-    generate bundles.
+    generate bundles. With concurrency > 1 jobs are processed by a bounded
+    worker pool on a single event loop. With deferred_llm, jobs are first
+    staged with heuristic scores and all LLM prompts go out as one OpenAI
+    Batch API job before thresholds and bundles are applied.
     """
     logger = get_run_logger()
     backend = backend or "auto"
@@ -353,15 +619,23 @@ def process_run_flow(
         use_llm_scoring = bool(getattr(settings, "use_llm_scoring", False))
     if apply_blocker_cap is None:
         apply_blocker_cap = bool(getattr(settings, "apply_blocker_cap", False))
+    if concurrency is None:
+        concurrency = int(getattr(settings, "process_concurrency", 1) or 1)
+    workers = max(1, int(concurrency))
+    if deferred_llm is None:
+        deferred_llm = bool(getattr(settings, "llm_deferred_mode", False))
 
     logger.info(
-        "process_run_flow: profile_key=%s backend=%s use_llm_scoring=%s apply_blocker_cap=%s cutoff_iso=%s",
+        "process_run_flow: profile_key=%s backend=%s use_llm_scoring=%s apply_blocker_cap=%s cutoff_iso=%s concurrency=%s deferred_llm=%s",
         profile_key,
         backend,
         use_llm_scoring,
         apply_blocker_cap,
         cutoff_iso,
+        workers,
+        deferred_llm,
     )
+    warm_up_cpu_executor()
 
     forced_root = os.getenv("JOBAGENT_OUTPUT_ROOT")
     if forced_root:
@@ -418,52 +692,50 @@ def process_run_flow(
     logger.info(f"Collected {len(queue)} unique URLs to process")
 
     profile_dir = run_path.parent
-    pool_path = pool_path_for_profile(profile_dir)
-    pool_set = load_pool_set(pool_path)
-    pool_size_before = len(pool_set)
+    pool = open_pool_store(profile_dir)
+    pool_size_before = pool.count()
+    # Archive replays re-run already pooled URLs offline and must not grow the pool.
+    replay = backend == REPLAY_BACKEND
+    in_pool = set() if replay else pool.known(item.get("url") or "" for item in queue)
 
     accepted: List[Dict[str, Any]] = []
     for item in queue:
         url_norm = normalize_url(item.get("url") or "")
         item["url_norm"] = url_norm
-        if not url_norm or url_norm in pool_set:
+        if not url_norm or url_norm in in_pool:
             continue
         accepted.append(item)
 
     skipped_pool_existing = len(queue) - len(accepted)
     logger.info(f"Skipping {skipped_pool_existing} URLs already in pool")
 
+    # One event loop for the whole batch, even with a single worker, so pooled
+    # HTTP/LLM clients and warm browsers are reused across jobs and released once.
     processed: List[Dict[str, Any]] = []
-    for item in accepted:
-        result = _process_job_task(
-            item["url"],
-            item["seed_slug"],
+    if accepted:
+        if workers > 1:
+            logger.info(f"Processing {len(accepted)} jobs with {workers} concurrent workers")
+        processed = _process_jobs_concurrent_task(
+            accepted,
             cutoff_iso,
+            workers=workers,
+            profile_key=profile_key,
+            backend=backend,
+            use_llm_scoring=use_llm_scoring,
+            apply_blocker_cap=apply_blocker_cap,
+            deferred_llm=deferred_llm,
+        )
+
+    deferred_stats = None
+    if deferred_llm:
+        processed, deferred_stats = _deferred_llm_task(
+            processed,
+            run_path=run_path,
             profile_key=profile_key,
             backend=backend,
             use_llm_scoring=use_llm_scoring,
             apply_blocker_cap=apply_blocker_cap,
         )
-        status = result.get("status")
-        if status == "processed":
-            logger.info(
-                f"Processed {item['url']} ({item['seed_slug']}) -> {result.get('bundle_dir')}"
-            )
-        elif status == "stale":
-            logger.info(f"Skipping stale job {item['url']} ({item['seed_slug']})")
-        else:
-            detail = result.get("error")
-            if not detail and status == "rejected_low_score":
-                score_val = ((result.get("details") or {}).get("scoring") or {}).get("score")
-                detail = f"score={score_val} threshold={result.get('threshold')}"
-            logger.warning(
-                "Job %s (%s) finished with status %s: %s",
-                item["url"],
-                item["seed_slug"],
-                status,
-                detail,
-            )
-        processed.append(result)
 
     reports: List[Dict[str, Any]] = []
     for result in processed:
@@ -522,8 +794,8 @@ def process_run_flow(
         if status in terminal_statuses and url_val:
             pool_urls.append(url_val)
     run_id_label = run_id or os.getenv("JOBAGENT_RUN_ID") or run_path.name
-    append_pool_entries(pool_path, pool_urls, run_id=run_id_label)
-    pool_set.update({normalize_url(url) for url in pool_urls if normalize_url(url)})
+    if not replay:
+        pool.add_urls(pool_urls, run_id=run_id_label)
 
     status_counts = {
         "processed": 0,
@@ -533,17 +805,29 @@ def process_run_flow(
         "error": 0,
         "bundle_failed": 0,
     }
+    pool_size_after = pool.count()
+    pool.close()
+    llm_skip_reasons: Dict[str, int] = {}
     for res in processed:
         status = res.get("status")
         if status in status_counts:
             status_counts[status] += 1
+        skip_reason = ((res.get("details") or {}).get("scoring") or {}).get("llm_skipped_reason")
+        if skip_reason:
+            llm_skip_reasons[skip_reason] = llm_skip_reasons.get(skip_reason, 0) + 1
 
     run_metrics = {
         "discovered_total": len(queue),
         "skipped_pool_existing": skipped_pool_existing,
         "accepted_new": len(accepted),
         "pool_size_before": pool_size_before,
-        "pool_size_after": len(pool_set),
+        "pool_size_after": pool_size_after,
+        "concurrency": workers,
+        "cpu_executor": get_cpu_executor().stats(),
+        "deferred_llm": deferred_stats,
+        "llm_scheduler": LLM_SCHEDULER.stats(),
+        "llm_calls_saved": sum(llm_skip_reasons.values()),
+        "llm_skip_reasons": llm_skip_reasons,
         **status_counts,
     }
     potential_urls = [
@@ -628,8 +912,8 @@ def _parse_cli_args() -> argparse.Namespace:
         "--backend",
         type=str,
         default="auto",
-        choices=["auto", "http", "pw"],
-        help="Fetch backend to use.",
+        choices=list(FETCH_BACKENDS),
+        help="Fetch backend to use ('archive' replays saved HTML without network access).",
     )
 
     llm_group = process_parser.add_mutually_exclusive_group()
@@ -647,6 +931,61 @@ def _parse_cli_args() -> argparse.Namespace:
         default=None,
         help="Process a specific run directory name.",
     )
+    process_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Number of jobs processed concurrently (default: JOBAGENT_PROCESS_CONCURRENCY or 1).",
+    )
+    deferred_group = process_parser.add_mutually_exclusive_group()
+    deferred_group.add_argument(
+        "--deferred-llm",
+        dest="deferred_llm",
+        action="store_true",
+        help="Stage heuristic results and run all LLM prompts as one OpenAI Batch API job.",
+    )
+    deferred_group.add_argument("--no-deferred-llm", dest="deferred_llm", action="store_false")
+    process_parser.set_defaults(deferred_llm=None)
+
+    migrate_parser = sub.add_parser(
+        "migrate-cache",
+        help="Import the one-file-per-entry JSON cache into the configured cache store.",
+    )
+    migrate_parser.add_argument(
+        "--source-dir",
+        type=Path,
+        default=CACHE_DIR,
+        help="Directory with the JSON cache files (default: <output>/_cache).",
+    )
+    migrate_parser.add_argument("--delete", action="store_true", help="Remove JSON files once imported.")
+
+    pool_parser = sub.add_parser(
+        "import-url-pool",
+        help="Import url_pool.jsonl / url_pool_unavailable.jsonl of a profile into its indexed pool store.",
+    )
+    pool_parser.add_argument("profile_dirs", nargs="+", type=Path, help="Profile directories (containing url_pool.jsonl).")
+
+    maint_parser = sub.add_parser(
+        "cache-maintenance",
+        help="Report cache/URL pool/run directory usage and evict by TTL, size budget and stale versions.",
+    )
+    maint_parser.add_argument("--dry-run", action="store_true", help="Only report what would be evicted.")
+    maint_parser.add_argument("--ttl-days", type=float, default=None, help="Cache entry TTL (default: JOBAGENT_CACHE_TTL_DAYS).")
+    maint_parser.add_argument("--max-mb", type=int, default=None, help="Cache size budget (default: JOBAGENT_CACHE_MAX_MB).")
+    maint_parser.add_argument(
+        "--keep-stale-versions",
+        dest="evict_stale_versions",
+        action="store_false",
+        default=None,
+        help="Keep entries scored with older scoring versions.",
+    )
+    maint_parser.add_argument("--pool-ttl-days", type=float, default=None, help="Drop URL pool entries older than this.")
+    maint_parser.add_argument(
+        "--run-retention-days",
+        type=float,
+        default=None,
+        help="Delete run directories older than this (default: JOBAGENT_MAINTENANCE_RUN_RETENTION_DAYS).",
+    )
 
     return parser.parse_args()
 
@@ -676,7 +1015,36 @@ def _cli_entry() -> None:
             use_llm_scoring=args.use_llm_scoring,
             apply_blocker_cap=args.apply_blocker_cap,
             run_id=args.run_id,
+            concurrency=args.concurrency,
+            deferred_llm=args.deferred_llm,
+        )
+    elif args.command == "migrate-cache":
+        store = get_cache_store()
+        if store.backend == "json":
+            raise ValueError("migrate-cache needs JOBAGENT_CACHE_BACKEND=sqlite")
+        counts = import_json_cache(args.source_dir, store, delete=args.delete)
+        print(json.dumps({**counts, "store": store.stats()}, indent=2))
+    elif args.command == "import-url-pool":
+        for profile_dir in args.profile_dirs:
+            # open_pool_store would auto-import a fresh store before the explicit import below
+            pool = UrlPoolStore(pool_store_path_for_profile(profile_dir))
+            report = {
+                "active": pool.import_jsonl(pool_path_for_profile(profile_dir)),
+                "unavailable": pool.import_jsonl(unavailable_path_for_profile(profile_dir), active=False),
+                "store": pool.stats(),
+            }
+            pool.close()
+            print(json.dumps(report, indent=2))
+    elif args.command == "cache-maintenance":
+        policy = MaintenancePolicy.from_settings(
+            dry_run=args.dry_run,
+            ttl_days=args.ttl_days,
+            max_bytes=(args.max_mb * 1024 * 1024 if args.max_mb is not None else None),
+            evict_stale_versions=args.evict_stale_versions,
+            pool_ttl_days=args.pool_ttl_days,
+            run_retention_days=args.run_retention_days,
         )
+        print(json.dumps(run_maintenance(policy), indent=2, ensure_ascii=False))
     else:
         raise ValueError(f"Unsupported command {args.command}")
 
@@ -6,9 +6,11 @@ from urllib.parse import urljoin, urlparse, parse_qs, urlencode, urlunparse
 from datetime import datetime, timezone
 
 from loguru import logger
-from playwright.async_api import async_playwright, TimeoutError as PWTimeout
+from playwright.async_api import TimeoutError as PWTimeout
 from playwright._impl._errors import Error as PWError
 
+from ..fetching.browser_pool import get_browser_pool
+from ..fetching.page_profile import install_resource_blocking, search_profile
 from .dates import (
     isoformat_utc,
     parse_stepstone_listing_date,
@@ -22,6 +24,24 @@ RESULT_COUNT_RE = re.compile(r"(\d[\d\.]*)\s+Treffer", re.IGNORECASE)
 PAGE_LAST_RE = re.compile(r"data-page-last=\"(\d+)\"")
 JSON_LD_RE = re.compile(r"<script[^>]+type=\"application/ld\+json\"[^>]*>(.*?)</script>", re.DOTALL | re.IGNORECASE)
 PER_PAGE_DEFAULT = 25
+SEARCH_LAUNCH_ARGS = (
+    "--disable-blink-features=AutomationControlled",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-http2",  # <- important for this CDN
+    "--disable-features=IsolateOrigins,site-per-process",
+)
+SEARCH_CONTEXT_OPTIONS = {
+    "locale": "de-DE",
+    "ignore_https_errors": True,
+    "user_agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130 Safari/537.36",
+    "extra_http_headers": {
+        "Accept-Language": "de-DE,de;q=0.9,en;q=0.8",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "DNT": "1",
+        "Upgrade-Insecure-Requests": "1",
+    },
+}
 def _with_page(url: str, page_num: int) -> str:
     u = urlparse(url)
     qs = parse_qs(u.query)
@@ -228,30 +248,12 @@ async def search_stepstone_pw(
     # stop_urls are kept for backwards compatibility but no longer drive crawling
     # stop_set = {s.strip() for s in (stop_urls or []) if s}
 
-    async with async_playwright() as pw:
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--disable-blink-features=AutomationControlled",
-                "--no-sandbox",
-                "--disable-dev-shm-usage",
-                "--disable-http2",  # <- important for this CDN
-                "--disable-features=IsolateOrigins,site-per-process",
-            ],
-        )
-        ctx = await browser.new_context(
-            locale="de-DE",
-            ignore_https_errors=True,
-            user_agent="Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130 Safari/537.36",
-            extra_http_headers={
-                "Accept-Language": "de-DE,de;q=0.9,en;q=0.8",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-                "DNT": "1",
-                "Upgrade-Insecure-Requests": "1",
-            },
-        )
-        page = await ctx.new_page()
-
+    async with get_browser_pool().page(
+        context_options=SEARCH_CONTEXT_OPTIONS,
+        launch_args=SEARCH_LAUNCH_ARGS,
+        headless=True,
+    ) as page:
+        resource_stats = await install_resource_blocking(page, search_profile())
         all_jobs: List[Dict[str, Any]] = []
         seen_urls: set[str] = set()
         page_hits: List[Dict] = []
@@ -261,72 +263,73 @@ async def search_stepstone_pw(
         per_page = PER_PAGE_DEFAULT
         empty_streak = 0
 
-        try:
-            # warm-up: hit root domain first, accept cookies once
-            root = "https://www.stepstone.de/"
-            await _safe_goto(page, root, try_accept_cookies=True)
+        # warm-up: hit root domain first, accept cookies once
+        root = "https://www.stepstone.de/"
+        await _safe_goto(page, root, try_accept_cookies=True)
 
-            p = 1
-            while True:
-                page_url = _with_page(seed_url, p)
-                try:
-                    await _safe_goto(page, page_url)
-                except (PWTimeout, PWError) as exc:
-                    logger.warning("playwright goto failed for {} page {}: {}", seed_url, p, exc)
-                    break
-                try:
-                    await page.wait_for_selector('[data-at="job-item"]', timeout=12000)
-                except Exception:
-                    # fallback: give the client additional time to render lazy results
-                    await page.wait_for_timeout(2000)
+        p = 1
+        while True:
+            page_url = _with_page(seed_url, p)
+            try:
+                await _safe_goto(page, page_url)
+            except (PWTimeout, PWError) as exc:
+                logger.warning("playwright goto failed for {} page {}: {}", seed_url, p, exc)
+                break
+            try:
+                await page.wait_for_selector('[data-at="job-item"]', timeout=12000)
+            except Exception:
+                # fallback: give the client additional time to render lazy results
+                await page.wait_for_timeout(2000)
 
-                # gentle scroll to trigger lazy lists
+            # gentle scroll to trigger lazy lists, only when the list looks incomplete
+            try:
+                item_count = len(await page.query_selector_all('[data-at="job-item"]'))
+            except Exception:
+                item_count = 0
+            if item_count < per_page:
                 for _ in range(3):
                     await page.mouse.wheel(0, 1600)
                     await page.wait_for_timeout(350)
 
-                page_html = await page.content()
-                jobs = await _extract_job_entries(page, include_titles_any, exclude_titles_any)
+            page_html = await page.content()
+            jobs = await _extract_job_entries(page, include_titles_any, exclude_titles_any)
 
-                added = 0
-                for job in jobs:
-                    url = job["url"]
-                    if url in seen_urls:
-                        continue
-                    seen_urls.add(url)
-                    all_jobs.append(job); added += 1
-                    if max_jobs and len(all_jobs) >= max_jobs:
-                        break
+            added = 0
+            for job in jobs:
+                url = job["url"]
+                if url in seen_urls:
+                    continue
+                seen_urls.add(url)
+                all_jobs.append(job); added += 1
+                if max_jobs and len(all_jobs) >= max_jobs:
+                    break
 
-                page_hits.append({"page": p, "url": page.url, "found": added})
+            page_hits.append({"page": p, "url": page.url, "found": added})
 
-                empty_streak = empty_streak + 1 if added == 0 else 0
+            empty_streak = empty_streak + 1 if added == 0 else 0
 
-                if p == 1 and target_pages is None:
-                    estimated_pages = _estimate_total_pages_from_html(page_html, per_page=per_page)
-                    if estimated_pages:
-                        target_pages = min(estimated_pages, guard)
+            if p == 1 and target_pages is None:
+                estimated_pages = _estimate_total_pages_from_html(page_html, per_page=per_page)
+                if estimated_pages:
+                    target_pages = min(estimated_pages, guard)
 
-                if target_pages is None:
-                    target_pages = guard
+            if target_pages is None:
+                target_pages = guard
 
-                if max_jobs:
-                    pages_from_jobs = max(1, math.ceil(max_jobs / per_page))
-                    target_pages = min(target_pages, pages_from_jobs)
+            if max_jobs:
+                pages_from_jobs = max(1, math.ceil(max_jobs / per_page))
+                target_pages = min(target_pages, pages_from_jobs)
 
-                if max_jobs and len(all_jobs) >= max_jobs:
-                    break
-                if target_pages and p >= target_pages:
-                    break
-                if empty_streak >= 5:
-                    logger.debug("Stopping {} after {} empty pages ({} total urls)", seed_url, empty_streak, len(all_jobs))
-                    break
+            if max_jobs and len(all_jobs) >= max_jobs:
+                break
+            if target_pages and p >= target_pages:
+                break
+            if empty_streak >= 5:
+                logger.debug("Stopping {} after {} empty pages ({} total urls)", seed_url, empty_streak, len(all_jobs))
+                break
 
-                p += 1
-                await page.wait_for_timeout(int(1200 * delay_sec * random.uniform(0.8, 1.4)))
-        finally:
-            await ctx.close()
-            await browser.close()
+            p += 1
+            await page.wait_for_timeout(int(1200 * delay_sec * random.uniform(0.8, 1.4)))
 
     return {
         "ok": True,
@@ -337,6 +340,7 @@ async def search_stepstone_pw(
         "count": len(all_jobs),
         "estimated_total_pages": estimated_pages,
         "target_pages": target_pages,
+        "resources": resource_stats.as_dict(),
         "urls": [job["url"] for job in all_jobs],
         "jobs": [
             {
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: fast JSON-LD extraction vs. the full-DOM parser path."""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.pipeline import parsers  # noqa: E402
+
+
+def _load_pages(paths: List[Path], pad_kb: int) -> Dict[str, str]:
+    pages: Dict[str, str] = {}
+    for path in paths:
+        files = sorted(path.glob("*.html")) if path.is_dir() else [path]
+        for f in files:
+            html = f.read_text(encoding="utf-8", errors="ignore")
+            if pad_kb:
+                # Real detail pages carry hundreds of KB of markup around the JSON-LD.
+                filler = "<div class='x'><span>filler</span><a href='#'>link</a></div>"
+                html = html.replace("</body>", filler * (pad_kb * 1024 // len(filler)) + "</body>")
+            pages[f.name] = html
+    return pages
+
+
+def _time(fn: Callable[[str], object], html: str, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(html)
+    return (time.perf_counter() - start) / iterations * 1000.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark parsers.extract_jobposting_from_html.")
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        type=Path,
+        default=[ROOT / "tests" / "data"],
+        help="HTML files or directories (default: tests/data).",
+    )
+    parser.add_argument("-n", "--iterations", type=int, default=200, help="Runs per page (default: 200).")
+    parser.add_argument(
+        "--pad-kb",
+        type=int,
+        default=0,
+        help="Pad each page body with this many KB of markup to mimic full pages (default: 0).",
+    )
+    args = parser.parse_args()
+
+    pages = _load_pages(args.paths, args.pad_kb)
+    if not pages:
+        parser.error("no HTML pages found")
+
+    print(f"{'page':<32} {'KB':>7} {'dom ms':>9} {'fast ms':>9} {'speedup':>8} parity")
+    for name, html in pages.items():
+        dom_ms = _time(parsers._extract_jobposting_soup, html, args.iterations)
+        fast_ms = _time(parsers.extract_jobposting_from_html, html, args.iterations)
+        same = parsers.extract_jobposting_from_html(html) == parsers._extract_jobposting_soup(html)
+        print(
+            f"{name:<32} {len(html) / 1024:>7.1f} {dom_ms:>9.3f} {fast_ms:>9.3f} "
+            f"{dom_ms / fast_ms if fast_ms else 0:>7.1f}x {'ok' if same else 'DIFF'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
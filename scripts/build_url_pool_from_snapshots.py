@@ -4,13 +4,17 @@ from __future__ import annotations
 import argparse
 import glob
 import json
-import os
-from dataclasses import dataclass
+import sys
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Set
+from typing import Any, Dict, List, Optional
 from urllib.parse import urlsplit, urlunsplit
 
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.pipeline.url_pool import open_pool_store  # noqa: E402
+
 
 def utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
@@ -67,39 +71,6 @@ def seed_slug_from_payload(payload: Dict[str, Any], fallback: str) -> Optional[s
     return fallback or None
 
 
-def load_existing_pool(pool_path: Path) -> Set[str]:
-    """
-    Returns set of URLs (already normalized) that exist in url_pool.jsonl.
-    """
-    if not pool_path.exists():
-        return set()
-
-    seen: Set[str] = set()
-    with pool_path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                obj = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-            u = normalize_url(str(obj.get("url") or ""))
-            if u:
-                seen.add(u)
-    return seen
-
-
-def append_pool_entries(pool_path: Path, entries: Iterable[Dict[str, Any]]) -> int:
-    pool_path.parent.mkdir(parents=True, exist_ok=True)
-    n = 0
-    with pool_path.open("a", encoding="utf-8") as f:
-        for e in entries:
-            f.write(json.dumps(e, ensure_ascii=False) + "\n")
-            n += 1
-    return n
-
-
 def find_profile_dir(outputs_base: Path, profile_key: str, user_id: Optional[str]) -> Path:
     """
     Tries to locate outputs/<user_id>/<profile_key>.
@@ -137,7 +108,7 @@ def main() -> None:
 
     outputs_base = Path(args.outputs_base)
     profile_dir = find_profile_dir(outputs_base, args.profile_key, args.user_id)
-    pool_path = profile_dir / "url_pool.jsonl"
+    pool = open_pool_store(profile_dir)
 
     # Expand snapshot patterns to JSON files
     json_files: List[Path] = []
@@ -172,11 +143,11 @@ def main() -> None:
     else:
         seen_at = utc_now_iso()
 
-    already = load_existing_pool(pool_path)
+    # insertion-ordered set; pool membership is checked once for all of them
+    discovered_urls: Dict[str, None] = {}
 
     new_entries: List[Dict[str, Any]] = []
     discovered = 0
-    added = 0
 
     for jf in json_files:
         payload = load_json(jf)
@@ -199,25 +170,26 @@ def main() -> None:
             nu = normalize_url(u)
             if not nu:
                 continue
-            if nu in already:
+            if nu in discovered_urls:
                 continue
-            already.add(nu)
+            discovered_urls[nu] = None
             new_entries.append({
                 "url": nu,
                 "seen_at": seen_at,
                 "run_id": run_id,
                 "seed_slug": seed_slug,
             })
-            added += 1
 
-    appended = append_pool_entries(pool_path, new_entries)
+    already = pool.known(discovered_urls, active_only=False)
+    new_entries = [e for e in new_entries if e["url"] not in already]
+    added = pool.upsert(new_entries)
+    pool.close()
 
     print(f"profile_dir: {profile_dir}")
-    print(f"pool_path:   {pool_path}")
+    print(f"pool_path:   {pool.path}")
     print(f"inputs:      {len(json_files)} files")
     print(f"discovered:  {discovered} raw urls")
     print(f"added:       {added} new urls")
-    print(f"appended:    {appended} lines written")
 
 
 if __name__ == "__main__":
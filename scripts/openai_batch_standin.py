@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the OpenAI Files + Batch endpoints used by deferred LLM mode.
+
+Implements just enough of the API for the OpenAI SDK:
+POST /v1/files, GET /v1/files/{id}/content, POST /v1/batches, GET /v1/batches/{id}.
+Batches report ``in_progress`` on the first poll and complete on the next one.
+Each request line is answered by a ``responder(body) -> content`` callable.
+An exception from the responder becomes a line in the batch's error file.
+
+Point a process run at it with JOBAGENT_LLM_BATCH_BASE_URL=http://127.0.0.1:8099/v1.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+import uuid
+from email.parser import BytesParser
+from email.policy import default as default_policy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+
+Responder = Callable[[Dict[str, Any]], str]
+
+DEFAULT_REPLY = {
+    "seniority": "Junior",
+    "english_ok": True,
+    "skills_detected": [],
+    "scoring": {
+        "llm_score": 75,
+        "german_requirement": {"type": "none", "min_level": None, "justification": "stand-in"},
+        "risk_flags": [],
+        "critical_blockers": [],
+        "summary": "stand-in reply",
+        "confidence": 0.5,
+    },
+}
+
+
+def _default_responder(body: Dict[str, Any]) -> str:
+    return json.dumps(DEFAULT_REPLY)
+
+
+class BatchStandIn:
+    """In-memory file and batch store shared by the request handlers."""
+
+    def __init__(self, responder: Responder = _default_responder, *, polls_before_complete: int = 1) -> None:
+        self.responder = responder
+        self.polls_before_complete = polls_before_complete
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.batches: Dict[str, Dict[str, Any]] = {}
+        self.polls: Dict[str, int] = {}
+        self.lock = threading.RLock()
+
+    def add_file(self, filename: str, data: bytes, purpose: str) -> Dict[str, Any]:
+        file_id = f"file-{uuid.uuid4().hex[:12]}"
+        obj = {
+            "id": file_id,
+            "object": "file",
+            "bytes": len(data),
+            "created_at": int(time.time()),
+            "filename": filename,
+            "purpose": purpose,
+            "status": "processed",
+        }
+        with self.lock:
+            self.files[file_id] = {"meta": obj, "data": data}
+        return obj
+
+    def create_batch(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        batch_id = f"batch_{uuid.uuid4().hex[:12]}"
+        batch = {
+            "id": batch_id,
+            "object": "batch",
+            "endpoint": payload.get("endpoint"),
+            "input_file_id": payload.get("input_file_id"),
+            "completion_window": payload.get("completion_window", "24h"),
+            "status": "validating",
+            "created_at": int(time.time()),
+            "metadata": payload.get("metadata"),
+            "output_file_id": None,
+            "error_file_id": None,
+            "request_counts": {"total": 0, "completed": 0, "failed": 0},
+        }
+        with self.lock:
+            self.batches[batch_id] = batch
+            self.polls[batch_id] = 0
+        return batch
+
+    def _complete(self, batch: Dict[str, Any]) -> None:
+        data = self.files[batch["input_file_id"]]["data"].decode("utf-8")
+        out_lines, err_lines = [], []
+        for raw in data.splitlines():
+            if not raw.strip():
+                continue
+            req = json.loads(raw)
+            line: Dict[str, Any] = {"id": f"req-{uuid.uuid4().hex[:8]}", "custom_id": req["custom_id"], "error": None}
+            try:
+                content = self.responder(req["body"])
+                line["response"] = {
+                    "status_code": 200,
+                    "request_id": line["id"],
+                    "body": {
+                        "object": "chat.completion",
+                        "model": req["body"].get("model"),
+                        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}}],
+                    },
+                }
+                out_lines.append(line)
+            except Exception as exc:
+                line["response"] = {"status_code": 500, "body": {"error": {"message": str(exc)}}}
+                err_lines.append(line)
+        if out_lines:
+            payload = "\n".join(json.dumps(x) for x in out_lines).encode("utf-8")
+            batch["output_file_id"] = self.add_file("output.jsonl", payload, "batch_output")["id"]
+        if err_lines:
+            payload = "\n".join(json.dumps(x) for x in err_lines).encode("utf-8")
+            batch["error_file_id"] = self.add_file("errors.jsonl", payload, "batch_output")["id"]
+        batch["request_counts"] = {
+            "total": len(out_lines) + len(err_lines),
+            "completed": len(out_lines),
+            "failed": len(err_lines),
+        }
+        batch["status"] = "completed"
+
+    def retrieve_batch(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            batch = self.batches.get(batch_id)
+            if batch is None or batch["status"] == "completed":
+                return batch
+            self.polls[batch_id] += 1
+            if self.polls[batch_id] > self.polls_before_complete:
+                self._complete(batch)
+            else:
+                batch["status"] = "in_progress"
+            return dict(batch)
+
+
+def _handler_for(store: BatchStandIn):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+            return
+
+        def _send(self, status: int, body: Any, content_type: str = "application/json") -> None:
+            data = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _body(self) -> bytes:
+            return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        def do_POST(self) -> None:
+            if self.path.endswith("/files"):
+                raw = self._body()
+                header = f"Content-Type: {self.headers.get('Content-Type')}\r\n\r\n".encode("utf-8")
+                msg = BytesParser(policy=default_policy).parsebytes(header + raw)
+                fields: Dict[str, Tuple[Optional[str], bytes]] = {}
+                for part in msg.iter_parts():
+                    name = part.get_param("name", header="content-disposition")
+                    fields[name] = (part.get_filename(), part.get_payload(decode=True) or b"")
+                filename, data = fields.get("file", ("input.jsonl", b""))
+                purpose = fields.get("purpose", (None, b"batch"))[1].decode("utf-8")
+                self._send(200, store.add_file(filename or "input.jsonl", data, purpose))
+            elif self.path.endswith("/batches"):
+                payload = json.loads(self._body() or b"{}")
+                if payload.get("input_file_id") not in store.files:
+                    self._send(400, {"error": {"message": "unknown input_file_id"}})
+                    return
+                self._send(200, store.create_batch(payload))
+            else:
+                self._send(404, {"error": {"message": f"no route {self.path}"}})
+
+        def do_GET(self) -> None:
+            parts = [p for p in self.path.split("?")[0].split("/") if p]
+            if len(parts) >= 3 and parts[-3] == "files" and parts[-1] == "content":
+                entry = store.files.get(parts[-2])
+                if entry is None:
+                    self._send(404, {"error": {"message": "file not found"}})
+                else:
+                    self._send(200, entry["data"], "application/octet-stream")
+            elif len(parts) >= 2 and parts[-2] == "batches":
+                batch = store.retrieve_batch(parts[-1])
+                if batch is None:
+                    self._send(404, {"error": {"message": "batch not found"}})
+                else:
+                    self._send(200, batch)
+            else:
+                self._send(404, {"error": {"message": f"no route {self.path}"}})
+
+    return Handler
+
+
+def start_standin(
+    responder: Responder = _default_responder,
+    *,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    polls_before_complete: int = 1,
+) -> Tuple[ThreadingHTTPServer, BatchStandIn, str]:
+    """Serve in a daemon thread; returns (server, store, base_url). Call server.shutdown() when done."""
+    store = BatchStandIn(responder, polls_before_complete=polls_before_complete)
+    server = ThreadingHTTPServer((host, port), _handler_for(store))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://{host}:{server.server_address[1]}/v1"
+    return server, store, base_url
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the OpenAI Batch API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    args = parser.parse_args()
+    server, _, base_url = start_standin(host=args.host, port=args.port)
+    print(f"Batch stand-in listening on {base_url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,10 @@
+import os
 import sys
 from pathlib import Path
 
+# Keep fake LLM responses out of the persistent response cache.
+os.environ.setdefault("JOBAGENT_LLM_CACHE_ENABLED", "false")
+
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
@@ -0,0 +1,166 @@
+"""
+Reference lookups for the scoring parity tests and scripts/bench_scoring.py:
+the per-call regex/substring helpers scoring used before the compiled focus
+matcher, plus a few sample postings.
+"""
+from __future__ import annotations
+
+import contextlib
+import re
+from typing import Any, Dict, Iterator, List
+
+from app.pipeline import scoring
+from app.pipeline.matcher import GERMAN_HEAVY_CONTEXT, LANG_PATTERNS, PUBLIC_SECTOR, JobHits
+
+SAMPLE_JOBS: List[Dict[str, Any]] = [
+    {
+        "title": "Junior Data Analyst (m/w/d)",
+        "location": "Dortmund, NRW, DE",
+        "employment_type": "FULL_TIME",
+        "description_text": (
+            "Ihre Aufgaben: Aufbau von Power BI Dashboards und Reports für unsere Fachbereiche. "
+            "Datenmodellierung mit SQL und Automatisierung mit Python (Pandas, NumPy). "
+            "Ihr Profil: Abgeschlossenes Studium, erste Erfahrung mit DAX und Power Query. "
+            "Sehr gute Deutschkenntnisse und gute Englischkenntnisse. Kundenkontakt und Beratung der Fachabteilungen. "
+            "Wir bieten: 30 Tage Urlaub, flexible Arbeitszeiten und ein modernes Büro in der Innenstadt. "
+        ),
+    },
+    {
+        "title": "Working Student Data Engineering",
+        "location": "Berlin, DE",
+        "employment_type": "PART_TIME",
+        "description_text": (
+            "Your tasks: build and maintain data pipelines in Python and SQL, support the analytics team with "
+            "ad-hoc analyses and dashboards. Your profile: enrolled student in computer science or a related field, "
+            "2+ years of experience with Python is a plus. Fluent English is required, German is nice to have. "
+            "We offer a hybrid setup, a learning budget and a friendly international team. "
+        ),
+    },
+    {
+        "title": "Senior BI Consultant",
+        "location": "Köln",
+        "employment_type": "FULL_TIME",
+        "description_text": (
+            "Als Berater verantworten Sie Workshops mit Stakeholdern und die Konzeption von BI-Lösungen in der "
+            "öffentlichen Verwaltung. Mindestens 5 Jahre Erfahrung mit SQL Server und Power BI. "
+            "Verhandlungssichere Deutschkenntnisse sind Voraussetzung, Englisch von Vorteil. "
+        ),
+    },
+]
+
+
+def contains_any(text: str, words: List[str]) -> List[str]:
+    hits = []
+    low = text.lower()
+    for w in words:
+        if w and w.lower() in low:
+            hits.append(w)
+    return hits
+
+
+def count_keywords(text: str, keywords: List[str]) -> Dict[str, int]:
+    low = text.lower()
+    counts = {}
+    for k in keywords:
+        if not k:
+            continue
+        parts = k.lower().split()
+        if not parts:
+            continue
+        if len(parts) == 1:
+            pattern = rf"\b{re.escape(parts[0])}\b"
+        else:
+            pattern = r"\b" + r"\s+".join(re.escape(part) for part in parts) + r"\b"
+        counts[k] = len(re.findall(pattern, low))
+    return counts
+
+
+def reference_title_seniority(title: str):
+    if re.search(r"\b(werkstudent|working student)\b", title.lower()):
+        return "Working Student"
+    if re.search(r"\btrainee\b", title.lower()):
+        return "Internship"
+    if re.search(r"\b(intern(ship)?)\b", title.lower()):
+        return "Internship"
+    if re.search(r"\bjunior\b", title.lower()):
+        return "Junior"
+    if re.search(r"\bsenior\b", title.lower()):
+        return "Senior"
+    return None
+
+
+class ReferenceTextScan:
+    """Recomputes every lookup on access, like the original helpers did."""
+
+    def __init__(self, text_lower: str) -> None:
+        self.text = text_lower
+
+    @property
+    def post_language(self) -> str:
+        german_hits = len(re.findall(r"\b(und|der|die|das|nicht|ist|mit|für|den|des|auf|zu|vom|nach)\b", self.text)) + len(re.findall(r"[äöüß]", self.text))
+        english_hits = len(re.findall(r"\b(the|and|with|for|not|is|are|will|from|into|of|in)\b", self.text))
+        if german_hits == 0 and english_hits == 0:
+            return "Unknown"
+        if german_hits > english_hits * 1.5:
+            return "German"
+        if english_hits > german_hits * 1.5:
+            return "English"
+        return "Mixed"
+
+    @property
+    def mentions_english(self) -> bool:
+        return bool(re.search(r"\b(english|englisch)\b", self.text))
+
+    @property
+    def customer_facing(self) -> bool:
+        return bool(GERMAN_HEAVY_CONTEXT.search(self.text))
+
+    @property
+    def public_sector(self) -> bool:
+        return bool(PUBLIC_SECTOR.search(self.text))
+
+    @property
+    def german_pattern(self):
+        for pattern, level, conf in LANG_PATTERNS:
+            m = re.search(pattern, self.text)
+            if m:
+                return level, conf, m.group(0)
+        return None
+
+
+class _ReferenceSubstrings:
+    def __init__(self, words) -> None:
+        self.words = words
+
+    def hits(self, text: str) -> List[str]:
+        return contains_any(text, list(self.words))
+
+
+class ReferenceMatcher:
+    def __init__(self, focus) -> None:
+        self.focus = focus
+        self.exclude_titles = _ReferenceSubstrings(focus.exclude_titles_any)
+
+    def location_hits(self, title: str, location: str) -> List[str]:
+        return contains_any(f"{title} {location}", list(self.focus.locations_any))
+
+    def match(self, title: str, text_lower: str, location: str) -> JobHits:
+        return JobHits(
+            scan=ReferenceTextScan(text_lower),
+            exclude_title_hits=contains_any(title, list(self.focus.exclude_titles_any)),
+            location_hits=self.location_hits(title, location),
+            must_have_counts=count_keywords(text_lower, list(self.focus.include_skills_any)),
+            nice_to_have_counts=count_keywords(text_lower, list(self.focus.nice_to_have)),
+            title_seniority=reference_title_seniority(title),
+        )
+
+
+@contextlib.contextmanager
+def reference_scoring() -> Iterator[None]:
+    """Temporarily score with the reference lookups instead of the compiled matcher."""
+    saved = (scoring.matcher_for, scoring.scan_text, scoring.title_seniority)
+    scoring.matcher_for, scoring.scan_text, scoring.title_seniority = ReferenceMatcher, ReferenceTextScan, reference_title_seniority
+    try:
+        yield
+    finally:
+        scoring.matcher_for, scoring.scan_text, scoring.title_seniority = saved
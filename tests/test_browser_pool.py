@@ -0,0 +1,172 @@
+import asyncio
+
+from app.fetching.browser_pool import BrowserPool
+
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+        self.closed = False
+
+    async def new_page(self):
+        page = FakePage()
+        self.pages.append(page)
+        return page
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self, args):
+        self.args = tuple(args)
+        self.contexts = []
+        self.connected = True
+        self.closed = False
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **options):
+        ctx = FakeContext()
+        self.contexts.append(ctx)
+        return ctx
+
+    async def close(self):
+        self.closed = True
+        self.connected = False
+
+
+def _pool(launched, **kwargs):
+    async def launcher(headless, args):
+        browser = FakeBrowser(args)
+        launched.append(browser)
+        return browser
+
+    params = {"size": 1, "max_pages_per_browser": 10, "headless": True}
+    params.update(kwargs)
+    return BrowserPool(launcher=launcher, **params)
+
+
+def test_browser_pool_reuses_browser_and_context():
+    launched = []
+    pool = _pool(launched)
+
+    async def run():
+        pages = []
+        for _ in range(3):
+            async with pool.page(context_options={"user_agent": "ua"}) as page:
+                pages.append(page)
+        await pool.aclose()
+        return pages
+
+    pages = asyncio.run(run())
+
+    assert len(launched) == 1
+    assert len(launched[0].contexts) == 1
+    assert all(p.closed for p in pages)
+    assert launched[0].closed is True
+    assert pool.stats()["pages_served"] == 3
+
+
+def test_browser_pool_recycles_after_max_pages_and_on_disconnect():
+    launched = []
+    pool = _pool(launched, max_pages_per_browser=2)
+
+    async def run():
+        for _ in range(3):
+            async with pool.page():
+                pass
+        launched[-1].connected = False
+        async with pool.page():
+            pass
+
+    asyncio.run(run())
+
+    assert len(launched) == 3
+    assert launched[0].closed is True
+    assert pool.stats()["recycled"] >= 1
+
+
+def test_browser_pool_launches_separate_browser_for_other_launch_args():
+    launched = []
+    pool = _pool(launched, size=2)
+
+    async def run():
+        async with pool.page() as first:
+            async with pool.page(launch_args=("--disable-http2",)) as second:
+                assert first is not second
+
+    asyncio.run(run())
+
+    assert [b.args for b in launched] == [(), ("--disable-http2",)]
+
+
+def test_browser_pool_launches_concurrently_outside_the_lock():
+    active = []
+    peak = []
+
+    async def launcher(headless, args):
+        active.append(1)
+        peak.append(len(active))
+        await asyncio.sleep(0.01)
+        active.pop()
+        return FakeBrowser(args)
+
+    pool = BrowserPool(size=2, max_pages_per_browser=10, headless=True, launcher=launcher)
+
+    async def lease():
+        async with pool.page():
+            await asyncio.sleep(0.01)
+
+    async def run():
+        await asyncio.gather(lease(), lease())
+
+    asyncio.run(run())
+
+    assert max(peak) == 2
+    assert pool.stats()["launched"] == 2
+
+
+def test_browser_pool_closes_retired_browsers_outside_the_lock():
+    closing = asyncio.Event()
+    finish_close = asyncio.Event()
+
+    class SlowCloseBrowser(FakeBrowser):
+        async def close(self):
+            closing.set()
+            await finish_close.wait()
+            await super().close()
+
+    launched = []
+
+    async def launcher(headless, args):
+        browser = SlowCloseBrowser(args) if not launched else FakeBrowser(args)
+        launched.append(browser)
+        return browser
+
+    pool = BrowserPool(size=2, max_pages_per_browser=1, headless=True, launcher=launcher)
+
+    async def retire():
+        async with pool.page():
+            pass
+
+    async def run():
+        retiring = asyncio.create_task(retire())
+        await closing.wait()
+        # another lease goes through while the retired browser is still closing
+        await asyncio.wait_for(retire(), timeout=1.0)
+        finish_close.set()
+        await retiring
+
+    asyncio.run(run())
+
+    assert pool.stats()["recycled"] == 2
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+import os
+import time
+from pathlib import Path
+
+from app.pipeline.cache_maintenance import (
+    MaintenancePolicy,
+    current_scoring_versions,
+    maintain_cache_store,
+    prune_run_dirs,
+)
+from app.pipeline.cache_store import SqliteCacheStore
+from app.pipeline.state import settings
+
+DAY = 86400
+
+
+def _iso(ts: float) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(ts))
+
+
+def _put(store, key, *, age_days=0.0, body="x" * 100, layer="result", **meta):
+    cache_meta = {"cached_at": _iso(time.time() - age_days * DAY), "cache_version": settings.cache_version, **meta}
+    store.put(key, layer, {"cache_meta": cache_meta, "payload": {"body": body}})
+
+
+def test_maintenance_evicts_expired_stale_and_over_budget_entries(tmp_path: Path):
+    store = SqliteCacheStore(tmp_path / "cache.sqlite")
+    _put(store, "expired", age_days=20)
+    _put(store, "old-cache", cache_version="v0")
+    _put(store, "old-scoring", scoring_versions={**current_scoring_versions(), "version": "0.1"})
+    _put(store, "no-llm", scoring_versions={**current_scoring_versions(), "llm_scoring_version": None})
+    for i in range(4):
+        _put(store, f"fresh{i}", age_days=4 - i, layer="parse")
+
+    policy = MaintenancePolicy(ttl_days=7, max_bytes=450, batch_size=2)
+    dry = maintain_cache_store(store, dataclasses.replace(policy, dry_run=True))
+    assert dry["entries"] == 8 and dry["deleted"] == 0
+    assert dry["age_histogram"]["7-30d"] == 1
+    assert dry["layers"]["parse"]["entries"] == 4
+
+    report = maintain_cache_store(store, policy)
+    assert report["evict"] == {"expired": 1, "cache_version": 1, "scoring_version": 1, "size_budget": 1}
+    assert report["deleted"] == 4
+    remaining = {info.key for batch in store.scan() for info in batch}
+    # the oldest fresh entry went to fit the budget
+    assert remaining == {"no-llm", "fresh1", "fresh2", "fresh3"}
+    store.close()
+
+
+def test_run_retention_spares_latest_and_running_runs(tmp_path: Path):
+    profile = tmp_path / "user1" / "junior_data_bi"
+    old = time.time() - 60 * DAY
+    for name, status in (
+        ("20240101T000000-aaaa0001", "completed"),
+        ("20240102T000000-aaaa0002", "running"),
+        ("20240103T000000-aaaa0003", "completed"),
+    ):
+        run_dir = profile / name
+        run_dir.mkdir(parents=True)
+        (run_dir / "status.json").write_text(json.dumps({"status": status}), encoding="utf-8")
+        os.utime(run_dir, (old, old))
+    (profile / "latest.json").write_text(json.dumps({"run_id": "20240103T000000-aaaa0003"}), encoding="utf-8")
+    (tmp_path / "runs" / "2099-01-01T00:00:00Z").mkdir(parents=True)
+
+    report = prune_run_dirs(tmp_path, MaintenancePolicy(run_retention_days=30))
+
+    assert report["run_dirs"] == 4 and report["deleted"] == 1
+    assert sorted(p.name for p in profile.iterdir() if p.is_dir()) == ["20240102T000000-aaaa0002", "20240103T000000-aaaa0003"]
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import dataclasses
+import os
+from pathlib import Path
+
+from app.pipeline import cache_store, state
+from app.pipeline.cache_store import JsonFileCacheStore, MemoryFrontStore, SqliteCacheStore, import_json_cache
+
+
+def _entry(cached_at: str = "2099-01-01T00:00:00Z", **payload):
+    return {"cache_meta": {"cached_at": cached_at, "cache_version": "v2"}, "payload": payload}
+
+
+def test_sqlite_backend_keeps_entries_in_one_file(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(state, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(state, "settings", dataclasses.replace(state.settings, cache_enabled=True, cache_backend="sqlite"))
+
+    for i in range(5):
+        state.cache_put(f"http://example.com/job/{i}", {"ok": True, "job": {"title": f"Job {i}"}})
+    state.layer_put(state.LAYER_PARSE, "k1", {"title": "Parsed"})
+
+    assert state.cache_get("http://example.com/job/3")["job"]["title"] == "Job 3"
+    assert state.layer_get(state.LAYER_PARSE, "k1") == {"title": "Parsed"}
+    assert not list(tmp_path.rglob("*.json"))
+    stats = state.get_cache_store().stats()
+    assert stats["entries"] == 6
+    assert stats["layers"]["result"]["entries"] == 5
+
+
+def test_sqlite_store_bulk_evicts_by_ttl_and_size(tmp_path: Path):
+    store = SqliteCacheStore(tmp_path / "cache.sqlite")
+    store.put("old", "result", _entry("2020-01-01T00:00:00Z", body="x" * 10))
+    for i in range(10):
+        store.put(f"new{i}", "parse", _entry(body="y" * 100))
+
+    assert store.evict(ttl_sec=86400) == 1
+    assert store.get("old", "result") is None
+
+    assert store.evict(max_bytes=600) > 0
+    assert store.stats()["bytes"] <= 540
+    assert store.evict(max_bytes=600) == 0
+    store.close()
+
+
+def test_import_json_cache_moves_files_into_sqlite(tmp_path: Path):
+    files = JsonFileCacheStore(tmp_path)
+    files.put("a" * 40, "result", _entry(title="Result"))
+    files.put("b" * 40, "score", _entry(score=42))
+    (tmp_path / "broken.json").write_text("{not json", encoding="utf-8")
+
+    store = SqliteCacheStore(tmp_path / "cache.sqlite")
+    counts = import_json_cache(tmp_path, store, delete=True)
+
+    assert counts == {"imported": 2, "failed": 1, "deleted": 2}
+    assert store.get("a" * 40, "result")["payload"] == {"title": "Result"}
+    assert store.get("b" * 40, "score")["payload"] == {"score": 42}
+    assert [p.name for p in tmp_path.rglob("*.json")] == ["broken.json"]
+    store.close()
+
+
+def test_memory_front_serves_copies_and_reloads_rewritten_files(tmp_path: Path):
+    inner = JsonFileCacheStore(tmp_path)
+    store = MemoryFrontStore(inner, max_entries=2, max_bytes=0)
+    inner.put("k", "parse", _entry(title="First"))
+
+    first = store.get("k", "parse")
+    first["payload"]["title"] = "mutated"
+    assert store.get("k", "parse")["payload"]["title"] == "First"
+    assert store.memory_stats()["hits"] == 1
+
+    # another process rewrites the file
+    path = inner.path_for("k", "parse")
+    inner.put("k", "parse", _entry(title="Second"))
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 1_000_000))
+    assert store.get("k", "parse")["payload"]["title"] == "Second"
+    assert store.memory_stats()["stale"] == 1
+
+    inner.put("a", "parse", _entry())
+    inner.put("b", "parse", _entry())
+    store.get("a", "parse")
+    store.get("b", "parse")
+    stats = store.memory_stats()
+    assert stats["entries"] == 2 and stats["evictions"] == 1
+
+
+def test_memory_front_sees_sqlite_writes_from_other_connections(tmp_path: Path):
+    store = MemoryFrontStore(SqliteCacheStore(tmp_path / "cache.sqlite"), max_entries=16, max_bytes=1024 * 1024)
+    other = SqliteCacheStore(tmp_path / "cache.sqlite")
+    store.put("k", "score", _entry(score=1))
+    assert store.get("k", "score")["payload"] == {"score": 1}
+
+    other.put("k", "score", _entry(score=2))
+    assert store.get("k", "score")["payload"] == {"score": 2}
+    other.close()
+    store.close()
+
+
+def test_memory_front_drops_entries_evicted_by_the_inner_store(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(cache_store, "_EVICT_EVERY_PUTS", 3)
+    inner = SqliteCacheStore(tmp_path / "cache.sqlite", max_bytes=1)
+    store = MemoryFrontStore(inner, max_entries=16, max_bytes=1024 * 1024)
+    store.put("a", "parse", _entry(title="A"))
+    assert store.get("a", "parse")["payload"] == {"title": "A"}
+
+    # the third put runs the inner store's periodic size eviction
+    store.put("b", "parse", _entry())
+    store.put("c", "parse", _entry())
+
+    assert inner.get("a", "parse") is None
+    assert store.get("a", "parse") is None
+    store.close()
+
+
+def test_focus_fingerprint_is_memoized_per_instance():
+    from app.config.focus import DEFAULT_FOCUS
+
+    focus = dataclasses.replace(DEFAULT_FOCUS, profile_name="memo")
+    first = state.focus_fingerprint(focus)
+    assert id(focus) in state._FINGERPRINTS
+    assert state.focus_fingerprint(focus) == first == state.focus_fingerprint(dataclasses.replace(focus))
+    key = id(focus)
+    del focus
+    assert key not in state._FINGERPRINTS
@@ -18,6 +18,10 @@ def test_cache_version_invalidation(tmp_path: Path, monkeypatch):
             cache_version="new",
             cache_per_profile=False,
             output_dir=tmp_path,
+            cache_backend="json",
+            cache_max_mb=0,
+            cache_memory_entries=0,
+            cache_memory_mb=0,
         ),
     )
 
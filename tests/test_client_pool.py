@@ -0,0 +1,78 @@
+import asyncio
+
+import httpx
+
+from app.fetching.client_pool import HttpClientPool
+
+
+def _pool(seen):
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.url.host, request.headers.get("User-Agent")))
+        return httpx.Response(200, text="ok")
+
+    return HttpClientPool(
+        max_connections=4,
+        max_keepalive=2,
+        keepalive_expiry=5.0,
+        http2=False,
+        transport_factory=lambda: httpx.MockTransport(handler),
+    )
+
+
+def test_pool_reuses_one_client_per_domain():
+    seen = []
+    pool = _pool(seen)
+
+    async def run():
+        for _ in range(3):
+            resp = await pool.get("https://a.example/x", headers={"User-Agent": "ua-1"})
+            assert resp.text == "ok"
+        await pool.get("https://b.example/y")
+        stats = pool.stats()
+        await pool.aclose()
+        return stats
+
+    stats = asyncio.run(run())
+
+    assert stats["clients_created"] == 2
+    assert stats["domains"] == ["a.example", "b.example"]
+    assert seen[0] == ("a.example", "ua-1")
+    assert pool.stats()["domains"] == []
+
+
+def test_pool_rebuilds_clients_on_new_event_loop():
+    pool = _pool([])
+
+    async def run():
+        await pool.get("https://a.example/x")
+
+    asyncio.run(run())
+    asyncio.run(run())
+
+    assert pool.stats()["clients_created"] == 2
+
+
+def test_pool_follows_redirects_only_when_asked():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/old":
+            return httpx.Response(301, headers={"Location": "https://a.example/new"})
+        return httpx.Response(200, text="new")
+
+    pool = HttpClientPool(
+        max_connections=4,
+        max_keepalive=2,
+        keepalive_expiry=5.0,
+        http2=False,
+        transport_factory=lambda: httpx.MockTransport(handler),
+    )
+
+    async def run():
+        plain = await pool.get("https://a.example/old")
+        followed = await pool.get("https://a.example/old", follow_redirects=True)
+        await pool.aclose()
+        return plain, followed
+
+    plain, followed = asyncio.run(run())
+
+    assert plain.status_code == 301
+    assert followed.status_code == 200 and followed.text == "new"
@@ -0,0 +1,124 @@
+import asyncio
+import dataclasses
+import os
+from pathlib import Path
+
+from concurrent.futures.process import BrokenProcessPool
+
+from app.pipeline import executors, pipeline
+from app.pipeline import scoring as scoring_mod
+from app.pipeline.executors import CpuExecutor
+from app.pipeline.parsers import extract_jobposting_from_html
+
+HTML = (Path(__file__).parent / "data" / "job_stepstone_1.html").read_text(encoding="utf-8")
+
+
+def test_process_mode_runs_in_worker_and_reports_timings():
+    cpu = CpuExecutor(mode="process", workers=2)
+    try:
+        info = cpu.warm_up()
+        assert info["mode"] == "process" and info["workers"] >= 1
+
+        async def run():
+            parsed, timing = await cpu.run("parse", extract_jobposting_from_html, HTML)
+            pid, _ = await cpu.run("pid", os.getpid)
+            # a lambda can't be sent to a worker process; it runs on the thread pool
+            local, local_timing = await cpu.run("local", lambda x: x * 2, 21)
+            return parsed, timing, pid, local, local_timing
+
+        parsed, timing, pid, local, local_timing = asyncio.run(run())
+    finally:
+        cpu.shutdown()
+
+    assert parsed == extract_jobposting_from_html(HTML)
+    assert timing["mode"] == "process"
+    assert timing["queue_wait_ms"] >= 0 and timing["exec_ms"] >= 0
+    assert pid != os.getpid()
+    assert (local, local_timing["mode"]) == (42, "thread")
+    stages = cpu.stats()["stages"]
+    assert stages["parse"]["calls"] == 1
+
+
+def test_broken_process_pool_degrades_to_inline(monkeypatch):
+    cpu = CpuExecutor(mode="process", workers=1)
+
+    def broken(mode):
+        raise BrokenProcessPool("no workers")
+
+    monkeypatch.setattr(cpu, "_pool_for", broken)
+    result, timing = asyncio.run(cpu.run("parse", extract_jobposting_from_html, HTML))
+
+    assert result["title"]
+    assert timing["mode"] == "inline"
+    assert cpu.stats()["mode"] == "inline"
+    assert "no workers" in cpu.stats()["fallback_reason"]
+
+
+def test_fetch_job_details_records_stage_timings(monkeypatch):
+    async def fake_fetch_job_html(url, preferred_backend=None):
+        return HTML, {"backend": "http", "attempts": [], "ok": True}
+
+    cpu = CpuExecutor(mode="process", workers=1)
+    monkeypatch.setattr(pipeline, "fetch_job_html", fake_fetch_job_html)
+    monkeypatch.setattr(pipeline, "get_cpu_executor", lambda: cpu)
+    try:
+        result = asyncio.run(
+            pipeline.fetch_job_details(
+                "https://example.com/job/1",
+                backend="http",
+                score=True,
+                use_cache=False,
+                use_llm_scoring=False,
+            )
+        )
+    finally:
+        cpu.shutdown()
+
+    timings = result["fetch_meta"]["stage_timings"]
+    assert timings["parse"]["mode"] == "process"
+    assert timings["score"]["mode"] == "process"
+    # in-place annotations made by score_job survive the process hop
+    assert "language_requirements" in result["job"]
+    assert result["job"]["junior_fit_score"] == result["scoring"]["score"]
+
+
+def test_llm_scoring_runs_heuristics_on_executor_and_times_llm_separately(monkeypatch):
+    async def fake_fetch_job_html(url, preferred_backend=None):
+        return HTML, {"backend": "http", "attempts": [], "ok": True}
+
+    calls = []
+
+    async def fake_allm(job, focus, heuristic_result):
+        calls.append(heuristic_result["heuristic_score"])
+        return {"llm_ok": True, "llm_score": 80, "llm_reasons": ["fake"]}
+
+    cpu = CpuExecutor(mode="thread", workers=1)
+    monkeypatch.setattr(pipeline, "fetch_job_html", fake_fetch_job_html)
+    monkeypatch.setattr(pipeline, "get_cpu_executor", lambda: cpu)
+    monkeypatch.setattr(scoring_mod, "settings", dataclasses.replace(scoring_mod.settings, llm_gate_enabled=False))
+    monkeypatch.setattr(scoring_mod, "allm_score_job", fake_allm)
+    try:
+        result = asyncio.run(
+            pipeline.fetch_job_details(
+                "https://example.com/job/1",
+                backend="http",
+                score=True,
+                use_cache=False,
+                use_llm_scoring=True,
+            )
+        )
+    finally:
+        cpu.shutdown()
+
+    timings = result["fetch_meta"]["stage_timings"]
+    assert len(calls) == 1
+    assert timings["score"]["mode"] == "thread"
+    assert timings["score_blend"]["mode"] == "thread"
+    assert timings["llm_score"]["mode"] == "async"
+    assert result["scoring"]["llm_score"] == 80
+    assert result["scoring"]["llm_ok"] is True
+
+
+def test_executor_mode_falls_back_for_unknown_value():
+    assert CpuExecutor(mode="gpu").mode == "thread"
+    assert executors.EXECUTOR_MODES == ("process", "thread", "inline")
@@ -0,0 +1,37 @@
+from app.fetching.html_archive import HtmlArchive
+
+
+def test_archive_roundtrip_dedupes_identical_pages(tmp_path):
+    archive = HtmlArchive(tmp_path / "arch", max_bytes=10 * 1024 * 1024)
+    html = "<html><body>" + "Data Engineer " * 200 + "</body></html>"
+
+    sha1 = archive.put("https://www.stepstone.de/job-1.html#apply", html, backend="http", status=200, fetched_at=100.0)
+    sha2 = archive.put("https://www.stepstone.de/job-1.html", html, backend="pw", status=200, fetched_at=200.0)
+
+    assert sha1 == sha2
+    page = archive.latest("https://www.stepstone.de/job-1.html")
+    assert page is not None
+    assert page.html == html
+    assert page.backend == "pw"
+    assert [h["fetched_at"] for h in archive.history("https://www.stepstone.de/job-1.html#x")] == [100.0, 200.0]
+
+    stats = archive.stats()
+    assert stats["blobs"] == 1
+    assert stats["fetches"] == 2
+    assert stats["stored_bytes"] < stats["raw_bytes"]
+
+
+def test_archive_gzip_codec_and_size_bounded_eviction(tmp_path):
+    archive = HtmlArchive(tmp_path / "arch", max_bytes=1, codec="gzip")
+    archive.max_bytes = 0  # disable eviction while seeding
+    for i in range(5):
+        archive.put(f"https://example.com/{i}", f"<html>{i}-{'x' * 50}</html>", fetched_at=float(i))
+    sizes = archive.stats()["stored_bytes"]
+
+    archive.max_bytes = sizes // 2
+    evicted = archive.evict()
+
+    assert evicted >= 2
+    assert archive.stats()["stored_bytes"] <= sizes // 2
+    assert archive.latest("https://example.com/0") is None
+    assert archive.latest("https://example.com/4").html.startswith("<html>4-")
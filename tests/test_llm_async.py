@@ -0,0 +1,88 @@
+import asyncio
+import copy
+import dataclasses
+import json
+
+from app.pipeline import llm_enrich, scoring as scoring_mod
+from app.pipeline.llm_limits import LlmLimiter
+
+LLM_REPLY = {
+    "llm_score": 80,
+    "german_requirement": {"type": "preferred", "min_level": "B1", "justification": "nice to have"},
+    "risk_flags": [],
+    "critical_blockers": [],
+    "summary": "good fit",
+}
+
+JOB = {
+    "title": "Junior Data Analyst",
+    "company": "Example AG",
+    "location": "Berlin",
+    "employment_type": "FULL_TIME",
+    "description_text": "Python and SQL. English is our working language.",
+}
+
+
+class _Resp:
+    def __init__(self, content):
+        self.choices = [type("C", (), {"message": type("M", (), {"content": content})()})()]
+
+
+class FakeAsyncClient:
+    def __init__(self, reply, delay=0.01):
+        self.reply = reply
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.models = []
+        self.chat = type("Chat", (), {"completions": self})()
+
+    async def create(self, model, temperature, messages):
+        self.models.append(model)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        return _Resp(json.dumps(self.reply))
+
+
+def test_async_enrichment_respects_per_model_cap(monkeypatch):
+    client = FakeAsyncClient({"seniority": "Junior", "english_ok": True})
+    monkeypatch.setattr(llm_enrich, "_async_client", lambda: client)
+    monkeypatch.setattr(llm_enrich, "LLM_LIMITER", LlmLimiter(4, {llm_enrich.settings.openai_model: 2}))
+
+    async def run():
+        return await asyncio.gather(*(llm_enrich.aenrich_jobposting(dict(JOB)) for _ in range(6)))
+
+    results = asyncio.run(run())
+
+    assert client.peak == 2
+    assert all(meta["ok"] and job["seniority"] == "Junior" for job, meta in results)
+    assert llm_enrich.LLM_LIMITER.stats()["requests"] == 6
+
+
+def test_async_enrichment_times_out_without_raising(monkeypatch):
+    client = FakeAsyncClient({"seniority": "Junior"}, delay=1.0)
+    monkeypatch.setattr(llm_enrich, "_async_client", lambda: client)
+    monkeypatch.setattr(llm_enrich, "settings", dataclasses.replace(llm_enrich.settings, llm_timeout_sec=0.05))
+
+    job, meta = asyncio.run(llm_enrich.aenrich_jobposting(dict(JOB)))
+
+    assert job == JOB
+    assert meta["ok"] is False
+    assert meta["error_type"] == "TimeoutError"
+
+
+def test_ascore_job_matches_sync_score_job(monkeypatch):
+    client = FakeAsyncClient(LLM_REPLY)
+    monkeypatch.setattr(llm_enrich, "_async_client", lambda: client)
+    monkeypatch.setattr(scoring_mod, "llm_score_job", lambda job, focus, payload: llm_enrich._parse_llm_score(json.dumps(LLM_REPLY)))
+
+    sync_result = scoring_mod.score_job(copy.deepcopy(JOB), use_llm_scoring=True, apply_blocker_cap=True)
+    async_result = asyncio.run(scoring_mod.ascore_job(copy.deepcopy(JOB), use_llm_scoring=True, apply_blocker_cap=True))
+
+    assert client.models == [llm_enrich.settings.openai_model_scoring]
+    assert async_result == sync_result
+    assert async_result["llm_score"] == 80.0
@@ -0,0 +1,103 @@
+import json
+from pathlib import Path
+
+from openai import OpenAI
+
+from app.pipeline.llm_batch import BatchLlmClient, run_deferred_llm
+from app.pipeline.parsers import extract_jobposting_from_html
+from app.pipeline.scoring import score_job
+from scripts.openai_batch_standin import start_standin
+
+HTML = (Path(__file__).parent / "data" / "job_stepstone_1.html").read_text(encoding="utf-8")
+
+COMBINED_REPLY = {
+    "seniority": "Junior",
+    "english_ok": True,
+    "skills_detected": ["Python", "SQL"],
+    "scoring": {
+        "llm_score": 82,
+        "german_requirement": {"type": "preferred", "min_level": "B1", "justification": "nice to have"},
+        "risk_flags": [],
+        "critical_blockers": [],
+        "summary": "good fit",
+        "confidence": 0.7,
+    },
+}
+
+
+def _responder(body):
+    if "BROKEN" in body["messages"][-1]["content"]:
+        raise RuntimeError("model overloaded")
+    return json.dumps(COMBINED_REPLY)
+
+
+def _staged(title):
+    job = {**extract_jobposting_from_html(HTML), "title": title}
+    scoring = score_job(job, use_llm_scoring=False, apply_blocker_cap=False)
+    return {"job": {**job, "junior_fit_score": scoring["score"]}, "scoring": scoring}
+
+
+def _client(base_url):
+    return BatchLlmClient(OpenAI(api_key="test", base_url=base_url), poll_interval=0, timeout=10)
+
+
+def test_deferred_llm_round_trip_against_standin(tmp_path):
+    server, store, base_url = start_standin(_responder)
+    try:
+        staged = [_staged("Junior Data Analyst"), _staged("BROKEN posting")]
+        heuristic_broken = staged[1]["scoring"]["score"]
+        stats = run_deferred_llm(
+            staged,
+            use_llm_scoring=True,
+            apply_blocker_cap=False,
+            work_dir=tmp_path,
+            batch_client=_client(base_url),
+        )
+    finally:
+        server.shutdown()
+
+    assert stats["submitted"] == 2 and stats["failed"] == 1
+    assert stats["status"] == "completed"
+    assert store.polls[stats["batch_id"]] >= 2
+
+    ok, broken = staged
+    assert ok["job"]["seniority"] == "Junior"
+    assert ok["scoring"]["llm_score"] == 82 and ok["scoring"]["llm_combined"] is True
+    assert ok["job"]["junior_fit_score"] == ok["scoring"]["score"]
+    assert ok["enrichment_meta"]["deferred"] is True
+    assert ok["enrichment_meta"]["batch_id"] == stats["batch_id"]
+
+    assert broken["enrichment_meta"]["ok"] is False
+    assert "model overloaded" in broken["enrichment_meta"]["error_message"]
+    assert broken["scoring"]["llm_ok"] is False
+    assert broken["scoring"]["score"] == heuristic_broken
+
+    state = json.loads((tmp_path / "batch_state.json").read_text(encoding="utf-8"))
+    assert state["batch_id"] == stats["batch_id"] and state["status"] == "completed"
+
+
+def test_deferred_llm_resumes_persisted_batch(tmp_path):
+    server, store, base_url = start_standin(_responder)
+    try:
+        first = run_deferred_llm(
+            [_staged("Junior Data Analyst")],
+            use_llm_scoring=False,
+            apply_blocker_cap=False,
+            work_dir=tmp_path,
+            batch_client=_client(base_url),
+        )
+        again = [_staged("Junior Data Analyst")]
+        second = run_deferred_llm(
+            again,
+            use_llm_scoring=False,
+            apply_blocker_cap=False,
+            work_dir=tmp_path,
+            batch_client=_client(base_url),
+        )
+    finally:
+        server.shutdown()
+
+    assert len(store.batches) == 1
+    assert second["batch_id"] == first["batch_id"]
+    assert again[0]["job"]["english_ok"] is True
+    assert "llm_score" not in again[0]["scoring"]
@@ -0,0 +1,97 @@
+import asyncio
+import json
+import time
+
+from app.pipeline import llm_enrich
+from app.pipeline.llm_cache import LlmResponseCache, llm_cache_key
+
+JOB = {
+    "title": "Junior Data Analyst",
+    "company": "Example AG",
+    "location": "Berlin",
+    "description_text": "Python and SQL.",
+}
+
+
+class _Resp:
+    def __init__(self, content):
+        self.choices = [type("C", (), {"message": type("M", (), {"content": content})()})()]
+
+
+class FakeClient:
+    def __init__(self, content):
+        self.content = content
+        self.calls = 0
+        self.chat = type("Chat", (), {"completions": self})()
+
+    def create(self, model, temperature, messages):
+        self.calls += 1
+        return _Resp(self.content)
+
+
+class FakeAsyncClient(FakeClient):
+    async def create(self, model, temperature, messages):
+        self.calls += 1
+        return _Resp(self.content)
+
+
+def test_cache_key_depends_on_model_temperature_and_messages():
+    messages = [{"role": "user", "content": "hi"}]
+    key = llm_cache_key("m1", 0.2, messages)
+    assert key == llm_cache_key("m1", 0.2, [dict(m) for m in messages])
+    assert key != llm_cache_key("m2", 0.2, messages)
+    assert key != llm_cache_key("m1", 1, messages)
+    assert key != llm_cache_key("m1", 0.2, [{"role": "user", "content": "hi!"}])
+
+
+def test_cache_expires_and_evicts_least_recently_read(tmp_path):
+    cache = LlmResponseCache(tmp_path / "llm.sqlite", ttl_sec=3600, max_bytes=250)
+    for i in range(3):
+        cache.put(f"k{i}", "m", "x" * 100)
+        time.sleep(0.01)
+    # size eviction is throttled to every few puts; force a pass
+    assert cache.stats()["entries"] == 3
+    assert cache.evict() == 1
+    # over the cap: the oldest entry goes first
+    assert cache.get("k0") is None
+    assert cache.get("k2") == "x" * 100
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    expired = LlmResponseCache(tmp_path / "llm.sqlite", ttl_sec=0.01, max_bytes=0)
+    time.sleep(0.02)
+    assert expired.get("k2") is None
+
+
+def test_enrichment_reuses_cached_response(monkeypatch, tmp_path):
+    cache = LlmResponseCache(tmp_path / "llm.sqlite", ttl_sec=3600, max_bytes=0)
+    client = FakeClient(json.dumps({"seniority": "Junior"}))
+    monkeypatch.setattr(llm_enrich, "get_llm_cache", lambda: cache)
+    monkeypatch.setattr(llm_enrich, "_client", lambda: client)
+
+    first, meta1 = llm_enrich.enrich_jobposting(dict(JOB))
+    second, meta2 = llm_enrich.enrich_jobposting(dict(JOB))
+
+    # the async path shares the same entries
+    async_client = FakeAsyncClient("unused")
+    monkeypatch.setattr(llm_enrich, "_async_client", lambda: async_client)
+    third, meta3 = asyncio.run(llm_enrich.aenrich_jobposting(dict(JOB)))
+
+    assert client.calls == 1 and async_client.calls == 0
+    assert first == second == third
+    assert meta1["llm_cache"]["hit"] is False
+    assert meta2["llm_cache"] == {"hit": True, "hits": 1, "misses": 1}
+    assert meta3["llm_cache"]["hit"] is True
+
+
+def test_unparseable_responses_are_not_cached(monkeypatch, tmp_path):
+    cache = LlmResponseCache(tmp_path / "llm.sqlite", ttl_sec=3600, max_bytes=0)
+    client = FakeClient("sorry, I cannot help")
+    monkeypatch.setattr(llm_enrich, "get_llm_cache", lambda: cache)
+    monkeypatch.setattr(llm_enrich, "_client", lambda: client)
+
+    llm_enrich.llm_score_job(dict(JOB), None, {"score": 50})
+    result = llm_enrich.llm_score_job(dict(JOB), None, {"score": 50})
+
+    assert client.calls == 2
+    assert result["error_type"] == "parse_error"
+    assert cache.stats()["entries"] == 0
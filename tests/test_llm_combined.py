@@ -0,0 +1,109 @@
+import asyncio
+import copy
+import json
+from pathlib import Path
+
+from app.common.singleflight import SingleFlight
+from app.pipeline import llm_enrich, pipeline, scoring as scoring_mod
+from app.pipeline.executors import CpuExecutor
+
+HTML = (Path(__file__).parent / "data" / "job_stepstone_1.html").read_text(encoding="utf-8")
+
+COMBINED_REPLY = {
+    "seniority": "Junior",
+    "english_ok": True,
+    "skills_detected": ["Python", "SQL"],
+    "scoring": {
+        "llm_score": 82,
+        "german_requirement": {"type": "preferred", "min_level": "B1", "justification": "nice to have"},
+        "risk_flags": [],
+        "critical_blockers": [],
+        "summary": "good fit",
+        "confidence": 0.7,
+    },
+}
+
+
+class _Resp:
+    def __init__(self, content):
+        self.choices = [type("C", (), {"message": type("M", (), {"content": content})()})()]
+
+
+class FakeAsyncClient:
+    def __init__(self, reply):
+        self.reply = reply
+        self.messages = []
+        self.chat = type("Chat", (), {"completions": self})()
+
+    async def create(self, model, temperature, messages):
+        self.messages.append(messages)
+        return _Resp(json.dumps(self.reply))
+
+
+def test_combined_call_splits_enrichment_and_llm_part(monkeypatch):
+    client = FakeAsyncClient(COMBINED_REPLY)
+    monkeypatch.setattr(llm_enrich, "_async_client", lambda: client)
+
+    job = {"title": "Junior Data Analyst", "description_text": "Python SQL"}
+    enriched, meta, llm_part = asyncio.run(llm_enrich.aenrich_and_score_jobposting(job))
+
+    assert len(client.messages) == 1
+    assert "scoring" in client.messages[0][0]["content"]
+    assert enriched["seniority"] == "Junior" and "scoring" not in enriched
+    assert meta["ok"] is True and meta["combined"] is True
+    assert llm_part["llm_ok"] is True and llm_part["llm_score"] == 82.0
+    assert llm_part["german_requirement"]["min_level"] == "B1"
+
+
+def test_combined_reply_without_scoring_object_falls_back_to_heuristic(monkeypatch):
+    client = FakeAsyncClient({"seniority": "Junior"})
+    monkeypatch.setattr(llm_enrich, "_async_client", lambda: client)
+
+    enriched, meta, llm_part = asyncio.run(llm_enrich.aenrich_and_score_jobposting({"title": "x"}))
+    scoring = scoring_mod.score_job(enriched, llm_part=llm_part, apply_blocker_cap=False)
+
+    assert meta["ok"] is True
+    assert llm_part["llm_ok"] is False and llm_part["error_type"] == "schema_error"
+    assert scoring["alpha"] == 1.0
+    assert scoring["score"] == round(scoring["heuristic_score"])
+
+
+def test_fetch_job_details_uses_one_llm_call_in_combined_mode(monkeypatch):
+    client = FakeAsyncClient(COMBINED_REPLY)
+
+    async def fake_fetch_job_html(url, preferred_backend=None):
+        return HTML, {"backend": "http", "attempts": [], "ok": True}
+
+    def no_separate_scoring(*args, **kwargs):
+        raise AssertionError("llm_score_job should not be called in combined mode")
+
+    cpu = CpuExecutor(mode="inline")
+    monkeypatch.setattr(llm_enrich, "_async_client", lambda: client)
+    monkeypatch.setattr(scoring_mod, "llm_score_job", no_separate_scoring)
+    monkeypatch.setattr(scoring_mod, "allm_score_job", no_separate_scoring)
+    monkeypatch.setattr(pipeline, "fetch_job_html", fake_fetch_job_html)
+    monkeypatch.setattr(pipeline, "get_cpu_executor", lambda: cpu)
+    monkeypatch.setattr(pipeline, "ENRICH_FLIGHT", SingleFlight("enrich"))
+
+    result = asyncio.run(
+        pipeline.fetch_job_details(
+            "https://example.com/job/1",
+            backend="http",
+            enrich=True,
+            score=True,
+            use_cache=False,
+            use_llm_scoring=True,
+            apply_blocker_cap=False,
+            combined_llm=True,
+        )
+    )
+
+    assert len(client.messages) == 1
+    scoring = result["scoring"]
+    assert scoring["llm_combined"] is True
+    assert scoring["llm_score"] == 82.0
+    # blended exactly like a separate LLM scoring call would be
+    _, _, llm_part = llm_enrich._split_combined({}, json.dumps(COMBINED_REPLY), None)
+    expected = scoring_mod.score_job(copy.deepcopy(result["job"]), llm_part=llm_part, apply_blocker_cap=False)
+    assert scoring["score"] == expected["score"]
+    assert 0.65 <= scoring["alpha"] <= 0.90
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+
+from app.config.focus import DEFAULT_FOCUS
+from app.pipeline import scoring as scoring_mod
+
+JOB = {
+    "title": "Junior Data Analyst",
+    "company": "Example AG",
+    "location": "Dortmund, DE",
+    "employment_type": "FULL_TIME",
+    "description_text": "Junior role. English required. Python and SQL, Power BI is a plus.",
+    "seniority": "Junior",
+}
+
+
+def _gate(monkeypatch, **overrides):
+    values = {"llm_gate_enabled": True, "llm_gate_min_score": 30.0, "llm_gate_max_score": 100.0}
+    values.update(overrides)
+    monkeypatch.setattr(scoring_mod, "settings", dataclasses.replace(scoring_mod.settings, **values))
+
+
+def _fake_llm(calls):
+    def fake_llm_score_job(job, focus, heuristic_payload):
+        calls.append(job.get("title"))
+        return {"llm_ok": True, "llm_score": 60, "confidence": 0.8, "german_requirement": {}}
+
+    return fake_llm_score_job
+
+
+def test_gate_skips_llm_outside_band(monkeypatch):
+    calls = []
+    monkeypatch.setattr(scoring_mod, "llm_score_job", _fake_llm(calls))
+    _gate(monkeypatch, llm_gate_min_score=0.0, llm_gate_max_score=10.0)
+
+    result = scoring_mod.score_job(dict(JOB), use_llm_scoring=True, apply_blocker_cap=True)
+
+    assert calls == []
+    assert result["llm_enabled"] is True
+    assert result["llm_skipped_reason"] == scoring_mod.LLM_SKIP_ABOVE_BAND
+    assert result["score"] == round(result["heuristic_score"])
+    assert result["alpha"] == 1.0
+
+
+def test_gate_skips_llm_when_hard_blockers_cap(monkeypatch):
+    calls = []
+    monkeypatch.setattr(scoring_mod, "llm_score_job", _fake_llm(calls))
+    _gate(monkeypatch)
+    focus = dataclasses.replace(DEFAULT_FOCUS, relocation_ok=False, locations_any={"Hamburg"})
+
+    capped = scoring_mod.score_job(dict(JOB), focus, use_llm_scoring=True, apply_blocker_cap=True)
+    assert calls == []
+    assert capped["llm_skipped_reason"] == scoring_mod.LLM_SKIP_HARD_BLOCKERS
+    assert capped["score"] <= focus.blocker_cap_hard
+
+    # Without the cap the blocker doesn't bound the score, so the LLM still runs.
+    uncapped = scoring_mod.score_job(dict(JOB), focus, use_llm_scoring=True, apply_blocker_cap=False)
+    assert calls == ["Junior Data Analyst"]
+    assert uncapped["llm_skipped_reason"] is None
+
+
+def test_gate_calls_llm_inside_band_and_async_matches(monkeypatch):
+    calls = []
+    monkeypatch.setattr(scoring_mod, "llm_score_job", _fake_llm(calls))
+
+    async def fake_allm(job, focus, heuristic_payload):
+        return _fake_llm(calls)(job, focus, heuristic_payload)
+
+    monkeypatch.setattr(scoring_mod, "allm_score_job", fake_allm)
+    _gate(monkeypatch)
+
+    result = scoring_mod.score_job(dict(JOB), use_llm_scoring=True, apply_blocker_cap=True)
+    assert result["llm_skipped_reason"] is None and result["llm_score"] == 60
+
+    _gate(monkeypatch, llm_gate_min_score=101.0)
+    skipped = asyncio.run(scoring_mod.ascore_job(dict(JOB), use_llm_scoring=True, apply_blocker_cap=True))
+    assert skipped["llm_skipped_reason"] == scoring_mod.LLM_SKIP_BELOW_BAND
+    assert scoring_mod.llm_gate_reason(dict(JOB), apply_blocker_cap=True) == scoring_mod.LLM_SKIP_BELOW_BAND
+    assert len(calls) == 1
+
+
+def test_gate_disabled_by_default_keeps_llm_call(monkeypatch):
+    calls = []
+    monkeypatch.setattr(scoring_mod, "llm_score_job", _fake_llm(calls))
+    _gate(monkeypatch, llm_gate_enabled=False, llm_gate_min_score=99.0)
+
+    result = scoring_mod.score_job(dict(JOB), use_llm_scoring=True, apply_blocker_cap=True)
+
+    assert calls == ["Junior Data Analyst"]
+    assert result["llm_skipped_reason"] is None
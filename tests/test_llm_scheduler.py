@@ -0,0 +1,143 @@
+import asyncio
+import dataclasses
+import json
+
+import httpx
+import openai
+
+from app.pipeline import llm_enrich, llm_scheduler
+from app.pipeline.llm_scheduler import LlmScheduler, parse_reset_duration, reset_delay_from_headers
+
+
+def _status_error(cls, status, headers=None):
+    response = httpx.Response(status, headers=headers or {}, request=httpx.Request("POST", "https://api.test/v1/chat"))
+    return cls("provider error", response=response, body=None)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_window_enforces_rpm_and_tpm_per_model():
+    clock = Clock()
+    sched = LlmScheduler(rpm=2, tpm=1000, model_tpm={"big": 5000}, clock=clock)
+
+    assert sched._try_reserve("m", 400)[0] == 0.0
+    clock.now += 10
+    assert sched._try_reserve("m", 400)[0] == 0.0
+    wait, entry = sched._try_reserve("m", 100)
+    assert entry is None and abs(wait - 50.0) < 1e-6  # first request leaves the window at t+60
+
+    clock.now += 51
+    assert sched._try_reserve("m", 100)[0] == 0.0
+    # 400 + 100 used, 600 more would exceed tpm until the t+10 reservation expires
+    assert abs(sched._try_reserve("m", 600)[0] - 9.0) < 1e-6
+    assert sched._try_reserve("big", 3000)[0] == 0.0
+    assert sched.stats()["models"]["m"] == {"rpm": 2, "tpm": 1000, "requests": 2, "tokens": 500}
+
+
+def test_reset_headers_are_parsed():
+    assert parse_reset_duration("6m0s") == 360.0
+    assert abs(parse_reset_duration("20ms") - 0.02) < 1e-9
+    assert parse_reset_duration("1h2m3.5s") == 3723.5
+    headers = {"retry-after": "1", "x-ratelimit-reset-tokens": "2.5s", "retry-after-ms": "300"}
+    assert reset_delay_from_headers(headers) == 2.5
+
+
+def test_acall_retries_429_and_5xx_honoring_reset_headers():
+    sched = LlmScheduler(max_retries=3, backoff_base=0.001, backoff_max=1.0)
+    errors = [
+        _status_error(openai.RateLimitError, 429, {"retry-after-ms": "60"}),
+        _status_error(openai.InternalServerError, 503),
+    ]
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    assert asyncio.run(sched.acall("m", 10, fn)) == "ok"
+
+    stats = sched.stats()
+    assert len(calls) == 3
+    assert stats["retries"] == 2
+    assert stats["errors"] == {"rate_limited": 1, "server_error": 1}
+    assert stats["throttle_sec_total"] >= 0.06
+
+
+def test_call_gives_up_after_max_retries_and_skips_client_errors():
+    sched = LlmScheduler(max_retries=1, backoff_base=0.001)
+
+    def throttled():
+        raise _status_error(openai.RateLimitError, 429)
+
+    def bad_request():
+        raise _status_error(openai.BadRequestError, 400)
+
+    for fn, expected in ((throttled, openai.RateLimitError), (bad_request, openai.BadRequestError)):
+        try:
+            sched.call("m", 10, fn)
+        except expected:
+            pass
+        else:
+            raise AssertionError("expected the error to propagate")
+
+    stats = sched.stats()
+    assert stats["retries"] == 1
+    assert stats["failures_after_retries"] == 1
+
+
+def test_over_budget_callers_queue_instead_of_failing(monkeypatch):
+    monkeypatch.setattr(llm_scheduler, "_WINDOW_SEC", 0.2)
+    sched = LlmScheduler(rpm=1)
+    seen_depth = []
+
+    async def fn():
+        return "done"
+
+    async def run():
+        first = await sched.acall("m", 1, fn)
+        task = asyncio.create_task(sched.acall("m", 1, fn))
+        await asyncio.sleep(0.05)
+        seen_depth.append(sched.stats()["queue_depth"])
+        return first, await task
+
+    assert asyncio.run(run()) == ("done", "done")
+    assert seen_depth == [1]
+    stats = sched.stats()
+    assert stats["queue_depth"] == 0 and stats["queued_total"] == 1
+    assert stats["throttle_sec_total"] > 0.1
+
+
+def test_async_enrichment_survives_a_429_burst(monkeypatch):
+    class Resp:
+        def __init__(self, content):
+            self.choices = [type("C", (), {"message": type("M", (), {"content": content})()})()]
+
+    class FlakyClient:
+        def __init__(self):
+            self.calls = 0
+            self.chat = type("Chat", (), {"completions": self})()
+
+        async def create(self, model, temperature, messages):
+            self.calls += 1
+            if self.calls <= 2:
+                raise _status_error(openai.RateLimitError, 429, {"x-ratelimit-reset-requests": "10ms"})
+            return Resp(json.dumps({"seniority": "Junior"}))
+
+    client = FlakyClient()
+    monkeypatch.setattr(llm_enrich, "_async_client", lambda: client)
+    monkeypatch.setattr(llm_enrich, "LLM_SCHEDULER", LlmScheduler(max_retries=3, backoff_base=0.001))
+    monkeypatch.setattr(llm_enrich, "settings", dataclasses.replace(llm_enrich.settings, llm_timeout_sec=5))
+
+    job, meta = asyncio.run(llm_enrich.aenrich_jobposting({"title": "Junior Data Analyst", "description_text": "SQL"}))
+
+    assert meta["ok"] is True and job["seniority"] == "Junior"
+    assert client.calls == 3
+    assert llm_enrich.LLM_SCHEDULER.stats()["errors"] == {"rate_limited": 2}
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import copy
+import dataclasses
+
+from app.config.focus import DEFAULT_FOCUS
+from app.pipeline import scoring
+from app.pipeline.matcher import TextScan, matcher_for
+from tests.scoring_reference import SAMPLE_JOBS, ReferenceTextScan, contains_any, count_keywords, reference_scoring
+
+FOCUS = dataclasses.replace(
+    DEFAULT_FOCUS,
+    include_skills_any={"Python", "SQL", "C++", "CI/CD", "machine learning", "data data"},
+    nice_to_have={"Power BI", "Power", "Power Query", "DAX", "Node.js", "", "  "},
+    locations_any={"Essen", "Essen-Nord", "Köln", "NRW"},
+    exclude_titles_any={"Senior", "Lead", "Head"},
+)
+
+TEXTS = [
+    "Python, SQL und Power BI; power  query\tpower\nbi. PowerBI python3 SQL-Server",
+    "Machine\nLearning with C++ and CI/CD pipelines, Node.js; data data data machine-learning",
+    "Fließende Deutschkenntnisse (C1) und Kundenkontakt in der öffentlichen Verwaltung. DAX!",
+    "Fluent in English and German, native German is a plus. Grundkenntnisse in Deutsch.",
+    "",
+]
+
+
+def test_keyword_counts_and_substring_hits_match_reference():
+    matcher = matcher_for(FOCUS)
+    for text in TEXTS:
+        hits = matcher.match("Senior Lead Engineer", text.lower(), "Essen-Nord, NRW")
+        assert hits.must_have_counts == count_keywords(text, list(FOCUS.include_skills_any))
+        assert hits.nice_to_have_counts == count_keywords(text, list(FOCUS.nice_to_have))
+        assert hits.exclude_title_hits == contains_any("Senior Lead Engineer", list(FOCUS.exclude_titles_any))
+        assert hits.location_hits == contains_any("Senior Lead Engineer Essen-Nord, NRW", list(FOCUS.locations_any))
+    assert matcher.location_hits("Analyst", "Hamburg") == []
+
+
+def test_language_scan_matches_reference():
+    for text in TEXTS + [job["description_text"] for job in SAMPLE_JOBS]:
+        low = text.lower()
+        scan, ref = TextScan(low), ReferenceTextScan(low)
+        for attr in ("post_language", "mentions_english", "customer_facing", "public_sector", "german_pattern"):
+            assert getattr(scan, attr) == getattr(ref, attr), (attr, text)
+
+
+def test_score_job_is_unchanged_by_the_matcher():
+    jobs = [dict(job) for job in SAMPLE_JOBS]
+    jobs += [{"title": "Junior Analyst", "description_text": text, "location": "Köln"} for text in TEXTS]
+    for focus in (DEFAULT_FOCUS, FOCUS):
+        for job in jobs:
+            with reference_scoring():
+                expected = scoring.score_job(copy.deepcopy(job), focus)
+            assert scoring.score_job(copy.deepcopy(job), focus) == expected
+
+
+def test_matcher_is_cached_per_focus_fingerprint():
+    same = dataclasses.replace(FOCUS)
+    assert matcher_for(FOCUS) is matcher_for(same)
+    assert matcher_for(dataclasses.replace(FOCUS, locations_any={"Berlin"})) is not matcher_for(FOCUS)
@@ -0,0 +1,91 @@
+import asyncio
+
+from app.fetching.page_profile import (
+    ResourceProfile,
+    install_resource_blocking,
+    wait_for_content,
+)
+
+
+class FakeRequest:
+    def __init__(self, url, resource_type):
+        self.url = url
+        self.resource_type = resource_type
+
+
+class FakeRoute:
+    def __init__(self):
+        self.outcome = None
+
+    async def abort(self):
+        self.outcome = "abort"
+
+    async def continue_(self):
+        self.outcome = "continue"
+
+
+class FakePage:
+    def __init__(self, selector_ok=True):
+        self.handler = None
+        self.listeners = {}
+        self.selector_ok = selector_ok
+        self.sleeps = []
+
+    async def route(self, pattern, handler):
+        self.handler = handler
+
+    def on(self, event, callback):
+        self.listeners[event] = callback
+
+    async def wait_for_selector(self, selector, state=None, timeout=None):
+        if not self.selector_ok:
+            raise TimeoutError("no json-ld")
+
+    async def wait_for_timeout(self, ms):
+        self.sleeps.append(ms)
+
+
+def test_resource_blocking_counts_blocked_and_respects_allowlist():
+    profile = ResourceProfile(
+        block_types=("image", "font"),
+        block_url_patterns=("googletagmanager.com",),
+        allow_url_patterns=("stepstone.de/static/logo",),
+    )
+    page = FakePage()
+
+    async def run():
+        stats = await install_resource_blocking(page, profile)
+        cases = [
+            ("https://www.stepstone.de/job.html", "document"),
+            ("https://www.stepstone.de/a.png", "image"),
+            ("https://www.stepstone.de/static/logo.png", "image"),
+            ("https://www.googletagmanager.com/gtm.js", "script"),
+        ]
+        outcomes = []
+        for url, rtype in cases:
+            route = FakeRoute()
+            await page.handler(route, FakeRequest(url, rtype))
+            outcomes.append(route.outcome)
+        return stats, outcomes
+
+    stats, outcomes = asyncio.run(run())
+
+    assert outcomes == ["continue", "abort", "continue", "abort"]
+    assert stats.blocked == 2
+    assert stats.allowed == 2
+    assert stats.blocked_requests_by_type == {"image": 1, "script": 1}
+    assert stats.bytes_saved_estimate > 0
+
+
+def test_wait_for_content_jsonld_mode_skips_fixed_sleep():
+    found = FakePage(selector_ok=True)
+    missing = FakePage(selector_ok=False)
+
+    meta_found = asyncio.run(wait_for_content(found, mode="jsonld", timeout_ms=10, started_at=0.0))
+    meta_missing = asyncio.run(wait_for_content(missing, mode="jsonld", timeout_ms=10))
+
+    assert meta_found["jsonld_found"] is True
+    assert "time_to_content" in meta_found
+    assert found.sleeps == []
+    assert meta_missing["jsonld_found"] is False
+    assert missing.sleeps == [350]
@@ -0,0 +1,58 @@
+import json
+from pathlib import Path
+
+from app.pipeline import parsers
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+def _page(jobposting, *, escape=False, extra_head="", h1="Fallback Title"):
+    payload = json.dumps(jobposting)
+    if escape:
+        payload = payload.replace('"', "&quot;")
+    return (
+        "<html><head>"
+        f"{extra_head}"
+        '<script type="application/ld+json">{"@type": "BreadcrumbList"}</script>'
+        f"<script type='application/ld+json'>{payload}</script>"
+        f"</head><body><h1>{h1}</h1><div>{'<p>filler</p>' * 50}</div></body></html>"
+    )
+
+
+SYNTHETIC = [
+    _page(
+        {
+            "@type": "JobPosting",
+            "title": "Data Engineer (m/w/d)",
+            "hiringOrganization": {"name": "ACME &amp; Co"},
+            "jobLocation": {"address": {"addressLocality": "Berlin", "addressCountry": "DE"}},
+            "description": "<p>Build <b>pipelines</b>&nbsp;with Python.</p><ul><li>SQL</li><li>dbt</li></ul><!-- x -->",
+        }
+    ),
+    _page(
+        {"@graph": [{"@type": "Organization"}, {"@type": ["JobPosting"], "title": "Analyst", "description": "a < b<br/>c"}]},
+        escape=True,
+    ),
+    # no title in JSON-LD -> h1 fallback goes through the DOM path
+    _page({"@type": "JobPosting", "description": "<p>x</p>"}, h1="Junior <span>BI</span> Analyst"),
+    # no JobPosting at all
+    "<html><body><h1>Only heading</h1></body></html>",
+]
+
+
+def test_fast_path_matches_dom_path_on_samples():
+    pages = [p.read_text(encoding="utf-8") for p in sorted(DATA_DIR.glob("*.html"))] + SYNTHETIC
+    for html in pages:
+        assert parsers.extract_jobposting_from_html(html) == parsers._extract_jobposting_soup(html)
+
+
+def test_fast_path_skips_dom_when_jsonld_present(monkeypatch):
+    def no_dom(*args, **kwargs):
+        raise AssertionError("BeautifulSoup should not be built")
+
+    monkeypatch.setattr(parsers, "BeautifulSoup", no_dom)
+    parsed = parsers.extract_jobposting_from_html(SYNTHETIC[0])
+
+    assert parsed["title"] == "Data Engineer (m/w/d)"
+    assert parsed["company"] == "ACME & Co"
+    assert parsed["description_text"] == "Build pipelines with Python. SQL dbt"
@@ -0,0 +1,82 @@
+import asyncio
+import dataclasses
+from pathlib import Path
+
+from app.common.singleflight import SingleFlight
+from app.config.focus import DEFAULT_FOCUS
+from app.pipeline import pipeline, state
+
+HTML = (Path(__file__).parent / "data" / "job_stepstone_1.html").read_text(encoding="utf-8")
+
+
+def _setup(monkeypatch, tmp_path):
+    counts = {"fetch": 0, "enrich": 0}
+
+    async def fake_fetch_job_html(url, preferred_backend=None):
+        counts["fetch"] += 1
+        return HTML, {"backend": "http", "attempts": [], "ok": True}
+
+    async def fake_enrich(job, focus=None):
+        counts["enrich"] += 1
+        return {**job, "seniority": "Junior"}, {"ok": True, "model": "test"}
+
+    cfg = dataclasses.replace(state.settings, cache_enabled=True, cache_ttl_days=7)
+    monkeypatch.setattr(state, "settings", cfg)
+    monkeypatch.setattr(pipeline, "settings", dataclasses.replace(pipeline.settings, cache_enabled=True))
+    monkeypatch.setattr(state, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(pipeline, "fetch_job_html", fake_fetch_job_html)
+    monkeypatch.setattr(pipeline, "aenrich_jobposting", fake_enrich)
+    monkeypatch.setattr(pipeline, "FETCH_FLIGHT", SingleFlight("fetch"))
+    monkeypatch.setattr(pipeline, "ENRICH_FLIGHT", SingleFlight("enrich"))
+    return counts
+
+
+def _run(focus):
+    return asyncio.run(
+        pipeline.fetch_job_details(
+            "https://example.com/job/1",
+            backend="http",
+            enrich=True,
+            score=True,
+            focus=focus,
+            use_llm_scoring=False,
+        )
+    )
+
+
+def test_scoring_only_focus_change_reuses_fetch_parse_and_enrichment(monkeypatch, tmp_path):
+    counts = _setup(monkeypatch, tmp_path)
+
+    first = _run(DEFAULT_FOCUS)
+    assert not any(first["cache_layers"].values())
+
+    again = _run(DEFAULT_FOCUS)
+    assert all(again["cache_layers"].values())
+    assert again["scoring"] == first["scoring"]
+    assert again["job"] == first["job"]
+
+    stricter = dataclasses.replace(DEFAULT_FOCUS, blocker_cap_hard=5, experience_penalty_strength=2.0)
+    rescored = _run(stricter)
+    assert rescored["cache_layers"] == {"fetch": True, "parse": True, "enrich": True, "score": False}
+    assert counts == {"fetch": 1, "enrich": 1}
+
+
+def test_prompt_relevant_focus_change_re_enriches(monkeypatch, tmp_path):
+    counts = _setup(monkeypatch, tmp_path)
+
+    _run(DEFAULT_FOCUS)
+    other = dataclasses.replace(DEFAULT_FOCUS, include_skills_any={"Rust"})
+    result = _run(other)
+
+    assert result["cache_layers"] == {"fetch": True, "parse": True, "enrich": False, "score": False}
+    assert counts == {"fetch": 1, "enrich": 2}
+
+
+def test_use_cache_false_skips_layers(monkeypatch, tmp_path):
+    counts = _setup(monkeypatch, tmp_path)
+    _run(DEFAULT_FOCUS)
+
+    result = asyncio.run(pipeline.fetch_job_details("https://example.com/job/1", backend="http", use_cache=False))
+
+    assert not any(result["cache_layers"].values())
+    assert counts["fetch"] == 2
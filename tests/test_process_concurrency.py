@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("prefect")
+
+from app import prefect_run  # noqa: E402
+
+
+class _Logger:
+    def __init__(self):
+        self.lines = []
+
+    def info(self, *args, **kwargs):
+        self.lines.append(args)
+
+    debug = warning = info
+
+
+def test_process_jobs_concurrently_keeps_order_and_isolates_errors(monkeypatch):
+    running = []
+    peak = []
+
+    async def fake_process_job(url, seed_slug, cutoff_iso, **kwargs):
+        running.append(url)
+        peak.append(len(running))
+        # later items finish first so completion order differs from input order
+        await asyncio.sleep(0.01 * (5 - int(url.rsplit("/", 1)[-1])))
+        running.remove(url)
+        if url.endswith("/2"):
+            raise RuntimeError("boom")
+        return {"url": url, "seed_slug": seed_slug, "status": "processed"}
+
+    monkeypatch.setattr(prefect_run, "_process_job", fake_process_job)
+    items = [{"url": f"https://x/job/{i}", "seed_slug": "s"} for i in range(5)]
+
+    results = asyncio.run(
+        prefect_run._process_jobs_concurrently(
+            items,
+            None,
+            workers=3,
+            backend="http",
+            profile_key=None,
+            focus=None,
+            use_llm_scoring=False,
+            apply_blocker_cap=True,
+            logger=_Logger(),
+        )
+    )
+
+    assert [res["url"] for res in results] == [item["url"] for item in items]
+    assert results[2]["status"] == "error" and results[2]["error"] == "boom"
+    assert all(res["status"] == "processed" for i, res in enumerate(results) if i != 2)
+    assert max(peak) == 3
+
+
+def test_process_jobs_concurrently_bounds_workers_by_items(monkeypatch):
+    peak = []
+    running = []
+
+    async def fake_process_job(url, seed_slug, cutoff_iso, **kwargs):
+        running.append(url)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.remove(url)
+        return {"url": url, "seed_slug": seed_slug, "status": "processed"}
+
+    monkeypatch.setattr(prefect_run, "_process_job", fake_process_job)
+    items = [{"url": f"https://x/job/{i}", "seed_slug": "s"} for i in range(2)]
+
+    results = asyncio.run(
+        prefect_run._process_jobs_concurrently(
+            items,
+            None,
+            workers=8,
+            backend="http",
+            profile_key=None,
+            focus=None,
+            use_llm_scoring=False,
+            apply_blocker_cap=True,
+            logger=_Logger(),
+        )
+    )
+
+    assert len(results) == 2
+    assert max(peak) == 2
+    assert asyncio.run(
+        prefect_run._process_jobs_concurrently(
+            [], None, workers=4, backend="http", profile_key=None, focus=None,
+            use_llm_scoring=False, apply_blocker_cap=True, logger=_Logger(),
+        )
+    ) == []
+
+
+def test_deferred_llm_task_returns_finalized_results_without_mutating_input(monkeypatch, tmp_path):
+    monkeypatch.setattr(prefect_run, "get_run_logger", _Logger)
+    monkeypatch.setattr(prefect_run, "_resolve_focus", lambda profile_key, logger: None)
+    monkeypatch.setattr(prefect_run, "run_deferred_llm", lambda jobs, **kwargs: {"status": "ended", "submitted": len(jobs)})
+    monkeypatch.setattr(
+        prefect_run,
+        "_finalize_job",
+        lambda url, seed_slug, details, **kwargs: {"url": url, "seed_slug": seed_slug, "status": "processed"},
+    )
+    processed = [
+        {"url": "https://x/job/0", "seed_slug": "s", "status": "skipped_existing"},
+        {"url": "https://x/job/1", "seed_slug": "s", "status": "staged", "details": {}},
+    ]
+    original = [dict(res) for res in processed]
+
+    task_fn = getattr(prefect_run._deferred_llm_task, "fn", prefect_run._deferred_llm_task)
+    finalized, stats = task_fn(
+        processed,
+        run_path=tmp_path,
+        profile_key=None,
+        backend="http",
+        use_llm_scoring=True,
+        apply_blocker_cap=True,
+    )
+
+    assert processed == original
+    assert [res["status"] for res in finalized] == ["skipped_existing", "processed"]
+    assert stats["submitted"] == 1
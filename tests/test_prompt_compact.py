@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+
+from app.config.focus import DEFAULT_FOCUS
+from app.pipeline import llm_enrich
+from app.pipeline.prompt_compact import compact_description, estimate_tokens
+
+DESCRIPTION = (
+    "Wir sind ein wachsendes Analytics-Team in Dortmund. Wir sind ein wachsendes Analytics-Team in Dortmund. "
+    "Ihre Aufgaben: Aufbau von Power BI Dashboards. Datenmodellierung mit SQL. "
+    "Ihr Profil: Erste Erfahrung mit Python und SQL. Sehr gute Deutschkenntnisse (C1) und gute Englischkenntnisse. "
+    "Wir bieten: 30 Tage Urlaub. Firmenwagen. Englisch ist unsere Arbeitssprache im Team. Obstkorb und Jobrad. "
+    "Über uns: Die Beispiel AG ist seit 1900 Marktführer mit 5000 Mitarbeitenden weltweit. "
+    "Wir freuen uns über Bewerbungen unabhängig von Geschlecht, Alter und Herkunft. "
+    "Haben wir Ihr Interesse geweckt? Dann bewerben Sie sich über den Button. Datenschutzhinweise finden Sie hier."
+)
+
+JOB = {
+    "title": "Junior Data Analyst",
+    "company": "Beispiel AG",
+    "location": "Dortmund",
+    "url": "https://example.com/job/1",
+    "description_text": DESCRIPTION,
+}
+
+
+def test_compaction_strips_boilerplate_and_keeps_requirements():
+    result = compact_description(DESCRIPTION, 4000)
+
+    assert "Ihr Profil: Erste Erfahrung mit Python und SQL. Sehr gute Deutschkenntnisse (C1)" in result.text
+    assert "Ihre Aufgaben: Aufbau von Power BI Dashboards." in result.text
+    # language evidence survives inside the dropped benefits section
+    assert "Englisch ist unsere Arbeitssprache im Team." in result.text
+    for gone in ("Urlaub", "Marktführer", "unabhängig von Geschlecht", "Datenschutz", "Button"):
+        assert gone not in result.text
+    assert result.text.count("wachsendes Analytics-Team") == 1
+    assert result.tokens_out < result.tokens_in
+    assert not result.truncated
+
+
+def test_compaction_budget_fills_requirement_sections_first():
+    padded = "Unternehmensgeschichte und Vision. " * 200 + DESCRIPTION
+    result = compact_description(padded, 60)
+
+    assert result.truncated
+    assert result.tokens_out <= 60 + 2
+    assert "Sehr gute Deutschkenntnisse (C1)" in result.text
+    assert estimate_tokens(result.text) == result.tokens_out
+
+
+
+def test_sentence_dropped_in_boilerplate_does_not_suppress_later_copy():
+    sentence = "Wir entwickeln moderne Datenplattformen für Kunden aus der Logistikbranche"
+    result = compact_description(f"Über uns {sentence}. Ihre Aufgaben {sentence}. Sie bauen Pipelines.", 1000)
+
+    assert f"Ihre Aufgaben {sentence}." in result.text
+
+
+def test_prompts_use_compacted_description(monkeypatch):
+    on = dataclasses.replace(llm_enrich.settings, llm_prompt_compaction=True, llm_prompt_max_tokens=4000)
+    off = dataclasses.replace(on, llm_prompt_compaction=False)
+
+    monkeypatch.setattr(llm_enrich, "settings", on)
+    compact_user = llm_enrich._enrich_messages(JOB)[1]["content"]
+    score_payload = json.loads(llm_enrich._llm_score_messages(JOB, llm_enrich.DEFAULT_FOCUS, {"meta": {"x": 1}})[1]["content"])
+
+    monkeypatch.setattr(llm_enrich, "settings", off)
+    full_user = llm_enrich._enrich_messages(JOB)[1]["content"]
+
+    assert "Marktführer" in full_user and "Marktführer" not in compact_user
+    assert "Deutschkenntnisse (C1)" in compact_user
+    # titles/skills live in the system prompt, so neither user prompt repeats them
+    assert '"titles_any"' not in full_user and '"titles_any"' not in compact_user
+    assert len(compact_user) < len(full_user)
+    assert "meta" not in score_payload["heuristic_summary"]
+    assert "Urlaub" not in score_payload["job"]["description_text"]
+
+
+def test_enrichment_fingerprint_ignores_scoring_only_focus_fields(monkeypatch):
+    stricter = dataclasses.replace(DEFAULT_FOCUS, blocker_cap_hard=5, experience_penalty_strength=2.0)
+    for compaction in (False, True):
+        monkeypatch.setattr(llm_enrich, "settings", dataclasses.replace(llm_enrich.settings, llm_prompt_compaction=compaction))
+        assert llm_enrich.enrichment_fingerprint(stricter) == llm_enrich.enrichment_fingerprint(DEFAULT_FOCUS)
+        prompt = llm_enrich._build_user_prompt(JOB, stricter)
+        assert "experience_penalty_strength" not in prompt
+        assert "candidate_german_level" in prompt
@@ -0,0 +1,68 @@
+from email.utils import formatdate
+
+from app.fetching import rate_limit
+from app.fetching.rate_limit import AimdBounds
+
+
+BOUNDS = AimdBounds(min_rate=0.05, max_rate=0.5, initial_rate=0.1)
+
+
+def test_reserve_paces_requests_at_current_rate():
+    state = rate_limit.new_state(BOUNDS, now=0.0)
+
+    assert rate_limit.reserve(state, 0.0) == 0.0
+    # second request right away waits one full gap (1 / 0.1 = 10s)
+    assert abs(rate_limit.reserve(state, 0.0) - 10.0) < 1e-6
+    # concurrent third caller queues behind the second
+    assert abs(rate_limit.reserve(state, 0.0) - 20.0) < 1e-6
+
+
+def test_reserve_spaces_callers_queued_behind_retry_after():
+    state = rate_limit.new_state(BOUNDS, now=0.0)
+    rate_limit.on_throttle(state, BOUNDS, now=100.0, retry_after=30)
+    rate = state.rate
+
+    first = rate_limit.reserve(state, 100.0)
+    second = rate_limit.reserve(state, 100.0)
+
+    assert abs(first - 30.0) < 1e-6
+    # the second caller fires one gap after the block ends, not together with the first
+    assert abs(second - (30.0 + 1.0 / rate)) < 1e-6
+
+
+def test_aimd_increases_on_fast_success_and_halves_on_throttle():
+    state = rate_limit.new_state(BOUNDS, now=0.0)
+    for _ in range(200):
+        rate_limit.on_success(state, BOUNDS, latency=0.2)
+    assert state.rate == BOUNDS.max_rate
+
+    rate_limit.on_throttle(state, BOUNDS, now=100.0, retry_after=30)
+    assert state.rate == BOUNDS.max_rate * 0.5
+    assert state.blocked_until == 130.0
+    assert rate_limit.reserve(state, 101.0) >= 29.0
+
+    for _ in range(20):
+        rate_limit.on_throttle(state, BOUNDS, now=200.0)
+    assert state.rate == BOUNDS.min_rate
+
+
+def test_slow_success_eases_rate_down():
+    state = rate_limit.new_state(BOUNDS, now=0.0)
+    rate_limit.on_success(state, BOUNDS, latency=60.0)
+    assert state.rate < BOUNDS.initial_rate
+
+
+def test_parse_retry_after_seconds_and_http_date():
+    assert rate_limit.parse_retry_after("120") == 120.0
+    assert rate_limit.parse_retry_after(None) is None
+    assert rate_limit.parse_retry_after("soon") is None
+    now = 1_700_000_000.0
+    http_date = formatdate(now + 90, usegmt=True)
+    assert abs(rate_limit.parse_retry_after(http_date, now=now) - 90.0) < 1.0
+
+
+def test_bounds_overrides_match_parent_domain(monkeypatch):
+    monkeypatch.setattr(rate_limit, "_OVERRIDES", {"stepstone.de": (0.01, 0.05)})
+    bounds = rate_limit.bounds_for_domain("www.stepstone.de")
+    assert (bounds.min_rate, bounds.max_rate) == (0.01, 0.05)
+    assert bounds.min_rate <= bounds.initial_rate <= bounds.max_rate
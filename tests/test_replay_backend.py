@@ -0,0 +1,86 @@
+import asyncio
+import dataclasses
+import json
+from pathlib import Path
+
+import pytest
+
+from app.fetching import polite_fetch, replay as replay_mod
+from app.fetching.html_archive import HtmlArchive
+from app.pipeline import pipeline
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+def _use_replay(monkeypatch, replay_dir, archive=None):
+    monkeypatch.setattr(
+        replay_mod,
+        "settings",
+        dataclasses.replace(replay_mod.settings, fetch_replay_dir=str(replay_dir) if replay_dir else None),
+    )
+    monkeypatch.setattr(replay_mod, "get_html_archive", lambda: archive)
+
+
+def _no_network(*args, **kwargs):
+    raise AssertionError("replay backend must not touch the network")
+
+
+def test_replay_backend_serves_saved_page_without_robots_or_rate_limit(monkeypatch):
+    _use_replay(monkeypatch, DATA_DIR)
+    monkeypatch.setattr(polite_fetch, "_ensure_robots_allowed", _no_network)
+    monkeypatch.setattr(polite_fetch, "_respect_rate_limit", _no_network)
+
+    html, meta = asyncio.run(
+        polite_fetch.fetch_job_html(
+            "https://www.stepstone.de/stellenangebote--x/job_stepstone_1.html",
+            preferred_backend="archive",
+        )
+    )
+
+    assert html == (DATA_DIR / "job_stepstone_1.html").read_text(encoding="utf-8")
+    assert meta["backend"] == "archive"
+    assert meta["attempts"][0]["source"] == "replay_dir"
+
+
+def test_replay_backend_uses_manifest_then_archive(monkeypatch, tmp_path):
+    (tmp_path / "saved.html").write_text("<html>manifest</html>", encoding="utf-8")
+    (tmp_path / "index.json").write_text(
+        json.dumps({"https://example.com/jobs/1": "saved.html"}), encoding="utf-8"
+    )
+    archive = HtmlArchive(tmp_path / "arch", max_bytes=0)
+    archive.put("https://example.com/jobs/2", "<html>archived</html>", backend="http", status=200)
+    _use_replay(monkeypatch, tmp_path, archive)
+
+    html1, _ = asyncio.run(polite_fetch.fetch_job_html("https://example.com/jobs/1#top", preferred_backend="archive"))
+    html2, meta2 = asyncio.run(polite_fetch.fetch_job_html("https://example.com/jobs/2", preferred_backend="archive"))
+
+    assert html1 == "<html>manifest</html>"
+    assert html2 == "<html>archived</html>"
+    assert meta2["archive_sha256"]
+
+    with pytest.raises(polite_fetch.FetchError) as excinfo:
+        asyncio.run(polite_fetch.fetch_job_html("https://example.com/jobs/3", preferred_backend="archive"))
+    assert excinfo.value.status == 404
+
+
+def test_fetch_job_details_archive_backend_bypasses_cache(monkeypatch):
+    _use_replay(monkeypatch, DATA_DIR)
+
+    def fail_cache(*args, **kwargs):
+        raise AssertionError("cache must not be used for replays")
+
+    monkeypatch.setattr(pipeline, "layer_get", fail_cache)
+    monkeypatch.setattr(pipeline, "layer_put", fail_cache)
+
+    result = asyncio.run(
+        pipeline.fetch_job_details(
+            "https://www.stepstone.de/job_stepstone_1.html",
+            backend="archive",
+            enrich=False,
+            score=True,
+        )
+    )
+
+    assert result["ok"] is True
+    assert result["backend"] == "archive"
+    assert result["job"]["title"]
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import copy
+import dataclasses
+
+from app.config.focus import DEFAULT_FOCUS
+from app.pipeline import scoring
+from app.pipeline.scoring import HeuristicWeights, aggregate_heuristic, score_job
+from app.pipeline.scoring_batch import score_jobs
+from tests.scoring_reference import SAMPLE_JOBS
+
+JOBS = [dict(job) for job in SAMPLE_JOBS] + [
+    {"title": "Junior Data Analyst", "description_text": "English only. Python, SQL.", "location": "Hamburg", "english_ok": True},
+    {"title": "", "description_text": "", "location": ""},
+    {"title": "Lead BI Developer", "description_text": "Deutsch C2, 6 years of SQL.", "location": "Essen", "seniority": "Senior"},
+]
+LLM_PARTS = [
+    {"llm_ok": True, "llm_score": 82, "confidence": 0.9, "german_requirement": {"min_level": "B2", "type": "required"}},
+    None,
+    {"llm_ok": False, "llm_score": None, "error_type": "timeout"},
+    {"llm_ok": True, "llm_score": 10, "confidence": 0.3, "critical_blockers": ["on-site only"], "risk_flags": ["x"]},
+    {},
+    {"llm_ok": True, "llm_score": 55.5, "confidence": 0.6, "german_requirement": {"min_level": "C1", "type": "hard_blocker"}},
+]
+
+
+def _pairs(focus, apply_blocker_cap, llm_parts):
+    batch_jobs, single_jobs = copy.deepcopy(JOBS), copy.deepcopy(JOBS)
+    batch = score_jobs(batch_jobs, focus, apply_blocker_cap=apply_blocker_cap, llm_parts=copy.deepcopy(llm_parts))
+    single = [
+        score_job(job, focus, use_llm_scoring=False, apply_blocker_cap=apply_blocker_cap, llm_part=copy.deepcopy(llm_parts[i]) if llm_parts else None)
+        for i, job in enumerate(single_jobs)
+    ]
+    # jobs are updated in place (language_requirements, german_requirement) as score_job does
+    assert batch_jobs == single_jobs
+    return batch, single
+
+
+def test_score_jobs_matches_score_job_heuristic_only():
+    relocation = dataclasses.replace(DEFAULT_FOCUS, relocation_ok=False)
+    for focus in (DEFAULT_FOCUS, relocation):
+        for cap in (True, False):
+            batch, single = _pairs(focus, cap, None)
+            assert batch == single
+
+
+def test_score_jobs_blends_stored_llm_parts_like_score_job(monkeypatch):
+    focus = dataclasses.replace(DEFAULT_FOCUS, candidate_german_level="A2", relocation_ok=False)
+    for override in (True, False):
+        monkeypatch.setattr(scoring, "settings", dataclasses.replace(scoring.settings, llm_language_override=override))
+        batch, single = _pairs(focus, True, LLM_PARTS)
+        assert batch == single
+    assert batch[0]["alpha"] < 1.0 and batch[2]["alpha"] == 1.0
+    assert batch[5]["cap_reason"].startswith("hard_blockers:")
+
+
+def test_score_jobs_applies_custom_weights():
+    weights = HeuristicWeights(base_score=40.0, components={"skills": 2.0, "language": 0.5})
+    jobs = copy.deepcopy(JOBS)
+    results = score_jobs(jobs, apply_blocker_cap=False, weights=weights)
+
+    for job, result in zip(copy.deepcopy(JOBS), results):
+        hp = scoring.heuristic_pass(job, DEFAULT_FOCUS)
+        assert result["heuristic_score"] == aggregate_heuristic(hp.component_results, weights)
+    assert score_jobs([]) == []
@@ -0,0 +1,65 @@
+import asyncio
+
+from app.fetching import polite_fetch
+from app.fetching.rate_limit import AimdBounds
+from app.fetching.shared_state import SharedFetchState
+
+BOUNDS = AimdBounds(min_rate=0.05, max_rate=0.5, initial_rate=0.1)
+
+
+def test_reservations_queue_across_handles(tmp_path):
+    path = tmp_path / "state.sqlite"
+    proc_a = SharedFetchState(path)
+    proc_b = SharedFetchState(path)
+
+    wait_a, _ = proc_a.reserve("www.stepstone.de", BOUNDS)
+    wait_b, record = proc_b.reserve("www.stepstone.de", BOUNDS)
+
+    assert wait_a == 0.0
+    # the second "process" sees the first one's token and waits ~one gap
+    assert 9.0 <= wait_b <= 10.5
+    assert record.aimd.rate == BOUNDS.initial_rate
+
+
+def test_update_and_robots_are_visible_to_other_handles(tmp_path):
+    path = tmp_path / "state.sqlite"
+    proc_a = SharedFetchState(path)
+    proc_b = SharedFetchState(path)
+
+    def throttle(record, now):
+        record.consecutive_failures += 1
+        record.aimd.rate = 0.05
+
+    proc_a.update("example.com", BOUNDS, throttle)
+    proc_a.put_robots("example.com", "User-agent: *\nDisallow: /private")
+    proc_a.put_robots("allow-all.example", None)
+
+    _, record = proc_b.reserve("example.com", BOUNDS)
+    assert record.consecutive_failures == 1
+    assert record.aimd.rate == 0.05
+    assert proc_b.get_robots("example.com", ttl=60) == (True, "User-agent: *\nDisallow: /private")
+    assert proc_b.get_robots("allow-all.example", ttl=60) == (True, None)
+    assert proc_b.get_robots("unknown.example", ttl=60) == (False, None)
+
+
+def test_polite_fetch_reuses_robots_fetched_by_another_process(monkeypatch, tmp_path):
+    shared = SharedFetchState(tmp_path / "state.sqlite")
+    shared.put_robots("jobs.example", "User-agent: *\nDisallow: /private")
+    monkeypatch.setattr(polite_fetch, "get_shared_fetch_state", lambda: shared)
+    monkeypatch.setattr(polite_fetch, "ROBOTS_CACHE", {})
+    monkeypatch.setattr(polite_fetch, "ROBOTS_LOCKS", {})
+
+    async def no_network(url, user_agent):
+        raise AssertionError("robots.txt should come from shared state")
+
+    monkeypatch.setattr(polite_fetch, "_fetch_robots_text", no_network)
+
+    async def run():
+        await polite_fetch._ensure_robots_allowed("https://jobs.example/ok", "ua")
+        try:
+            await polite_fetch._ensure_robots_allowed("https://jobs.example/private/x", "ua")
+        except polite_fetch.RobotsDisallowedError:
+            return True
+        return False
+
+    assert asyncio.run(run()) is True
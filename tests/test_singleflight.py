@@ -0,0 +1,84 @@
+import asyncio
+from pathlib import Path
+
+from app.common.singleflight import SingleFlight
+from app.pipeline import pipeline
+
+
+def test_singleflight_coalesces_and_copies_results():
+    flight = SingleFlight("test")
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"value": [1, 2]}
+
+    async def run():
+        return await asyncio.gather(*(flight.do("k", work) for _ in range(3)))
+
+    results = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert [shared for _, shared in results] == [False, True, True]
+    first, second = results[0][0], results[1][0]
+    assert first == second and first is not second
+    assert flight.stats()["coalesced"] == 2
+    assert flight.stats()["inflight"] == 0
+
+
+def test_singleflight_propagates_errors_to_all_waiters():
+    flight = SingleFlight("test")
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    async def run():
+        return await asyncio.gather(*(flight.do("k", boom) for _ in range(2)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_fetch_job_details_shares_fetch_and_enrichment(monkeypatch):
+    html = (Path(__file__).parent / "data" / "job_stepstone_1.html").read_text(encoding="utf-8")
+    counts = {"fetch": 0, "enrich": 0}
+
+    async def fake_fetch_job_html(url, preferred_backend=None):
+        counts["fetch"] += 1
+        await asyncio.sleep(0.01)
+        return html, {"backend": "http", "attempts": [], "ok": True}
+
+    async def fake_enrich(job, focus=None):
+        counts["enrich"] += 1
+        await asyncio.sleep(0.01)
+        return {**job, "seniority": "Junior"}, {"ok": True, "model": "test"}
+
+    monkeypatch.setattr(pipeline, "fetch_job_html", fake_fetch_job_html)
+    monkeypatch.setattr(pipeline, "aenrich_jobposting", fake_enrich)
+    monkeypatch.setattr(pipeline, "FETCH_FLIGHT", SingleFlight("fetch"))
+    monkeypatch.setattr(pipeline, "ENRICH_FLIGHT", SingleFlight("enrich"))
+
+    async def run():
+        return await asyncio.gather(
+            *(
+                pipeline.fetch_job_details(
+                    "https://example.com/job/1#top",
+                    backend="http",
+                    enrich=True,
+                    score=False,
+                    use_cache=False,
+                )
+                for _ in range(2)
+            )
+        )
+
+    results = asyncio.run(run())
+
+    assert counts["fetch"] == 1
+    assert sorted(r["fetch_meta"]["coalesced"] for r in results) == [False, True]
+    assert counts["enrich"] == 1
+    assert sorted(r["enrichment_meta"]["coalesced"] for r in results) == [False, True]
+    assert all(r["job"]["seniority"] == "Junior" for r in results)
+    assert results[0]["job"] is not results[1]["job"]
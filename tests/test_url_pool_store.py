@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from app.pipeline import url_pool_maintenance
+from app.pipeline.url_pool import UrlPoolStore, open_pool_store
+
+
+def test_upsert_collapses_duplicates_and_checks_membership(tmp_path: Path):
+    pool = UrlPoolStore(tmp_path / "url_pool.sqlite")
+    written = pool.upsert(
+        [
+            {"url": "https://x/job/1#top", "seen_at": "2025-01-02T00:00:00Z", "run_id": "r2"},
+            {"url": "https://x/job/1", "seen_at": "2025-01-01T00:00:00+00:00", "run_id": "r1"},
+            {"url": "https://x/job/2", "seen_at": "2025-01-03T00:00:00Z", "run_id": "r3"},
+            {"url": "  "},
+        ]
+    )
+
+    assert written == 3
+    assert pool.count() == 2
+    assert pool.known(["https://x/job/1", "https://x/job/2#a", "https://x/job/3"]) == {"https://x/job/1", "https://x/job/2"}
+    assert pool.urls() == ["https://x/job/1", "https://x/job/2"]
+    row = pool._conn.execute("SELECT first_seen_at, last_seen_at, run_id FROM url_pool WHERE url = ?", ("https://x/job/1",)).fetchone()
+    assert tuple(row) == ("2025-01-01T00:00:00Z", "2025-01-02T00:00:00Z", "r2")
+
+    pool.mark_inactive(["https://x/job/2"], http_status=410)
+    assert not pool.contains("https://x/job/2")
+    assert pool.known(["https://x/job/2"], active_only=False) == {"https://x/job/2"}
+    assert pool.stats()["inactive"] == 1
+    pool.close()
+
+
+def test_open_pool_store_imports_legacy_jsonl(tmp_path: Path):
+    lines = [{"url": f"https://x/job/{i}", "seen_at": "2025-01-01T00:00:00Z", "run_id": "r1"} for i in range(3)]
+    (tmp_path / "url_pool.jsonl").write_text(
+        "\n".join(json.dumps(line) for line in lines + lines[:1]) + "\nbroken\n", encoding="utf-8"
+    )
+    (tmp_path / "url_pool_unavailable.jsonl").write_text(
+        json.dumps({"url": "https://x/job/2", "seen_at": "2025-02-01T00:00:00Z", "reason": "stepstone_unavailable"}) + "\n",
+        encoding="utf-8",
+    )
+
+    pool = open_pool_store(tmp_path)
+
+    assert pool.urls() == ["https://x/job/0", "https://x/job/1"]
+    assert pool.urls(active=False) == ["https://x/job/2"]
+    pool.close()
+
+
+def test_reimporting_legacy_pool_keeps_pruned_urls_inactive(tmp_path: Path):
+    (tmp_path / "url_pool.jsonl").write_text(
+        json.dumps({"url": "https://x/job/1", "seen_at": "2025-01-01T00:00:00Z", "run_id": "r1"}) + "\n",
+        encoding="utf-8",
+    )
+    pool = open_pool_store(tmp_path)
+    pool.mark_inactive(["https://x/job/1"], http_status=404, reason="stepstone_unavailable")
+
+    counts = pool.import_jsonl(tmp_path / "url_pool.jsonl")
+
+    assert counts["imported"] == 1
+    assert not pool.contains("https://x/job/1")
+    row = pool._conn.execute("SELECT last_http_status, reason FROM url_pool").fetchone()
+    assert tuple(row) == (404, "stepstone_unavailable")
+    pool.close()
+
+
+def test_prune_marks_unavailable_urls_inactive(tmp_path: Path, monkeypatch):
+    pool = open_pool_store(tmp_path)
+    pool.add_urls(["https://x/job/gone", "https://x/job/live"], run_id="r1")
+    pool.close()
+
+    async def fake_fetch(url, preferred_backend=None):
+        status = 404 if url.endswith("gone") else 200
+        return "<html></html>", {"status": status}
+
+    async def no_wait(self):
+        return None
+
+    monkeypatch.setattr(url_pool_maintenance, "fetch_job_html", fake_fetch)
+    monkeypatch.setattr(url_pool_maintenance._RateLimiter, "wait_turn", no_wait)
+
+    metrics = url_pool_maintenance.prune_unavailable_stepstone_urls(tmp_path, run_id="prune", preferred_backend="http")
+
+    assert metrics["removed_unavailable"] == 1 and metrics["kept_active"] == 1
+    pool = open_pool_store(tmp_path)
+    assert pool.urls() == ["https://x/job/live"]
+    statuses = dict(pool._conn.execute("SELECT url, last_http_status FROM url_pool").fetchall())
+    assert statuses == {"https://x/job/gone": 404, "https://x/job/live": 200}
+    pool.close()